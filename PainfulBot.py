@@ -6,8 +6,8 @@ import asyncio
 import math
 import time
 import re
-import inspect
-from datetime import datetime, timedelta
+import signal
+from datetime import datetime, timedelta, timezone
 
 from aiohttp import web as aiohttp_web
 from twitchio.ext import commands, eventsub
@@ -20,9 +20,13 @@ from items import (ITEMS, Item, junk_fee_for, apply_cash_skim,
 from bot.config import (
     BOT_NICK, CLIENT_ID, CLIENT_SECRET, TOKEN, PREFIX,
     CHANNEL, CHANNEL_OWNER, BROADCASTER_ID, MODERATOR_ID,
-    EVENTSUB_TOKEN, MONDAY_MODEL, MONDAY_COOLDOWN
+    EVENTSUB_TOKEN, MONDAY_MODEL, MONDAY_COOLDOWN, CHAT_RATE_LIMIT, ARENA_COUNT
 )
 from bot import helpers
+from bot import chat_queue
+from bot import web_dispatch
+from bot import player_locks
+from bot import click_burst
 from bot import db as player_db
 from bot import memory as chatter_memory
 from bot import perks
@@ -31,9 +35,22 @@ from integrations import monday, audio
 from integrations.monday import openai_client
 from integrations import battle_overlay as overlay
 from integrations import game_overlay
-from game.battle import BossBattle
+from game.battle import BattleAction, BattleEngine, ITEM_EFFECTS
+from game import battle as battle_engine
 from game import jail
 from game import hardware, hacks
+from game import attacks
+from game import job_scheduler
+from game import expiry
+from game import item_index
+from game import locations
+from game import usernames
+from game import drops
+from game import curse_timers
+from game import arenas
+from game import ledger
+# Aliased: `leaderboard` is also the name of the chat command method.
+from game import leaderboard as rankings
 
 HACK_ITEMS = {
     "Wireshark", "Metasploit", "EvilGinx", "O.MG Cable",
@@ -49,55 +66,6 @@ BATTLE_DROPS = [
 ]
 
 
-# ── Boss-battle item effects (Round 2) ───────────────────────────────────────
-# Each entry: {tier, attack_name, damage_range, effect}.
-# `effect` is either None (pure damage) or a discriminated-union dict:
-#   {"type": "max_roll"}                                       — deal top of range
-#   {"type": "crit", "mult": float}                            — multiply rolled damage
-#   {"type": "skip_boss_next_turn", "chance": float}           — chance to skip boss's next attack
-#   {"type": "weakness_next_turn", "reduction": int}           — boss next attack does -N dmg
-#   {"type": "heal_self", "amount": int}                       — heal user
-#   {"type": "heal_random_teammate", "amount": int}            — heal random ally
-#   {"type": "bonus_points", "amount": int}                    — extra points at battle end
-#   {"type": "reveal_boss_damage"}                             — log boss's pre-rolled next dmg
-#   {"type": "reveal_boss_target"}                             — log boss's pre-rolled next target
-#   {"type": "browns_punt"}                                    — cosmetic chance for log gag
-#   {"type": "burner_volley", "shots": N, "per_shot": (lo,hi)} — multi-shot, overrides damage_range
-# BATTLE_DROPS items (Consciousness USB, Raspberry Pi, etc.) are intentionally
-# absent — they remain passive auto-triggers in run_team_battle.
-ITEM_EFFECTS = {
-    # ── Tier 1 — common, damage stamps ───────────────────────────────
-    "Cookies":              {"tier": 1, "attack_name": "Session hijack",       "damage_range": (15, 25),  "effect": None},
-    "Mimikatz":             {"tier": 1, "attack_name": "Credential dump",      "damage_range": (20, 35),  "effect": None},
-    "VX Underground HDD":   {"tier": 1, "attack_name": "Ransomware payload",   "damage_range": (25, 40),  "effect": None},
-
-    # ── Tier 2 — mid-tier, light effects ─────────────────────────────
-    "EvilGinx":             {"tier": 2, "attack_name": "Spear-phish Theo",     "damage_range": (45, 65),  "effect": None},
-    "Nmap":                 {"tier": 2, "attack_name": "Recon scan",           "damage_range": (35, 55),  "effect": {"type": "reveal_boss_damage"}},
-    "Hydra":                {"tier": 2, "attack_name": "Brute force creds",    "damage_range": (45, 65),  "effect": {"type": "max_roll"}},
-    "Shodan API Key":       {"tier": 2, "attack_name": "Banner grab",          "damage_range": (40, 60),  "effect": {"type": "skip_boss_next_turn", "chance": 0.25}},
-    "Kali ISO":             {"tier": 2, "attack_name": "Full toolkit barrage", "damage_range": (55, 75),  "effect": None},
-
-    # ── Tier 3 — marquee, meaningful effects ─────────────────────────
-    "Wireshark":            {"tier": 3, "attack_name": "Packet sniff + inject","damage_range": (50, 80),  "effect": {"type": "reveal_boss_target"}},
-    "Metasploit":           {"tier": 3, "attack_name": "Exploit chain",        "damage_range": (70, 100), "effect": {"type": "crit", "mult": 1.5}},
-    "O.MG Cable":           {"tier": 3, "attack_name": "Hardware backdoor",    "damage_range": (60, 90),  "effect": {"type": "weakness_next_turn", "reduction": 15}},
-    "YubiKey":              {"tier": 3, "attack_name": "Auth bypass",          "damage_range": (65, 95),  "effect": {"type": "skip_boss_next_turn", "chance": 1.0}},
-    "Burner Laptop":        {"tier": 3, "attack_name": "Rapid-fire barrage",   "damage_range": (0, 0),    "effect": {"type": "burner_volley", "shots": 10, "per_shot": (8, 15)}},
-
-    # ── Tier 4 — rare/event, powerful effects ────────────────────────
-    "NES":                  {"tier": 4, "attack_name": "Konami code DDoS",     "damage_range": (85, 115), "effect": {"type": "skip_boss_next_turn", "chance": 0.5}},
-    "Contra Cartridge":     {"tier": 4, "attack_name": "30 lives barrage",     "damage_range": (100, 130),"effect": None},
-    "Golden Cassette Tape": {"tier": 4, "attack_name": "Mixtape mind-fuck",    "damage_range": (90, 110), "effect": {"type": "bonus_points", "amount": 50}},
-    "Jet Black Hoodie":     {"tier": 4, "attack_name": "Vanish + strike",     "damage_range": (90, 120), "effect": {"type": "heal_self", "amount": 30}},
-    "RGB Keyboard (Purple)":{"tier": 4, "attack_name": "Mechanical frenzy",    "damage_range": (100, 140),"effect": None},
-
-    # ── Flavor — low damage, support effects ─────────────────────────
-    "A Fresh Hot Cup of Black Coffee": {"tier": 0, "attack_name": "Caffeinate",        "damage_range": (5, 15),  "effect": {"type": "heal_self", "amount": 15}},
-    "Tiny Browns Helmet":              {"tier": 0, "attack_name": "We punt!",          "damage_range": (8, 18),  "effect": {"type": "browns_punt"}},
-    "Root Beer Flask":                 {"tier": 0, "attack_name": "Patch Tuesday brew","damage_range": (15, 30), "effect": {"type": "heal_random_teammate", "amount": 20}},
-}
-
 JOIN_TAUNTS = [
     "Scanning @{username}... threat level: negligible.",
     "Another script kiddie enters the terminal. How adorable.",
@@ -109,31 +77,6 @@ JOIN_TAUNTS = [
     "@{username} detected on the network. Firewall says: lol.",
 ]
 
-DEATH_TAUNTS = [
-    "Process terminated. Exit code: skill issue.",
-    "Garbage collected. Next.",
-    "404: Hacker not found.",
-    "Connection closed by foreign host.",
-    "Segmentation fault (core dumped).",
-    "CTRL+C accepted. Thread killed.",
-    "That one gets recycled into my botnet. Thanks.",
-    "rm -rf challenger — done.",
-]
-
-TURN_TAUNTS = [
-    "My DDoS has its own DDoS.",
-    "I've already pwned your home router. Just so you know.",
-    "My firewall is literally laughing at you right now.",
-    "Checked your commit history. Oh no.",
-    "I have root on six of your machines already.",
-    "AngyTheo.exe has entered an infinite loop.",
-    "I wrote this ransomware over a lunch break. Took 20 minutes.",
-    "Your OPSEC is giving me second-hand embarrassment.",
-    "I see you're using Metasploit. How... beginner of you.",
-    "The RGB is set to red. You know what that means.",
-]
-
-
 class WebCtx:
     """Mock TwitchIO context for web-triggered commands."""
 
@@ -163,10 +106,35 @@ class _ChannelCtx:
         self.command = None
 
     async def send(self, msg):
-        try:
-            await self._bot.connected_channels[0].send(str(msg))
-        except Exception:
-            pass  # If the bot is between reconnects, drop the message rather than crash the task.
+        # Queued, not sent inline: the chat queue paces against Twitch's limits
+        # and drops (rather than raises) if the bot is between reconnects.
+        self._bot.say(msg)
+
+
+class _QueuedChannel:
+    """Channel stand-in for helpers that take a channel / send_func (audio
+    clips, Monday replies) so their output goes through the chat queue."""
+    def __init__(self, bot, priority, mergeable=True):
+        self._bot = bot
+        self._priority = priority
+        self._mergeable = mergeable
+
+    async def send(self, msg):
+        self._bot.say(msg, self._priority, mergeable=self._mergeable)
+
+
+class _QueuedContext(commands.Context):
+    """Chat command context whose replies go through the bot's chat queue.
+    Owner/mod replies jump ahead of game output; everything else is a game
+    outcome."""
+    async def send(self, content):
+        author = self.author
+        name = getattr(author, 'name', '') or ''
+        if getattr(author, 'is_mod', False) or self.bot.is_channel_owner(name):
+            priority = chat_queue.PRIORITY_MOD
+        else:
+            priority = chat_queue.PRIORITY_GAME
+        self.bot.say(content, priority)
 
 
 class Bot(commands.Bot):
@@ -189,11 +157,15 @@ class Bot(commands.Bot):
         # Load player data from JSON file
         self.player_data = {}
         self.player_data = helpers.load_player_data()
-        self.last_battle_time = datetime.min
-        self.boss_battle_cooldown = timedelta(minutes=5)
-        self.ongoing_battle = None
-        self.dropped_items = []  # Add this line to initialize dropped_items list
+        # Boss battles run side by side in numbered arenas (game/arenas.py),
+        # each with its own team, cooldown, turn loop and overlay channel.
+        self.arenas = arenas.ArenaManager(ARENA_COUNT)
         self.drop_expiry = timedelta(minutes=15)  # Drops expire after 15 minutes
+        # World drops keyed by name with an expiry heap; drops_loop retires
+        # expired ones and pulls them from the overlay's Grab bar.
+        self._drops_wakeup = asyncio.Event()
+        self.drops = drops.DropRegistry(self.drop_expiry.total_seconds(),
+                                        on_earlier=self._drops_wakeup.set)
         self.last_public_message = {}  # Add this to track last public message per command
         self.last_monday_time = datetime.min  # Track global cooldown for !Monday command
         self.last_monday_error = None
@@ -292,14 +264,40 @@ class Bot(commands.Bot):
         # treasury in one batched write + overlay push on the idle ticker, so a
         # holder autoclicking can't trigger a treasury write per attack.
         self._pending_skim = 0
-        # Timed (on_tick) malicious-effect schedule: {(username, item): next_due_dt}.
-        # In-memory — a bot restart just grants a one-cycle reprieve. Dispatch by
-        # effect kind so adding a timed curse is one handler + one registry entry.
-        self._malicious_due = {}
+        # Timed (on_tick) malicious effects, dispatched by kind so adding a
+        # timed curse is one handler + one registry entry.
         self._on_tick_handlers = {
             'inventory_drop': self._force_inventory_drop,
             'jail_beacon':    self._fire_jail_beacon,
         }
+        # Curses that fire on a timer, armed on acquisition and cancelled when
+        # they leave the inventory (Player.add_item/remove_item). Due times
+        # persist on the player; curse_loop fires only what is due.
+        self._curse_wakeup = asyncio.Event()
+        self.curse_timers = curse_timers.CurseTimers(
+            {name: eff['interval_sec'] for name, eff in MALICIOUS_EFFECTS.items()
+             if 'interval_sec' in eff and eff.get('kind') in self._on_tick_handlers},
+            on_earlier=self._curse_wakeup.set)
+        set_curse_timers(self.curse_timers)
+        # Item → holders index, kept current by Player.add_item/remove_item and
+        # re-seeded from the roster once the DB has loaded.
+        self.item_index = item_index.ItemIndex()
+        set_item_index(self.item_index)
+        # Points / cash / session-earnings rankings, fed by every Player
+        # points/cash write; the idle ticker pushes a board only when its
+        # top-N changes.
+        self.leaderboards = rankings.Leaderboards()
+        set_leaderboards(self.leaderboards)
+        # Economy ledger: every points/cash change goes through ledger.apply,
+        # which records why; bot/db.py's flusher bulk-inserts the rows.
+        self.ledger = ledger.Ledger()
+        ledger.set_ledger(self.ledger)
+        # location → players index (steal, !here) plus per-location activity.
+        self.locations = locations.LocationIndex()
+        set_location_index(self.locations)
+        # Sorted username index: target autocomplete (/complete) and the
+        # "did you mean" hint on unknown targets.
+        self.usernames = usernames.UsernameIndex()
         # Monday random replies tuning
         self.monday_random_chance = 0.10
         # Lower frequency for random replies: 2–4 minutes between global triggers
@@ -321,8 +319,32 @@ class Bot(commands.Bot):
         self.audio_clip_cooldowns = {}
         self.audio_seen_users = set()  # track first-message cases (e.g., britejess)
         self.audio_triggers = helpers.load_audio_triggers()
+        # All outbound chat is paced through one prioritized queue (see
+        # bot/chat_queue.py); the drain task starts in event_ready.
+        self.chat_queue = chat_queue.ChatQueue(
+            lambda text: self.connected_channels[0].send(text),
+            rate_limit=CHAT_RATE_LIMIT,
+        )
+
+        # Per-player command serialization (see bot/player_locks.py), held by
+        # both entry points: invoke() for chat, execute_web_command for the GUI.
+        self.player_locks = player_locks.PlayerLocks()
+        # Clicker attacks: per-click rolls, batched feed/player pushes.
+        self.click_bursts = click_burst.BurstCoalescer(self._flush_click_burst)
+        # Idle-job deadline heap. hacks.start_hack registers every new job;
+        # registering an earlier deadline wakes job_scheduler_loop to re-arm.
+        self._jobs_wakeup = asyncio.Event()
+        self.job_scheduler = job_scheduler.JobScheduler(on_earlier=self._jobs_wakeup.set)
+        hacks.set_job_scheduler(self.job_scheduler)
+        # Expiry timers (jail release, VPS lapse, box expiry, no-cap end). The
+        # game mutators register deadlines via expiry.track.
+        self._expiry_wakeup = asyncio.Event()
+        self.expiry_timers = expiry.ExpiryTimers(on_earlier=self._expiry_wakeup.set)
+        expiry.set_expiry_timers(self.expiry_timers)
 
         self._load_command_cogs()
+        # Built once all cogs are in; add_cog/remove_cog rebuild it afterwards.
+        self._rebuild_web_dispatch()
 
     def _load_command_cogs(self):
         """Auto-discover and load every Cog module under commands/.
@@ -341,6 +363,44 @@ class Bot(commands.Bot):
             if callable(prepare):
                 prepare(self)
 
+    def _rebuild_web_dispatch(self):
+        """(Re)compile the web command dispatch table — see bot/web_dispatch.py."""
+        self._web_dispatch = web_dispatch.build_dispatch_table(
+            self, self.commands, self._WEB_ONLY_HANDLERS,
+        )
+
+    def add_cog(self, cog):
+        super().add_cog(cog)
+        # Cogs loaded during __init__ are picked up by the first build.
+        if hasattr(self, '_web_dispatch'):
+            self._rebuild_web_dispatch()
+
+    def remove_cog(self, cog_name):
+        super().remove_cog(cog_name)
+        if hasattr(self, '_web_dispatch'):
+            self._rebuild_web_dispatch()
+
+    def say(self, message, priority=chat_queue.PRIORITY_GAME, *, mergeable=True):
+        """Queue a line for the channel. Returns False if the queue dropped it."""
+        return self.chat_queue.put(message, priority, mergeable=mergeable)
+
+    async def invoke(self, context):
+        """Run a chat command while holding the locks of every player it
+        touches, so it can't interleave with that player's other commands."""
+        if context.command is None:
+            return await super().invoke(context)
+        content = (getattr(context.message, 'content', '') or '').split(None, 1)
+        args = content[1] if len(content) > 1 else ''
+        involved = player_locks.involved_players(
+            context.command.name, context.author.name, args,
+        )
+        async with self.player_locks.hold(*involved):
+            await super().invoke(context)
+
+    async def get_context(self, message, *, cls=None):
+        # Route chat command replies (ctx.send) through the chat queue.
+        return await super().get_context(message, cls=cls or _QueuedContext)
+
     async def send_clamped(self, ctx, message):
         """Send a message with Twitch-length clamping and log if clipped."""
         text, clipped = helpers.clamp_chat_message(message)
@@ -385,44 +445,9 @@ class Bot(commands.Bot):
                 helpers.log_to_file(f"EventSub healthcheck error: {e}")
         
     def get_item_bonus(self, player, attack_type):
-        """Calculate success chance and point bonuses based on relevant items."""
-        bonus = {
-            'success_boost': False,
-            'points_multiplier': 1.0,
-            'item_name': None
-        }
-        
-        # Map items to attack types
-        item_benefits = {
-            'Wireshark': ['sniff', 'mitm', 'ddos'],  # Network attacks
-            'EvilGinx': ['phish', 'spoof'],  # Phishing attacks
-            'Metasploit': ['revshell', 'root', 'burp', 'sqliw', 'xss'],  # Penetration testing
-            'O.MG Cable': ['drop', 'tailgate'],  # Physical attacks
-            'VX Underground HDD': ['virus', 'ransom'],  # Malware attacks
-            'Cookies': ['burp'],  # Website attacks
-            'Nmap': ['revshell', 'root', 'sniff'],  # Recon/network leverage
-            'Hydra': ['bruteforce', 'crack'],  # Password attacks
-            'YubiKey': ['tailgate', 'socialengineer'],  # Physical/social engineering
-            'Shodan API Key': ['ddos', 'sniff'],  # Intel feeding attacks
-            'Kali ISO': ['phish', 'burp', 'revshell'],  # Generalist boost
-            'NES': ['ddos', 'xss'],  # Fun bonus
-            'Contra Cartridge': ['ddos', 'ransom'],  # Easter egg power
-            'Mimikatz': ['dump'],  # Credential dump helper
-            'Nmap': ['nmapscan'],  # Early recon
-            'Shodan API Key': ['nmapscan'],
-            'Kali ISO': ['ffuf'],
-            'Cookies': ['ffuf'],
-        }
-        
-        # Check if player has any items that help with this attack
-        for item in player.items:
-            if item in item_benefits and attack_type in item_benefits[item]:
-                bonus['success_boost'] = True
-                bonus['points_multiplier'] = 1.5  # 50% more points
-                bonus['item_name'] = item
-                break
-                
-        return bonus
+        """Calculate success chance and point bonuses based on relevant items.
+        Backed by the precomputed attack → boosting-items index in game/attacks.py."""
+        return attacks.item_bonus(player.items, attack_type)
 
     def format_item(self, item_name):
         """Return item name with emoji if available."""
@@ -441,22 +466,22 @@ class Bot(commands.Bot):
         return net, skimmed
 
     async def _attack_result(self, ctx, command, result_msg, success, player):
-        """Push attack result to game overlay (no chat send). Handle level-up chat notification."""
+        """Record an attack result (no chat send). The feed event, player push
+        and save are coalesced per (user, attack) burst — see bot/click_burst.py
+        and _flush_click_burst. Level-ups are announced immediately."""
         username = ctx.author.name.lower()
-        event_type = 'attack-success' if success else 'attack-fail'
         # World regen: every /twitchack action ticks +1 HP (30s per-user cooldown).
         # Damage outside boss battle persists, so chat engagement is the recovery path.
         helpers.regen_tick(player)
         # Bootstrap rule (idle hacking, spec §8): every successful click pays a
         # little cash so a fresh player can afford their first rig before any
         # idle hack exists. Clicks stay cash-light; idle hacks pay the bulk.
+        net = 0
         if success:
             net, _ = self._apply_skim(player, hacks.CLICK_CASH)
-            player.cash = getattr(player, 'cash', 0) + net
+            ledger.apply(player, ledger.ATTACK, cash=net)
         leveled_up = helpers.check_level_up(self.player_data, username)
-        helpers.save_player_data(self.player_data)
-        await game_overlay.event(username, command, result_msg, event_type)
-        await game_overlay.player(username, player)
+        self.click_bursts.add(username, command, player, success, result_msg, cash=net)
         if isinstance(ctx, WebCtx):
             await ctx.send(result_msg)
         if leveled_up:
@@ -464,6 +489,13 @@ class Bot(commands.Bot):
             await ctx.send(lv_msg)
             await game_overlay.event(username, 'LEVEL UP', lv_msg, 'level-up')
 
+    async def _flush_click_burst(self, burst):
+        """One save mark, one feed event and one player push per click burst."""
+        helpers.save_player_data(self.player_data)
+        msg, event_type = burst.summary()
+        await game_overlay.event(burst.username, burst.command, msg, event_type)
+        await game_overlay.player(burst.username, burst.player)
+
     # ------------------------------------------------------------------
     # Idle hacking (TWITCHACK_IDLE_HACKING_SPEC.md). Output goes to the
     # TwitcHack feed, never Twitch chat — web players get it via WebCtx.
@@ -483,16 +515,35 @@ class Bot(commands.Bot):
         if isinstance(ctx, WebCtx):
             await ctx.send(msg)
 
+    # Resolved jobs announced one by one; more than this (a long queue chain
+    # settled at once) collapses into a single summary line.
+    HACK_FEED_DETAIL = 3
+
     async def _resolve_idle_jobs(self, username):
-        """Bank any finished idle hacks and announce them on the feed. Lazy
-        resolution (Phase 1): called whenever the player next interacts."""
+        """Bank any finished idle hacks and standing-order progress and
+        announce them on the feed. Called by job_scheduler_loop at each job's
+        deadline (and each order's coarse settle), and whenever the player
+        next interacts."""
         player = self.player_data.get(username)
-        if not player or not player.jobs:
+        if not player or not (player.jobs or player.orders):
             return
         results = hacks.resolve_due_jobs(player)
-        if not results:
+        settled = hacks.settle_orders(player)
+        if not results and not settled:
             return
         total_skimmed = 0
+        if len(results) > self.HACK_FEED_DETAIL:
+            # A queue that chained while nobody watched: one summary line
+            # instead of a feed event per run.
+            wins = [r for r in results if r['success']]
+            total_skimmed = sum(r.get('skimmed', 0) for r in wins)
+            msg = (f"@{player.username}'s queues finished {len(results)} hacks — "
+                   f"{len(wins)} landed, +{sum(r['cash'] for r in wins)} cash, "
+                   f"+{sum(r['rep'] for r in wins)} rep.")
+            if total_skimmed:
+                msg += f" (📡 {total_skimmed} skimmed)"
+            await game_overlay.event(username, 'HACK DONE', msg, 'attack-success')
+            results = []
         for r in results:
             if r['success']:
                 total_skimmed += r.get('skimmed', 0)
@@ -504,6 +555,10 @@ class Bot(commands.Bot):
             else:
                 msg = f"@{player.username}'s {r['name']} failed — no payout."
                 await game_overlay.event(username, 'HACK FAIL', msg, 'attack-fail')
+        for r in settled:
+            total_skimmed += r['skimmed']
+            await game_overlay.event(username, 'ORDER', self._order_summary(player, r),
+                                     'attack-success' if r['successes'] else 'info')
         # Malicious-item skim (e.g. Mnap) feeds the treasury; banked in a
         # batched flush on the idle ticker (see idle_ticker_loop).
         if total_skimmed:
@@ -512,20 +567,30 @@ class Bot(commands.Bot):
         helpers.save_player_data(self.player_data)
         await game_overlay.player(username, player)
 
+    def _order_summary(self, player, r):
+        """One feed line for a settled standing order (see hacks.settle_orders)."""
+        mc = hardware.get_component(r['machine'])
+        on = mc.name if mc else r['machine']
+        msg = f"@{player.username}'s {on} ran {r['name']} ×{r['runs']}"
+        if r['runs']:
+            msg += (f" — {r['successes']} landed, +{r['cash']} cash, +{r['rep']} rep")
+            if r['skimmed']:
+                msg += f" (📡 {r['skimmed']} skimmed)"
+        msg += "."
+        if r['stopped']:
+            msg += f" Order ended: {r['stopped']}."
+        return msg
+
     _DROP_LOCATIONS = ['email', 'website', '/etc/shadow', 'database',
                        'server', 'network', 'evilcorp']
 
     async def _spawn_world_drop(self, item_name, location=None):
         """Place `item_name` into the world as a grabbable drop and notify the
         overlay. Dedups by name. Returns the location used, or None if a drop
-        with that name is already pending."""
-        if not hasattr(self, 'dropped_items'):
-            self.dropped_items = []
-        if any(d['name'].lower() == item_name.lower() for d in self.dropped_items):
-            return None
+        with that name is already pending. Every drop spawns through here."""
         location = location or random.choice(self._DROP_LOCATIONS)
-        self.dropped_items.append({'name': item_name, 'location': location,
-                                   'ts': datetime.now().timestamp()})
+        if self.drops.spawn(item_name, location) is None:
+            return None
         self.session_items_dropped.append(item_name)
         self.drop_spawned_count += 1
         await game_overlay.drop(item_name, location)
@@ -541,7 +606,7 @@ class Bot(commands.Bot):
             return False
         if target == item_name:
             # Final self-destruct — the curse crumbles, inventory now empty.
-            player.items.remove(item_name)
+            player.remove_item(item_name)
             helpers.save_player_data(self.player_data)
             msg = (f"💀 @{username}'s {self.format_item(item_name)} finished its "
                    f"work and crumbled to dust — inventory empty.")
@@ -549,7 +614,7 @@ class Bot(commands.Bot):
             await game_overlay.player(username, player)
             return False
         # Drop one item into the world for anyone to grab.
-        player.items.remove(target)
+        player.remove_item(target)
         location = await self._spawn_world_drop(target)
         helpers.save_player_data(self.player_data)
         if location:
@@ -576,40 +641,21 @@ class Bot(commands.Bot):
         await game_overlay.player(username, player)
         return True
 
-    async def _tick_malicious_effects(self, now=None):
-        """on_tick phase: fire each holder's timed malicious effects on their
-        interval, dispatched by kind. Called from the idle ticker. Timers live in
-        self._malicious_due keyed by (username, item)."""
-        now = now or datetime.now()
-        live = set()
-        for username in list(self.player_data.keys()):
-            player = self.player_data.get(username)
-            if not player:
-                continue
-            for item_name in list(player.items or []):
-                eff = MALICIOUS_EFFECTS.get(item_name)
-                if not eff or 'interval_sec' not in eff:
-                    continue
-                handler = self._on_tick_handlers.get(eff['kind'])
-                if handler is None:
-                    continue
-                key = (username, item_name)
-                live.add(key)
-                due = self._malicious_due.get(key)
-                if due is None:
-                    self._malicious_due[key] = now + timedelta(seconds=eff['interval_sec'])
-                    continue
-                if now >= due:
-                    keep = await handler(username, player, item_name)
-                    if keep:
-                        self._malicious_due[key] = now + timedelta(seconds=eff['interval_sec'])
-                    else:
-                        self._malicious_due.pop(key, None)
-                        live.discard(key)
-        # Forget timers for curses no longer held (junked / dropped / consumed).
-        for key in list(self._malicious_due.keys()):
-            if key not in live:
-                self._malicious_due.pop(key, None)
+    async def _fire_curse(self, due):
+        """Fire one due timed curse, dispatched by kind, then arm its next
+        round, or let it lapse if the handler says it's done. A curse that
+        left the inventory meanwhile was already cancelled by remove_item."""
+        username, item_name = due
+        player = self.player_data.get(username)
+        if not player or player.find_item(item_name) is None:
+            return
+        handler = self._on_tick_handlers[MALICIOUS_EFFECTS[item_name]['kind']]
+        keep = await handler(username, player, item_name)
+        if keep and player.find_item(item_name) is not None:
+            self.curse_timers.schedule(player, item_name)
+        else:
+            self.curse_timers.cancel(player, item_name)
+        helpers.save_player_data(self.player_data)
 
     @commands.command(name='buy')
     async def buy(self, ctx, *, component: str = None):
@@ -711,6 +757,143 @@ class Bot(commands.Bot):
         msg = f"@{ctx.author.name}, running {len(player.jobs)}/{slots}: " + " | ".join(parts)
         await self._idle_say(ctx, username, '!jobs', msg)
 
+    @commands.command(name='queue')
+    async def queue(self, ctx, *, args: str = None):
+        """Per-machine job queues: the machine starts the next run itself when
+        a job finishes. `!queue <hack> <machine> [xN] [min%]` repeats until
+        cancelled, N times, or until condition drops below min%.
+        `!queue clear <machine>` empties it; no arg lists them."""
+        username = ctx.author.name.lower()
+        if username not in self.player_data:
+            await self._idle_say(ctx, username, '!queue', f'@{ctx.author.name}, use !start to register first.')
+            return
+        await self._resolve_idle_jobs(username)
+        player = self.player_data[username]
+        parts = (args or '').strip().lower().split()
+
+        if not parts:
+            listing = []
+            for m, entries in player.queues.items():
+                mc = hardware.get_component(m)
+                steps = []
+                for e in entries:
+                    hd = hacks.HACK_DEFS.get(e['hack_id'])
+                    step = hd.name if hd else e['hack_id']
+                    step += f" ×{e['runs']}" if e.get('runs') is not None else " ∞"
+                    if e.get('min_condition') is not None:
+                        step += f" (≥{e['min_condition']:g}%)"
+                    steps.append(step)
+                listing.append(f"{mc.name if mc else m}: " + " → ".join(steps))
+            msg = (f"@{ctx.author.name}, queues: " + " | ".join(listing) if listing else
+                   f"@{ctx.author.name}, no queues. !queue <hack> <machine> [xN] [min%] "
+                   f"re-runs a hack on that machine as each job finishes.")
+            await self._idle_say(ctx, username, '!queue', msg)
+            return
+
+        if parts[0] == 'clear':
+            machine_id = parts[1] if len(parts) > 1 else None
+            if machine_id is None and len(player.queues) == 1:
+                machine_id = next(iter(player.queues))
+            removed = hacks.clear_queue(player, machine_id)
+            if not removed:
+                await self._idle_say(ctx, username, '!queue',
+                                     f'@{ctx.author.name}, that machine has no queue.', 'attack-fail')
+                return
+            helpers.save_player_data(self.player_data)
+            await self._idle_say(ctx, username, '!queue',
+                                 f'@{ctx.author.name} cleared {removed} queued order(s).', 'info')
+            await game_overlay.player(username, player)
+            return
+
+        if len(parts) < 2:
+            await self._idle_say(ctx, username, '!queue',
+                                 f'@{ctx.author.name}, usage: !queue <hack> <machine> [xN] [min%]', 'attack-fail')
+            return
+        runs = min_condition = None
+        for opt in parts[2:]:
+            try:
+                if opt.endswith('%'):
+                    min_condition = float(opt.rstrip('%').lstrip('<'))
+                else:
+                    runs = int(opt.lstrip('x'))
+            except ValueError:
+                await self._idle_say(ctx, username, '!queue',
+                                     f"@{ctx.author.name}, didn't understand '{opt}' — use x5 or 40%.", 'attack-fail')
+                return
+        entry, job, reason = hacks.enqueue(player, parts[1], parts[0], runs, min_condition)
+        if entry is None:
+            await self._idle_say(ctx, username, '!queue', f'@{ctx.author.name}, {reason}', 'attack-fail')
+            return
+        helpers.save_player_data(self.player_data)
+        hd = hacks.HACK_DEFS[entry['hack_id']]
+        mc = hardware.get_component(parts[1])
+        until = (f"{runs} run(s)" if runs is not None else "cancelled")
+        if min_condition is not None:
+            until += f" or condition < {min_condition:g}%"
+        started = f" First run ETA {self._fmt_secs(hacks.time_left(job))}." if job else ""
+        msg = (f"@{ctx.author.name} queued {hd.name} on {mc.name if mc else parts[1]} "
+               f"until {until}.{started} 🔁")
+        await self._idle_say(ctx, username, '!queue', msg, 'attack-success')
+        await game_overlay.player(username, player)
+
+    @commands.command(name='order')
+    async def order(self, ctx, *, args: str = None):
+        """Standing orders: keep one hack repeating on a machine while you're
+        away. `!order <hack> <machine>` sets one, `!order cancel <machine>`
+        ends it, no arg lists them."""
+        username = ctx.author.name.lower()
+        if username not in self.player_data:
+            await self._idle_say(ctx, username, '!order', f'@{ctx.author.name}, use !start to register first.')
+            return
+        await self._resolve_idle_jobs(username)
+        player = self.player_data[username]
+        parts = (args or '').strip().lower().split()
+
+        if not parts:
+            if not player.orders:
+                msg = (f"@{ctx.author.name}, no standing orders. !order <hack> <machine> "
+                       f"keeps a hack repeating on that machine while you're away.")
+            else:
+                listing = []
+                for m, o in player.orders.items():
+                    hd = hacks.HACK_DEFS.get(o['hack_id'])
+                    mc = hardware.get_component(m)
+                    listing.append(f"{mc.name if mc else m}: {hd.name if hd else o['hack_id']}")
+                msg = f"@{ctx.author.name}, standing orders: " + " | ".join(listing)
+            await self._idle_say(ctx, username, '!order', msg)
+            return
+
+        if parts[0] == 'cancel':
+            machine_id = parts[1] if len(parts) > 1 else None
+            if machine_id is None and len(player.orders) == 1:
+                machine_id = next(iter(player.orders))
+            result, reason = hacks.cancel_order(player, machine_id)
+            if result is None:
+                await self._idle_say(ctx, username, '!order', f'@{ctx.author.name}, {reason}', 'attack-fail')
+                return
+            self._pending_skim += result['skimmed']
+            helpers.check_level_up(self.player_data, username)
+            helpers.save_player_data(self.player_data)
+            await self._idle_say(ctx, username, '!order', self._order_summary(player, result), 'info')
+            await game_overlay.player(username, player)
+            return
+
+        if len(parts) < 2:
+            await self._idle_say(ctx, username, '!order',
+                                 f'@{ctx.author.name}, usage: !order <hack> <machine>', 'attack-fail')
+            return
+        order, reason = hacks.set_order(player, parts[1], parts[0])
+        if order is None:
+            await self._idle_say(ctx, username, '!order', f'@{ctx.author.name}, {reason}', 'attack-fail')
+            return
+        helpers.save_player_data(self.player_data)
+        hd = hacks.HACK_DEFS[order['hack_id']]
+        mc = hardware.get_component(parts[1])
+        msg = (f"@{ctx.author.name} put {mc.name if mc else parts[1]} on a standing order: "
+               f"{hd.name}, back to back until you !order cancel {parts[1]}. 🔁")
+        await self._idle_say(ctx, username, '!order', msg, 'attack-success')
+        await game_overlay.player(username, player)
+
     @commands.command(name='repair')
     async def repair(self, ctx, *, machine: str = None):
         """Repair a worn machine to full condition for cash (pricier each time)."""
@@ -832,9 +1015,9 @@ class Bot(commands.Bot):
         await self._idle_say(ctx, username, '!unrent', msg, 'info')
         await game_overlay.player(username, player)
 
-    # Background idle-job ticker cadence (seconds). Jobs settle within this of
-    # finishing; small enough that a 15s hack feels responsive, and the player
-    # list is tiny so scanning it costs nothing.
+    # Background ticker cadence (seconds) for the catalog re-push, skim banking
+    # and leaderboard pushes. Idle jobs and timed curses no longer ride this
+    # tick: they fire at their own deadlines (job_scheduler_loop, curse_loop).
     IDLE_TICK_SECONDS = 5
 
     async def _push_idle_catalog(self):
@@ -859,13 +1042,89 @@ class Bot(commands.Bot):
              for it in ITEMS.values()],
         )
 
+    async def _deadline_loop(self, timers, wakeup, fire, label):
+        """Sleep until the earliest deadline in `timers` (or until an earlier
+        one wakes us via `wakeup`), then `fire` each due entry. Shared by the
+        idle-job scheduler, expiry timers, drops and timed curses."""
+        while True:
+            try:
+                # Clear before reading the deadline so a registration that
+                # lands while we sleep is never missed.
+                wakeup.clear()
+                delay = timers.seconds_until_next()
+                if delay is None:
+                    await wakeup.wait()
+                    continue
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), timeout=delay)
+                        continue        # earlier deadline registered: re-arm
+                    except asyncio.TimeoutError:
+                        pass
+                for due in timers.pop_due():
+                    await fire(due)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                helpers.log_to_file(f'[{label}] error: {e}')
+
+    async def job_scheduler_loop(self):
+        """Settle idle hacks the moment they finish and announce them on the
+        feed — feed-only, never Twitch chat (spec §11 #4). Resolves only the
+        players whose jobs are due, instead of scanning the whole roster every
+        tick. Reuses the lazy per-player resolver, so resolution lives in one
+        place; a job a command already settled just leaves a stale heap entry
+        that resolves nothing."""
+        await self._deadline_loop(self.job_scheduler, self._jobs_wakeup,
+                                  self._resolve_idle_jobs, 'job_scheduler')
+
+    async def expiry_loop(self):
+        """Fire jail releases, rental lapses, box expiries and no-cap ends at
+        their deadline, so the GUI drops stale badges without waiting for the
+        player to act."""
+        await self._deadline_loop(self.expiry_timers, self._expiry_wakeup,
+                                  self._fire_expiry, 'expiry')
+
+    async def curse_loop(self):
+        """Fire timed malicious effects (Metaploit drip, 0.MG Cable beacon)
+        on their interval, touching only the curses that are due."""
+        await self._deadline_loop(self.curse_timers, self._curse_wakeup,
+                                  self._fire_curse, 'curses')
+
+    async def _fire_expiry(self, due):
+        """Settle one expiry and push it to the overlay. Re-checks the real
+        state first: a bail, a renewal or a lazy per-command check may have
+        got there already, in which case nothing is announced."""
+        kind, username, key = due
+        player = self.player_data.get(username)
+        if not player:
+            return
+        msg = None
+        if kind == expiry.JAIL:
+            if jail._release_if_expired(player, datetime.now(timezone.utc)):
+                msg = "🔓 served their time and walked out of jail."
+        elif kind == expiry.RENTAL:
+            if not hardware.rental_active(player, key):
+                comp = hardware.get_component(key)
+                msg = f"☁️ {comp.name if comp else key} rental lapsed."
+        elif kind == expiry.BOX:
+            if perks.prune_box(player):
+                msg = f"📦 {perks.CARDBOARD_BOX} wore off — stealable again."
+        elif kind == expiry.NO_CAP:
+            if jail.no_cap_remaining_seconds(player) <= 0:
+                msg = "⏱️ no-cap window ended — speed limits are back."
+        # Woke a hair early, or the deadline moved: re-arm whatever is left.
+        self.expiry_timers.track(username, player)
+        if msg is None:
+            return
+        helpers.save_player_data(self.player_data)
+        await game_overlay.event(username, 'EXPIRED', msg, 'info')
+        await game_overlay.player(username, player)
+
     async def idle_ticker_loop(self):
-        """Settle finished idle hacks across all players and announce them on
-        the feed the moment they complete — so the loop is actually idle (no
-        need to poke !jobs to collect). Feed-only, never Twitch chat (spec §11
-        #4). Reuses the lazy per-player resolver, so resolution lives in one
-        place. The command handlers still call it too, for instant settlement
-        when a player interacts between ticks."""
+        """Periodic housekeeping: catalog re-push, batched skim banking and
+        leaderboard pushes. Job settlement lives in job_scheduler_loop and
+        timed curses in curse_loop."""
         ticks = 0
         while True:
             try:
@@ -876,26 +1135,21 @@ class Bot(commands.Bot):
                 # static payload; the first re-push lands ~5s after startup.
                 if ticks % 6 == 1:
                     await self._push_idle_catalog()
-                # Snapshot names first: _resolve_idle_jobs awaits feed pushes,
-                # and the player dict may be mutated during those awaits.
-                active = [name for name, p in self.player_data.items()
-                          if getattr(p, 'jobs', None)]
-                for username in active:
-                    await self._resolve_idle_jobs(username)
                 # Bank accumulated malicious cash-skim in one treasury write +
                 # overlay push, so autoclicking holders don't flood either.
                 if self._pending_skim:
                     banked, self._pending_skim = self._pending_skim, 0
                     new_balance = jail._credit_treasury(banked)
                     await game_overlay.treasury(new_balance)
-                # on_tick malicious effects (Metaploit drip, 0.MG Cable beacon).
-                await self._tick_malicious_effects()
+                # Leaderboards whose top-N moved since the last push.
+                for board, top in self.leaderboards.take_changed().items():
+                    await game_overlay.leaderboard(board, top)
             except asyncio.CancelledError:
                 raise
             except Exception as e:
                 helpers.log_to_file(f'[idle_ticker] error: {e}')
 
-    async def _jail_speed_gate(self, ctx, player, base_reward):
+    async def _jail_speed_gate(self, ctx, player, base_reward, command=None):
         """Jail + speed-penalty preflight for attack commands.
 
         Returns True if the attack should abort (already sent response).
@@ -912,58 +1166,52 @@ class Bot(commands.Bot):
             await ctx.send(blocked)
             await game_overlay.event(player.username, '!jail', blocked, 'attack-fail')
             return True
+        if command is None:
+            command = f"!{ctx.command.name}" if getattr(ctx, 'command', None) else '!attack'
+        # Open (or join) this click's burst before any points move, so the
+        # aggregated feed line reports the net change across the window.
+        self.click_bursts.begin(player.username, command, player.points)
         result = jail.record_attack(player, player.location, base_reward)
         if not result.is_violation:
             return False
         penalty = jail.speed_penalty(base_reward)
-        player.points = max(0, player.points - penalty)
-        helpers.save_player_data(self.player_data)
-        cmd = ctx.command.name if getattr(ctx, 'command', None) else 'attack'
+        ledger.apply(player, ledger.SPEED_PENALTY, points=-penalty, clamp=True)
         if result.jailed:
             msg = f"{result.message} You also lost {penalty} pts on the way in."
         else:
             msg = f"{result.message} You lost {penalty} pts."
-        await self._attack_result(ctx, f'!{cmd}', msg, False, player)
+        await self._attack_result(ctx, command, msg, False, player)
         return True
 
-    def _ov_state(self, result=None):
-        """Build overlay state dict from current battle for push()."""
-        battle = self.ongoing_battle
+    def _ov_player(self, name, health, max_health, alive):
+        """One challenger's overlay entry. overlay.push() only ships the
+        fields that changed since the last push, so an unchanged inventory
+        costs nothing on the wire."""
+        p = self.player_data.get(name)
+        all_items = p.items if p else []
+        return {
+            "health": health,
+            "max_health": max_health,
+            "items": [i for i in all_items if i in BATTLE_DROPS],
+            "inventory": [i for i in all_items if i in ITEM_EFFECTS],
+            "alive": alive,
+            "jail": getattr(p, "jail", None) if p else None,
+            "founder_tier": getattr(p, "founder_tier", None) if p else None,
+        }
+
+    def _ov_state(self, arena, result=None):
+        """Build overlay state dict from an arena's battle for push()."""
+        battle = arena.battle
         # Cooldown is set when a battle STARTS, so the player-facing overlay can show
         # a Start button only when (last_start + cooldown) is in the past.
-        if self.last_battle_time == datetime.min:
-            cooldown_until_ms = 0
-        else:
-            cooldown_until_ms = int(
-                (self.last_battle_time + self.boss_battle_cooldown).timestamp() * 1000
-            )
+        until = arena.cooldown_until(self.arenas.cooldown)
+        cooldown_until_ms = int(until.timestamp() * 1000) if until else 0
         if not battle:
             return {"active": False, "cooldown_until": cooldown_until_ms}
-        players = {}
-        for name, hp in battle.challenger_team.items():
-            p = self.player_data.get(name)
-            all_items = list(p.items) if p else []
-            players[name] = {
-                "health": hp,
-                "max_health": battle.player_max_health.get(name, hp),
-                "items": [i for i in all_items if i in BATTLE_DROPS],
-                "inventory": [i for i in all_items if i in ITEM_EFFECTS],
-                "alive": True,
-                "jail": getattr(p, "jail", None) if p else None,
-                "founder_tier": getattr(p, "founder_tier", None) if p else None,
-            }
+        players = {name: self._ov_player(name, hp, battle.player_max_health.get(name, hp), True)
+                   for name, hp in battle.challenger_team.items()}
         for name in battle.fallen:
-            p = self.player_data.get(name)
-            all_items = list(p.items) if p else []
-            players[name] = {
-                "health": 0,
-                "max_health": battle.player_max_health.get(name, 100),
-                "items": [i for i in all_items if i in BATTLE_DROPS],
-                "inventory": [i for i in all_items if i in ITEM_EFFECTS],
-                "alive": False,
-                "jail": getattr(p, "jail", None) if p else None,
-                "founder_tier": getattr(p, "founder_tier", None) if p else None,
-            }
+            players[name] = self._ov_player(name, 0, battle.player_max_health.get(name, 100), False)
         state = {
             "active": True,
             "boss_name": battle.boss_name,
@@ -978,6 +1226,10 @@ class Bot(commands.Bot):
             state["result"] = result
         return state
 
+    async def _push_battle(self, arena, result=None):
+        """Push one arena's battle state to its overlay channel."""
+        await overlay.push(arena.id, **self._ov_state(arena, result))
+
     async def event_ready(self):
         # Called once when the bot successfully connects to Twitch.
         # Useful for initialization tasks and confirming the bot is online.
@@ -991,9 +1243,19 @@ class Bot(commands.Bot):
         player_db.attach_dict(self.player_data)
         await player_db.start_flusher()
         print(f'[db] Loaded {len(self.player_data)} players from Postgres')
+        # Re-seed the job deadline heap from persisted jobs, so hacks that
+        # finished (or will finish) across a restart still settle on time.
+        self.job_scheduler.rebuild(self.player_data)
+        self.expiry_timers.rebuild(self.player_data)
+        self.item_index.rebuild(self.player_data)
+        self.leaderboards.rebuild(self.player_data)
+        self.locations.rebuild(self.player_data)
+        self.usernames.rebuild(self.player_data)
+        self.curse_timers.rebuild(self.player_data)
 
         # Send a message to the chat indicating that the bot is online
-        await self.connected_channels[0].send(f"{self.nick} is now online")
+        self.chat_queue.start()
+        self.say(f"{self.nick} is now online")
         # Seed the overlay with the full roster, treasury, and catalogs. The
         # overlay holds this only in memory, so it also calls /resync on its
         # own startup (see _internal_resync_handler) to recover after an
@@ -1003,6 +1265,20 @@ class Bot(commands.Bot):
         self.loop.create_task(self.eventsub_healthcheck())
         self.loop.create_task(self.start_internal_api())
         self.loop.create_task(self.idle_ticker_loop())
+        self.loop.create_task(self.job_scheduler_loop())
+        self.loop.create_task(self.expiry_loop())
+        self.loop.create_task(self.drops_loop())
+        self.loop.create_task(self.curse_loop())
+
+    async def close(self):
+        # Shutdown (Ctrl-C, or SIGTERM from `docker stop`; see __main__).
+        # Emit the click bursts still inside their window, then stop the db
+        # flusher, which writes the last dirty players and ledger rows.
+        try:
+            await self.click_bursts.flush_all()
+        finally:
+            await player_db.close()
+            await super().close()
 
     # Game commands that belong in the GUI, not Twitch chat. Typed in chat they
     # are blocked with a one-line nudge (see _maybe_nudge_to_gui). Deliberately
@@ -1012,9 +1288,9 @@ class Bot(commands.Bot):
     # nuke and as movement).
     GUI_ONLY_COMMANDS = {
         # idle hacking
-        'buy', 'run', 'jobs', 'repair', 'cool', 'oc', 'rent', 'unrent',
+        'buy', 'run', 'jobs', 'queue', 'order', 'repair', 'cool', 'oc', 'rent', 'unrent',
         # info (now GUI-only)
-        'attacks', 'status', 'points', 'leaderboard', 'items', 'jail', 'treasury',
+        'attacks', 'status', 'points', 'leaderboard', 'rank', 'here', 'items', 'jail', 'treasury',
         # pvp / economy
         'steal', 'bail', 'requestbail', 'grab', 'junk', 'useburner',
         # clicker attacks
@@ -1039,8 +1315,9 @@ class Bot(commands.Bot):
             now = time.time()
             if now - self._last_gui_nudge_at.get(author.name.lower(), 0) >= self.GUI_NUDGE_COOLDOWN:
                 self._last_gui_nudge_at[author.name.lower()] = now
-                await message.channel.send(
-                    f"@{author.name}, TwitcHack is played here → bossbattle.b7h30.com/twitchack"
+                self.say(
+                    f"@{author.name}, TwitcHack is played here → bossbattle.b7h30.com/twitchack",
+                    chat_queue.PRIORITY_FLAVOR,
                 )
         return True
 
@@ -1183,13 +1460,13 @@ class Bot(commands.Bot):
 
         username = author.name.lower()
         if username not in self.player_data:
-            await self.connected_channels[0].send(f"@{author.name}, register with !start to get the code reward.")
+            self.say(f"@{author.name}, register with !start to get the code reward.", chat_queue.PRIORITY_FLAVOR)
             return
 
         # Avoid duplicate rewards in a single bot session
         rewarded = self.session_flags.get("konami", set())
         if username in rewarded:
-            await self.connected_channels[0].send(f"@{author.name}, you already used the Konami code this session!")
+            self.say(f"@{author.name}, you already used the Konami code this session!", chat_queue.PRIORITY_FLAVOR)
             return
 
         player = self.player_data[username]
@@ -1197,7 +1474,7 @@ class Bot(commands.Bot):
 
         player.add_item(reward_item)
         # Always give some points bonus too
-        player.points += 50
+        ledger.apply(player, ledger.EVENT, points=50)
         helpers.check_level_up(self.player_data, username)
         helpers.save_player_data(self.player_data)
 
@@ -1205,8 +1482,9 @@ class Bot(commands.Bot):
         self.session_flags["konami"] = rewarded
         helpers.save_session_flags(self.session_flags)
 
-        await self.connected_channels[0].send(
-            f"🎮 Konami code accepted! @{author.name} received a {self.format_item(reward_item)} and 50 points!"
+        self.say(
+            f"🎮 Konami code accepted! @{author.name} received a {self.format_item(reward_item)} and 50 points!",
+            chat_queue.PRIORITY_FLAVOR,
         )
 
     async def web_konami(self, ctx):
@@ -1231,7 +1509,7 @@ class Bot(commands.Bot):
 
         # Reward: points to gain 5 levels from current level
         pts_reward = points_for_n_levels_up(player.level, 5, player.points)
-        player.points += pts_reward
+        ledger.apply(player, ledger.EVENT, points=pts_reward)
 
         # Activate / refresh Cardboard Box (1h)
         perks.grant_box(player)
@@ -1250,7 +1528,7 @@ class Bot(commands.Bot):
                 f"@{ctx.author.name} found Snake's Cardboard box "
                 f"- no one can steal their points for an hour. 📦"
             )
-            await self.connected_channels[0].send(chat_msg)
+            self.say(chat_msg, chat_queue.PRIORITY_FLAVOR)
             await game_overlay.event(username, 'KONAMI', chat_msg, 'level-up')
         except Exception as e:
             helpers.log_to_file(f"[konami] chat broadcast failed: {e}")
@@ -1270,18 +1548,18 @@ class Bot(commands.Bot):
 
         username = author.name.lower()
         if username not in self.player_data:
-            await self.connected_channels[0].send(f"@{author.name}, register with !start to get a coffee boost.")
+            self.say(f"@{author.name}, register with !start to get a coffee boost.", chat_queue.PRIORITY_FLAVOR)
             return
 
         rewarded = self.session_flags.get("coffee", set())
         if username in rewarded:
-            await self.connected_channels[0].send(f"@{author.name}, you've already grabbed your coffee this session!")
+            self.say(f"@{author.name}, you've already grabbed your coffee this session!", chat_queue.PRIORITY_FLAVOR)
             return
 
         player = self.player_data[username]
         reward_item = "A Fresh Hot Cup of Black Coffee"
         player.add_item(reward_item)
-        player.points += 25
+        ledger.apply(player, ledger.EVENT, points=25)
         helpers.check_level_up(self.player_data, username)
         helpers.save_player_data(self.player_data)
 
@@ -1289,8 +1567,9 @@ class Bot(commands.Bot):
         self.session_flags["coffee"] = rewarded
         helpers.save_session_flags(self.session_flags)
 
-        await self.connected_channels[0].send(
-            f"☕ Coffee break! @{author.name} received {self.format_item(reward_item)} and 25 points!"
+        self.say(
+            f"☕ Coffee break! @{author.name} received {self.format_item(reward_item)} and 25 points!",
+            chat_queue.PRIORITY_FLAVOR,
         )
 
     async def handle_browns(self, author):
@@ -1300,15 +1579,13 @@ class Bot(commands.Bot):
 
         username = author.name.lower()
         if username not in self.player_data:
-            await self.connected_channels[0].send("You are now a fan of the Cleveland Browns. Sorry, this is the only way we can get fans now #GoBrowns...")
+            self.say("You are now a fan of the Cleveland Browns. Sorry, this is the only way we can get fans now #GoBrowns...", chat_queue.PRIORITY_FLAVOR)
             return
 
         rewarded = self.session_flags.get("browns", set())
         if username in rewarded:
             return  # silently ignore repeats
 
-        self.prune_expired_drops()
-
         player = self.player_data[username]
         reward_item = "Tiny Browns Helmet"
         player.add_item(reward_item)
@@ -1320,20 +1597,23 @@ class Bot(commands.Bot):
         self.session_flags["browns"] = rewarded
         helpers.save_session_flags(self.session_flags)
 
-        await self.connected_channels[0].send(
+        self.say(
             f"You are now a fan of the Cleveland Browns. Sorry, this is the only way we can get fans now #GoBrowns... "
-            f"{self.format_item(reward_item)} added to @{author.name}'s inventory."
+            f"{self.format_item(reward_item)} added to @{author.name}'s inventory.",
+            chat_queue.PRIORITY_FLAVOR,
         )
 
-    def prune_expired_drops(self):
-        """Remove drops older than drop_expiry."""
-        if not getattr(self, "dropped_items", []):
-            return
-        now_ts = datetime.now().timestamp()
-        self.dropped_items = [
-            d for d in self.dropped_items
-            if 'ts' in d and now_ts - d['ts'] <= self.drop_expiry.total_seconds()
-        ]
+    async def drops_loop(self):
+        """Retire world drops the moment they expire and pull them from the
+        overlay's Grab bar, instead of leaving them listed until someone
+        tries to grab."""
+        await self._deadline_loop(self.drops, self._drops_wakeup,
+                                  self._expire_drop, 'drops')
+
+    async def _expire_drop(self, drop):
+        await game_overlay.drop_taken(drop.name)
+        await game_overlay.event("", 'DROP', f"⌛ The {self.format_item(drop.name)} at "
+                                 f"{drop.location} crumbled — nobody grabbed it.", 'info')
 
     def prune_recent_chatters(self, window_minutes=30):
         """Keep only chatters active within the window."""
@@ -1354,7 +1634,11 @@ class Bot(commands.Bot):
             'audio_clip_last_trigger': self.audio_clip_last_trigger,
             'audio_triggers_fired': self.audio_triggers_fired
         }
-        await audio.maybe_trigger_audio_clip(message, bot_state, self.connected_channels[0])
+        await audio.maybe_trigger_audio_clip(
+            message, bot_state,
+            # Clip commands are read by another bot — never merge them.
+            _QueuedChannel(self, chat_queue.PRIORITY_FLAVOR, mergeable=False),
+        )
         # Update state
         self.audio_last_trigger = bot_state['audio_last_trigger']
         self.audio_clip_last_trigger = bot_state['audio_clip_last_trigger']
@@ -1384,7 +1668,7 @@ class Bot(commands.Bot):
             await monday.run_monday_response(
                 prompt=text,
                 author_name=message.author.name,
-                send_func=self.connected_channels[0].send,
+                send_func=_QueuedChannel(self, chat_queue.PRIORITY_FLAVOR).send,
                 bot_state=bot_state
             )
             # Update state
@@ -1478,7 +1762,7 @@ class Bot(commands.Bot):
             reply, clipped = helpers.clamp_chat_message(reply)
             if clipped:
                 helpers.log_to_file("Random Monday reply clipped to fit chat length.")
-            await self.connected_channels[0].send(reply)
+            self.say(reply, chat_queue.PRIORITY_FLAVOR)
 
             # Set next cooldown windows
             self.next_random_monday_time = now + timedelta(seconds=random.randint(*self.monday_random_cooldown_range))
@@ -1505,29 +1789,21 @@ class Bot(commands.Bot):
 
         username = author.name.lower()
         if username not in self.player_data:
-            await self.connected_channels[0].send("Absolutely not, Neovim is an abomination.")
+            self.say("Absolutely not, Neovim is an abomination.", chat_queue.PRIORITY_FLAVOR)
             return
 
-        self.prune_expired_drops()
-
         strikes = self.neovim_penalties.get(username, 0) + 1
         self.neovim_penalties[username] = strikes
 
         penalty = 25 * (2 ** (strikes - 1))
 
         player = self.player_data[username]
-        player.points = max(0, player.points - penalty)
+        ledger.apply(player, ledger.NEOVIM, points=-penalty, clamp=True)
 
         removed_item = None
         if player.items:
-            removed_item = random.choice(player.items)
-            player.items.remove(removed_item)
-            drop_location = random.choice(['email', 'website', '/etc/shadow', 'database', 'server', 'network', 'evilcorp'])
-            existing_names = {d['name'].lower() for d in self.dropped_items}
-            if removed_item.lower() not in existing_names:
-                self.dropped_items.append({'name': removed_item, 'location': drop_location, 'ts': datetime.now().timestamp()})
-                self.session_items_dropped.append(removed_item)
-                self.drop_spawned_count += 1
+            removed_item = player.remove_item(random.choice(player.items))
+            drop_location = await self._spawn_world_drop(removed_item)
 
         helpers.check_level_up(self.player_data, username)
         helpers.save_player_data(self.player_data)
@@ -1547,44 +1823,33 @@ class Bot(commands.Bot):
         snark = random.choice(snark_pool)
 
         item_msg = ""
-        if removed_item:
+        if removed_item and drop_location:
             item_msg = f" Dropped {self.format_item(removed_item)} at {drop_location} for anyone to grab."
+        elif removed_item:
+            item_msg = f" Their {self.format_item(removed_item)} is gone for good."
 
-        await self.connected_channels[0].send(
-            f"{snark} @{author.name} lost {penalty} points.{item_msg}"
+        self.say(
+            f"{snark} @{author.name} lost {penalty} points.{item_msg}",
+            chat_queue.PRIORITY_FLAVOR,
         )
 
     async def random_item_drop(self, event_type, username):
-        self.prune_expired_drops()
-
         item = random.choice(list(ITEMS.values()))
-        location = random.choice(['email', 'website', '/etc/shadow', 'database', 'server', 'network', 'evilcorp'])
 
-        # Prevent duplicate listing of the same item name at once
-        existing_names = {d['name'].lower() for d in self.dropped_items}
-        if item.name.lower() in existing_names:
-            return  # silently skip duplicate drop
+        # GUI-first: put it in the Grab bar as a button and announce on the
+        # feed. No Twitch chat, and no "!grab" syntax (grabbing is a GUI
+        # button). A drop with the same name already waiting → silently skip.
+        location = await self._spawn_world_drop(item.name)
+        if location is None:
+            return
 
         message = f"🎉 {username} just {event_type}ed! A wild {self.format_item(item.name)} appeared at {location} — grab it!"
-
-        # GUI-first: announce on the feed and put it in the Grab bar as a button.
-        # No Twitch chat, and no "!grab" syntax (grabbing is a GUI button).
-        await game_overlay.drop(item.name, location)
         await game_overlay.event("", 'DROP', message, 'drop')
-
-        # Add the dropped item to the list with timestamp
-        self.dropped_items.append({
-            'name': item.name,
-            'location': location,
-            'ts': datetime.now().timestamp()
-        })
-        self.session_items_dropped.append(item.name)
-        self.drop_spawned_count += 1
         print(f"Debug: Item dropped - {item.name} at {location}")  # Add debug print
 
     @commands.command(name='grab')
     async def grab(self, ctx, *, item_name: str):
-        if not hasattr(self, 'dropped_items') or not self.dropped_items:
+        if not self.drops:
             await ctx.send("There are no items to grab right now!")
             return
 
@@ -1594,25 +1859,26 @@ class Bot(commands.Bot):
             return
 
         player = self.player_data[username]
-        
-        for i, dropped_item in enumerate(self.dropped_items):
-            if dropped_item['name'].lower() == item_name.lower():
-                added = player.add_item(dropped_item['name'])
-                if added:
-                    self.session_items_picked_up.append((username, dropped_item['name']))
-                    grab_msg = f"@{ctx.author.name} grabbed the {self.format_item(item_name)}!"
-                    del self.dropped_items[i]
-                    helpers.save_player_data(self.player_data)
-                    await game_overlay.event(username, 'GRAB', grab_msg, 'grab')
-                    await game_overlay.player(username, player)
-                    await game_overlay.drop_taken(item_name)
-                    if isinstance(ctx, WebCtx):
-                        await ctx.send(grab_msg)
-                else:
-                    await ctx.send(f"@{ctx.author.name}, you already have this item!")
-                return
 
-        await ctx.send(f"@{ctx.author.name}, that item is not available to grab.")
+        # Claim first: the drop leaves the registry in the same step that
+        # finds it, so two racing grabs can't both get it.
+        dropped = self.drops.claim(item_name)
+        if dropped is None:
+            await ctx.send(f"@{ctx.author.name}, that item is not available to grab.")
+            return
+        if not player.add_item(dropped.name):
+            self.drops.release(dropped)
+            await ctx.send(f"@{ctx.author.name}, you already have this item!")
+            return
+
+        self.session_items_picked_up.append((username, dropped.name))
+        grab_msg = f"@{ctx.author.name} grabbed the {self.format_item(dropped.name)}!"
+        helpers.save_player_data(self.player_data)
+        await game_overlay.event(username, 'GRAB', grab_msg, 'grab')
+        await game_overlay.player(username, player)
+        await game_overlay.drop_taken(dropped.name)
+        if isinstance(ctx, WebCtx):
+            await ctx.send(grab_msg)
 
     @commands.command(name='junk')
     async def junk(self, ctx, *, item_name: str):
@@ -1625,16 +1891,14 @@ class Bot(commands.Bot):
             return
 
         player = self.player_data[username]
-        owned = next(
-            (i for i in player.items if i.lower() == item_name.strip().lower()), None
-        )
+        owned = player.find_item(item_name)
         if owned is None:
             await ctx.send(f"@{ctx.author.name}, you don't have a '{item_name}' to junk.")
             return
 
         fee = junk_fee_for(getattr(player, 'cash', 0))
-        player.cash = max(0, getattr(player, 'cash', 0) - fee)
-        player.items.remove(owned)
+        ledger.apply(player, ledger.FEE, cash=-fee, clamp=True)
+        player.remove_item(owned)
         helpers.save_player_data(self.player_data)
 
         msg = (f"🗑️ @{ctx.author.name} junked {self.format_item(owned)} "
@@ -1649,12 +1913,7 @@ class Bot(commands.Bot):
             await ctx.send(f"@{ctx.author.name}, this command is only for the channel owner.")
             return
 
-        self.prune_expired_drops()
-
         num_drops = random.randint(1, 2)  # Cap at 2 items per call
-        locations = ['email', 'website', '/etc/shadow', 'database', 'server', 'network', 'evilcorp']
-
-        names_seen = {d['name'].lower() for d in self.dropped_items}
         dropped_count = 0
 
         for _ in range(num_drops):
@@ -1662,23 +1921,14 @@ class Bot(commands.Bot):
             if not pool:
                 break
             item = random.choice(pool)
-            location = random.choice(locations)
 
-            # Prevent duplicate listing of the same item name at once
-            if item.name.lower() in names_seen:
+            # Skips an item whose drop is already waiting to be grabbed.
+            location = await self._spawn_world_drop(item.name, random.choice(locations.LOCATIONS))
+            if location is None:
                 continue
 
             message = f"🎁 A wild {self.format_item(item.name)} appeared at {location} — grab it!"
             await game_overlay.event("", 'DROP', message, 'drop')
-            await game_overlay.drop(item.name, location)
-
-            # Store the dropped item temporarily with timestamp
-            if not hasattr(self, 'dropped_items'):
-                self.dropped_items = []
-            self.dropped_items.append({'name': item.name, 'location': location, 'ts': datetime.now().timestamp()})
-            self.session_items_dropped.append(item.name)
-            names_seen.add(item.name.lower())
-            self.drop_spawned_count += 1
             dropped_count += 1
 
         await ctx.send(f"@{ctx.author.name} has dropped {dropped_count} random items across various locations!")
@@ -1692,8 +1942,6 @@ class Bot(commands.Bot):
             await ctx.send(f"@{ctx.author.name}, this command is only for the channel owner.")
             return
 
-        self.prune_expired_drops()
-
         # Resolve to the canonical catalog name (case-insensitive) so button
         # labels and chat typos both land on the real item.
         canonical = next(
@@ -1703,22 +1951,13 @@ class Bot(commands.Bot):
             await ctx.send(f"@{ctx.author.name}, unknown item: {item_name}")
             return
 
-        if not hasattr(self, 'dropped_items'):
-            self.dropped_items = []
-        if any(d['name'].lower() == canonical.lower() for d in self.dropped_items):
+        if canonical in self.drops:
             await ctx.send(f"@{ctx.author.name}, a {canonical} is already waiting to be grabbed.")
             return
 
-        location = random.choice(
-            ['email', 'website', '/etc/shadow', 'database', 'server', 'network', 'evilcorp']
-        )
+        location = await self._spawn_world_drop(canonical)
         message = f"🎁 A wild {self.format_item(canonical)} appeared at {location} — grab it!"
         await game_overlay.event("", 'DROP', message, 'drop')
-        await game_overlay.drop(canonical, location)
-
-        self.dropped_items.append({'name': canonical, 'location': location, 'ts': datetime.now().timestamp()})
-        self.session_items_dropped.append(canonical)
-        self.drop_spawned_count += 1
 
     @commands.command(name='mvp')
     async def mvp(self, ctx):
@@ -1749,7 +1988,7 @@ class Bot(commands.Bot):
         reward_item = random.choice(available) if available else random.choice(rewards)
 
         player.add_item(reward_item)
-        player.points += 50
+        ledger.apply(player, ledger.EVENT, points=50)
         self.check_level_up(winner)
         helpers.save_player_data(self.player_data)
 
@@ -1765,15 +2004,24 @@ class Bot(commands.Bot):
     ###################################################################
 
     @commands.command(name='items')
-    async def items_cmd(self, ctx):
-        """Show your items, what they buff, and any items dropped in chat."""
+    async def items_cmd(self, ctx, *, item_name: str = None):
+        """Show your items, what they buff, and any items dropped in chat.
+        `!items <name>` instead lists who currently holds that item."""
         username = ctx.author.name.lower()
 
         if username not in self.player_data:
             await ctx.send(f"@{ctx.author.name}, please register using !start before playing.")
             return
 
-        self.prune_expired_drops()
+        if item_name:
+            wanted = item_name.strip().lower()
+            canonical = next((k for k in ITEMS if k.lower() == wanted), item_name.strip())
+            holders = sorted(self.item_index.holders(canonical))
+            who = ", ".join(f"@{h}" for h in holders) if holders else "nobody"
+            await self.send_clamped(
+                ctx, f"@{ctx.author.name} | {self.format_item(canonical)} held by: {who}"
+            )
+            return
 
         player = self.player_data[username]
         # Drop the Cardboard Box from items if its 1h timer has elapsed
@@ -1781,35 +2029,13 @@ class Bot(commands.Bot):
             helpers.save_player_data(self.player_data)
         owned = player.items or []
 
-        # Map item bonuses to attacks for quick reference
-        item_benefits = {
-            'Wireshark': ['sniff', 'mitm', 'ddos'],
-            'EvilGinx': ['phish', 'spoof'],
-            'Metasploit': ['revshell', 'root', 'burp', 'sqliw', 'xss'],
-            'O.MG Cable': ['drop', 'tailgate'],
-            'VX Underground HDD': ['virus', 'ransom'],
-            'Cookies': ['burp'],
-            'Nmap': ['revshell', 'root', 'sniff'],
-            'Hydra': ['bruteforce', 'crack'],
-            'YubiKey': ['tailgate', 'socialengineer'],
-            'Shodan API Key': ['ddos', 'sniff'],
-            'Kali ISO': ['phish', 'burp', 'revshell'],
-            'NES': ['ddos', 'xss'],
-            'Contra Cartridge': ['ddos', 'ransom'],
-            'Mimikatz': ['dump'],
-            'Nmap': ['nmapscan'],
-            'Shodan API Key': ['nmapscan'],
-            'Kali ISO': ['ffuf'],
-            'Cookies': ['ffuf'],
-        }
-
         owned_parts = []
         for item in owned:
             if item == perks.CARDBOARD_BOX:
                 label = perks.box_remaining_label(player) or "expiring"
                 owned_parts.append(f"{self.format_item(item)} ({label}, steal-immune)")
                 continue
-            buffs = item_benefits.get(item, [])
+            buffs = attacks.ITEM_BOOSTS.get(item, ())
             buffs_str = f" buffs: {', '.join(buffs)}" if buffs else ""
             owned_parts.append(f"{self.format_item(item)}{buffs_str}")
 
@@ -1817,8 +2043,8 @@ class Bot(commands.Bot):
 
         # Show currently dropped items waiting to be grabbed
         dropped_text = "None"
-        if getattr(self, "dropped_items", []):
-            dropped_text = "; ".join(f"{self.format_item(d['name'])} at {d['location']}" for d in self.dropped_items)
+        if self.drops:
+            dropped_text = "; ".join(f"{self.format_item(d.name)} at {d.location}" for d in self.drops)
 
         await self.send_clamped(
             ctx,
@@ -1858,7 +2084,7 @@ class Bot(commands.Bot):
         # Round 2: in an active boss battle, the Burner Laptop hits the boss
         # instead of the open-world location. Route through web_useitem so the
         # consumption + damage + chat-quiet logging all happen in one place.
-        battle = self.ongoing_battle
+        battle = self.arenas.battle_of(username)
         if battle and not battle.join_phase and username in battle.challenger_team:
             await self.web_useitem(ctx, "Burner Laptop")
             return
@@ -1878,12 +2104,12 @@ class Bot(commands.Bot):
             jail.record_attack(player, player.location, max_reward, bypass_speed_check=True)
             if random.random() < 0.70:
                 reward = random.randint(int(max_reward * 0.6), max_reward)
-                player.points += reward
+                ledger.apply(player, ledger.ATTACK, points=reward)
                 gained += reward
                 hits += 1
             else:
                 penalty = random.randint(int(max_reward * 0.10), int(max_reward * 0.25))
-                player.points = max(0, player.points - penalty)
+                ledger.apply(player, ledger.ATTACK_PENALTY, points=-penalty, clamp=True)
                 lost += penalty
 
         # Plus the lingering no-cap window — speed-penalty check is bypassed
@@ -1891,7 +2117,7 @@ class Bot(commands.Bot):
         jail.grant_no_cap(player)
         no_cap_min = jail.BURNER_LAPTOP_NO_CAP_MINUTES
 
-        player.items.remove("Burner Laptop")
+        player.remove_item("Burner Laptop")
         helpers.save_player_data(self.player_data)
 
         net = gained - lost
@@ -1906,18 +2132,20 @@ class Bot(commands.Bot):
 
     @commands.command(name='battle')
     async def battle_status(self, ctx):
-        """Show current boss battle status (join phase, team, HP)."""
-        battle = self.ongoing_battle
-        if not battle:
+        """Show every arena's boss battle status (join phase, team, HP)."""
+        live = self.arenas.active()
+        if not live:
             await ctx.send("Boss battle: idle. Use !bossbattle to start when off cooldown.")
             return
 
-        team = battle.challenger_team or {}
-        team_list = ", ".join(team.keys()) if team else "none"
-        phase = "join" if battle.join_phase else "fight"
-        await ctx.send(
-            f"Boss battle ({phase}) vs {battle.boss_name} | Boss HP: {battle.boss_health} | Team: {team_list}"
-        )
+        parts = []
+        for arena in live:
+            battle = arena.battle
+            team_list = ", ".join(battle.challenger_team) or "none"
+            phase = "join" if battle.join_phase else "fight"
+            parts.append(f"Arena {arena.id} ({phase}) vs {battle.boss_name} | "
+                         f"Boss HP: {battle.boss_health} | Team: {team_list}")
+        await self.send_clamped(ctx, " || ".join(parts))
 
     @commands.command(name='mondayinsulttheo')
     async def mondayinsulttheo(self, ctx):
@@ -1964,24 +2192,15 @@ class Bot(commands.Bot):
 
         if outcome == 0:
             for player in self.player_data.values():
-                player.points = max(0, player.points - delta)
+                ledger.apply(player, ledger.PATCH_TUESDAY, points=-delta, clamp=True)
             message_lines.append(f"🛠️ Patch Tuesday backfired. Everyone loses {delta} points.")
             # Drop a consolation Root Beer Flask
-            self.prune_expired_drops()
-            if "Root Beer Flask".lower() not in {d['name'].lower() for d in self.dropped_items}:
-                location = random.choice(['email', 'website', '/etc/shadow', 'database', 'server', 'network', 'evilcorp'])
-                self.dropped_items.append({
-                    'name': "Root Beer Flask",
-                    'location': location,
-                    'ts': datetime.now().timestamp()
-                })
-                self.session_items_dropped.append("Root Beer Flask")
-                self.drop_spawned_count += 1
+            location = await self._spawn_world_drop("Root Beer Flask")
+            if location:
                 message_lines.append(f"🧉 A {self.format_item('Root Beer Flask')} fell off the change cart at {location} — grab it!")
-                await game_overlay.drop("Root Beer Flask", location)
         else:
             for player in self.player_data.values():
-                player.points += delta
+                ledger.apply(player, ledger.PATCH_TUESDAY, points=delta)
             message_lines.append(f"🛠️ Patch Tuesday miracle. Everyone gains {delta} points.")
 
         helpers.save_player_data(self.player_data)
@@ -1994,6 +2213,59 @@ class Bot(commands.Bot):
     # PvP COMMANDS #
     ###################################################################
 
+    def _did_you_mean(self, target):
+        """' Did you mean @a or @b?' for an unregistered target, else ''."""
+        matches = self.usernames.suggest(target)
+        if not matches:
+            return ""
+        return " Did you mean " + " or ".join(f"@{m}" for m in matches) + "?"
+
+    STEAL_COOLDOWN_SECONDS = 1800
+
+    def _steal_suggestions(self, username, limit=3):
+        """Richest players at `username`'s location that a !steal could land
+        on right now (not boxed, not on this attacker's cooldown, something to
+        take). Reads the location index — O(players here), not O(roster)."""
+        attacker = self.player_data.get(username)
+        if not attacker:
+            return []
+        cooldowns = getattr(self, 'steal_cooldowns', {})
+        now = datetime.now()
+        out = []
+        for name in self.locations.players_at(attacker.location):
+            victim = self.player_data.get(name)
+            if name == username or not victim or victim.points <= 0:
+                continue
+            if perks.is_box_active(victim):
+                continue
+            last = cooldowns.get((username, name))
+            if last and (now - last).total_seconds() < self.STEAL_COOLDOWN_SECONDS:
+                continue
+            out.append((name, victim.points))
+        out.sort(key=lambda t: (-t[1], t[0]))
+        return out[:limit]
+
+    @commands.command(name='here')
+    async def here(self, ctx):
+        """Who's at your location, the best steal targets among them, and the
+        location's activity this session."""
+        username = ctx.author.name.lower()
+        if username not in self.player_data:
+            await ctx.send(f"@{ctx.author.name}, please register using !start before playing.")
+            return
+        loc = self.player_data[username].location
+        others = sorted(u for u in self.locations.players_at(loc) if u != username)
+        who = ", ".join(f"@{u}" for u in others) if others else "nobody else"
+        targets = self._steal_suggestions(username)
+        target_text = (", ".join(f"@{u} ({pts} pts)" for u, pts in targets)
+                       if targets else "none")
+        stats = self.locations.stats().get(loc)
+        activity = (f" | {stats['actions']} actions, {stats['arrivals']} arrivals this session"
+                    if stats else "")
+        msg = f"@{ctx.author.name} | At {loc}: {who} | Steal targets: {target_text}{activity}"
+        await self.send_clamped(ctx, msg)
+        await game_overlay.event(username, '!here', msg, 'info')
+
     @commands.command(name='steal')
     async def steal(self, ctx, *, target: str = None):
         """Steal points from a player at your same location. 30-min cooldown per target."""
@@ -2004,7 +2276,10 @@ class Bot(commands.Bot):
             return
 
         if not target:
-            await ctx.send(f"@{ctx.author.name}, usage: !steal <username>")
+            suggestions = self._steal_suggestions(username)
+            hint = (" Targets here: " + ", ".join(f"@{u} ({pts} pts)" for u, pts in suggestions)
+                    if suggestions else "")
+            await ctx.send(f"@{ctx.author.name}, usage: !steal <username>.{hint}")
             return
 
         target = target.lstrip('@').lower()
@@ -2014,7 +2289,7 @@ class Bot(commands.Bot):
             return
 
         if target not in self.player_data:
-            await ctx.send(f"@{ctx.author.name}, player @{target} is not registered.")
+            await ctx.send(f"@{ctx.author.name}, player @{target} is not registered.{self._did_you_mean(target)}")
             return
 
         attacker = self.player_data[username]
@@ -2050,14 +2325,15 @@ class Bot(commands.Bot):
         cooldown_key = (username, target)
         now = datetime.now()
         last = self.steal_cooldowns.get(cooldown_key)
-        if last and (now - last).total_seconds() < 1800:
-            remaining = int((1800 - (now - last).total_seconds()) / 60) + 1
+        if last and (now - last).total_seconds() < self.STEAL_COOLDOWN_SECONDS:
+            remaining = int((self.STEAL_COOLDOWN_SECONDS - (now - last).total_seconds()) / 60) + 1
             await ctx.send(
                 f"@{ctx.author.name}, you already targeted @{target} recently. Try again in {remaining} min."
             )
             return
 
         self.steal_cooldowns[cooldown_key] = now
+        self.locations.record_action(attacker.location)
 
         # Success chance: 50% base ± 2% per level difference, capped 25–75%
         level_diff    = attacker.level - victim.level
@@ -2065,8 +2341,7 @@ class Bot(commands.Bot):
 
         if random.random() < success_chance:
             stolen = max(1, int(victim.points * random.uniform(0.10, 0.20)))
-            victim.points   = max(0, victim.points - stolen)
-            attacker.points += stolen
+            stolen = ledger.transfer(victim, attacker, stolen, ledger.STEAL)
             helpers.save_player_data(self.player_data)
             msg = f"@{username} ran a silent heist on @{target} and walked away with {stolen} pts. 🕵️"
             await ctx.send(msg)
@@ -2075,7 +2350,7 @@ class Bot(commands.Bot):
             await game_overlay.player(target, victim)
         else:
             penalty = max(1, int(attacker.points * 0.05))
-            attacker.points = max(0, attacker.points - penalty)
+            ledger.apply(attacker, ledger.STEAL_PENALTY, points=-penalty, clamp=True)
             # Caught stealing — straight to jail per spec §1.
             jail_status = jail.jail_on_steal_fail(attacker)
             helpers.save_player_data(self.player_data)
@@ -2101,7 +2376,7 @@ class Bot(commands.Bot):
             return
         target = target.lstrip('@').lower()
         if target not in self.player_data:
-            await ctx.send(f"@{ctx.author.name}, player @{target} is not registered.")
+            await ctx.send(f"@{ctx.author.name}, player @{target} is not registered.{self._did_you_mean(target)}")
             return
 
         bailer = self.player_data[username]
@@ -2130,7 +2405,7 @@ class Bot(commands.Bot):
             return
         target_clean = target.lstrip('@').lower()
         if target_clean not in self.player_data:
-            await ctx.send(f"@{ctx.author.name}, player @{target_clean} is not registered.")
+            await ctx.send(f"@{ctx.author.name}, player @{target_clean} is not registered.{self._did_you_mean(target_clean)}")
             return
 
         player = self.player_data[username]
@@ -2156,7 +2431,7 @@ class Bot(commands.Bot):
         username = ctx.author.name.lower()
         target = (target or username).lstrip('@').lower()
         if target not in self.player_data:
-            await ctx.send(f"@{ctx.author.name}, player @{target} is not registered.")
+            await ctx.send(f"@{ctx.author.name}, player @{target} is not registered.{self._did_you_mean(target)}")
             return
         status = jail.jail_status(self.player_data[target])
         if not status.is_jailed:
@@ -2198,6 +2473,7 @@ class Bot(commands.Bot):
             started=0           # Default started
         )
         self.player_data[username] = new_player
+        self.usernames.add(username)
         self.session_new_players.append(username)
         helpers.save_player_data(self.player_data)
 
@@ -2256,7 +2532,7 @@ class Bot(commands.Bot):
         username = ctx.author.name.lower()
 
         # During an active boss battle, !hack is a critical attack instead of navigation
-        battle = self.ongoing_battle
+        battle = self.arenas.battle_of(username)
         if battle and not battle.join_phase and username in battle.challenger_team:
             if username in battle.hack_used:
                 await ctx.send(f"@{ctx.author.name}, you already used your hack this battle!")
@@ -2264,20 +2540,11 @@ class Bot(commands.Bot):
             player = self.player_data.get(username)
             player_items = set(player.items) if player else set()
             owned_hack_items = player_items & HACK_ITEMS
-            if owned_hack_items:
-                damage = random.randint(55, 85)
-                item_name = next(iter(owned_hack_items))
-                msg = f"@{ctx.author.name} deploys {item_name}! CRITICAL HIT — {damage} damage to {battle.boss_name}!"
-            else:
-                damage = random.randint(30, 60)
-                msg = f"@{ctx.author.name} launches a manual hack — {damage} damage to {battle.boss_name}!"
-            battle.boss_health = max(0, battle.boss_health - damage)
+            tool = next(iter(owned_hack_items)) if owned_hack_items else None
+            # Claimed now so it can't be queued twice; resolves (and shows up
+            # in the GUI feed) at the engine's next batch point.
             battle.hack_used.add(username)
-            battle.team_damage += damage
-            battle.per_player_damage[username] = battle.per_player_damage.get(username, 0) + damage
-            # Route to the GUI feed + spectator overlay only — chat stays quiet.
-            await overlay.log(msg, "hack")
-            await overlay.push(**self._ov_state())
+            battle.queue_action(BattleAction(battle_engine.HACK, username, tool))
             return
 
         # Outside of battle: move to a TwitcHack location
@@ -2286,19 +2553,23 @@ class Bot(commands.Bot):
             return
 
         player = self.player_data[username]
-        valid_locations = ['email', '/etc/shadow', 'website', 'database', 'server', 'network', 'evilcorp']
 
         if not location:
-            await ctx.send(f"@{ctx.author.name}, you are currently at {player.location}. Use !hack <location> to move to: {', '.join(valid_locations)}")
+            occupancy = ', '.join(f"{loc} ({self.locations.count_at(loc)})"
+                                  for loc in locations.LOCATIONS)
+            await ctx.send(f"@{ctx.author.name}, you are currently at {player.location}. Use !hack <location> to move to: {occupancy}")
             return
 
-        if location.lower() in valid_locations:
-            player.location = location.lower()
+        destination = locations.normalize(location)
+        if destination:
+            player.location = destination
             helpers.save_player_data(self.player_data)
-            await ctx.send(f'@{ctx.author.name}, you have moved to {location}!')
+            here = self.locations.count_at(destination) - 1
+            company = f" {here} other hacker{'s' if here != 1 else ''} here." if here else ""
+            await ctx.send(f'@{ctx.author.name}, you have moved to {location}!{company}')
             await game_overlay.player(username, player)
         else:
-            await ctx.send(f'@{ctx.author.name}, invalid location. Valid locations are: {", ".join(valid_locations)}.')
+            await ctx.send(f'@{ctx.author.name}, invalid location. Valid locations are: {", ".join(locations.LOCATIONS)}.')
 
     @commands.command(name='points')
     async def points(self, ctx):
@@ -2319,6 +2590,21 @@ class Bot(commands.Bot):
         await game_overlay.event(username, '!points', f'@{ctx.author.name} has {player.points} points and {player.cash} cash.', 'info')
         await game_overlay.player(username, player)
 
+    @commands.command(name='chatstats')
+    async def chatstats(self, ctx):
+        """Owner-only: outbound chat queue depth, sends, merges and drops."""
+        if not self.is_channel_owner(ctx.author.name):
+            await ctx.send(f'@{ctx.author.name}, this command is only for the channel owner.')
+            return
+        m = self.chat_queue.metrics()
+        dropped = m['dropped']
+        await ctx.send(
+            f"Chat queue: depth {m['depth']} (max {m['max_depth_seen']}) | "
+            f"sent {m['sent']} | merged {m['merged']} | "
+            f"dropped {dropped['overflow']} full / {dropped['stale']} stale | "
+            f"errors {m['send_errors']}"
+        )
+
     @commands.command(name='ownerpoints')
     async def ownerpoints(self, ctx, amount: int):
         username = ctx.author.name.lower()
@@ -2331,7 +2617,7 @@ class Bot(commands.Bot):
             return
 
         player = self.player_data[username]
-        player.points += amount
+        ledger.apply(player, ledger.OWNER_GRANT, points=amount)
         helpers.check_level_up(self.player_data, username)
         helpers.save_player_data(self.player_data)
         await ctx.send(f'@{ctx.author.name}, added {amount} points. Your new total is {player.points} points.')
@@ -2345,10 +2631,10 @@ class Bot(commands.Bot):
             return
         target_username = (target or username).lower()
         if target_username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, {target_username} is not registered.')
+            await ctx.send(f'@{ctx.author.name}, {target_username} is not registered.{self._did_you_mean(target_username)}')
             return
         player = self.player_data[target_username]
-        player.cash = getattr(player, 'cash', 0) + amount
+        ledger.apply(player, ledger.OWNER_GRANT, cash=amount, counterparty=username)
         helpers.save_player_data(self.player_data)
         await ctx.send(f'@{ctx.author.name}, gave {amount} cash to @{target_username}. New balance: {player.cash} cash.')
 
@@ -2361,37 +2647,67 @@ class Bot(commands.Bot):
 
         target = target.lower()
         if target not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, target player {target} is not registered.')
+            await ctx.send(f'@{ctx.author.name}, target player {target} is not registered.{self._did_you_mean(target)}')
             return
 
         player = self.player_data[target]
-        player.points += amount
+        ledger.apply(player, ledger.OWNER_GRANT, points=amount, counterparty=username)
         self.check_level_up(target)
         helpers.save_player_data(self.player_data)
         await ctx.send(f'@{ctx.author.name} assigned {amount} points to @{target}. Their new total is {player.points} points.')
 
-    @commands.command(name='leaderboard')
-    async def leaderboard(self, ctx):
-        # Displays the top players based on points. 
-        # Parameters: - ctx (Context): The context in which the command was invoked.
-        
-        # Sort players by points in descending order
-        sorted_players = sorted(
-            self.player_data.items(),
-            key=lambda item: item[1].points,   # Sort by the points attribute of each Player object 
-            reverse=True
-        )
-        top_players = sorted_players[:5]  # Get top 5 players
+    # !leaderboard / !rank board names → the label shown in chat.
+    LEADERBOARD_LABELS = {
+        rankings.POINTS: 'points',
+        rankings.CASH: 'cash',
+        rankings.SESSION: 'earned this session',
+    }
+
+    def _board_arg(self, arg):
+        """Resolve a board name argument (default: points); None if unknown."""
+        name = (arg or rankings.POINTS).strip().lower()
+        return name if name in self.LEADERBOARD_LABELS else None
 
-        # Construct the leaderboard message
-        leaderboard_message = 'Leaderboard:\n'
-        for idx, (username, player) in enumerate(top_players, start=1):
-            leaderboard_message += f'{idx}. {username} - {player.points} points. // '
+    @commands.command(name='leaderboard')
+    async def leaderboard(self, ctx, board: str = None):
+        """Top players on a board: `!leaderboard [points|cash|session]`.
+        Served from the incrementally maintained rankings — no roster sort."""
+        name = self._board_arg(board)
+        if name is None:
+            await ctx.send(f"@{ctx.author.name}, boards: {', '.join(self.LEADERBOARD_LABELS)}.")
+            return
+        label = self.LEADERBOARD_LABELS[name]
+        leaderboard_message = f'Leaderboard ({label}):\n'
+        for idx, (username, score) in enumerate(self.leaderboards[name].top(), start=1):
+            leaderboard_message += f'{idx}. {username} - {score} {label}. // '
 
         # Send the leaderboard message to chat
         await self.send_clamped(ctx, leaderboard_message)
         await game_overlay.event(ctx.author.name.lower(), '!leaderboard', leaderboard_message, 'info')
 
+    @commands.command(name='rank')
+    async def rank(self, ctx, board: str = None):
+        """Your rank, percentile and neighbours: `!rank [points|cash|session]`."""
+        username = ctx.author.name.lower()
+        if username not in self.player_data:
+            await ctx.send(f"@{ctx.author.name}, please register using !start before playing.")
+            return
+        name = self._board_arg(board)
+        if name is None:
+            await ctx.send(f"@{ctx.author.name}, boards: {', '.join(self.LEADERBOARD_LABELS)}.")
+            return
+        ranks = self.leaderboards[name]
+        position = ranks.rank(username)
+        if position is None:
+            await ctx.send(f"@{ctx.author.name}, you're not ranked yet.")
+            return
+        nearby = " // ".join(f"{r}. {u} - {score}"
+                             for r, u, score in ranks.around(username))
+        msg = (f"@{ctx.author.name} | #{position} of {len(ranks)} by "
+               f"{self.LEADERBOARD_LABELS[name]} (ahead of {ranks.percentile(username):.0f}% of players) | "
+               f"{nearby}")
+        await self.send_clamped(ctx, msg)
+        await game_overlay.event(username, '!rank', msg, 'info')
 
     @commands.command(name='status')
     async def status(self, ctx, *, target_player: str = None):
@@ -2425,7 +2741,7 @@ class Bot(commands.Bot):
             target_username = target_player.lower()
 
             if target_username not in self.player_data:
-                await ctx.send(f'@{ctx.author.name}, player "{target_player}" is not registered.')
+                await ctx.send(f'@{ctx.author.name}, player "{target_player}" is not registered.{self._did_you_mean(target_username)}')
                 return
 
             player = self.player_data[target_username]
@@ -2463,9 +2779,7 @@ class Bot(commands.Bot):
                     player.virus_attempts = 0
                 player.virus_attempts += 1
                 points_lost = max(1, int(player.points * 0.15 * player.virus_attempts))  # Penalty is 15% of player total points
-                player.points -= points_lost
-                if player.points < 0:
-                    player.points = 0  # Ensure points do not go below zero
+                ledger.apply(player, ledger.VIRUS, points=-points_lost, clamp=True)  # Points do not go below zero
                 helpers.save_player_data(self.player_data)  # Save the updated player data to the JSON file
                 await ctx.send(f'@{ctx.author.name}, unauthorized use of !virus! You have been penalized {points_lost} points.')
             else:
@@ -2477,16 +2791,14 @@ class Bot(commands.Bot):
 
             # Check if the target player is registered
             if target not in self.player_data:
-                await ctx.send(f'@{ctx.author.name}, the target player {target} is not registered.')
+                await ctx.send(f'@{ctx.author.name}, the target player {target} is not registered.{self._did_you_mean(target)}')
                 return
 
             player = self.player_data[target]  # Retrieve the target player's data
 
             # Simulate the effect of the virus by penalizing points
             points_lost = max(1, int(player.points * random.uniform(0.20, 0.30))) # Random points lost due to virus
-            player.points -= points_lost  # Subtract the points from the player's total
-            if player.points < 0:
-                player.points = 0  # Ensure points do not go below zero
+            ledger.apply(player, ledger.VIRUS, points=-points_lost, counterparty=username, clamp=True)
             helpers.save_player_data(self.player_data)  # Save the updated player data to the JSON file
             await ctx.send(f'@{ctx.author.name} has spread a virus to @{target}! They lost {points_lost} points.')
         else:
@@ -2497,9 +2809,7 @@ class Bot(commands.Bot):
             for affected in affected_players:
                 player = self.player_data[affected]  # Retrieve the affected player's data
                 points_lost = max(1, int(player.points * random.uniform(0.10, 0.20)))  # Random points lost due to virus
-                player.points -= points_lost  # Subtract the points from the player's total
-                if player.points < 0:
-                    player.points = 0  # Ensure points do not go below zero
+                ledger.apply(player, ledger.VIRUS, points=-points_lost, counterparty=username, clamp=True)
 
             helpers.save_player_data(self.player_data)  # Save the updated player data to the JSON file
             affected_list = ', '.join(affected_players)
@@ -2509,862 +2819,138 @@ class Bot(commands.Bot):
 
 
     ###################################################################
-    # EMAIL ATTACKS #
+    # CLICKER ATTACKS #
+    # Rows live in game/attacks.py (ATTACKS); _run_attack executes any
+    # row. A new attack is one table row + one registration below.
     ###################################################################
 
-    @commands.command(name='phish')
-    async def phish(self, ctx):
-        """Performs a phishing attack if the player is at the 'email' location."""
+    async def _run_attack(self, ctx, attack_id):
+        """Run one clicker attack: gates, jail speed check, roll, result."""
+        attack = attacks.ATTACKS[attack_id]
         username = ctx.author.name.lower()
-
-        # Check if the user is registered
         if username not in self.player_data:
             await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
             return
-
         player = self.player_data[username]
 
-        # Check if the player is at the 'email' location
-        if player.location != 'email' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the email location to perform phishing.')
-            return
-
-        # Check if the player meets the required level
-        if player.level < 0 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 0 to perform phishing.')
+        denied = attacks.check_access(attack, player, self.is_channel_owner(username))
+        if denied:
+            await ctx.send(f'@{ctx.author.name}, {denied}')
             return
 
-        if await self._jail_speed_gate(ctx, player, base_reward=60):
+        command = f'!{attack.id}'
+        if await self._jail_speed_gate(ctx, player, base_reward=attack.base_reward, command=command):
             return
 
-        # Check for item bonuses
-        bonus = self.get_item_bonus(player, 'phish')
-        
-        # Simulate phishing success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
+        result = attacks.roll(attack, player.items)
+        text = attacks.apply_roll(attack, player, result)
+        self.locations.record_action(player.location)
+        await self._attack_result(ctx, command, f'@{ctx.author.name}, {text}', result.success, player)
 
-        if success:
-            base_points = random.randint(20, 60)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            points_earned = random.randint(20, 60)
-            player.points += points_earned
-            await self._attack_result(ctx, '!phish', f'@{ctx.author.name}, phishing successful!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(10, 30)
-            player.points -= points_lost
-            if player.points < 0:
-                player.points = 0
-            await self._attack_result(ctx, '!phish', f'@{ctx.author.name}, phishing failed! You lost {points_lost} points.', False, player)
+    # email
+    @commands.command(name='phish')
+    async def phish(self, ctx):
+        await self._run_attack(ctx, 'phish')
 
     @commands.command(name='spoof')
     async def spoof(self, ctx):
-        username = ctx.author.name.lower()
-
-        # Check if the user is registered
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
+        await self._run_attack(ctx, 'spoof')
 
-        player = self.player_data[username]
+    @commands.command(name='dump')
+    async def dump(self, ctx):
+        await self._run_attack(ctx, 'dump')
 
-        # Check if the player is at the 'email' location
-        if player.location != 'email' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the email location to send a spoofed email.')
-            return
+    # /etc/shadow
+    @commands.command(name='crack')
+    async def crack(self, ctx):
+        await self._run_attack(ctx, 'crack')
 
-        # Check if the player meets the required level
-        if player.level < 5 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 5 to send a spoofed email.')
-            return
+    @commands.command(name='stealth')
+    async def stealth(self, ctx):
+        await self._run_attack(ctx, 'stealth')
 
-        if await self._jail_speed_gate(ctx, player, base_reward=70):
-            return
+    @commands.command(name='bruteforce')
+    async def bruteforce(self, ctx):
+        await self._run_attack(ctx, 'bruteforce')
 
-        # Check for item bonuses
-        bonus = self.get_item_bonus(player, 'spoof')
-        
-        # Simulate spoofing success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(30, 70)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!spoof', f'@{ctx.author.name}, spoofing successful!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(15, 35)
-            player.points -= points_lost
-            if player.points < 0:
-                player.points = 0
-            await self._attack_result(ctx, '!spoof', f'@{ctx.author.name}, spoofing failed! You lost {points_lost} points.', False, player)
+    # website
+    @commands.command(name='ffuf')
+    async def ffuf(self, ctx):
+        await self._run_attack(ctx, 'ffuf')
 
-    @commands.command(name='dump')
-    async def dump(self, ctx):
-        username = ctx.author.name.lower()
+    @commands.command(name='burp')
+    async def burp(self, ctx):
+        await self._run_attack(ctx, 'burp')
 
-        # Check if the user is registered
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
+    @commands.command(name='sqliw')
+    async def sqliw(self, ctx):
+        await self._run_attack(ctx, 'sqliw')
 
-        player = self.player_data[username]
+    @commands.command(name='xss')
+    async def xss(self, ctx):
+        await self._run_attack(ctx, 'xss')
 
-        # Check if the player is at the 'email' location
-        if player.location != 'email' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the email location to dump emails.')
-            return
+    # database
+    @commands.command(name='dumpdb')
+    async def dumpdb(self, ctx):
+        await self._run_attack(ctx, 'dumpdb')
 
-        # Check if the player meets the required level
-        if player.level < 10 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 10 to dump emails.')
-            return
+    @commands.command(name='sqlidb')
+    async def sqlidb(self, ctx):
+        await self._run_attack(ctx, 'sqlidb')
 
-        if await self._jail_speed_gate(ctx, player, base_reward=80):
-            return
+    @commands.command(name='admin')
+    async def admin(self, ctx):
+        await self._run_attack(ctx, 'admin')
 
-        # Check for item bonuses
-        bonus = self.get_item_bonus(player, 'dump')
+    # server (nmap also runs from network)
+    @commands.command(name='nmap')
+    async def nmap_scan(self, ctx):
+        await self._run_attack(ctx, 'nmap')
 
-        # Simulate dumping success or failure
-        success = random.choice([True, False, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(40, 80)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!dump', f'@{ctx.author.name}, email dump successful!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(20, 40)
-            player.points -= points_lost
-            if player.points < 0:
-                player.points = 0
-            await self._attack_result(ctx, '!dump', f'@{ctx.author.name}, email dump failed! You lost {points_lost} points.', False, player)
+    @commands.command(name='revshell')
+    async def revshell(self, ctx):
+        await self._run_attack(ctx, 'revshell')
 
-    ###################################################################
-    # /etc/shadow ATTACKS #
-    ###################################################################
+    @commands.command(name='root')
+    async def root(self, ctx):
+        await self._run_attack(ctx, 'root')
 
-    @commands.command(name='crack')
-    async def crack(self, ctx):
-        # Simulates cracking hashed passwords when at '/etc/shadow' location.
-        # Parameters: - ctx (Context): The context in which the command was invoked.
+    @commands.command(name='ransom')
+    async def ransom(self, ctx):
+        await self._run_attack(ctx, 'ransom')
 
-        username = ctx.author.name.lower()      # Convert the username to lowercase for consistency
+    # network
+    @commands.command(name='sniff')
+    async def sniff(self, ctx):
+        await self._run_attack(ctx, 'sniff')
 
-        # Check if the user is registered
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
+    @commands.command(name='mitm')
+    async def mitm(self, ctx):
+        await self._run_attack(ctx, 'mitm')
 
-        player = self.player_data[username]     # Retrieve the player's data
+    @commands.command(name='ddos')
+    async def ddos(self, ctx):
+        await self._run_attack(ctx, 'ddos')
 
-        # Check if the player is at the '/etc/shadow' location
-        if player.location != '/etc/shadow' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the /etc/shadow location to crack hashes.')
-            return
-
-        # Check if the player meets the required level
-        if player.level < 15 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 15 to crack hashes.')
-            return
-
-        if await self._jail_speed_gate(ctx, player, base_reward=90):
-            return
-
-        # Check for item bonuses
-        bonus = self.get_item_bonus(player, 'crack')
-        
-        # Simulate cracking success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(50, 90)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!crack', f'@{ctx.author.name}, cracking successful!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(10, 30)
-            player.points -= points_lost
-            if player.points < 0:
-                player.points = 0
-            await self._attack_result(ctx, '!crack', f'@{ctx.author.name}, cracking failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='stealth')
-    async def stealth(self, ctx):
-        # Simulates hiding tracks by modifying log files when at '/etc/shadow' location.
-        # Parameters: - ctx (Context): The context in which the command was invoked.
-
-        username = ctx.author.name.lower()  # Convert the username to lowercase for consistency
-
-        # Check if the user is registered
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]  # Retrieve the player's data
-
-        # Check if the player is at the '/etc/shadow' location
-        if player.location != '/etc/shadow' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the /etc/shadow location to hide your tracks.')
-            return
-
-        # Check if the player meets the required level
-        if player.level < 20 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 20 to hide your tracks.')
-            return
-
-        if await self._jail_speed_gate(ctx, player, base_reward=100):
-            return
-
-        # Simulate success or failure of hiding tracks
-        success = random.choice([True, False])
-        if success:
-            points_earned = random.randint(60, 100)
-            player.points += points_earned
-            await self._attack_result(ctx, '!stealth', f'@{ctx.author.name}, stealth successful! You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(5, 20)
-            player.points -= points_lost
-            if player.points < 0:
-                player.points = 0
-            await self._attack_result(ctx, '!stealth', f'@{ctx.author.name}, stealth failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='bruteforce')
-    async def bruteforce(self, ctx):
-        # Simulates performing a brute force attack on password hashes when at '/etc/shadow' location.
-        # Parameters: - ctx (Context): The context in which the command was invoked.
-
-        username = ctx.author.name.lower()  # Convert the username to lowercase for consistency
-
-        # Check if the user is registered
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]  # Retrieve the player's data
-
-        # Check if the player is at the '/etc/shadow' location
-        if player.location != '/etc/shadow' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the /etc/shadow location to perform a brute force attack.')
-            return
-
-        # Check if the player meets the required level
-        if player.level < 25 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 25 to perform a brute force attack.')
-            return
-
-
-        if await self._jail_speed_gate(ctx, player, base_reward=110):
-            return
-
-        # Simulate success or failure of brute force attack
-        success = random.choice([True, False])
-        if success:
-            points_earned = random.randint(70, 110)
-            player.points += points_earned
-            await self._attack_result(ctx, '!bruteforce', f'@{ctx.author.name}, brute force attack successful! You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(15, 40)
-            player.points -= points_lost
-            if player.points < 0:
-                player.points = 0
-            await self._attack_result(ctx, '!bruteforce', f'@{ctx.author.name}, brute force attack failed! You lost {points_lost} points.', False, player)
-
-    ###################################################################
-    # WEBSITE ATTACKS #
-    ###################################################################
-
-    @commands.command(name='ffuf')
-    async def ffuf(self, ctx):
-        """Low-level web fuzzing for early players."""
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'website' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the website location to fuzz.')
-            return
-
-        if player.level > 5 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, ffuf fuzzing is for level 5 and below.')
-            return
-
-        if await self._jail_speed_gate(ctx, player, base_reward=25):
-            return
-
-        bonus = self.get_item_bonus(player, 'ffuf')
-        success = random.choice([True, False, False]) if bonus['success_boost'] else random.choice([True, False])
-
-        if success:
-            base_points = random.randint(12, 25)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!ffuf', f'@{ctx.author.name}, ffuf found some tasty endpoints!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(5, 12)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!ffuf', f'@{ctx.author.name}, ffuf came up empty. You lost {points_lost} points.', False, player)
-
-    @commands.command(name='burp')
-    async def burp(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'website' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the website location to scan.')
-            return
-
-        if player.level < 30 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 30 to use Burp Suite.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=120):
-            return
-
-        bonus = self.get_item_bonus(player, 'burp')
-        
-        # Simulate burp success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(80, 120)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!burp', f'@{ctx.author.name}, vulnerability scan successful!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(20, 45)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!burp', f'@{ctx.author.name}, scan failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='sqliw')
-    async def sqliw(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'website' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the website location for SQL injection.')
-            return
-
-        if player.level < 35 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 35 for SQL injection.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=130):
-            return
-
-        bonus = self.get_item_bonus(player, 'sqliw')
-        
-        # Simulate SQL injection success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(90, 130)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!sqliw', f'@{ctx.author.name}, SQL injection successful!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(25, 50)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!sqliw', f'@{ctx.author.name}, SQL injection failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='xss')
-    async def xss(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'website' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the website location for XSS attacks.')
-            return
-
-        if player.level < 40 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 40 for XSS attacks.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=140):
-            return
-
-        bonus = self.get_item_bonus(player, 'xss')
-        
-        # Simulate XSS success or failure with potential item boost
-        success = random.choice([True, False, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(100, 140)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!xss', f'@{ctx.author.name}, XSS attack successful!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(30, 55)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!xss', f'@{ctx.author.name}, XSS attack failed! You lost {points_lost} points.', False, player)
-
-    ###################################################################
-    # DATABASE ATTACKS #
-    ###################################################################
-
-    @commands.command(name='dumpdb')
-    async def dumpdb(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'database' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the database location to dump data.')
-            return
-
-        if player.level < 45 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 45 to dump database.')
-            return
-
-        if await self._jail_speed_gate(ctx, player, base_reward=150):
-            return
-
-        success = random.choice([True, False])
-        if success:
-            points_earned = random.randint(110, 150)
-            player.points += points_earned
-            await self._attack_result(ctx, '!dumpdb', f'@{ctx.author.name}, database dump successful! You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(35, 60)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!dumpdb', f'@{ctx.author.name}, database dump failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='sqlidb')
-    async def sqlidb(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'database' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the database location for SQL injection.')
-            return
-
-        if player.level < 50 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 50 to attempt database SQL injection.')
-            return
-
-        if await self._jail_speed_gate(ctx, player, base_reward=160):
-            return
-
-        success = random.choice([True, False])
-        if success:
-            points_earned = random.randint(120, 160)
-            player.points += points_earned
-            await self._attack_result(ctx, '!sqlidb', f'@{ctx.author.name}, database SQL injection successful! You gained unauthorized access. You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(40, 65)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!sqlidb', f'@{ctx.author.name}, database SQL injection failed! Your query was blocked. You lost {points_lost} points.', False, player)
-
-    @commands.command(name='admin')
-    async def admin(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'database' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the database location for privilege escalation.')
-            return
-
-        if player.level < 55 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 55 to attempt privilege escalation.')
-            return
-
-        if await self._jail_speed_gate(ctx, player, base_reward=170):
-            return
-
-        success = random.choice([True, False])
-        if success:
-            points_earned = random.randint(130, 170)
-            player.points += points_earned
-            await self._attack_result(ctx, '!admin', f'@{ctx.author.name}, privilege escalation successful! You now have admin access. You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(45, 70)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!admin', f'@{ctx.author.name}, privilege escalation failed! Your attempt was logged and blocked. You lost {points_lost} points.', False, player)
-
-    ###################################################################
-    # SERVER ATTACKS #
-    ###################################################################
-
-    @commands.command(name='nmap')
-    async def nmap_scan(self, ctx):
-        """Low-level recon for server/network locations."""
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location not in ('server', 'network') and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at server or network to run nmap.')
-            return
-
-        if player.level > 5 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, nmap recon is for level 5 and below.')
-            return
-
-        if await self._jail_speed_gate(ctx, player, base_reward=25):
-            return
-
-        bonus = self.get_item_bonus(player, 'nmapscan')
-        success = random.choice([True, False, False]) if bonus['success_boost'] else random.choice([True, False])
-
-        if success:
-            base_points = random.randint(12, 25)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!nmap', f'@{ctx.author.name}, nmap recon found open doors!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(5, 12)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!nmap', f'@{ctx.author.name}, nmap recon fizzled. You lost {points_lost} points.', False, player)
-
-    @commands.command(name='revshell')
-    async def revshell(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'server' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the server location to establish a reverse shell.')
-            return
-
-        if player.level < 60 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 60 to attempt a reverse shell.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=180):
-            return
-
-        bonus = self.get_item_bonus(player, 'revshell')
-        
-        # Simulate reverse shell success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(140, 180)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!revshell', f'@{ctx.author.name}, reverse shell established!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(50, 75)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!revshell', f'@{ctx.author.name}, reverse shell attempt failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='root')
-    async def root(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'server' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the server location for privilege escalation.')
-            return
-
-        if player.level < 65 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 65 to attempt root escalation.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=190):
-            return
-
-        bonus = self.get_item_bonus(player, 'root')
-        
-        # Simulate root access success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(150, 190)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!root', f'@{ctx.author.name}, root access achieved!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(55, 80)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!root', f'@{ctx.author.name}, privilege escalation failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='ransom')
-    async def ransom(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'server' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the server location to deploy ransomware.')
-            return
-
-        if player.level < 70 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 70 to attempt ransomware deployment.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=200):
-            return
-
-        bonus = self.get_item_bonus(player, 'ransom')
-        
-        # Simulate ransomware success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(160, 200)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!ransom', f'@{ctx.author.name}, ransomware deployed successfully!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(60, 85)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!ransom', f'@{ctx.author.name}, ransomware deployment failed! You lost {points_lost} points.', False, player)
-
-    ###################################################################
-    # NETWORK ATTACKS #
-    ###################################################################
-
-    @commands.command(name='sniff')
-    async def sniff(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'network' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the network location to sniff traffic.')
-            return
-
-        if player.level < 75 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 75 to attempt network sniffing.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=210):
-            return
-
-        bonus = self.get_item_bonus(player, 'sniff')
-        
-        # Simulate sniffing success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(170, 210)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!sniff', f'@{ctx.author.name}, network sniffing successful! Captured sensitive data!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(65, 90)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!sniff', f'@{ctx.author.name}, network sniffing failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='mitm')
-    async def mitm(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'network' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the network location for MITM attacks.')
-            return
-
-        if player.level < 80 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 80 to attempt MITM attack.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=220):
-            return
-
-        bonus = self.get_item_bonus(player, 'mitm')
-        
-        # Simulate MITM success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(180, 220)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!mitm', f'@{ctx.author.name}, MITM attack successful! Intercepted traffic!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(70, 95)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!mitm', f'@{ctx.author.name}, MITM attack failed! You lost {points_lost} points.', False, player)
-
-    @commands.command(name='ddos')
-    async def ddos(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'network' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the network location to launch DDoS attacks.')
-            return
-
-        if player.level < 85 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 85 to attempt DDoS attack.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=230):
-            return
-
-        bonus = self.get_item_bonus(player, 'ddos')
-        
-        # Simulate DDoS success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(190, 230)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!ddos', f'@{ctx.author.name}, DDoS attack successful! Services disrupted!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(75, 100)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!ddos', f'@{ctx.author.name}, DDoS attack failed! You lost {points_lost} points.', False, player)
-
-    ###################################################################
-    # EVILCORP ATTACKS #
-    ###################################################################
-
-    @commands.command(name='drop')
-    async def drop(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'evilcorp' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the EvilCorp location for a USB drop attack.')
-            return
-
-        if player.level < 90 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 90 to attempt a USB drop attack.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=240):
-            return
-
-        bonus = self.get_item_bonus(player, 'drop')
-        
-        # Simulate USB drop success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(200, 240)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!drop', f'@{ctx.author.name}, USB drop attack successful! Target connected the device!{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(80, 105)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!drop', f'@{ctx.author.name}, USB drop attack failed! No one took the bait. You lost {points_lost} points.', False, player)
+    # evilcorp
+    @commands.command(name='drop')
+    async def drop(self, ctx):
+        await self._run_attack(ctx, 'drop')
 
     @commands.command(name='tailgate')
     async def tailgate(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'evilcorp' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the EvilCorp location to attempt tailgating.')
-            return
-
-        if player.level < 95 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 95 to attempt tailgating.')
-            return
-
-        # Check for item bonuses
-        if await self._jail_speed_gate(ctx, player, base_reward=250):
-            return
-
-        bonus = self.get_item_bonus(player, 'tailgate')
-        
-        # Simulate tailgating success or failure with potential item boost
-        success = random.choice([True, True, False]) if bonus['success_boost'] else random.choice([True, False])
-        if success:
-            base_points = random.randint(210, 250)
-            points_earned = int(base_points * bonus['points_multiplier'])
-            item_msg = f" Your {bonus['item_name']} helped!" if bonus['item_name'] else ""
-            player.points += points_earned
-            await self._attack_result(ctx, '!tailgate', f'@{ctx.author.name}, tailgating successful! You slipped in unnoticed.{item_msg} You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(85, 110)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!tailgate', f'@{ctx.author.name}, tailgating failed! Security caught you. You lost {points_lost} points.', False, player)
+        await self._run_attack(ctx, 'tailgate')
 
     @commands.command(name='socialengineer')
     async def socialengineer(self, ctx):
-        username = ctx.author.name.lower()
-        if username not in self.player_data:
-            await ctx.send(f'@{ctx.author.name}, please register using !start before playing.')
-            return
-
-        player = self.player_data[username]
-        if player.location != 'evilcorp' and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at the EvilCorp location for social engineering.')
-            return
-
-        if player.level < 100 and not self.is_channel_owner(username):
-            await ctx.send(f'@{ctx.author.name}, you need to be at least level 100 to attempt social engineering.')
-            return
-
-        if await self._jail_speed_gate(ctx, player, base_reward=260):
-            return
-
-        success = random.choice([True, False])
-        if success:
-            points_earned = random.randint(220, 260)
-            player.points += points_earned
-            await self._attack_result(ctx, '!socialengineer', f'@{ctx.author.name}, social engineering successful! You obtained sensitive information. You earned {points_earned} points.', True, player)
-        else:
-            points_lost = random.randint(90, 115)
-            player.points = max(0, player.points - points_lost)
-            await self._attack_result(ctx, '!socialengineer', f'@{ctx.author.name}, social engineering failed! Your cover was blown. You lost {points_lost} points.', False, player)
+        await self._run_attack(ctx, 'socialengineer')
 
     ###################################################################
     # BOSS BATTLE #
     ###################################################################
 
-    async def _grant_bonus_points(self, battle):
+    async def _grant_bonus_points(self, arena, battle):
         """Apply any item-effect bonus points accumulated during the battle.
         Awarded to survivors AND fallen alike (e.g. Golden Cassette Tape:
         '+50 bonus points at battle end, win or lose')."""
@@ -3374,31 +2960,31 @@ class Bot(commands.Bot):
             player = self.player_data.get(username)
             if not player:
                 continue
-            player.points += amt
+            ledger.apply(player, ledger.BATTLE_BONUS, points=amt)
             self.session_points_earned[username] = self.session_points_earned.get(username, 0) + amt
             helpers.check_level_up(self.player_data, username)
-            await overlay.log(f"@{username} pockets +{amt} item-effect bonus pts.", "reward")
+            await overlay.log(f"@{username} pockets +{amt} item-effect bonus pts.", "reward", arena.id)
 
     async def web_useitem(self, ctx, item_name):
         """Use an inventory item as a boss-battle attack. Web-only handler.
 
-        Resolves the item against ITEM_EFFECTS, deducts HP from the boss,
-        applies any side-effect (skip/heal/reveal/etc), removes one copy of
-        the item from the player's inventory, and pushes the new state to
-        the overlay. Chat stays quiet (per Round 1B); the GUI feed gets the
-        combat log entry.
+        Validates the press and queues it on the battle. BattleEngine's
+        action_phase resolves it against ITEM_EFFECTS at the next batch point
+        (before the boss acts, or before the team attacks) and spends the
+        item then. Chat stays quiet (per Round 1B); the GUI feed gets the
+        combat log block.
         """
         username = ctx.author.name.lower()
-        battle = self.ongoing_battle
+        battle = self.arenas.battle_of(username)
 
         # Precondition checks — feedback flows back to the web toast via ctx.
-        if not battle or battle.join_phase:
-            await ctx.send("No active battle to use an item in.")
-            return
-        if username not in battle.challenger_team:
+        if not battle:
             await ctx.send("Join the battle before using items.")
             return
-        if battle.challenger_team[username] <= 0:
+        if battle.join_phase:
+            await ctx.send("No active battle to use an item in.")
+            return
+        if username not in battle.challenger_team or battle.challenger_team[username] <= 0:
             await ctx.send("You've fallen — items can't be used while down.")
             return
         player = self.player_data.get(username)
@@ -3416,105 +3002,20 @@ class Bot(commands.Bot):
             await ctx.send(f"{item_name} auto-triggers — it doesn't take a manual button.")
             return
 
-        # Roll damage
-        lo, hi = spec["damage_range"]
-        effect = spec.get("effect")
-        damage = random.randint(lo, hi) if lo or hi else 0
-        crit_note = ""
-
-        # Apply pre-damage effect modifiers
-        if effect and effect.get("type") == "max_roll":
-            damage = hi
-        elif effect and effect.get("type") == "crit":
-            damage = int(damage * effect.get("mult", 1.5))
-            crit_note = " — CRIT!"
-        elif effect and effect.get("type") == "burner_volley":
-            shots = effect["shots"]
-            plo, phi = effect["per_shot"]
-            shot_rolls = [random.randint(plo, phi) for _ in range(shots)]
-            damage = sum(shot_rolls)
-            crit_note = f" ({shots} hits)"
-
-        # Apply damage to boss
-        emoji = self.item_emojis.get(item_name, "📦")
-        battle.boss_health = max(0, battle.boss_health - damage)
-        battle.team_damage += damage
-        battle.per_player_damage[username] = battle.per_player_damage.get(username, 0) + damage
-
-        # Consume the item (one copy)
-        try:
-            player.items.remove(item_name)
-        except ValueError:
-            pass  # Race condition guard — shouldn't happen given the check above.
-
-        # Apply side-effects + build a flavor message for the log
-        attack_name = spec["attack_name"]
-        msg = f"{emoji} @{username} → {attack_name}{crit_note} — {damage} dmg to {battle.boss_name}!"
-        await overlay.log(msg, "item")
-
-        if effect:
-            etype = effect["type"]
-            if etype == "skip_boss_next_turn":
-                if random.random() < effect.get("chance", 1.0):
-                    battle.skip_boss_turns += 1
-                    await overlay.log(f"  ⤷ {battle.boss_name} is stunned — skipping their next turn!", "buff")
-            elif etype == "weakness_next_turn":
-                battle.weakness_next_turn += effect["reduction"]
-                await overlay.log(f"  ⤷ {battle.boss_name} weakened — next attack does -{effect['reduction']} dmg.", "buff")
-            elif etype == "heal_self":
-                amt = effect["amount"]
-                max_hp = battle.player_max_health.get(username, battle.challenger_team[username])
-                new_hp = min(max_hp, battle.challenger_team[username] + amt)
-                healed = new_hp - battle.challenger_team[username]
-                battle.challenger_team[username] = new_hp
-                await overlay.log(f"  ⤷ @{username} heals +{healed} HP ({new_hp}/{max_hp}).", "heal")
-            elif etype == "heal_random_teammate":
-                alive_others = [u for u in battle.challenger_team if u != username and battle.challenger_team[u] > 0]
-                if alive_others:
-                    target = random.choice(alive_others)
-                    amt = effect["amount"]
-                    max_hp = battle.player_max_health.get(target, battle.challenger_team[target])
-                    new_hp = min(max_hp, battle.challenger_team[target] + amt)
-                    healed = new_hp - battle.challenger_team[target]
-                    battle.challenger_team[target] = new_hp
-                    await overlay.log(f"  ⤷ @{target} healed for +{healed} HP ({new_hp}/{max_hp}).", "heal")
-                else:
-                    await overlay.log("  ⤷ No teammates left to heal.", "info")
-            elif etype == "bonus_points":
-                amt = effect["amount"]
-                battle.bonus_points[username] = battle.bonus_points.get(username, 0) + amt
-                await overlay.log(f"  ⤷ @{username} pockets +{amt} bonus pts at battle end.", "buff")
-            elif etype == "reveal_boss_damage":
-                # Pre-roll the boss's next-turn damage so the reveal is honest.
-                battle.next_boss_damage = random.randint(20, 70)
-                await overlay.log(f"  ⤷ Recon: {battle.boss_name}'s next attack will hit for {battle.next_boss_damage} dmg.", "reveal")
-            elif etype == "reveal_boss_target":
-                alive = [u for u in battle.challenger_team if battle.challenger_team[u] > 0]
-                if alive:
-                    battle.next_boss_target = random.choice(alive)
-                    await overlay.log(f"  ⤷ Sniff: {battle.boss_name} is targeting @{battle.next_boss_target} next turn.", "reveal")
-            elif etype == "browns_punt":
-                if random.random() < 0.3:
-                    await overlay.log(f"  ⤷ {battle.boss_name} laughs at the tiny helmet. The Browns punt.", "gag")
-
-        await overlay.push(**self._ov_state())
-        # Quick ack for the web toast.
-        await ctx.send(f"Used {item_name}: {damage} dmg.")
+        if battle.queued(username, item_name) >= player.items.count(item_name):
+            await ctx.send(f"Your {item_name} is already queued.")
+            return
+
+        # Resolved (and spent) by the engine at the next batch point, with
+        # everyone else's presses, in one log block and one state push.
+        battle.queue_action(BattleAction(battle_engine.USE_ITEM, username, item_name))
+        await ctx.send(f"{item_name} queued — fires at the next action window.")
 
     @commands.command(name='bossbattle')
-    async def bossbattle(self, ctx):
+    async def bossbattle(self, ctx, arena_id: str = None):
+        """Start a boss battle in `arena_id`, or in the first free arena."""
+        arena = None
         try:
-            if self.ongoing_battle:
-                await ctx.send("A boss battle is already in progress!")
-                return
-
-            current_time = datetime.now()
-            if current_time - self.last_battle_time < self.boss_battle_cooldown:
-                time_left = self.boss_battle_cooldown - (current_time - self.last_battle_time)
-                minutes_left = int(time_left.total_seconds() / 60)
-                await ctx.send(f"Please wait {minutes_left} minutes before starting another boss battle!")
-                return
-
             boss_player = self.player_data.get('b7h30')
             if not boss_player:
                 await ctx.send("Error: Boss not registered.")
@@ -3523,12 +3024,14 @@ class Bot(commands.Bot):
             # Boss always starts at full BOSS_MAX_HEALTH — its HP is a property
             # of the fight, never derived from the b7h30 player record (which is
             # an ordinary 50-HP player and used to cap the boss at 50).
-            self.ongoing_battle = BossBattle(boss_name='b7h30')
-            self.last_battle_time = current_time
+            arena, reason = self.arenas.start(arena_id, boss_name='b7h30')
+            if arena is None:
+                await ctx.send(reason)
+                return
 
             # Immediate state push so the / player console + /twitchack popup react
             # right now, instead of waiting 30s for the join phase to end.
-            await overlay.push(**self._ov_state())
+            await self._push_battle(arena)
 
             # Always broadcast battle messages to actual Twitch chat regardless of
             # whether !bossbattle came from chat or the /web Start button. (WebCtx
@@ -3536,285 +3039,186 @@ class Bot(commands.Bot):
             chat_ctx = _ChannelCtx(self, ctx.author.name)
             await self.send_clamped(
                 chat_ctx,
-                f"⚔️ BOSS BATTLE INITIATED! ⚔️\n"
-                f"💀 Boss: 1337haxxor Theo (HP: {self.ongoing_battle.boss_health})\n"
-                f"👥 Tap JOIN at bossbattle.b7h30.com — 30 seconds to enlist!\n"
-                f"💪 Max 5 members | Smaller teams get bigger rewards!\n"
+                f"⚔️ BOSS BATTLE INITIATED — ARENA {arena.id}! ⚔️\n"
+                f"💀 Boss: 1337haxxor Theo (HP: {arena.battle.boss_health})\n"
+                f"👥 Tap JOIN at bossbattle.b7h30.com or !joinbattle {arena.id} — 30 seconds to enlist!\n"
+                f"💪 Max {self.arenas.team_cap} members | Smaller teams get bigger rewards!\n"
                 f"⚔️ Survivors get points and +5 permanent max HP!"
             )
 
             # Quick toast for the web caller (chat caller would see this redundantly
             # since their ctx is also the channel — only respond to web callers).
             if isinstance(ctx, WebCtx):
-                await ctx.send("Boss battle started — gather the team!")
+                await ctx.send(f"Boss battle started in arena {arena.id} — gather the team!")
 
             # Run the join wait + actual battle in the background so this handler
             # returns immediately. Web HTTP timeout is 5s; the join phase alone
             # takes 30s so a synchronous await here always times out the toast.
-            asyncio.create_task(self._run_bossbattle_after_init(chat_ctx))
+            asyncio.create_task(self._run_bossbattle_after_init(arena, chat_ctx))
 
         except Exception as e:
             print(f"Error in bossbattle: {str(e)}")
             await ctx.send("An error occurred while starting the boss battle.")
-            self.ongoing_battle = None
+            if arena is not None:
+                self.arenas.close(arena.id)
 
-    async def _run_bossbattle_after_init(self, chat_ctx):
+    async def _run_bossbattle_after_init(self, arena, chat_ctx):
         """Background half of !bossbattle: wait out the join window, then run
         the battle. Split out so the caller can return immediately and the web
         HTTP request doesn't hit its 5s timeout while we're sleeping."""
         try:
             await asyncio.sleep(30)
 
-            if not self.ongoing_battle:
+            battle = arena.battle
+            if not battle:
                 return
 
-            self.ongoing_battle.join_phase = False
+            battle.join_phase = False
             # Push the join_phase=False transition so the GUI swaps Join → Hack/Burner.
-            await overlay.push(**self._ov_state())
+            await self._push_battle(arena)
 
-            if not self.ongoing_battle.challenger_team:
-                await chat_ctx.send("No challengers joined! Battle cancelled.")
-                self.ongoing_battle = None
-                await overlay.clear()
+            if not battle.challenger_team:
+                await chat_ctx.send(f"No challengers joined arena {arena.id}! Battle cancelled.")
+                self.arenas.close(arena.id)
+                await overlay.clear(arena.id)
                 # Re-push so the player console knows cooldown_until and active=false.
-                await overlay.push(**self._ov_state())
+                await self._push_battle(arena)
                 return
 
             # Team roster is visible in the spectator overlay; no chat message needed.
-            team_members = ", ".join(self.ongoing_battle.challenger_team.keys())
-            await overlay.log(f"Join phase ended — Team: {team_members}", "info")
-            await self.run_team_battle(chat_ctx)
+            team_members = ", ".join(battle.challenger_team.keys())
+            await overlay.log(f"Join phase ended — Team: {team_members}", "info", arena.id)
+            await self.run_team_battle(arena, chat_ctx)
 
         except Exception as e:
             print(f"Error in _run_bossbattle_after_init: {e}")
-            self.ongoing_battle = None
+            self.arenas.close(arena.id)
             try:
-                await overlay.clear()
+                await overlay.clear(arena.id)
             except Exception:
                 pass
 
-    async def run_team_battle(self, ctx):
+    # Battle presenter: seconds to hold after each engine event, and which
+    # events re-push battle state to the overlay. The pacing is the live
+    # show; the engine itself never sleeps.
+    BATTLE_PACING = {
+        battle_engine.TURN: 1, battle_engine.SKIP: 0.5, battle_engine.TAUNT: 0.5,
+        battle_engine.BOSS_ATTACK: 1, battle_engine.DODGE: 0.5, battle_engine.SAVE: 0.5,
+        battle_engine.DEATH: 0.5, battle_engine.HIT: 0.5, battle_engine.TEAM_PHASE: 1,
+        battle_engine.TEAM_ATTACK: 0.5, battle_engine.CRACKER: 0.5, battle_engine.BOSS_HP: 2,
+        battle_engine.ACTIONS: 1,
+    }
+    BATTLE_PUSH = {battle_engine.TURN, battle_engine.SAVE, battle_engine.DEATH,
+                   battle_engine.HIT, battle_engine.BOSS_HP}
+
+    async def _present_battle(self, arena, events):
+        """Play engine events onto the arena's overlay (and chat, for KOs) at
+        live pace. An action batch goes out as one log block and one push."""
+        if events and events[0].kind == battle_engine.ACTIONS:
+            await overlay.log_batch([(ev.text, ev.style) for ev in events], arena.id)
+            await self._push_battle(arena)
+            await asyncio.sleep(self.BATTLE_PACING[battle_engine.ACTIONS])
+            return
+        for ev in events:
+            await overlay.log(ev.text, ev.style, arena.id)
+            if ev.kind == battle_engine.DEATH:
+                # Stream-worthy KO moment — broadcast a short version to chat.
+                # (Taunt stays GUI-only to keep chat from spamming.)
+                self.say(f"☠️ @{ev.target} has fallen!")
+            if ev.kind in self.BATTLE_PUSH:
+                await self._push_battle(arena)
+            pause = self.BATTLE_PACING.get(ev.kind)
+            if pause:
+                await asyncio.sleep(pause)
+
+    def _spend_battle_item(self, username, item_name):
+        """BattleEngine `consume` hook: spend one copy as the use resolves."""
+        player = self.player_data.get(username)
+        return player is not None and player.remove_item(item_name) is not None
+
+    async def run_team_battle(self, arena, ctx):
         try:
-            battle = self.ongoing_battle
+            battle = arena.battle
             if not battle:
                 await ctx.send("No active battle found!")
                 return
-                
-            turn = 0
-            max_turns = 15
 
             # Push initial battle state to overlay
-            await overlay.push(**self._ov_state())
+            await self._push_battle(arena)
             await overlay.log(
                 f"⚔️ RAID BEGINS — {battle.boss_name} vs {len(battle.challenger_team)} challengers!",
-                "info"
+                "info", arena.id
             )
 
-            while battle.boss_health > 0 and battle.challenger_team and turn < max_turns:
-                turn += 1
-                await overlay.log(f"⚔️ Turn {turn} ⚔️", "info")
-                await overlay.push(**self._ov_state())
-                await asyncio.sleep(1)
-
-                # Round 2: item-triggered skip (YubiKey / NES / Shodan procs).
-                if battle.skip_boss_turns > 0:
-                    battle.skip_boss_turns -= 1
-                    await overlay.log(f"⏭️ {battle.boss_name}'s turn skipped — too dazed to attack.", "buff")
-                    await asyncio.sleep(0.5)
+            # The engine resolves each phase; _present_battle paces it. Item
+            # uses and !hack queue up while we sleep and resolve as a batch
+            # before the boss acts and before the team attacks.
+            engine = BattleEngine(battle, self.item_index, consume=self._spend_battle_item,
+                                  emojis=self.item_emojis)
+            while not engine.over:
+                await self._present_battle(arena, engine.begin_turn())
+                await self._present_battle(arena, engine.action_phase())
+                if engine.victory:
+                    break
+                boss = engine.boss_phase()
+                await self._present_battle(arena, boss)
+                if boss[-1].kind in (battle_engine.SKIP, battle_engine.WIPE):
                     continue
-
-                # Boss turn taunt (50% chance)
-                if random.random() < 0.5:
-                    taunt_text = random.choice(TURN_TAUNTS)
-                    taunt_msg = f"💀 {battle.boss_name}: {taunt_text}"
-                    await overlay.log(taunt_msg, "taunt")
-                    await asyncio.sleep(0.5)
-
-                # Raspberry Pi: 25% chance to short-circuit boss attack this turn
-                pi_holders = [p for p in battle.challenger_team
-                              if "Elliot Alderson's Raspberry Pi" in self.player_data[p].items]
-                if pi_holders and random.random() < 0.25:
-                    pi_msg = (
-                        f"🫐 @{random.choice(pi_holders)}'s Raspberry Pi runs interference — "
-                        f"boss attack short-circuited this turn!"
-                    )
-                    await overlay.log(pi_msg, "pi")
-                else:
-                    # Boss targets one random player — honor any Wireshark-revealed target.
-                    if battle.next_boss_target and battle.next_boss_target in battle.challenger_team:
-                        target = battle.next_boss_target
-                    else:
-                        target = random.choice(list(battle.challenger_team.keys()))
-                    battle.next_boss_target = None
-                    # Round 3 — base damage roll widened from (10,30) to (15,40)
-                    # to compensate for Round 2's team damage buffs.
-                    # Use Nmap-revealed damage if pre-rolled, otherwise standard roll.
-                    if battle.next_boss_damage is not None:
-                        damage = battle.next_boss_damage
-                        battle.next_boss_damage = None
-                    else:
-                        damage = random.randint(15, 40)
-                    # Round 3 — soft enrage when boss drops below 25% HP: +25% damage.
-                    # Lets the boss get a few "I'm not done yet" moments before dying.
-                    if battle.boss_health > 0 and battle.boss_health < battle.boss_max_health * 0.25:
-                        damage = int(damage * 1.25)
-                    # O.MG Cable weakness debuff applies to THIS turn's attack, then resets.
-                    if battle.weakness_next_turn > 0:
-                        damage = max(0, damage - battle.weakness_next_turn)
-                        battle.weakness_next_turn = 0
-                    boss_action = random.choice([
-                        f"launches a targeted DDoS at @{target}!",
-                        f"deploys ransomware on @{target}'s rig!",
-                        f"executes a supply chain attack against @{target}!",
-                        f"activates defenses specifically against @{target}!",
-                        f"sets rgb to red and locks eyes on @{target}!",
-                        f"sends 'AngyTheo' emote directly at @{target}!",
-                    ])
-                    boss_msg = f"🔥 {battle.boss_name} {boss_action}"
-                    await overlay.log(boss_msg, "damage")
-                    await asyncio.sleep(1)
-
-                    target_player = self.player_data.get(target)
-
-                    # Lambo Keys: 35% dodge chance when targeted
-                    if (target_player and
-                            "Heath Adams' Lambo Keys" in target_player.items and
-                            random.random() < 0.35):
-                        dodge_msg = f"🏎️ @{target} floors it in the Lambo — attack missed!"
-                        await overlay.log(dodge_msg, "dodge")
-                    else:
-                        health = battle.challenger_team[target]
-                        new_health = max(0, health - damage)
-
-                        if new_health <= 0:
-                            # Consciousness USB: one-time death save per player per battle
-                            if (target_player and
-                                    "John Hammond's Consciousness USB" in target_player.items and
-                                    target not in battle.consciousness_used):
-                                battle.consciousness_used.add(target)
-                                battle.challenger_team[target] = 1
-                                save_msg = (
-                                    f"🧠 @{target}'s Consciousness USB kicks in — "
-                                    f"mind transferred to backup! Survives at 1 HP!"
-                                )
-                                await overlay.log(save_msg, "save")
-                                await overlay.push(**self._ov_state())
-                            else:
-                                death_taunt = random.choice(DEATH_TAUNTS)
-                                death_msg = f"☠️ @{target} has fallen! | 💀 {battle.boss_name}: {death_taunt}"
-                                await overlay.log(death_msg, "death")
-                                # Stream-worthy KO moment — broadcast a short version to chat.
-                                # (Taunt stays GUI-only to keep chat from spamming.)
-                                try:
-                                    await self.connected_channels[0].send(f"☠️ @{target} has fallen!")
-                                except Exception:
-                                    pass
-                                del battle.challenger_team[target]
-                                battle.fallen.append(target)
-                                await overlay.push(**self._ov_state())
-                        else:
-                            battle.challenger_team[target] = new_health
-                            dmg_msg = f"@{target} takes {damage} damage! ({new_health} HP remaining)"
-                            await overlay.log(dmg_msg, "damage")
-                            await overlay.push(**self._ov_state())
-                    await asyncio.sleep(0.5)
-
-                if not battle.challenger_team:
-                    wipe_msg = "All challengers have been defeated!"
-                    await overlay.log(wipe_msg, "defeat")
+                await self._present_battle(arena, engine.action_phase())
+                if engine.victory:
                     break
+                await self._present_battle(arena, engine.team_phase())
+            engine.discard_pending()
 
-                await overlay.log("🗡️ Team attack phase:", "info")
-                await asyncio.sleep(1)
-
-                # Team attack phase
-                total_damage = 0
-                for player_name in battle.challenger_team:
-                    player_damage = random.randint(5, 15)
-                    total_damage += player_damage
-                    battle.team_damage += player_damage
-                    battle.per_player_damage[player_name] = battle.per_player_damage.get(player_name, 0) + player_damage
-
-                    attack_action = random.choice([
-                        "executes a SQL injection",
-                        "deploys a zero-day exploit",
-                        "launches a social engineering attack",
-                        "attempts a buffer overflow",
-                        "distracts Theo by disparaging the Cleveland Browns"
-                    ])
-
-                    atk_msg = f"@{player_name} {attack_action} for {player_damage} damage!"
-                    await overlay.log(atk_msg, "team")
-                    await asyncio.sleep(0.5)
-
-                # Password Cracker: +15 bonus damage per holder
-                crackers = [p for p in battle.challenger_team
-                            if "Kevin Mitnick's Password Cracker" in self.player_data[p].items]
-                if crackers:
-                    crack_bonus = len(crackers) * 15
-                    total_damage += crack_bonus
-                    battle.team_damage += crack_bonus
-                    holder_str = ", ".join(f"@{p}" for p in crackers)
-                    crack_msg = (
-                        f"🔓 Password Cracker{'s' if len(crackers) > 1 else ''} "
-                        f"({holder_str}) — +{crack_bonus} bonus damage!"
-                    )
-                    await overlay.log(crack_msg, "cracker")
-                    await asyncio.sleep(0.5)
-
-                battle.boss_health = max(0, battle.boss_health - total_damage)
-                hp_msg = f"Boss HP: {battle.boss_health} | Team members remaining: {len(battle.challenger_team)}"
-                await overlay.log(hp_msg, "info")
-                await overlay.push(**self._ov_state())
-                await asyncio.sleep(2)
-
-            # Battle resolution
+            # Battle resolution. Payouts and penalties hold the participants'
+            # player locks (not a roster-wide one) so they can't interleave
+            # with those players' own commands; other arenas carry on.
             self.session_total_damage += battle.team_damage
+            participants = sorted(set(battle.challenger_team) | set(battle.fallen))
             if battle.boss_health <= 0:
                 self.session_battles["won"] += 1
                 self.session_battles["bosses"].append(battle.boss_name)
-                await overlay.push(**self._ov_state(result="victory"))
-                await overlay.log(f"🏆 VICTORY! {battle.boss_name} has been defeated!", "victory")
-                await self.reward_team(ctx)
+                await self._push_battle(arena, result="victory")
+                await overlay.log(f"🏆 VICTORY! {battle.boss_name} has been defeated!", "victory", arena.id)
+                async with self.player_locks.hold(*participants):
+                    await self.reward_team(arena, ctx)
                 await asyncio.sleep(30)
-                await overlay.clear()
+                await overlay.clear(arena.id)
             else:
                 self.session_battles["lost"] += 1
-                # Loss penalty — everyone who joined exits at 1 HP. World regen
-                # then owns the recovery curve and gates the next attempt via
-                # the 50% entry floor.
-                losers = list(set(battle.challenger_team.keys()) | set(battle.fallen))
-                for username in losers:
-                    if username in self.player_data:
-                        self.player_data[username].health = 1
-                helpers.save_player_data(self.player_data)
-                await overlay.push(**self._ov_state(result="defeat"))
-                await overlay.log("☠ DEFEAT — all challengers have fallen.", "defeat")
-                await self.battle_summary(ctx, victory=False)
-                # Round 2 — item-effect bonus pts (e.g. Golden Cassette Tape) still pay on defeat.
-                await self._grant_bonus_points(battle)
+                async with self.player_locks.hold(*participants):
+                    # Loss penalty — everyone who joined exits at 1 HP. World regen
+                    # then owns the recovery curve and gates the next attempt via
+                    # the 50% entry floor.
+                    for username in participants:
+                        if username in self.player_data:
+                            self.player_data[username].health = 1
+                    helpers.save_player_data(self.player_data)
+                    await self._push_battle(arena, result="defeat")
+                    await overlay.log("☠ DEFEAT — all challengers have fallen.", "defeat", arena.id)
+                    await self.battle_summary(arena, ctx, victory=False)
+                    # Round 2 — item-effect bonus pts (e.g. Golden Cassette Tape) still pay on defeat.
+                    await self._grant_bonus_points(arena, battle)
                 # Defeat broadcast — short, points back to the GUI for a rematch.
-                try:
-                    await self.connected_channels[0].send(
-                        f"💀 {battle.boss_name} survived — no winners this round. "
-                        f"Challenge him at bossbattle.b7h30.com"
-                    )
-                except Exception:
-                    pass
+                self.say(
+                    f"💀 {battle.boss_name} survived — no winners this round. "
+                    f"Challenge him at bossbattle.b7h30.com"
+                )
                 await asyncio.sleep(20)
-                await overlay.clear()
+                await overlay.clear(arena.id)
             
         except Exception as e:
             await ctx.send(f"An error occurred during battle: {str(e)}")
         finally:
-            self.ongoing_battle = None
+            self.arenas.close(arena.id)
             helpers.save_player_data(self.player_data)
 
     @commands.command(name='joinbattle')
-    async def joinbattle(self, ctx):
+    async def joinbattle(self, ctx, arena_id: str = None):
+        """Join the battle in `arena_id`, or the first arena still enlisting."""
         username = ctx.author.name.lower()
-        
-        if not self.ongoing_battle or not self.ongoing_battle.join_phase:
+
+        if not any(a.battle and a.battle.join_phase for a in self.arenas):
             await ctx.send("No battle to join right now!")
             return
             
@@ -3822,10 +3226,6 @@ class Bot(commands.Bot):
             await ctx.send("The boss cannot join the challenger team!")
             return
 
-        if len(self.ongoing_battle.challenger_team) >= 5:
-            await ctx.send("The team is full!")
-            return
-
         if username not in self.player_data:
             await ctx.send(f"@{ctx.author.name}, sign in at bossbattle.b7h30.com/twitchack to play.")
             return
@@ -3844,20 +3244,28 @@ class Bot(commands.Bot):
             )
             return
 
-        self.ongoing_battle.challenger_team[username] = player.health
+        # One arena per player, held until that arena's battle closes.
+        arena, reason = self.arenas.join(username, arena_id)
+        if arena is None:
+            await ctx.send(reason)
+            return
+        battle = arena.battle
+
+        battle.challenger_team[username] = player.health
         # True max (not join-time HP) so the overlay shows wounded entry as
         # a partial-fill bar rather than a deceptively full one.
-        self.ongoing_battle.player_max_health[username] = player.max_health
-        join_msg = f"@{ctx.author.name} has joined the raid! ({len(self.ongoing_battle.challenger_team)}/5 members)"
+        battle.player_max_health[username] = player.max_health
+        join_msg = (f"@{ctx.author.name} has joined the arena {arena.id} raid! "
+                    f"({len(battle.challenger_team)}/{self.arenas.team_cap} members)")
         # GUI feed + spectator overlay only — chat stays quiet during the raid.
-        await overlay.log(join_msg, "info")
-        await overlay.push(**self._ov_state())
+        await overlay.log(join_msg, "info", arena.id)
+        await self._push_battle(arena)
         taunt = random.choice(JOIN_TAUNTS).format(username=ctx.author.name, level=player.level)
-        taunt_msg = f"💀 {self.ongoing_battle.boss_name}: {taunt}"
-        await overlay.log(taunt_msg, "taunt")
+        taunt_msg = f"💀 {battle.boss_name}: {taunt}"
+        await overlay.log(taunt_msg, "taunt", arena.id)
 
-    async def battle_summary(self, ctx, victory: bool):
-        battle = self.ongoing_battle
+    async def battle_summary(self, arena, ctx, victory: bool):
+        battle = arena.battle
         if not battle:
             return
         survivors = list(battle.challenger_team.keys())
@@ -3878,25 +3286,19 @@ class Bot(commands.Bot):
         # Spectator overlay's result panel already shows survivors/fallen/MVP/damage.
         # reward_team broadcasts the winner-focused chat message on victory; on
         # defeat, the run_team_battle defeat path posts a short chat note.
-        await overlay.log(summary, "victory" if victory else "defeat")
+        await overlay.log(summary, "victory" if victory else "defeat", arena.id)
 
-    async def reward_team(self, ctx):
+    async def reward_team(self, arena, ctx):
         try:
-            battle = self.ongoing_battle
+            battle = arena.battle
             if not battle:
                 return
 
-            # Round 3 — rewards roughly 2× their Round 1 values. Boss is harder
-            # now (Round 3 HP/dmg buff) so the team's effort warrants more.
-            base_reward = 400                                                # was 200
-            team_size_bonus = min((5 - len(battle.challenger_team)) * 100, 400)  # was * 50, cap 200
-            damage_bonus = min(battle.team_damage // 25, 200)                # was // 50, cap 100
-
-            total_reward = base_reward + team_size_bonus + damage_bonus
-
-            # Round 3 — treasury bounty. Scales with team damage so big fights
-            # fund big bail-payouts. Multiplier is the single tuning knob here.
-            treasury_bounty = int(battle.team_damage * 1.5)
+            # Round 3 reward and treasury-bounty formulas live with the engine
+            # (game/battle.py) so the balance simulator pays out identically.
+            total_reward = battle_engine.victory_reward(len(battle.challenger_team),
+                                                        battle.team_damage)
+            treasury_bounty = battle_engine.treasury_bounty(battle.team_damage)
             new_treasury = 0
             if treasury_bounty > 0:
                 try:
@@ -3906,7 +3308,7 @@ class Bot(commands.Bot):
                     print(f"Error crediting treasury bounty: {e}")
                     new_treasury = jail.get_treasury_balance()
 
-            await self.battle_summary(ctx, victory=True)
+            await self.battle_summary(arena, ctx, victory=True)
 
             survivor_names = list(battle.challenger_team.keys())
             for username in survivor_names:
@@ -3914,11 +3316,11 @@ class Bot(commands.Bot):
                     continue
 
                 player = self.player_data[username]
-                player.points += total_reward
+                ledger.apply(player, ledger.BATTLE_REWARD, points=total_reward)
                 self.session_points_earned[username] = self.session_points_earned.get(username, 0) + total_reward
                 helpers.check_level_up(self.player_data, username)
                 # Per-player reward goes to the GUI player card / feed, not chat.
-                await overlay.log(f"@{username} earned {total_reward} points and +5 max HP!", "reward")
+                await overlay.log(f"@{username} earned {total_reward} points and +5 max HP!", "reward", arena.id)
 
             # Victory heals the whole team — survivors AND fallen. The +5 max
             # bump goes to every participant (it was always a per-fight reward
@@ -3934,7 +3336,7 @@ class Bot(commands.Bot):
 
             # Round 2 — Golden Cassette Tape (and any other bonus_points effects)
             # grant their pts to participants regardless of survival outcome.
-            await self._grant_bonus_points(battle)
+            await self._grant_bonus_points(arena, battle)
 
             # The one winner-focused chat broadcast — name the survivors and
             # call out the treasury bounty (Round 3) so chat sees the inflow.
@@ -3943,29 +3345,19 @@ class Bot(commands.Bot):
                 f" Treasury +{treasury_bounty} cash (balance: {new_treasury})."
                 if treasury_bounty > 0 else ""
             )
-            try:
-                await self.connected_channels[0].send(
-                    f"🏆 VICTORY! {survivors_str} defeated {battle.boss_name} "
-                    f"— each earned {total_reward} pts.{bounty_part} "
-                    f"Replay or rematch at bossbattle.b7h30.com"
-                )
-            except Exception:
-                pass
+            self.say(
+                f"🏆 VICTORY! {survivors_str} defeated {battle.boss_name} "
+                f"— each earned {total_reward} pts.{bounty_part} "
+                f"Replay or rematch at bossbattle.b7h30.com"
+            )
 
             # Victory drop — added to the drops list so the /twitchack drops widget
             # surfaces it. No chat broadcast: drops live in the GUI now.
-            self.prune_expired_drops()
             drop_item = random.choice(BATTLE_DROPS)
-            existing_names = {d['name'].lower() for d in self.dropped_items}
-            if drop_item.lower() not in existing_names:
-                self.dropped_items.append({
-                    'name': drop_item,
-                    'location': 'the arena',
-                    'ts': datetime.now().timestamp()
-                })
+            if await self._spawn_world_drop(drop_item, 'the arena'):
                 await overlay.log(
                     f"🏆 VICTORY DROP — {self.format_item(drop_item)} dropped in the arena.",
-                    "drop"
+                    "drop", arena.id
                 )
 
         except Exception as e:
@@ -4065,40 +3457,30 @@ class Bot(commands.Bot):
     async def execute_web_command(self, username, command, args=''):
         """Execute a TwitcHack game command submitted from the web interface.
 
-        Looks up commands in twitchio's registry (`self.commands`) and forwards
-        `args` into the first non-(self/ctx) parameter via signature introspection.
-        Bypasses TwitchIO's Command dispatcher, which requires a real Context
-        with a .view attribute.
+        Dispatches through the precompiled table (`self._web_dispatch`, built
+        from twitchio's registry plus _WEB_ONLY_HANDLERS): one lookup, then the
+        route's binder forwards `args` into the command's first non-(self/ctx)
+        parameter. Bypasses TwitchIO's Command dispatcher, which requires a real
+        Context with a .view attribute.
         """
         ctx = WebCtx(username)
         cmd = command.lower().strip()
         args = (args or '').strip()
 
         try:
-            web_only = self._WEB_ONLY_HANDLERS.get(cmd)
-            if web_only is not None:
-                await web_only(self, ctx, args)
+            route = self._web_dispatch.get(cmd)
+            if route is None:
+                await ctx.send(f'Unknown command: {command}')
                 return ctx.result()
 
-            cmd_obj = self.commands.get(cmd)
-            if cmd_obj is None:
-                await ctx.send(f'Unknown command: {command}')
+            kwargs = route.bind(args)
+            if kwargs is None:
+                await ctx.send(route.usage)
                 return ctx.result()
 
-            # Skip the leading (self/cog, ctx) parameters; the next one (if any)
-            # receives the web `args` string.
-            params = list(inspect.signature(cmd_obj._callback).parameters.values())[2:]
-            kwargs = {}
-            if params:
-                first = params[0]
-                if args:
-                    kwargs[first.name] = args
-                elif first.default is inspect.Parameter.empty:
-                    await ctx.send(f'Usage: !{cmd} <{first.name}>')
-                    return ctx.result()
-
-            instance = cmd_obj._instance if cmd_obj._instance is not None else self
-            await cmd_obj._callback(instance, ctx, **kwargs)
+            involved = player_locks.involved_players(cmd, username, args)
+            async with self.player_locks.hold(*involved):
+                await route.handler(ctx, **kwargs)
         except Exception as e:
             helpers.log_to_file(f'[web_cmd] Error executing {command} for {username}: {e}')
             await ctx.send('An error occurred processing your command.')
@@ -4116,6 +3498,7 @@ class Bot(commands.Bot):
         app = aiohttp_web.Application()
         app.router.add_post('/command', self._internal_api_handler)
         app.router.add_post('/resync', self._internal_resync_handler)
+        app.router.add_get('/complete', self._internal_complete_handler)
         runner = aiohttp_web.AppRunner(app)
         await runner.setup()
         site = aiohttp_web.TCPSite(runner, host, port)
@@ -4124,8 +3507,8 @@ class Bot(commands.Bot):
 
     async def _reseed_overlay(self):
         """Push the full current game state to the overlay: clear its caches,
-        re-push every registered player, the treasury balance, and the
-        idle-hacking catalogs.
+        re-push every registered player, live drops, the treasury balance,
+        the idle-hacking catalogs and the leaderboards.
 
         The overlay keeps all of this in memory only, so it is lost whenever the
         overlay process restarts. This is the single source of that seed — called
@@ -4138,11 +3521,22 @@ class Bot(commands.Bot):
         # full roster immediately, instead of only players who act next.
         for _name, _p in list(self.player_data.items()):
             await game_overlay.player(_name, _p)
+        # Drops still waiting to be grabbed, so the Grab bar survives a restart.
+        for drop in self.drops:
+            await game_overlay.drop(drop.name, drop.location)
         # Treasury balance so the widget shows the real number on first paint.
         await game_overlay.treasury(jail.get_treasury_balance())
         # Catalogs so the GUI renders buy/run buttons from the live source of
         # truth (add hardware/hacks → buttons appear).
         await self._push_idle_catalog()
+        # Every leaderboard's current top-N (the ticker only pushes changes).
+        for board in rankings.BOARDS:
+            await game_overlay.leaderboard(board, self.leaderboards[board].top())
+        # Every arena's battle state (idle ones too) so the arena switcher
+        # lists them all and a live battle survives an overlay restart.
+        for arena in self.arenas:
+            overlay.resend(arena.id)
+            await self._push_battle(arena)
 
     async def _internal_resync_handler(self, request):
         """Handle POST /resync from the overlay. The overlay calls this on its
@@ -4162,6 +3556,19 @@ class Bot(commands.Bot):
                 status=500
             )
 
+    async def _internal_complete_handler(self, request):
+        """Handle GET /complete?prefix=<p>&limit=<n> from the overlay: the
+        registered usernames starting with the prefix, for GUI target pickers."""
+        try:
+            limit = max(1, min(25, int(request.query.get('limit', 10))))
+        except ValueError:
+            limit = 10
+        matches = self.usernames.complete(request.query.get('prefix', ''), limit)
+        return aiohttp_web.Response(
+            text=json.dumps({'ok': True, 'matches': matches}),
+            content_type='application/json'
+        )
+
     async def _internal_api_handler(self, request):
         """Handle POST /command from the Flask overlay server."""
         try:
@@ -4186,5 +3593,9 @@ class Bot(commands.Bot):
 
 # Entry point
 if __name__ == '__main__':
+    def _stop(*_):
+        # bot.run() only closes cleanly on KeyboardInterrupt.
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, _stop)
     bot = Bot()
     bot.run()
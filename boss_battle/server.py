@@ -16,7 +16,7 @@ import requests as http_req
 from urllib.parse import urlencode
 
 from flask import Flask, render_template, request, jsonify, redirect, session, send_from_directory
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, join_room, leave_room
 
 from cf_access import CFAccessVerifier
 
@@ -99,6 +99,8 @@ BOT_API              = os.environ.get('BOT_API', 'http://localhost:3004/command'
 # our own startup we ask the bot (the source of truth) to re-push everything.
 # Derive the resync URL from BOT_API so both always point at the same bot.
 BOT_RESYNC_URL       = BOT_API.rsplit('/', 1)[0] + '/resync'
+# Username autocomplete for the GUI target pickers (bot keeps the index).
+BOT_COMPLETE_URL     = BOT_API.rsplit('/', 1)[0] + '/complete'
 
 # ---------------------------------------------------------------------------
 # Boss battle state
@@ -107,23 +109,72 @@ BOT_RESYNC_URL       = BOT_API.rsplit('/', 1)[0] + '/resync'
 state_lock = threading.Lock()
 MAX_LOG = 60
 
-state = {
-    "active": False,
-    "boss_name": "",
-    "boss_health": 0,
-    "boss_max_health": 0,
-    "players": {},   # {username: {health, max_health, items: [], alive: bool}}
-    "log": [],       # [{msg, type}] — newest first
-    "result": None,  # None | "victory" | "defeat"
-    "join_phase": False,
-    "hack_used": [],          # list of usernames who've used their !hack nuke this battle
-    "cooldown_until": 0,      # epoch ms; bossbattle Start button enables once Date.now() > this
-}
+# One battle state per bot arena (game/arenas.py). Spectators sit in the
+# socket room of the arena they picked; arena "1" is the default. Only the
+# bot's full /api/push creates an arena (it pushes every arena its
+# ArenaManager runs on startup and /resync), so a client naming some other
+# id can't conjure one up.
+DEFAULT_ARENA = "1"
+_ARENA_ID_RE = re.compile(r"\d{1,2}")
+
+
+def _new_arena_state():
+    return {
+        "active": False,
+        "boss_name": "",
+        "boss_health": 0,
+        "boss_max_health": 0,
+        "players": {},   # {username: {health, max_health, items: [], alive: bool}}
+        "log": [],       # [{msg, type}] — newest first
+        "result": None,  # None | "victory" | "defeat"
+        "join_phase": False,
+        "hack_used": [],          # list of usernames who've used their !hack nuke this battle
+        "cooldown_until": 0,      # epoch ms; bossbattle Start button enables once Date.now() > this
+        "version": 0,             # bumped by every bot push/patch; clients patch against it
+    }
+
+
+arenas = {DEFAULT_ARENA: _new_arena_state()}
+_sid_arena = {}   # {sid: arena id} — which arena room each socket is in
+
+BATTLE_FIELDS = ("active", "boss_name", "boss_health", "boss_max_health",
+                 "players", "result", "join_phase", "hack_used", "cooldown_until")
+
+
+def _known_arena(value):
+    """The arena id if the bot has pushed that arena, else None."""
+    value = str(value or "").strip()
+    return value if value in arenas else None
+
+
+def _arena_id(value):
+    """A client-supplied arena id: a known arena, else the default."""
+    return _known_arena(value) or DEFAULT_ARENA
+
+
+def _arena(arena_id):
+    """The arena's state dict. Call under state_lock; only api_push may pass
+    an id that doesn't exist yet (it creates the arena)."""
+    return arenas.setdefault(arena_id, _new_arena_state())
+
 
+def _room(arena_id):
+    return f"arena:{arena_id}"
 
-def _snapshot():
+
+def _arena_list():
+    """[{id, active, join_phase, team}] for the arena switcher. Call under state_lock."""
+    return [{"id": k, "active": a["active"], "join_phase": a["join_phase"],
+             "team": len(a["players"])}
+            for k, a in sorted(arenas.items(), key=lambda kv: int(kv[0]))]
+
+
+def _snapshot(arena_id=DEFAULT_ARENA):
     with state_lock:
+        state = _arena(arena_id)
         return {
+            "arena": arena_id,
+            "arenas": _arena_list(),
             "active": state["active"],
             "boss_name": state["boss_name"],
             "boss_health": state["boss_health"],
@@ -134,9 +185,17 @@ def _snapshot():
             "join_phase": state["join_phase"],
             "hack_used": list(state["hack_used"]),
             "cooldown_until": state["cooldown_until"],
+            "version": state["version"],
         }
 
 
+def _emit_arenas():
+    """Tell every page which arenas are live (switcher + boss alert)."""
+    with state_lock:
+        listing = _arena_list()
+    socketio.emit("arenas_update", listing)
+
+
 # ---------------------------------------------------------------------------
 # Game (TwitcHack) state
 # ---------------------------------------------------------------------------
@@ -153,6 +212,8 @@ game = {
     # buy/run buttons from the real source of truth (game/hardware.py,
     # game/hacks.py) — add hardware/hacks there and the buttons appear here.
     "catalog": {"hardware": [], "hacks": [], "items": []},
+    # Bot-pushed leaderboard top-N per board: {board: [{username, score}]}.
+    "leaderboards": {},
 }
 
 # SID → username for authenticated socket connections
@@ -167,6 +228,7 @@ def _game_snapshot():
             "drops":    list(game["drops"]),
             "treasury": int(game.get("treasury", 0)),
             "catalog":  dict(game.get("catalog", {})),
+            "leaderboards": dict(game.get("leaderboards", {})),
         }
 
 
@@ -520,59 +582,137 @@ def api_me():
     })
 
 
+@app.route("/api/game/complete")
+def api_complete():
+    """Autocomplete registered usernames for the GUI target pickers
+    (steal/bail/status). Proxies to the bot's sorted username index."""
+    if not session.get('twitch_username'):
+        return jsonify({'matches': []})
+    prefix = (request.args.get('prefix') or '').strip()
+    if not prefix:
+        return jsonify({'matches': []})
+    try:
+        resp = http_req.get(BOT_COMPLETE_URL,
+                            params={'prefix': prefix, 'limit': request.args.get('limit', 10)},
+                            timeout=2)
+        matches = resp.json().get('matches', [])
+    except Exception:
+        matches = []
+    return jsonify({'matches': matches})
+
+
 # ── Boss battle endpoints ────────────────────────────────────────────────────
 
 @app.route("/api/push", methods=["POST"])
 def api_push():
-    """Bot pushes full battle state snapshot here."""
+    """Bot pushes an arena's full battle state snapshot here. The first push
+    for an arena creates it."""
     data = request.get_json(force=True, silent=True) or {}
+    arena_id = str(data.get("arena") or DEFAULT_ARENA).strip()
+    if not _ARENA_ID_RE.fullmatch(arena_id):
+        return jsonify({"ok": False, "error": "bad arena id"}), 400
     with state_lock:
-        for key in ("active", "boss_name", "boss_health", "boss_max_health",
-                    "players", "result", "join_phase", "hack_used", "cooldown_until"):
+        state = _arena(arena_id)
+        for key in BATTLE_FIELDS:
             if key in data:
                 state[key] = data[key]
-    socketio.emit("state_update", _snapshot())
+        state["version"] = data.get("version", state["version"] + 1)
+    socketio.emit("state_update", _snapshot(arena_id), to=_room(arena_id))
+    _emit_arenas()
+    return jsonify({"ok": True})
+
+
+@app.route("/api/patch", methods=["POST"])
+def api_patch():
+    """Bot pushes the fields that changed since version `base` (see
+    integrations/battle_state.py). A version gap answers 409 so the bot
+    falls back to a full /api/push. So does a patch for an arena this server
+    hasn't been pushed yet. The arena's spectators get the patch as-is."""
+    data = request.get_json(force=True, silent=True) or {}
+    arena_id = _known_arena(data.get("arena") or DEFAULT_ARENA)
+    if arena_id is None:
+        return jsonify({"ok": False, "version": None}), 409
+    with state_lock:
+        state = _arena(arena_id)
+        if data.get("base") != state["version"]:
+            return jsonify({"ok": False, "version": state["version"]}), 409
+        for key, value in (data.get("set") or {}).items():
+            if key in BATTLE_FIELDS:
+                state[key] = value
+        if data.get("players"):
+            players = dict(state["players"])
+            for name, fields in data["players"].items():
+                if fields is None:
+                    players.pop(name, None)
+                else:
+                    players[name] = {**players.get(name, {}), **fields}
+            state["players"] = players
+        state["version"] = data["v"]
+    socketio.emit("state_patch", {k: data[k] for k in ("v", "base", "set", "players") if k in data},
+                  to=_room(arena_id))
+    changed = data.get("set") or {}
+    if "active" in changed or "join_phase" in changed or data.get("players"):
+        _emit_arenas()
     return jsonify({"ok": True})
 
 
 @app.route("/api/log", methods=["POST"])
 def api_log():
-    """Bot appends a single combat log entry; also fans out to TwitcHack feed."""
+    """Bot appends a combat log entry, or a block of them as `entries`
+    (one battle action batch); each also fans out to the TwitcHack feed.
+    Lines for an arena that was never pushed are dropped."""
     data = request.get_json(force=True, silent=True) or {}
-    msg = data.get("msg", "").strip()
-    entry_type = data.get("type", "info")
-    if msg:
-        with state_lock:
-            state["log"].insert(0, {"msg": msg, "type": entry_type})
-            if len(state["log"]) > MAX_LOG:
-                state["log"] = state["log"][:MAX_LOG]
-        socketio.emit("log_entry", {"msg": msg, "type": entry_type})
-
-        # Fan out to TwitcHack feed as a boss event
-        game_entry = {
-            "username": "",
-            "command": "boss battle",
-            "result": msg,
-            "type": "boss",
-            "ts": _time.time(),
-        }
-        with game_lock:
-            game["events"].insert(0, game_entry)
-            if len(game["events"]) > MAX_EVENTS:
-                game["events"] = game["events"][:MAX_EVENTS]
-        socketio.emit("game_event", game_entry)
-
+    arena_id = _known_arena(data.get("arena") or DEFAULT_ARENA)
+    if arena_id is None:
+        return jsonify({"ok": False, "error": "unknown arena"}), 404
+    entries = data.get("entries")
+    if not isinstance(entries, list):
+        entries = [data]
+    for entry in entries:
+        if isinstance(entry, dict):
+            _append_log(arena_id, str(entry.get("msg", "")).strip(), entry.get("type", "info"))
     return jsonify({"ok": True})
 
 
+def _append_log(arena_id, msg, entry_type):
+    if not msg:
+        return
+    with state_lock:
+        state = _arena(arena_id)
+        state["log"].insert(0, {"msg": msg, "type": entry_type})
+        if len(state["log"]) > MAX_LOG:
+            state["log"] = state["log"][:MAX_LOG]
+    socketio.emit("log_entry", {"msg": msg, "type": entry_type}, to=_room(arena_id))
+
+    # Fan out to TwitcHack feed as a boss event
+    game_entry = {
+        "username": "",
+        "command": "boss battle",
+        "result": msg,
+        "type": "boss",
+        "ts": _time.time(),
+    }
+    with game_lock:
+        game["events"].insert(0, game_entry)
+        if len(game["events"]) > MAX_EVENTS:
+            game["events"] = game["events"][:MAX_EVENTS]
+    socketio.emit("game_event", game_entry)
+
+
 @app.route("/api/clear", methods=["POST"])
 def api_clear():
     """Reset boss battle overlay to idle state.
 
     Preserves `cooldown_until` so the player overlay knows when the next battle
     can be started (the bot pushes the post-battle cooldown via the same field).
+    An arena that was never pushed has nothing to clear.
     """
+    data = request.get_json(force=True, silent=True) or {}
+    arena_id = _known_arena(data.get("arena") or DEFAULT_ARENA)
+    if arena_id is None:
+        return jsonify({"ok": False, "error": "unknown arena"}), 404
     with state_lock:
+        state = _arena(arena_id)
         state["active"] = False
         state["boss_name"] = ""
         state["boss_health"] = 0
@@ -582,7 +722,9 @@ def api_clear():
         state["result"] = None
         state["join_phase"] = False
         state["hack_used"] = []
-    socketio.emit("state_update", _snapshot())
+        state["version"] += 1     # strands any patch still in flight
+    socketio.emit("state_update", _snapshot(arena_id), to=_room(arena_id))
+    _emit_arenas()
     return jsonify({"ok": True})
 
 
@@ -635,6 +777,8 @@ def api_game_player():
             # the GUI can render buy/run/jobs buttons and disable run when full.
             "rig":          data.get("rig", []),
             "jobs":         data.get("jobs", []),
+            "orders":       data.get("orders", {}),
+            "queues":       data.get("queues", {}),
             "job_slots":    data.get("job_slots", 0),
             "rig_state":    data.get("rig_state", {}),
         }
@@ -705,6 +849,20 @@ def api_game_treasury():
     return jsonify({"ok": True})
 
 
+@app.route("/api/game/leaderboard", methods=["POST"])
+def api_game_leaderboard():
+    """Bot pushes one leaderboard's top-N (only when it changed)."""
+    data = request.get_json(force=True, silent=True) or {}
+    board = str(data.get("board", "")).strip()
+    if not board:
+        return jsonify({"ok": True})
+    top = data.get("top", [])
+    with game_lock:
+        game["leaderboards"][board] = top
+    socketio.emit("leaderboard_update", {"board": board, "top": top})
+    return jsonify({"ok": True})
+
+
 @app.route("/api/game/clear", methods=["POST"])
 def api_game_clear():
     """Reset TwitcHack session data (call on bot restart)."""
@@ -725,6 +883,9 @@ def on_connect():
     username = session.get('twitch_username')
     if username:
         _sid_username[request.sid] = username
+    # Everyone starts in the default arena's room; pages switch with join_arena.
+    _sid_arena[request.sid] = DEFAULT_ARENA
+    join_room(_room(DEFAULT_ARENA))
     # Send both boss battle state and game state on connect
     socketio.emit("state_update", _snapshot(), to=request.sid)
     socketio.emit("game_state", _game_snapshot(), to=request.sid)
@@ -733,6 +894,7 @@ def on_connect():
 @socketio.on("disconnect")
 def on_disconnect():
     _sid_username.pop(request.sid, None)
+    _sid_arena.pop(request.sid, None)
 
 
 @socketio.on("web_command")
@@ -767,9 +929,25 @@ def on_web_command(data):
     socketio.emit("web_result", {"result": result, "command": cmd}, to=request.sid)
 
 
+@socketio.on("join_arena")
+def on_join_arena(data):
+    """Move this socket to another arena's room and send that arena's state.
+    An unknown id lands in the default arena; `arena_joined` tells the page
+    which arena it is actually in."""
+    arena_id = _arena_id((data or {}).get("arena"))
+    previous = _sid_arena.get(request.sid)
+    if previous and previous != arena_id:
+        leave_room(_room(previous))
+    _sid_arena[request.sid] = arena_id
+    join_room(_room(arena_id))
+    socketio.emit("arena_joined", {"arena": arena_id}, to=request.sid)
+    socketio.emit("state_update", _snapshot(arena_id), to=request.sid)
+
+
 @socketio.on("request_state")
 def on_request_state():
-    socketio.emit("state_update", _snapshot(), to=request.sid)
+    socketio.emit("state_update", _snapshot(_sid_arena.get(request.sid, DEFAULT_ARENA)),
+                  to=request.sid)
 
 
 @socketio.on("request_game_state")
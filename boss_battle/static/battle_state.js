@@ -0,0 +1,68 @@
+/* Pure, DOM-free client side of the versioned boss-battle state.
+ *
+ * The overlay server sends one full `state_update` on connect and then
+ * `state_patch`es of only the fields that changed (integrations/
+ * battle_state.py documents the shape). This keeps the local copy current
+ * and asks for a fresh full state when a patch doesn't follow on from the
+ * version we hold. Loaded as a plain <script> by the spectator and
+ * /twitchack pages, and require()-able from tests/test_battle_state.js.
+ */
+(function (root) {
+  'use strict';
+
+  var MAX_LOG = 60;   // matches the server's MAX_LOG
+
+  /* Apply `patch` to `state` and return the new state, or null if the patch
+   * doesn't build on `state.version` (the caller must re-sync). */
+  function applyPatch(state, patch) {
+    if (!state || !patch || patch.base !== state.version) return null;
+    var next = Object.assign({}, state, patch.set || {});
+    if (patch.players) {
+      var players = Object.assign({}, state.players || {});
+      Object.keys(patch.players).forEach(function (name) {
+        var fields = patch.players[name];
+        if (fields === null) delete players[name];
+        else players[name] = Object.assign({}, players[name] || {}, fields);
+      });
+      next.players = players;
+    }
+    next.version = patch.v;
+    return next;
+  }
+
+  /* Track the battle state for one page. `render(state)` runs after every
+   * full state or applied patch; `requestFull()` is called (once per gap)
+   * when a patch can't be applied. Log lines arrive separately and are
+   * folded in so a re-render doesn't roll the log back. */
+  function makeBattleState(render, requestFull) {
+    var current = null;
+    var resyncing = false;
+    return {
+      full: function (st) {
+        current = st;
+        resyncing = false;
+        render(st);
+      },
+      patch: function (p) {
+        var next = applyPatch(current, p);
+        if (next === null) {
+          if (!resyncing) {
+            resyncing = true;
+            requestFull();
+          }
+          return;
+        }
+        current = next;
+        render(next);
+      },
+      log: function (entry) {
+        if (current) current.log = [entry].concat(current.log || []).slice(0, MAX_LOG);
+      },
+      get: function () { return current; }
+    };
+  }
+
+  var api = { applyPatch: applyPatch, makeBattleState: makeBattleState };
+  if (typeof module !== 'undefined' && module.exports) module.exports = api;
+  root.BattleState = api;
+})(typeof window !== 'undefined' ? window : this);
@@ -0,0 +1,77 @@
+"""Regression test: clients can't create phantom arenas.
+
+Only the bot's full /api/push creates an arena. A spectator naming an arena
+the bot never pushed (?arena=57, ?arena=abc) lands in the default arena and
+is told so via `arena_joined`, and nothing new shows up in the arena list.
+
+OVERLAY_DISABLE_RESEED is set before importing server so the background
+re-seed greenlet does not fire during the test.
+
+Run from the boss_battle/ directory:
+    .venv/bin/python -m pytest tests/test_arena_ids.py -v
+or as a plain script:
+    .venv/bin/python tests/test_arena_ids.py
+"""
+import os
+import sys
+
+os.environ["OVERLAY_DISABLE_RESEED"] = "1"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+def _reset_arenas():
+    with server.state_lock:
+        server.arenas.clear()
+        server.arenas[server.DEFAULT_ARENA] = server._new_arena_state()
+
+
+def _joined(client):
+    return [e["args"][0]["arena"] for e in client.get_received() if e["name"] == "arena_joined"]
+
+
+def test_unknown_arena_joins_the_default_without_creating_it():
+    _reset_arenas()
+    client = server.socketio.test_client(server.app)
+    for wanted in ("57", "abc", ""):
+        client.emit("join_arena", {"arena": wanted})
+        assert _joined(client) == [server.DEFAULT_ARENA], wanted
+    assert list(server.arenas) == [server.DEFAULT_ARENA]
+    client.disconnect()
+
+
+def test_bot_push_creates_the_arena_and_clients_can_join_it():
+    _reset_arenas()
+    http = server.app.test_client()
+    assert http.post("/api/push", json={"arena": "2", "active": True}).status_code == 200
+    assert http.post("/api/push", json={"arena": "abc"}).status_code == 400
+    client = server.socketio.test_client(server.app)
+    client.emit("join_arena", {"arena": "2"})
+    assert _joined(client) == ["2"]
+    assert sorted(server.arenas) == ["1", "2"]
+    client.disconnect()
+
+
+def test_bot_updates_for_unpushed_arenas_create_nothing():
+    _reset_arenas()
+    http = server.app.test_client()
+    assert http.post("/api/patch", json={"arena": "3", "base": 0, "v": 1}).status_code == 409
+    assert http.post("/api/log", json={"arena": "3", "msg": "hi"}).status_code == 404
+    assert http.post("/api/clear", json={"arena": "3"}).status_code == 404
+    assert list(server.arenas) == [server.DEFAULT_ARENA]
+
+
+if __name__ == '__main__':
+    failures = 0
+    for fn in (test_unknown_arena_joins_the_default_without_creating_it,
+               test_bot_push_creates_the_arena_and_clients_can_join_it,
+               test_bot_updates_for_unpushed_arenas_create_nothing):
+        try:
+            fn()
+            print(f'PASS  {fn.__name__}')
+        except AssertionError as e:
+            failures += 1
+            print(f'FAIL  {fn.__name__}: {e}')
+    sys.exit(1 if failures else 0)
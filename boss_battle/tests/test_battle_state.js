@@ -0,0 +1,92 @@
+/* Tests for static/battle_state.js — the spectator side of versioned
+ * boss-battle state (full snapshot + per-field patches).
+ *
+ * Pure logic, no DOM, no dependencies. Run from boss_battle/:
+ *     node tests/test_battle_state.js
+ */
+
+'use strict';
+
+const assert = require('assert');
+const path = require('path');
+const { applyPatch, makeBattleState } =
+  require(path.join(__dirname, '..', 'static', 'battle_state.js'));
+
+let failures = 0;
+function test(name, fn) {
+  try {
+    fn();
+    console.log('  ok   ' + name);
+  } catch (e) {
+    failures++;
+    console.log('  FAIL ' + name + '\n       ' + e.message);
+  }
+}
+
+const BASE = {
+  version: 4, active: true, boss_health: 1500, hack_used: [],
+  players: {
+    alice: { health: 50, alive: true, inventory: ['Cookies'] },
+    bob:   { health: 40, alive: true, inventory: [] },
+  },
+  log: [],
+};
+
+// ── applyPatch ──────────────────────────────────────────────────────────────
+
+test('a patch merges only the fields it names', () => {
+  const next = applyPatch(BASE, {
+    v: 5, base: 4, set: { boss_health: 1400 }, players: { alice: { health: 20 } },
+  });
+  assert.strictEqual(next.version, 5);
+  assert.strictEqual(next.boss_health, 1400);
+  assert.deepStrictEqual(next.players.alice, { health: 20, alive: true, inventory: ['Cookies'] });
+  assert.strictEqual(next.players.bob, BASE.players.bob);
+  assert.strictEqual(BASE.boss_health, 1500, 'input state is not mutated');
+});
+
+test('null removes a player and a new name adds one', () => {
+  const next = applyPatch(BASE, {
+    v: 5, base: 4, players: { bob: null, carol: { health: 60, alive: true } },
+  });
+  assert.deepStrictEqual(Object.keys(next.players).sort(), ['alice', 'carol']);
+});
+
+test('a patch that skips a version is refused', () => {
+  assert.strictEqual(applyPatch(BASE, { v: 7, base: 6, set: { boss_health: 1 } }), null);
+  assert.strictEqual(applyPatch(null, { v: 1, base: 0 }), null);
+});
+
+// ── makeBattleState ─────────────────────────────────────────────────────────
+
+test('patches render in order and a gap asks for one full resync', () => {
+  const rendered = [];
+  let resyncs = 0;
+  const bs = makeBattleState((st) => rendered.push(st.version), () => resyncs++);
+  bs.full(BASE);
+  bs.patch({ v: 5, base: 4, set: { boss_health: 1450 } });
+  bs.patch({ v: 7, base: 6, set: { boss_health: 1300 } });   // v6 was missed
+  bs.patch({ v: 8, base: 7, set: { boss_health: 1200 } });   // still out of step
+  assert.deepStrictEqual(rendered, [4, 5]);
+  assert.strictEqual(resyncs, 1, 'one request per gap, not one per patch');
+  bs.full(Object.assign({}, BASE, { version: 8, boss_health: 1200 }));
+  bs.patch({ v: 9, base: 8, set: { boss_health: 1100 } });
+  assert.deepStrictEqual(rendered, [4, 5, 8, 9]);
+  assert.strictEqual(bs.get().boss_health, 1100);
+});
+
+test('log lines survive the next patch render', () => {
+  const bs = makeBattleState(() => {}, () => {});
+  bs.full(BASE);
+  bs.log({ msg: 'hit', type: 'damage' });
+  bs.patch({ v: 5, base: 4, set: { boss_health: 1490 } });
+  assert.deepStrictEqual(bs.get().log, [{ msg: 'hit', type: 'damage' }]);
+});
+
+// ── Summary ─────────────────────────────────────────────────────────────────
+
+if (failures) {
+  console.error('\n' + failures + ' test(s) failed');
+  process.exit(1);
+}
+console.log('\nall tests passed');
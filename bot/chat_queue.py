@@ -0,0 +1,242 @@
+"""Prioritized, rate-limited outbound Twitch chat queue.
+
+Every line the bot says in chat goes through one `ChatQueue` instead of hitting
+`connected_channels[0].send` directly. Twitch silently drops (or throttles the
+bot for) anything past its per-30s send limit, so bursts — a boss-battle KO
+line landing on top of a victory broadcast, three Monday replies, a wave of
+GUI nudges — used to lose messages at random. The queue:
+
+- paces sends with a token bucket sized so that no 30s window can exceed the
+  Twitch limit (burst + WINDOW * rate <= limit);
+- drains highest priority first: owner/mod > game outcome > flavor;
+- merges queued short lines of the same priority into one message (joined with
+  " | ", clamped via helpers.clamp_chat_message), so a burst costs one token;
+- sheds load from the bottom: when full, the oldest lowest-priority line is
+  dropped, and flavor lines that sat in the queue too long are discarded;
+- keeps counters for queue depth, sends, merges and drops (`metrics()`).
+
+Pure asyncio, no Twitch imports — the bot passes a `send(text)` coroutine
+function in, so the whole thing is unit-testable with a fake clock.
+"""
+import asyncio
+import time
+from collections import deque
+
+from bot import helpers
+
+
+# Priorities — lower number drains first.
+PRIORITY_MOD = 0      # owner / moderator command replies, moderation notices
+PRIORITY_GAME = 1     # game outcomes: battle KOs, victory/defeat, command results
+PRIORITY_FLAVOR = 2   # easter eggs, Monday banter, audio clips, GUI nudges
+PRIORITIES = (PRIORITY_MOD, PRIORITY_GAME, PRIORITY_FLAVOR)
+
+# Twitch chat limits: 20 messages / 30s for a regular account, 100 / 30s when
+# the bot is a moderator or the broadcaster in the channel.
+WINDOW_SECONDS = 30.0
+USER_RATE_LIMIT = 20
+MOD_RATE_LIMIT = 100
+
+DEFAULT_BURST = 5          # tokens available immediately after a quiet spell
+MAX_DEPTH = 50             # queued lines across all priorities
+MERGE_SEPARATOR = " | "    # same separator WebCtx uses to join buffered replies
+
+# How long a queued line is still worth sending. Flavor goes stale quickly;
+# game outcomes and owner replies are never aged out.
+MAX_AGE_SECONDS = {PRIORITY_FLAVOR: 60.0}
+
+
+# Float slack so waiting exactly `wait_time()` always yields a token.
+_EPSILON = 1e-9
+
+
+class TokenBucket:
+    """Classic token bucket. `rate` tokens/sec refill up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._last = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._last)
+        self._last = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self._tokens >= 1.0 - _EPSILON:
+            self._tokens = max(0.0, self._tokens - 1.0)
+            return True
+        return False
+
+    def wait_time(self) -> float:
+        """Seconds until one token is available (0 if one is ready now)."""
+        self._refill()
+        if self._tokens >= 1.0 - _EPSILON:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate
+
+
+def bucket_for_limit(limit: int, window: float = WINDOW_SECONDS,
+                     burst: int = DEFAULT_BURST, clock=time.monotonic) -> TokenBucket:
+    """A bucket that can never exceed `limit` sends in any `window` seconds.
+
+    Worst case in a window is a full burst plus a window's worth of refill, so
+    the refill rate is (limit - burst) / window.
+    """
+    burst = max(1, min(burst, limit - 1))
+    return TokenBucket(rate=(limit - burst) / window, capacity=burst, clock=clock)
+
+
+class ChatQueue:
+    """Priority queue of outbound chat lines drained through a token bucket."""
+
+    def __init__(self, send, *, rate_limit: int = USER_RATE_LIMIT,
+                 burst: int = DEFAULT_BURST, max_depth: int = MAX_DEPTH,
+                 limit: int = 480, clock=time.monotonic):
+        self._send = send
+        self._clock = clock
+        self.bucket = bucket_for_limit(rate_limit, burst=burst, clock=clock)
+        self.max_depth = max_depth
+        self.limit = limit
+        # One FIFO per priority; entries are (text, mergeable, enqueued_at).
+        self._queues = {p: deque() for p in PRIORITIES}
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._stats = {
+            "enqueued": 0,
+            "sent": 0,
+            "merged": 0,
+            "send_errors": 0,
+            "max_depth_seen": 0,
+            "dropped": {"overflow": 0, "stale": 0},
+        }
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+    def depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def put(self, text, priority: int = PRIORITY_GAME, *, mergeable: bool = True) -> bool:
+        """Queue a line. Never blocks. Returns False if it was dropped.
+
+        Set mergeable=False for lines that must go out verbatim on their own —
+        e.g. audio-clip commands another bot reacts to.
+        """
+        text = str(text)
+        if not text:
+            return False
+        if priority not in self._queues:
+            priority = PRIORITY_GAME
+        if self.depth() >= self.max_depth and not self._shed_below(priority):
+            self._stats["dropped"]["overflow"] += 1
+            helpers.log_to_file(f"[chat_queue] dropped (queue full): {text[:80]}")
+            return False
+        self._queues[priority].append((text, mergeable, self._clock()))
+        self._stats["enqueued"] += 1
+        self._stats["max_depth_seen"] = max(self._stats["max_depth_seen"], self.depth())
+        self._wakeup.set()
+        return True
+
+    def _shed_below(self, priority: int) -> bool:
+        """Make room for a `priority` line by dropping the oldest line of the
+        lowest strictly-lower priority. Returns False if nothing could go."""
+        for p in reversed(PRIORITIES):
+            if p <= priority:
+                break
+            if self._queues[p]:
+                text, _, _ = self._queues[p].popleft()
+                self._stats["dropped"]["overflow"] += 1
+                helpers.log_to_file(f"[chat_queue] shed for higher priority: {text[:80]}")
+                return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+    def _drop_stale(self) -> None:
+        now = self._clock()
+        for p, max_age in MAX_AGE_SECONDS.items():
+            q = self._queues[p]
+            while q and now - q[0][2] > max_age:
+                q.popleft()
+                self._stats["dropped"]["stale"] += 1
+
+    def _next_message(self):
+        """Pop the next line to send, merging following same-priority lines
+        while they fit in one chat message. Returns None if empty."""
+        self._drop_stale()
+        for p in PRIORITIES:
+            q = self._queues[p]
+            if not q:
+                continue
+            text, mergeable, _ = q.popleft()
+            if mergeable:
+                while q and q[0][1]:
+                    candidate = text + MERGE_SEPARATOR + q[0][0]
+                    if len(candidate) > self.limit:
+                        break
+                    text = candidate
+                    q.popleft()
+                    self._stats["merged"] += 1
+            text, clipped = helpers.clamp_chat_message(text, self.limit)
+            if clipped:
+                helpers.log_to_file("Outgoing message clipped to fit chat length.")
+            return text
+        return None
+
+    async def drain_once(self) -> float:
+        """Send at most one (possibly merged) message if a token is free.
+
+        Returns how long the caller should wait before trying again: 0 after a
+        send, the token wait when rate-limited, or None when the queue is empty.
+        """
+        if not self.depth():
+            return None
+        wait = self.bucket.wait_time()
+        if wait > 0:
+            return wait
+        text = self._next_message()
+        if text is None:
+            return None
+        self.bucket.try_take()
+        try:
+            await self._send(text)
+            self._stats["sent"] += 1
+        except Exception as e:
+            # Between reconnects the channel can vanish; drop rather than crash.
+            self._stats["send_errors"] += 1
+            helpers.log_to_file(f"[chat_queue] send failed: {e}")
+        return 0.0
+
+    async def run(self) -> None:
+        """Drain forever. Start once with `start()` from event_ready."""
+        while True:
+            wait = await self.drain_once()
+            if wait is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            elif wait > 0:
+                await asyncio.sleep(wait)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self.run())
+
+    def metrics(self) -> dict:
+        """Snapshot of queue depth and counters (for logs / the owner)."""
+        return {
+            "depth": self.depth(),
+            "depth_by_priority": {p: len(q) for p, q in self._queues.items()},
+            "enqueued": self._stats["enqueued"],
+            "sent": self._stats["sent"],
+            "merged": self._stats["merged"],
+            "send_errors": self._stats["send_errors"],
+            "max_depth_seen": self._stats["max_depth_seen"],
+            "dropped": dict(self._stats["dropped"]),
+        }
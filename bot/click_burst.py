@@ -0,0 +1,127 @@
+"""Autoclicker burst coalescing for clicker attacks.
+
+The GUI is routinely driven at up to ~10 clicks/sec per user. Each click used
+to cost a save mark and two overlay HTTP pushes (feed event + player card).
+The per-click work that matters for fairness still runs on every click: the
+jail speed gate (`jail.record_attack`), the success roll, the points/cash
+mutation and the level check. Only the *presentation* is batched here.
+Clicks from the same user on the same attack within BURST_WINDOW_SECONDS
+fold into one `ClickBurst`. When the window closes, the flush callback gets
+the whole burst and emits one aggregated feed event and one player push.
+
+Overlay traffic therefore scales with active (user, attack) pairs per window,
+not with the raw click rate. A lone click still produces exactly one event —
+with its original message — just up to one window later.
+
+The bot calls `flush_all()` on shutdown so bursts still inside their window
+aren't lost. A failing flush is logged and doesn't stop the others.
+"""
+import asyncio
+from dataclasses import dataclass
+
+from bot import helpers
+
+
+BURST_WINDOW_SECONDS = 0.5
+
+
+@dataclass
+class ClickBurst:
+    """Everything that happened in one (user, attack) window."""
+    username: str
+    command: str
+    start_points: int           # points before the first click's roll
+    player: object = None
+    clicks: int = 0
+    successes: int = 0
+    failures: int = 0
+    cash: int = 0               # net click cash kept (after any skim)
+    last_msg: str = ""
+
+    def summary(self) -> tuple[str, str]:
+        """(feed message, event type) for the whole burst."""
+        if self.clicks == 1:
+            return self.last_msg, 'attack-success' if self.successes else 'attack-fail'
+        delta = (self.player.points if self.player is not None else self.start_points) - self.start_points
+        sign = '+' if delta >= 0 else ''
+        cash = f", +${self.cash}" if self.cash else ""
+        msg = (f"@{self.username} {self.command} ×{self.clicks}: "
+               f"{self.successes} hit / {self.failures} missed "
+               f"({sign}{delta} pts{cash}).")
+        return msg, 'attack-success' if self.successes >= self.failures else 'attack-fail'
+
+
+class BurstCoalescer:
+    """Collects clicks per (username, command) and flushes each burst once its
+    window closes. `flush` is an async callable taking a ClickBurst."""
+
+    def __init__(self, flush, window: float = BURST_WINDOW_SECONDS):
+        self._flush = flush
+        self.window = window
+        self._open: dict[tuple, ClickBurst] = {}
+        self._timers: set[asyncio.Task] = set()    # every live timer (held so it isn't GC'd)
+        self._sleeping: dict[tuple, asyncio.Task] = {}  # timers still inside their window
+
+    def pending(self) -> int:
+        return len(self._open)
+
+    def begin(self, username: str, command: str, points: int) -> None:
+        """Note the points baseline before a click's roll. Only the first click
+        of a window sets it, so the burst reports the net change."""
+        key = (username, command)
+        if key not in self._open:
+            self._open[key] = ClickBurst(username=username, command=command,
+                                         start_points=points)
+            task = asyncio.get_event_loop().create_task(self._flush_later(key))
+            self._timers.add(task)
+            self._sleeping[key] = task
+            task.add_done_callback(self._timer_done)
+
+    def _timer_done(self, task: asyncio.Task) -> None:
+        self._timers.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            helpers.log_to_file(f"[click_burst] flush failed: {task.exception()!r}")
+
+    def add(self, username: str, command: str, player, success: bool,
+            msg: str, cash: int = 0) -> None:
+        """Record one resolved click."""
+        key = (username, command)
+        burst = self._open.get(key)
+        if burst is None:
+            # No begin() (e.g. a non-clicker result) — open a window now.
+            self.begin(username, command, player.points)
+            burst = self._open[key]
+        burst.player = player
+        burst.clicks += 1
+        if success:
+            burst.successes += 1
+        else:
+            burst.failures += 1
+        burst.cash += cash
+        burst.last_msg = msg
+
+    async def _flush_later(self, key) -> None:
+        await asyncio.sleep(self.window)
+        self._sleeping.pop(key, None)
+        burst = self._open.pop(key, None)
+        if burst is None or burst.clicks == 0:
+            return  # gate aborted before any result (e.g. jailed) — nothing to show
+        await self._flush(burst)
+
+    async def flush_all(self) -> None:
+        """Flush every open burst now (shutdown / tests). Timers still in
+        their window are cancelled; flushes already under way are awaited."""
+        for task in self._sleeping.values():
+            task.cancel()
+        self._sleeping.clear()
+        keys = list(self._open)
+        for key in keys:
+            burst = self._open.pop(key, None)
+            if burst is not None and burst.clicks:
+                try:
+                    await self._flush(burst)
+                except Exception as e:
+                    helpers.log_to_file(f"[click_burst] flush failed: {e!r}")
+        running = [t for t in self._timers if t is not asyncio.current_task()]
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
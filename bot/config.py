@@ -24,3 +24,17 @@ try:
     MONDAY_COOLDOWN = int(_raw_cd.split("#", 1)[0].strip())
 except ValueError:
     MONDAY_COOLDOWN = 15
+
+# Outbound chat pacing: Twitch allows 20 msgs/30s, or 100 when the bot account
+# is a moderator/broadcaster in the channel. Set to 100 once the bot is modded.
+try:
+    CHAT_RATE_LIMIT = int(os.getenv("CHAT_RATE_LIMIT", "20"))
+except ValueError:
+    CHAT_RATE_LIMIT = 20
+
+# Boss-battle arenas that can run at once (game/arenas.py). Each has its own
+# team cap and cooldown.
+try:
+    ARENA_COUNT = int(os.getenv("ARENA_COUNT", "3"))
+except ValueError:
+    ARENA_COUNT = 3
@@ -7,14 +7,24 @@ changes into a single transaction.
 
 This collapses N rapid command writes (e.g. autoclickers) into one DB write,
 without changing any command handler signatures.
+
+The economy ledger (game/ledger.py) rides the same flusher: each flush
+bulk-copies the rows recorded since the last one into the append-only
+`ledger` table.
+
+The treasury (game/jail.py) rides the same flusher too: a one-row `treasury`
+table, cached in memory as a jail.CachedTreasury, with queued credits applied
+in a single atomic `UPDATE ... RETURNING` per flush.
 """
 import asyncio
 import json
 import os
+from datetime import datetime, timezone
 from typing import Optional
 
 import asyncpg
 
+from game import jail, ledger
 from playerdata import Player
 
 FLUSH_INTERVAL = 0.5  # seconds; coalesces bursts within this window into one write
@@ -25,6 +35,7 @@ _player_data_ref: Optional[dict] = None
 _dirty = False
 _flush_task: Optional[asyncio.Task] = None
 _dsn: Optional[str] = None
+_treasury: Optional[jail.CachedTreasury] = None
 
 
 def _resolve_dsn() -> str:
@@ -58,6 +69,22 @@ async def init() -> dict:
             )
         """)
         row_count = await conn.fetchval("SELECT COUNT(*) FROM players")
+        await _init_treasury(conn)
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS ledger (
+                id            BIGSERIAL PRIMARY KEY,
+                ts            TIMESTAMPTZ NOT NULL,
+                username      TEXT NOT NULL,
+                delta_points  BIGINT NOT NULL DEFAULT 0,
+                delta_cash    BIGINT NOT NULL DEFAULT 0,
+                reason        TEXT NOT NULL,
+                counterparty  TEXT
+            )
+        """)
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS ledger_user_ts ON ledger (username, ts DESC)")
+        await conn.execute(
+            "CREATE INDEX IF NOT EXISTS ledger_reason_ts ON ledger (reason, ts)")
 
     if row_count == 0 and os.path.exists(LEGACY_JSON_PATH):
         await _migrate_from_json()
@@ -65,6 +92,29 @@ async def init() -> dict:
     return await _load_all()
 
 
+async def _init_treasury(conn) -> None:
+    """Ensure the one-row treasury table exists (importing the sidecar
+    game_state.json balance the first time) and install the cached store."""
+    global _treasury
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS treasury (
+            id         SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            balance    BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    inserted = await conn.fetchval(
+        "INSERT INTO treasury (id, balance) VALUES (1, $1) "
+        "ON CONFLICT (id) DO NOTHING RETURNING balance",
+        jail.sidecar_treasury_balance(),
+    )
+    if inserted is not None:
+        print(f"[db] Imported treasury balance {inserted} from the sidecar file")
+    balance = await conn.fetchval("SELECT balance FROM treasury WHERE id = 1")
+    _treasury = jail.CachedTreasury(balance)
+    jail.set_treasury_store(_treasury)
+
+
 async def _migrate_from_json() -> None:
     """One-time import of player_data.json into Postgres on empty-DB first boot."""
     try:
@@ -110,6 +160,78 @@ def mark_dirty() -> None:
 
 
 async def flush() -> None:
+    """Write dirty players, new ledger rows and any queued treasury credits.
+
+    Each stage logs its own failure and keeps its batch for the next flush,
+    so one failing table (e.g. a schema problem on `ledger`) can't starve
+    the others.
+    """
+    for stage in (_flush_players, _flush_ledger, _flush_treasury):
+        try:
+            await stage()
+        except Exception as e:
+            print(f"[db.flush] {stage.__name__.lstrip('_')} error: {e}")
+
+
+_LEDGER_COLUMNS = ("ts", "username", "delta_points", "delta_cash", "reason", "counterparty")
+
+
+async def _flush_ledger() -> None:
+    """Bulk-copy the ledger rows recorded since the last flush."""
+    book = ledger.get_ledger()
+    if book is None or _pool is None or not book.pending():
+        return
+    batch = book.take_batch()
+    records = [(datetime.fromtimestamp(ts, timezone.utc), user, dp, dc, reason, other)
+               for ts, user, dp, dc, reason, other in batch]
+    try:
+        async with _pool.acquire() as conn:
+            await conn.copy_records_to_table("ledger", records=records, columns=_LEDGER_COLUMNS)
+    except BaseException:
+        book.restore(batch)
+        raise
+
+
+async def fetch_history(username: str, limit: int = 50) -> list:
+    """A user's ledger rows, newest first (beyond the in-memory recent window)."""
+    return await _pool.fetch(
+        "SELECT ts, delta_points, delta_cash, reason, counterparty FROM ledger "
+        "WHERE username = $1 ORDER BY ts DESC LIMIT $2",
+        username, limit,
+    )
+
+
+async def fetch_reason_totals(since: Optional[datetime] = None) -> list:
+    """Per-reason count and summed deltas, optionally since `since`."""
+    return await _pool.fetch(
+        "SELECT reason, COUNT(*) AS count, SUM(delta_points) AS points, "
+        "SUM(delta_cash) AS cash FROM ledger "
+        "WHERE $1::timestamptz IS NULL OR ts >= $1 "
+        "GROUP BY reason ORDER BY reason",
+        since,
+    )
+
+
+async def _flush_treasury() -> None:
+    """Apply queued treasury credits in one atomic increment."""
+    if _treasury is None or _pool is None:
+        return
+    amount = _treasury.take_pending()
+    if not amount:
+        return
+    try:
+        balance = await _pool.fetchval(
+            "UPDATE treasury SET balance = balance + $1, updated_at = NOW() "
+            "WHERE id = 1 RETURNING balance",
+            amount,
+        )
+    except BaseException:
+        _treasury.restore(amount)
+        raise
+    _treasury.settle(balance)
+
+
+async def _flush_players() -> None:
     """Write all current players to Postgres in one transaction."""
     global _dirty
     if not _dirty or _player_data_ref is None or _pool is None:
@@ -120,15 +242,19 @@ async def flush() -> None:
     if not rows:
         return
 
-    async with _pool.acquire() as conn:
-        async with conn.transaction():
-            await conn.executemany(
-                "INSERT INTO players (username, data, updated_at) "
-                "VALUES ($1, $2::jsonb, NOW()) "
-                "ON CONFLICT (username) DO UPDATE "
-                "SET data = EXCLUDED.data, updated_at = NOW()",
-                rows,
-            )
+    try:
+        async with _pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(
+                    "INSERT INTO players (username, data, updated_at) "
+                    "VALUES ($1, $2::jsonb, NOW()) "
+                    "ON CONFLICT (username) DO UPDATE "
+                    "SET data = EXCLUDED.data, updated_at = NOW()",
+                    rows,
+                )
+    except BaseException:
+        _dirty = True   # nothing was written; retry the whole snapshot next flush
+        raise
 
 
 async def _flush_loop() -> None:
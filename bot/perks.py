@@ -4,7 +4,9 @@ Centralizes the timer/state logic so commands stay focused on game flow.
 """
 from datetime import datetime, timedelta
 
-CARDBOARD_BOX = "Snake's Cardboard Box"
+from game import expiry as expiry_timers
+from game.expiry import CARDBOARD_BOX
+
 CARDBOARD_BOX_HOURS = 1
 KONAMI_COOLDOWN_HOURS = 24
 
@@ -48,10 +50,10 @@ def prune_box(player) -> bool:
     """Remove an expired Cardboard Box from items. Returns True if pruned."""
     if is_box_active(player):
         return False
-    if CARDBOARD_BOX in (player.items or []):
-        player.items = [i for i in player.items if i != CARDBOARD_BOX]
-        return True
-    return False
+    pruned = False
+    while player.remove_item(CARDBOARD_BOX):
+        pruned = True
+    return pruned
 
 
 def grant_box(player) -> str:
@@ -61,8 +63,8 @@ def grant_box(player) -> str:
     """
     expiry = datetime.now() + timedelta(hours=CARDBOARD_BOX_HOURS)
     player.cardboard_box_until = expiry.isoformat(timespec='seconds')
-    if CARDBOARD_BOX not in (player.items or []):
-        player.items = (player.items or []) + [CARDBOARD_BOX]
+    player.add_item(CARDBOARD_BOX)
+    expiry_timers.track(player)
     return player.cardboard_box_until
 
 
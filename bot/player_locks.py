@@ -0,0 +1,98 @@
+"""Per-player command serialization.
+
+Command handlers mutate shared `Player` objects across `await` points (overlay
+pushes, chat sends), so two commands touching the same player could
+interleave on half-updated state — a double-clicked !steal paying out twice,
+or a steal landing while the victim's attack is mid-way through banking
+points. Every command entry point (chat via Bot.invoke, web via
+execute_web_command) therefore runs inside `PlayerLocks.hold(...)` for the
+players it touches:
+
+- single-player commands hold just the caller's lock, so unrelated players
+  never wait on each other;
+- multi-player commands (steal, bail, requestbail, owner grants) also hold
+  the target's lock. Locks are always taken in sorted username order, so two
+  commands pointed at each other (A steals B while B steals A) cannot
+  deadlock.
+
+Locks are not re-entrant: only the entry points acquire them, never the
+handlers themselves. Idle locks are dropped, so the table only holds players
+who have a command in flight.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+
+# Commands that act on a second player, and which positional arg names them.
+TARGET_ARG_INDEX = {
+    'steal': 0,
+    'bail': 0,
+    'requestbail': 0,
+    'assignpoints': 0,
+    'ownercash': 1,
+}
+
+
+def _clean(name) -> str:
+    return str(name or '').strip().lstrip('@').lower()
+
+
+def involved_players(command: str, author: str, args: str = '') -> list[str]:
+    """Usernames a command touches: always the author, plus the target for
+    multi-player commands. Sorted and de-duplicated — the lock order."""
+    names = {_clean(author)}
+    idx = TARGET_ARG_INDEX.get((command or '').lower())
+    if idx is not None:
+        parts = (args or '').split()
+        if len(parts) > idx:
+            names.add(_clean(parts[idx]))
+    names.discard('')
+    return sorted(names)
+
+
+class PlayerLocks:
+    """Lazily-created asyncio.Lock per username, refcounted so idle players
+    don't accumulate locks."""
+
+    def __init__(self):
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refs: dict[str, int] = {}
+
+    def _ref(self, name: str) -> asyncio.Lock:
+        lock = self._locks.get(name)
+        if lock is None:
+            lock = self._locks[name] = asyncio.Lock()
+        self._refs[name] = self._refs.get(name, 0) + 1
+        return lock
+
+    def _unref(self, name: str) -> None:
+        left = self._refs.get(name, 0) - 1
+        if left <= 0:
+            self._refs.pop(name, None)
+            self._locks.pop(name, None)
+        else:
+            self._refs[name] = left
+
+    def is_held(self, username: str) -> bool:
+        lock = self._locks.get(_clean(username))
+        return bool(lock and lock.locked())
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, *usernames):
+        """Hold every named player's lock (sorted order) for the block."""
+        names = sorted({_clean(n) for n in usernames} - {''})
+        locks = [self._ref(n) for n in names]
+        acquired = []
+        try:
+            for lock in locks:
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+            for n in names:
+                self._unref(n)
@@ -0,0 +1,81 @@
+"""Precompiled dispatch table for web (GUI) commands.
+
+Every GUI click lands in `Bot.execute_web_command`. It used to run
+`inspect.signature()` on the command callback and rebuild the parameter list
+on every call. This module does that introspection once, when the table is
+built. The result maps each command name to a `WebRoute`: the bound callable,
+an arg binder, and a usage string. Dispatch is then one dict lookup plus a
+call.
+
+The bot builds the table after `_load_command_cogs()` and rebuilds it whenever
+a cog is added or removed (see Bot.add_cog / Bot.remove_cog), so a hot-loaded
+command group shows up in the GUI without a restart.
+
+No Twitch imports — the table is built from anything with TwitchIO's
+`Command` shape (`_callback`, `_instance`), so it is unit-testable.
+"""
+import inspect
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class WebRoute:
+    """One dispatchable web command."""
+    name: str
+    handler: Callable        # async (ctx, **kwargs) — instance already bound
+    bind: Callable           # (args: str) -> kwargs dict, or None when usage is wrong
+    usage: str               # shown when a required argument is missing
+
+
+def _no_args(_args: str) -> dict:
+    return {}
+
+
+def make_binder(callback) -> tuple[Callable, str]:
+    """Introspect a command callback once and return (binder, usage_suffix).
+
+    Mirrors the old per-call logic: skip the leading (self/cog, ctx)
+    parameters; the next one (if any) receives the whole web `args` string.
+    If that parameter is required and `args` is empty, the binder returns
+    None so the caller can reply with the usage string.
+    """
+    params = list(inspect.signature(callback).parameters.values())[2:]
+    if not params:
+        return _no_args, ""
+    first = params[0]
+    name = first.name
+    required = first.default is inspect.Parameter.empty
+
+    def bind(args: str):
+        if args:
+            return {name: args}
+        return None if required else {}
+
+    return bind, f" <{name}>"
+
+
+def build_dispatch_table(bot, commands: dict, web_only: dict) -> dict[str, WebRoute]:
+    """Build name -> WebRoute for every registered command plus the web-only
+    handlers. Web-only handlers win on a name clash (same precedence as
+    before: they were checked first)."""
+    table: dict[str, WebRoute] = {}
+    for name, cmd_obj in commands.items():
+        instance = cmd_obj._instance if cmd_obj._instance is not None else bot
+        bind, usage = make_binder(cmd_obj._callback)
+        table[name] = WebRoute(
+            name=name,
+            handler=partial(cmd_obj._callback, instance),
+            bind=bind,
+            usage=f"Usage: !{name}{usage}",
+        )
+    for name, fn in web_only.items():
+        # Web-only handlers take the raw args string positionally.
+        table[name] = WebRoute(
+            name=name,
+            handler=partial(fn, bot),
+            bind=lambda args: {"args": args},
+            usage=f"Usage: !{name}",
+        )
+    return table
@@ -156,20 +156,23 @@ class UtilityCommands(commands.Cog):
         last_monday_err_time = self.bot.last_monday_error_time.strftime("%H:%M:%S") if self.bot.last_monday_error_time else "n/a"
 
         # Boss battle status
-        battle = self.bot.ongoing_battle
-        if battle:
-            battle_msg = f"active vs {battle.boss_name} (HP {battle.boss_health}) | join_phase={battle.join_phase} | team={len(battle.challenger_team)}"
-        else:
-            battle_msg = "idle"
-        battle_cd_left = max(0, int((self.bot.boss_battle_cooldown - (now - self.bot.last_battle_time)).total_seconds()))
-
-        drops = len(getattr(self.bot, "dropped_items", []))
+        parts = []
+        for arena in self.bot.arenas:
+            battle = arena.battle
+            cd_left = int(arena.cooldown_left(now, self.bot.arenas.cooldown).total_seconds())
+            if battle:
+                parts.append(f"#{arena.id} vs {battle.boss_name} (HP {battle.boss_health}) join_phase={battle.join_phase} team={len(battle.challenger_team)}")
+            else:
+                parts.append(f"#{arena.id} idle (cd {cd_left}s)")
+        battle_msg = "; ".join(parts)
+
+        drops = len(self.bot.drops)
         audio_cd_left = max(0, int((self.bot.audio_global_cooldown - (now - self.bot.audio_last_trigger)).total_seconds()))
 
         await self.bot.send_clamped(
             ctx,
             f"Bot status -> EventSub: {es_msg} (err={es_err} @ {es_err_time}) | Monday: {monday_msg} (last {last_monday}) err={last_monday_err} @ {last_monday_err_time} (model {MONDAY_MODEL}) | "
-            f"Battle: {battle_msg} (cd {battle_cd_left}s) | Drops live: {drops} | Audio cd: {audio_cd_left}s | Audio triggers fired: {self.bot.audio_triggers_fired} | Drops spawned: {self.bot.drop_spawned_count}"
+            f"Battles: {battle_msg} | Drops live: {drops} | Audio cd: {audio_cd_left}s | Audio triggers fired: {self.bot.audio_triggers_fired} | Drops spawned: {self.bot.drop_spawned_count}"
         )
 
     @commands.command(name='session')
@@ -195,6 +198,36 @@ class UtilityCommands(commands.Cog):
             f"Neovim penalties queued: {pending_neovim}"
         )
 
+    @commands.command(name='ledger')
+    async def ledger_summary(self, ctx, target: str = None):
+        """Owner-only: `!ledger` → since-boot totals per reason; `!ledger <user>`
+        → that user's last few balance changes and why."""
+        username = ctx.author.name.lower()
+        if not self.bot.is_channel_owner(username):
+            return
+
+        book = self.bot.ledger
+        if target:
+            target = target.lstrip('@').lower()
+            rows = book.history(target, limit=5)
+            if not rows:
+                await self.bot.send_clamped(ctx, f"Ledger -> no recent entries for @{target}.")
+                return
+            parts = []
+            for ts, _user, pts, cash, reason, other in rows:
+                when = datetime.fromtimestamp(ts).strftime("%H:%M:%S")
+                delta = " ".join(f"{v:+}{unit}" for v, unit in ((pts, "pts"), (cash, "cash")) if v)
+                parts.append(f"{when} {reason} {delta}" + (f" ↔ @{other}" if other else ""))
+            await self.bot.send_clamped(ctx, f"Ledger @{target} -> " + " | ".join(parts))
+            return
+
+        totals = sorted(book.totals().items(), key=lambda kv: -kv[1]["count"])
+        if not totals:
+            await self.bot.send_clamped(ctx, "Ledger -> nothing recorded yet this session.")
+            return
+        parts = [f"{reason}: {t['count']}× {t['points']:+}pts {t['cash']:+}cash" for reason, t in totals]
+        await self.bot.send_clamped(ctx, f"Ledger (pending {book.pending()}) -> " + " | ".join(parts))
+
 
     def _is_mod_or_owner(self, ctx):
         return self.bot.is_channel_owner(ctx.author.name.lower()) or ctx.author.is_mod
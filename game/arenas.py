@@ -0,0 +1,140 @@
+"""Boss-battle arenas: several BossBattles running side by side.
+
+The bot used to hold one `ongoing_battle` slot behind a 5-member cap and a
+global 5-minute cooldown, so on a busy stream most viewers never got a fight.
+ArenaManager keeps a fixed set of numbered arenas. Each one has its own
+battle, team, cooldown, turn loop and overlay channel. A player belongs to
+at most one arena at a time. They are bound when they join and released
+when that arena's battle closes, so falling in one fight doesn't free them
+to join another mid-battle.
+
+Everything here is synchronous and runs on the bot's single event loop, so
+`start`/`join` can't interleave. Player records are only touched under the
+per-player locks (bot/player_locks.py); there is no arena-wide or roster-wide
+lock.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+from datetime import datetime, timedelta
+
+from game.battle import BossBattle
+
+DEFAULT_ARENAS = 3
+DEFAULT_ARENA = "1"
+TEAM_CAP = 5
+COOLDOWN = timedelta(minutes=5)
+
+
+class Arena:
+    """One numbered arena: its current battle (if any) and last start time."""
+
+    def __init__(self, arena_id: str):
+        self.id = arena_id
+        self.battle: BossBattle | None = None
+        self.last_start = datetime.min
+
+    def cooldown_left(self, now: datetime, cooldown: timedelta = COOLDOWN) -> timedelta:
+        return max(timedelta(0), self.last_start + cooldown - now)
+
+    def cooldown_until(self, cooldown: timedelta = COOLDOWN) -> datetime | None:
+        """When this arena can host its next battle (None if never used)."""
+        if self.last_start == datetime.min:
+            return None
+        return self.last_start + cooldown
+
+
+class ArenaManager:
+    """Numbered arenas plus the username → arena binding."""
+
+    def __init__(self, count: int = DEFAULT_ARENAS, cooldown: timedelta = COOLDOWN,
+                 team_cap: int = TEAM_CAP):
+        self.cooldown = cooldown
+        self.team_cap = team_cap
+        self.arenas = {str(i): Arena(str(i)) for i in range(1, max(1, count) + 1)}
+        self._member: dict[str, str] = {}
+
+    def __iter__(self):
+        return iter(self.arenas.values())
+
+    def get(self, arena_id) -> Arena | None:
+        return self.arenas.get(str(arena_id or "").strip().lstrip("#"))
+
+    def active(self) -> list[Arena]:
+        return [a for a in self if a.battle is not None]
+
+    def arena_of(self, username: str) -> Arena | None:
+        arena_id = self._member.get(username)
+        return self.arenas[arena_id] if arena_id else None
+
+    def battle_of(self, username: str) -> BossBattle | None:
+        arena = self.arena_of(username)
+        return arena.battle if arena else None
+
+    # -- lifecycle ------------------------------------------------------------
+    def start(self, arena_id=None, boss_name: str = "b7h30",
+              now: datetime | None = None) -> tuple[Arena | None, str]:
+        """Open a battle in `arena_id`, or in the first free arena off
+        cooldown. Returns (arena, "") or (None, reason)."""
+        now = now or datetime.now()
+        if arena_id:
+            arena = self.get(arena_id)
+            if arena is None:
+                return None, f"No arena {arena_id} — arenas are {', '.join(self.arenas)}."
+            if arena.battle is not None:
+                return None, f"Arena {arena.id} already has a battle in progress!"
+            left = arena.cooldown_left(now, self.cooldown)
+            if left:
+                return None, (f"Arena {arena.id} is cooling down — "
+                              f"{int(left.total_seconds() // 60)} minutes left.")
+            candidates = [arena]
+        else:
+            candidates = [a for a in self
+                          if a.battle is None and not a.cooldown_left(now, self.cooldown)]
+            if not candidates:
+                if all(a.battle is not None for a in self):
+                    return None, "Every arena already has a battle in progress!"
+                soonest = min(a.cooldown_left(now, self.cooldown) for a in self if a.battle is None)
+                return None, (f"Please wait {int(soonest.total_seconds() // 60)} minutes "
+                              f"before starting another boss battle!")
+        arena = candidates[0]
+        arena.battle = BossBattle(boss_name=boss_name)
+        arena.last_start = now
+        return arena, ""
+
+    def join(self, username: str, arena_id=None) -> tuple[Arena | None, str]:
+        """Bind `username` to an arena in its join phase: `arena_id`, or the
+        first open one with room. Returns (arena, "") or (None, reason). The
+        caller adds them to `arena.battle.challenger_team`."""
+        current = self.arena_of(username)
+        if current is not None:
+            return None, f"You're already in arena {current.id}'s battle!"
+        if arena_id:
+            arena = self.get(arena_id)
+            if arena is None or arena.battle is None or not arena.battle.join_phase:
+                return None, f"Arena {arena_id} has no battle to join right now!"
+            if len(arena.battle.challenger_team) >= self.team_cap:
+                return None, f"Arena {arena.id}'s team is full!"
+        else:
+            open_ = [a for a in self if a.battle is not None and a.battle.join_phase]
+            if not open_:
+                return None, "No battle to join right now!"
+            roomy = [a for a in open_ if len(a.battle.challenger_team) < self.team_cap]
+            if not roomy:
+                return None, "The team is full!"
+            arena = roomy[0]
+        self._member[username] = arena.id
+        return arena, ""
+
+    def unbind(self, username: str) -> None:
+        """Drop a binding made by `join` whose team add didn't go through."""
+        self._member.pop(username, None)
+
+    def close(self, arena_id) -> BossBattle | None:
+        """End the arena's battle and release everyone bound to it."""
+        arena = self.get(arena_id)
+        if arena is None:
+            return None
+        battle, arena.battle = arena.battle, None
+        for name in [u for u, a in self._member.items() if a == arena.id]:
+            del self._member[name]
+        return battle
@@ -0,0 +1,315 @@
+"""Column-wise analysis of the jail attack log (attack_log.jsonl + segments).
+
+The speed-penalty tunables in game/jail.py (SPEED_THRESHOLDS,
+STRIKES_TO_JAIL, STRIKE_DECAY) are marked "revisit after one stream of
+telemetry". This module does that analysis. It streams the live log and its
+rotated `.jsonl.gz` segments (game/telemetry.py) into NumPy columns, then
+computes the following on whole arrays:
+
+  * per-location and per-level-band gap histograms;
+  * violation and jail rates;
+  * what-if replays of alternative thresholds, strikes-to-jail and decay
+    windows against the recorded traffic.
+
+Closed segments never change, so their parsed columns are cached next to
+them as `<segment>.cols.npz`. Re-running over a season only parses the live
+file and any new segments.
+
+Replay notes:
+  * A row whose gap was under its recorded threshold but wasn't a violation
+    was exempt: Burner Laptop shots or the no-cap window. It stays exempt
+    in every what-if.
+  * Rows the sink sampled carry `"sample": k` and count k times, both in
+    rates and as k back-to-back strikes.
+  * Rows judged by a rate-limit engine (`"limiter": "bucket"|"window"`,
+    game/speed_limits.py) have no gap threshold. They are read with a NaN
+    threshold and keep their recorded verdict, unless a {location: seconds}
+    override replays a gap threshold over them.
+  * The replay can't un-record traffic. A player jailed only in the what-if
+    is assumed to keep clicking, so extra jails are an upper bound.
+
+NumPy is a dev-only dependency (not in requirements.txt); the bot never
+imports this module. Run it with `python3 scripts/analyze_attack_log.py`.
+"""
+import glob
+import gzip
+import json
+import os
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+
+import numpy as np
+
+from game.telemetry import segment_glob
+from game import jail
+
+CHUNK_ROWS = 500_000
+CACHE_SUFFIX = ".cols.npz"
+GAP_BINS = (0.0, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0, 2.0, 5.0, 10.0, 60.0, np.inf)
+LEVEL_BANDS = (10, 100, 1_000, 10_000)          # band edges: <10, 10–99, ... , ≥10000
+
+
+@dataclass
+class Columns:
+    """One log's rows as parallel arrays. `user`/`loc` index `users`/`locations`."""
+    ts: np.ndarray              # float64 epoch seconds
+    user: np.ndarray            # int32
+    level: np.ndarray           # int64
+    loc: np.ndarray             # int16
+    gap: np.ndarray             # float64, NaN = first attack at that location
+    threshold: np.ndarray       # float64, NaN = no gap limit (none, or an engine)
+    violation: np.ndarray       # bool
+    jailed: np.ndarray          # bool
+    weight: np.ndarray          # int32, >1 for sampled rows
+    users: list
+    locations: list
+
+    def __len__(self) -> int:
+        return int(self.ts.size)
+
+    @property
+    def exempt(self) -> np.ndarray:
+        """Under the recorded threshold yet not a violation (laptop / no-cap)."""
+        with np.errstate(invalid="ignore"):
+            return ~self.violation & (self.gap < self.threshold)
+
+
+_ARRAYS = [f.name for f in fields(Columns) if f.name not in ("users", "locations")]
+
+
+def _empty() -> Columns:
+    return Columns(np.zeros(0), np.zeros(0, np.int32), np.zeros(0, np.int64),
+                   np.zeros(0, np.int16), np.zeros(0), np.zeros(0), np.zeros(0, bool),
+                   np.zeros(0, bool), np.zeros(0, np.int32), [], [])
+
+
+def concat(parts: list) -> Columns:
+    """Join Columns from several files, re-coding users and locations."""
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return _empty()
+    users, locations = {}, {}
+    user_cols, loc_cols = [], []
+    for p in parts:
+        umap = np.array([users.setdefault(u, len(users)) for u in p.users] or [0], np.int32)
+        lmap = np.array([locations.setdefault(l, len(locations)) for l in p.locations] or [0], np.int16)
+        user_cols.append(umap[p.user])
+        loc_cols.append(lmap[p.loc])
+    out = {name: np.concatenate([getattr(p, name) for p in parts]) for name in _ARRAYS}
+    out["user"] = np.concatenate(user_cols)
+    out["loc"] = np.concatenate(loc_cols)
+    return Columns(**out, users=list(users), locations=list(locations))
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def log_files(path: str) -> list:
+    """The log at `path` in time order: closed segments oldest first, then the
+    live file. A directory means its attack_log.jsonl."""
+    if os.path.isdir(path):
+        path = os.path.join(path, "attack_log.jsonl")
+    files = sorted(glob.glob(segment_glob(path)))
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def _epoch(ts) -> float:
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _parse(lines) -> Columns:
+    """Parse JSONL lines chunk by chunk into Columns. Unparseable lines (a
+    row half-written at the end of the live file) are skipped."""
+    users, locations = {}, {}
+    chunks = []
+    cols = [[] for _ in range(9)]
+
+    def flush():
+        if cols[0]:
+            chunks.append([
+                np.array(cols[0], np.float64), np.array(cols[1], np.int32),
+                np.array(cols[2], np.int64), np.array(cols[3], np.int16),
+                np.array(cols[4], np.float64), np.array(cols[5], np.float64),
+                np.array(cols[6], bool), np.array(cols[7], bool), np.array(cols[8], np.int32),
+            ])
+            for c in cols:
+                c.clear()
+
+    nan = float("nan")
+    for line in lines:
+        try:
+            r = json.loads(line)
+            ts = _epoch(r["ts"])
+        except (ValueError, KeyError, TypeError):
+            continue
+        gap, thr = r.get("gap"), r.get("threshold")
+        if r.get("limiter", "gap") != "gap":
+            thr = None                          # engine verdict, not a gap compare
+        cols[0].append(ts)
+        cols[1].append(users.setdefault(r.get("user", "?"), len(users)))
+        cols[2].append(r.get("level") or 0)
+        cols[3].append(locations.setdefault(r.get("location", "?"), len(locations)))
+        cols[4].append(nan if gap is None else gap)
+        cols[5].append(nan if thr is None else thr)
+        cols[6].append(bool(r.get("violation")))
+        cols[7].append(bool(r.get("jailed")))
+        cols[8].append(r.get("sample", 1))
+        if len(cols[0]) >= CHUNK_ROWS:
+            flush()
+    flush()
+    if not chunks:
+        return _empty()
+    arrays = [np.concatenate(parts) for parts in zip(*chunks)]
+    return Columns(*arrays, users=list(users), locations=list(locations))
+
+
+def read_file(path: str, cache: bool = True) -> Columns:
+    """Columns for one log file (plain or gzipped). Closed `.gz` segments
+    are cached as `<path>.cols.npz` and reused while newer than the segment."""
+    cache_path = path + CACHE_SUFFIX
+    closed = path.endswith(".gz")
+    if cache and closed and os.path.exists(cache_path) \
+            and os.path.getmtime(cache_path) >= os.path.getmtime(path):
+        with np.load(cache_path, allow_pickle=False) as z:
+            return Columns(**{n: z[n] for n in _ARRAYS},
+                           users=z["users"].tolist(), locations=z["locations"].tolist())
+    opener = gzip.open if closed else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        cols = _parse(f)
+    if cache and closed:
+        try:
+            with open(cache_path, "wb") as out:
+                np.savez(out, **{n: getattr(cols, n) for n in _ARRAYS},
+                         users=np.array(cols.users, dtype=str),
+                         locations=np.array(cols.locations, dtype=str))
+        except OSError:
+            pass
+    return cols
+
+
+def load(paths, cache: bool = True) -> Columns:
+    """Every row from `paths` (log paths, directories or single files)."""
+    files = []
+    for p in paths:
+        files.extend(log_files(p) if os.path.isdir(p) or not p.endswith(".gz") else [p])
+    return concat([read_file(f, cache) for f in dict.fromkeys(files)])
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+def level_band_labels(bands=LEVEL_BANDS) -> list:
+    edges = [0, *bands]
+    labels = [f"{lo}-{hi - 1}" for lo, hi in zip(edges, edges[1:])]
+    return labels + [f"{edges[-1]}+"]
+
+
+def location_report(cols: Columns, bands=LEVEL_BANDS) -> list:
+    """One row per (location, level band) plus an "all" band per location:
+    weighted attacks, violation and jail rates and gap percentiles."""
+    band = np.digitize(cols.level, bands)
+    labels = level_band_labels(bands)
+    w = cols.weight
+    out = []
+    for code, name in sorted(enumerate(cols.locations), key=lambda kv: kv[1]):
+        at = cols.loc == code
+        for b, label in [(None, "all"), *enumerate(labels)]:
+            m = at if b is None else at & (band == b)
+            n = int(w[m].sum())
+            if not n:
+                continue
+            gaps = cols.gap[m & ~np.isnan(cols.gap)]
+            pct = np.percentile(gaps, (1, 5, 50)) if gaps.size else (np.nan,) * 3
+            out.append({
+                "location": name, "levels": label, "attacks": n,
+                "users": int(np.unique(cols.user[m]).size),
+                "violation_rate": float(w[m & cols.violation].sum()) / n,
+                "jail_rate": float(w[m & cols.jailed].sum()) / n,
+                "gap_p1": float(pct[0]), "gap_p5": float(pct[1]), "gap_p50": float(pct[2]),
+            })
+    return out
+
+
+def gap_histograms(cols: Columns, bins=GAP_BINS, bands=LEVEL_BANDS) -> dict:
+    """{(location, level band label): weighted counts per gap bin}."""
+    band = np.digitize(cols.level, bands)
+    labels = level_band_labels(bands)
+    has_gap = ~np.isnan(cols.gap)
+    out = {}
+    for code, name in enumerate(cols.locations):
+        for b, label in enumerate(labels):
+            m = has_gap & (cols.loc == code) & (band == b)
+            if m.any():
+                out[(name, label)] = np.histogram(cols.gap[m], bins=bins, weights=cols.weight[m])[0]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# What-if replay
+# ---------------------------------------------------------------------------
+
+def _thresholds(cols: Columns, threshold) -> np.ndarray:
+    """Per-row threshold under the what-if. `threshold` is None (as
+    recorded), one float for every rate-limited location, or a
+    {location: float} override."""
+    if threshold is None:
+        return cols.threshold
+    if isinstance(threshold, dict):
+        per_loc = np.array([threshold.get(name, np.nan) for name in cols.locations] or [np.nan])
+        new = per_loc[cols.loc]
+        return np.where(np.isnan(new), cols.threshold, new)
+    return np.where(np.isnan(cols.threshold), np.nan, float(threshold))
+
+
+def what_if(cols: Columns, threshold=None, strikes: int = jail.STRIKES_TO_JAIL,
+            decay_seconds: float = jail.STRIKE_DECAY.total_seconds()) -> dict:
+    """Replay the strike/jail rules with other tunables over the recorded rows.
+
+    Violations are found column-wise. Only violating rows go through the
+    per-user strike state machine, in (user, time) order. Rows left without
+    a gap threshold keep their recorded verdict (engine-limited rows; rows
+    at unlimited locations never violate).
+    """
+    thr = _thresholds(cols, threshold)
+    with np.errstate(invalid="ignore"):
+        violating = ((cols.gap < thr) & ~cols.exempt) | (np.isnan(thr) & cols.violation)
+    idx = np.flatnonzero(violating)
+    order = idx[np.lexsort((cols.ts[idx], cols.user[idx]))]
+    users, times, weights = cols.user[order], cols.ts[order], cols.weight[order]
+
+    jails = 0
+    jailed_users = set()
+    cur_user, count, last = -1, 0, -np.inf
+    for u, t, w in zip(users.tolist(), times.tolist(), weights.tolist()):
+        if u != cur_user:
+            cur_user, count, last = u, 0, -np.inf
+        if round(t - last, 6) >= decay_seconds:     # µs precision, as logged
+            count = 0
+        count += w
+        last = t
+        if count >= strikes:
+            jails += count // strikes
+            count %= strikes
+            jailed_users.add(u)
+    total = int(cols.weight.sum())
+    return {
+        "threshold": threshold, "strikes": strikes, "decay_seconds": decay_seconds,
+        "attacks": total,
+        "violations": int(weights.sum()),
+        "violation_rate": float(weights.sum()) / total if total else 0.0,
+        "jails": jails,
+        "users_jailed": len(jailed_users),
+    }
+
+
+def sweep(cols: Columns, thresholds=(None,), strikes=(jail.STRIKES_TO_JAIL,),
+          decays=(jail.STRIKE_DECAY.total_seconds(),)) -> list:
+    """`what_if` over every threshold × strikes × decay combination."""
+    return [what_if(cols, t, k, d) for t in thresholds for k in strikes for d in decays]
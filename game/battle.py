@@ -1,4 +1,20 @@
-"""Boss battle game logic."""
+"""Boss battle game logic.
+
+BattleEngine resolves a fight phase by phase (turn start, boss turn, team
+attack) and returns each phase as a list of typed BattleEvents. It does no
+sleeping, overlay pushing or chat. The bot's presenter paces the events onto
+the overlay and chat. `resolve()` runs a whole fight back to back, which
+takes microseconds, for tests and simulations.
+
+Player actions (item buttons, the one-per-battle !hack nuke) are queued on
+the BossBattle and resolved by the engine in batches at two fixed points per
+turn: before the boss acts and before the team attacks. The rules for a
+batch are listed at `action_phase()`.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+import random
+from dataclasses import dataclass, field
 
 # The boss always starts every fight at full health. This is a property of the
 # fight, not of any player record — the boss (b7h30) happens to also exist as an
@@ -33,3 +49,531 @@ class BossBattle:
         self.bonus_points = {}             # {username: extra pts} added at reward time
         self.next_boss_damage = None       # pre-rolled by reveal_boss_damage so reveal is honest
         self.next_boss_target = None       # pre-rolled by reveal_boss_target
+
+        # Item uses and !hack nukes waiting for the engine's next batch point.
+        self.pending_actions = []
+
+    def queue_action(self, action) -> None:
+        self.pending_actions.append(action)
+
+    def queued(self, username, item=None) -> int:
+        """How many of `username`'s actions (optionally: uses of `item`) are waiting."""
+        return sum(1 for a in self.pending_actions
+                   if a.username == username and (item is None or a.item == item))
+
+
+# ---------------------------------------------------------------------------
+# Flavor lines drawn by the engine.
+# ---------------------------------------------------------------------------
+DEATH_TAUNTS = [
+    "Process terminated. Exit code: skill issue.",
+    "Garbage collected. Next.",
+    "404: Hacker not found.",
+    "Connection closed by foreign host.",
+    "Segmentation fault (core dumped).",
+    "CTRL+C accepted. Thread killed.",
+    "That one gets recycled into my botnet. Thanks.",
+    "rm -rf challenger — done.",
+]
+
+TURN_TAUNTS = [
+    "My DDoS has its own DDoS.",
+    "I've already pwned your home router. Just so you know.",
+    "My firewall is literally laughing at you right now.",
+    "Checked your commit history. Oh no.",
+    "I have root on six of your machines already.",
+    "AngyTheo.exe has entered an infinite loop.",
+    "I wrote this ransomware over a lunch break. Took 20 minutes.",
+    "Your OPSEC is giving me second-hand embarrassment.",
+    "I see you're using Metasploit. How... beginner of you.",
+    "The RGB is set to red. You know what that means.",
+]
+
+BOSS_ACTIONS = [
+    "launches a targeted DDoS at @{target}!",
+    "deploys ransomware on @{target}'s rig!",
+    "executes a supply chain attack against @{target}!",
+    "activates defenses specifically against @{target}!",
+    "sets rgb to red and locks eyes on @{target}!",
+    "sends 'AngyTheo' emote directly at @{target}!",
+]
+
+TEAM_ACTIONS = [
+    "executes a SQL injection",
+    "deploys a zero-day exploit",
+    "launches a social engineering attack",
+    "attempts a buffer overflow",
+    "distracts Theo by disparaging the Cleveland Browns",
+]
+
+# ---------------------------------------------------------------------------
+# Tuning. Round 3 widened the boss roll from (10,30) to (15,40) to answer
+# Round 2's team damage buffs, and added the soft enrage below 25% HP.
+# ---------------------------------------------------------------------------
+MAX_TURNS = 15
+BOSS_DAMAGE = (15, 40)
+ENRAGE_BELOW = 0.25
+ENRAGE_MULT = 1.25
+TEAM_DAMAGE = (5, 15)
+TAUNT_CHANCE = 0.5
+
+# Passive items the engine checks (held anywhere in the inventory).
+RASPBERRY_PI = "Elliot Alderson's Raspberry Pi"       # 25%: boss attack fizzles
+PI_CHANCE = 0.25
+LAMBO_KEYS = "Heath Adams' Lambo Keys"                # 35%: targeted holder dodges
+LAMBO_CHANCE = 0.35
+CONSCIOUSNESS_USB = "John Hammond's Consciousness USB"  # one death save per battle
+PASSWORD_CRACKER = "Kevin Mitnick's Password Cracker"   # +15 team damage per holder
+CRACKER_BONUS = 15
+
+
+# ── Boss-battle item effects (Round 2) ───────────────────────────────────────
+# Each entry: {tier, attack_name, damage_range, effect}.
+# `effect` is either None (pure damage) or a discriminated-union dict:
+#   {"type": "max_roll"}                                       — deal top of range
+#   {"type": "crit", "mult": float}                            — multiply rolled damage
+#   {"type": "skip_boss_next_turn", "chance": float}           — chance to skip boss's next attack
+#   {"type": "weakness_next_turn", "reduction": int}           — boss next attack does -N dmg
+#   {"type": "heal_self", "amount": int}                       — heal user
+#   {"type": "heal_random_teammate", "amount": int}            — heal random ally
+#   {"type": "bonus_points", "amount": int}                    — extra points at battle end
+#   {"type": "reveal_boss_damage"}                             — log boss's pre-rolled next dmg
+#   {"type": "reveal_boss_target"}                             — log boss's pre-rolled next target
+#   {"type": "browns_punt"}                                    — cosmetic chance for log gag
+#   {"type": "burner_volley", "shots": N, "per_shot": (lo,hi)} — multi-shot, overrides damage_range
+# BATTLE_DROPS items (Consciousness USB, Raspberry Pi, etc.) are intentionally
+# absent — they remain passive auto-triggers in BattleEngine.
+ITEM_EFFECTS = {
+    # ── Tier 1 — common, damage stamps ───────────────────────────────
+    "Cookies":              {"tier": 1, "attack_name": "Session hijack",       "damage_range": (15, 25),  "effect": None},
+    "Mimikatz":             {"tier": 1, "attack_name": "Credential dump",      "damage_range": (20, 35),  "effect": None},
+    "VX Underground HDD":   {"tier": 1, "attack_name": "Ransomware payload",   "damage_range": (25, 40),  "effect": None},
+
+    # ── Tier 2 — mid-tier, light effects ─────────────────────────────
+    "EvilGinx":             {"tier": 2, "attack_name": "Spear-phish Theo",     "damage_range": (45, 65),  "effect": None},
+    "Nmap":                 {"tier": 2, "attack_name": "Recon scan",           "damage_range": (35, 55),  "effect": {"type": "reveal_boss_damage"}},
+    "Hydra":                {"tier": 2, "attack_name": "Brute force creds",    "damage_range": (45, 65),  "effect": {"type": "max_roll"}},
+    "Shodan API Key":       {"tier": 2, "attack_name": "Banner grab",          "damage_range": (40, 60),  "effect": {"type": "skip_boss_next_turn", "chance": 0.25}},
+    "Kali ISO":             {"tier": 2, "attack_name": "Full toolkit barrage", "damage_range": (55, 75),  "effect": None},
+
+    # ── Tier 3 — marquee, meaningful effects ─────────────────────────
+    "Wireshark":            {"tier": 3, "attack_name": "Packet sniff + inject","damage_range": (50, 80),  "effect": {"type": "reveal_boss_target"}},
+    "Metasploit":           {"tier": 3, "attack_name": "Exploit chain",        "damage_range": (70, 100), "effect": {"type": "crit", "mult": 1.5}},
+    "O.MG Cable":           {"tier": 3, "attack_name": "Hardware backdoor",    "damage_range": (60, 90),  "effect": {"type": "weakness_next_turn", "reduction": 15}},
+    "YubiKey":              {"tier": 3, "attack_name": "Auth bypass",          "damage_range": (65, 95),  "effect": {"type": "skip_boss_next_turn", "chance": 1.0}},
+    "Burner Laptop":        {"tier": 3, "attack_name": "Rapid-fire barrage",   "damage_range": (0, 0),    "effect": {"type": "burner_volley", "shots": 10, "per_shot": (8, 15)}},
+
+    # ── Tier 4 — rare/event, powerful effects ────────────────────────
+    "NES":                  {"tier": 4, "attack_name": "Konami code DDoS",     "damage_range": (85, 115), "effect": {"type": "skip_boss_next_turn", "chance": 0.5}},
+    "Contra Cartridge":     {"tier": 4, "attack_name": "30 lives barrage",     "damage_range": (100, 130),"effect": None},
+    "Golden Cassette Tape": {"tier": 4, "attack_name": "Mixtape mind-fuck",    "damage_range": (90, 110), "effect": {"type": "bonus_points", "amount": 50}},
+    "Jet Black Hoodie":     {"tier": 4, "attack_name": "Vanish + strike",     "damage_range": (90, 120), "effect": {"type": "heal_self", "amount": 30}},
+    "RGB Keyboard (Purple)":{"tier": 4, "attack_name": "Mechanical frenzy",    "damage_range": (100, 140),"effect": None},
+
+    # ── Flavor — low damage, support effects ─────────────────────────
+    "A Fresh Hot Cup of Black Coffee": {"tier": 0, "attack_name": "Caffeinate",        "damage_range": (5, 15),  "effect": {"type": "heal_self", "amount": 15}},
+    "Tiny Browns Helmet":              {"tier": 0, "attack_name": "We punt!",          "damage_range": (8, 18),  "effect": {"type": "browns_punt"}},
+    "Root Beer Flask":                 {"tier": 0, "attack_name": "Patch Tuesday brew","damage_range": (15, 30), "effect": {"type": "heal_random_teammate", "amount": 20}},
+}
+
+
+# ---------------------------------------------------------------------------
+# Rewards. Round 3 roughly doubled the Round 1 values because the boss got
+# harder. The treasury bounty scales with team damage so big fights fund big
+# bail payouts.
+# ---------------------------------------------------------------------------
+BASE_REWARD = 400                 # was 200
+TEAM_SIZE_STEP, TEAM_SIZE_CAP = 100, 400    # was 50, cap 200
+DAMAGE_DIVISOR, DAMAGE_CAP = 25, 200        # was 50, cap 100
+BOUNTY_MULT = 1.5
+TEAM_CAP = 5
+
+
+def victory_reward(survivors: int, team_damage: int) -> int:
+    """Points each survivor earns for a win. Smaller surviving teams earn more."""
+    team_size_bonus = min((TEAM_CAP - survivors) * TEAM_SIZE_STEP, TEAM_SIZE_CAP)
+    damage_bonus = min(team_damage // DAMAGE_DIVISOR, DAMAGE_CAP)
+    return BASE_REWARD + team_size_bonus + damage_bonus
+
+
+def treasury_bounty(team_damage: int) -> int:
+    """Cash credited to the treasury when the boss falls."""
+    return int(team_damage * BOUNTY_MULT)
+
+
+# ---------------------------------------------------------------------------
+# Timeline events. `style` is the overlay log class; `kind` is what the
+# presenter keys pacing, state pushes and chat on.
+# ---------------------------------------------------------------------------
+TURN = "turn"
+SKIP = "skip"
+TAUNT = "taunt"
+PI_BLOCK = "pi"
+BOSS_ATTACK = "boss_attack"
+DODGE = "dodge"
+SAVE = "save"
+DEATH = "death"
+HIT = "hit"
+WIPE = "wipe"
+TEAM_PHASE = "team_phase"
+TEAM_ATTACK = "team_attack"
+CRACKER = "cracker"
+BOSS_HP = "boss_hp"
+ACTIONS = "actions"             # batch header
+ITEM_USE = "item"
+HACK_NUKE = "hack"
+EFFECT = "effect"               # an item's side effect, indented under its use
+FIZZLE = "fizzle"
+ACTIONS_DONE = "actions_done"   # batch footer: boss HP after the burst
+
+
+USE_ITEM, HACK = "use_item", "hack"
+
+HACK_DAMAGE = (30, 60)          # manual !hack
+HACK_TOOL_DAMAGE = (55, 85)     # !hack while holding a hack tool
+RECON_DAMAGE = (20, 70)         # Nmap's pre-rolled next boss hit
+PUNT_CHANCE = 0.3
+
+
+@dataclass(frozen=True)
+class BattleAction:
+    """A queued player action. For HACK, `item` is the hack tool deployed (or None)."""
+    kind: str
+    username: str
+    item: str | None = None
+
+
+@dataclass(frozen=True)
+class BattleEvent:
+    kind: str
+    text: str
+    style: str
+    target: str | None = None
+    amount: int = 0
+    data: dict = field(default_factory=dict, compare=False)
+
+
+class BattleEngine:
+    """Turn resolution for one BossBattle.
+
+    `items` answers passive-item questions (game.item_index.ItemIndex or
+    anything with `holds(username, item)` and `holders_among(item, team)`).
+    None means no passives. `rng` defaults to the random module."""
+
+    def __init__(self, battle: BossBattle, items=None, rng=random, max_turns: int = MAX_TURNS,
+                 consume=None, emojis=None):
+        self.battle = battle
+        self.items = items
+        self.rng = rng
+        self.max_turns = max_turns
+        # consume(username, item) -> bool spends one copy of a button item at
+        # resolution time; False (the item is gone) fizzles the use. None
+        # means nothing is tracked (tests, simulations).
+        self.consume = consume
+        self.emojis = emojis or {}
+        self.turn = 0
+
+    # -- queries ------------------------------------------------------------
+    @property
+    def over(self) -> bool:
+        b = self.battle
+        return b.boss_health <= 0 or not b.challenger_team or self.turn >= self.max_turns
+
+    @property
+    def victory(self) -> bool:
+        return self.battle.boss_health <= 0
+
+    def _holds(self, username: str, item: str) -> bool:
+        return self.items is not None and self.items.holds(username, item)
+
+    def _holders(self, item: str) -> list[str]:
+        if self.items is None:
+            return []
+        return self.items.holders_among(item, self.battle.challenger_team)
+
+    # -- phases -------------------------------------------------------------
+    def begin_turn(self) -> list[BattleEvent]:
+        self.turn += 1
+        return [BattleEvent(TURN, f"⚔️ Turn {self.turn} ⚔️", "info", amount=self.turn)]
+
+    def boss_phase(self) -> list[BattleEvent]:
+        """The boss acts: skip, taunt, then one attack on one challenger
+        (Raspberry Pi fizzle, Lambo dodge, Consciousness USB save)."""
+        b, rng = self.battle, self.rng
+        events = []
+        # Round 2: item-triggered skip (YubiKey / NES / Shodan procs).
+        if b.skip_boss_turns > 0:
+            b.skip_boss_turns -= 1
+            return [BattleEvent(SKIP, f"⏭️ {b.boss_name}'s turn skipped — too dazed to attack.", "buff")]
+
+        if rng.random() < TAUNT_CHANCE:
+            events.append(BattleEvent(TAUNT, f"💀 {b.boss_name}: {rng.choice(TURN_TAUNTS)}", "taunt"))
+
+        pi_holders = self._holders(RASPBERRY_PI)
+        if pi_holders and rng.random() < PI_CHANCE:
+            events.append(BattleEvent(
+                PI_BLOCK,
+                f"🫐 @{rng.choice(pi_holders)}'s Raspberry Pi runs interference — "
+                f"boss attack short-circuited this turn!", "pi"))
+        else:
+            events.extend(self._boss_attack())
+
+        if not b.challenger_team:
+            events.append(BattleEvent(WIPE, "All challengers have been defeated!", "defeat"))
+        return events
+
+    def _boss_attack(self) -> list[BattleEvent]:
+        b, rng = self.battle, self.rng
+        # Honor any Wireshark-revealed target, then any Nmap-revealed damage.
+        if b.next_boss_target and b.next_boss_target in b.challenger_team:
+            target = b.next_boss_target
+        else:
+            target = rng.choice(list(b.challenger_team.keys()))
+        b.next_boss_target = None
+        if b.next_boss_damage is not None:
+            damage = b.next_boss_damage
+            b.next_boss_damage = None
+        else:
+            damage = rng.randint(*BOSS_DAMAGE)
+        if 0 < b.boss_health < b.boss_max_health * ENRAGE_BELOW:
+            damage = int(damage * ENRAGE_MULT)
+        # O.MG Cable weakness debuff applies to THIS turn's attack, then resets.
+        if b.weakness_next_turn > 0:
+            damage = max(0, damage - b.weakness_next_turn)
+            b.weakness_next_turn = 0
+        action = rng.choice(BOSS_ACTIONS).format(target=target)
+        events = [BattleEvent(BOSS_ATTACK, f"🔥 {b.boss_name} {action}", "damage",
+                              target=target, amount=damage)]
+
+        if self._holds(target, LAMBO_KEYS) and rng.random() < LAMBO_CHANCE:
+            events.append(BattleEvent(DODGE, f"🏎️ @{target} floors it in the Lambo — attack missed!",
+                                      "dodge", target=target))
+            return events
+
+        new_health = max(0, b.challenger_team[target] - damage)
+        if new_health > 0:
+            b.challenger_team[target] = new_health
+            events.append(BattleEvent(HIT, f"@{target} takes {damage} damage! ({new_health} HP remaining)",
+                                      "damage", target=target, amount=damage))
+        elif self._holds(target, CONSCIOUSNESS_USB) and target not in b.consciousness_used:
+            b.consciousness_used.add(target)
+            b.challenger_team[target] = 1
+            events.append(BattleEvent(
+                SAVE, f"🧠 @{target}'s Consciousness USB kicks in — "
+                      f"mind transferred to backup! Survives at 1 HP!", "save", target=target))
+        else:
+            taunt = rng.choice(DEATH_TAUNTS)
+            del b.challenger_team[target]
+            b.fallen.append(target)
+            events.append(BattleEvent(DEATH, f"☠️ @{target} has fallen! | 💀 {b.boss_name}: {taunt}",
+                                      "death", target=target, amount=damage))
+        return events
+
+    def team_phase(self) -> list[BattleEvent]:
+        """Every standing challenger hits the boss, plus Password Cracker bonus."""
+        b, rng = self.battle, self.rng
+        events = [BattleEvent(TEAM_PHASE, "🗡️ Team attack phase:", "info")]
+        total = 0
+        for name in b.challenger_team:
+            dmg = rng.randint(*TEAM_DAMAGE)
+            total += dmg
+            b.team_damage += dmg
+            b.per_player_damage[name] = b.per_player_damage.get(name, 0) + dmg
+            events.append(BattleEvent(TEAM_ATTACK, f"@{name} {rng.choice(TEAM_ACTIONS)} for {dmg} damage!",
+                                      "team", target=name, amount=dmg))
+        crackers = self._holders(PASSWORD_CRACKER)
+        if crackers:
+            bonus = len(crackers) * CRACKER_BONUS
+            total += bonus
+            b.team_damage += bonus
+            holder_str = ", ".join(f"@{p}" for p in crackers)
+            events.append(BattleEvent(
+                CRACKER, f"🔓 Password Cracker{'s' if len(crackers) > 1 else ''} "
+                         f"({holder_str}) — +{bonus} bonus damage!", "cracker", amount=bonus))
+        b.boss_health = max(0, b.boss_health - total)
+        events.append(BattleEvent(
+            BOSS_HP, f"Boss HP: {b.boss_health} | Team members remaining: {len(b.challenger_team)}",
+            "info", amount=total))
+        return events
+
+    # -- player actions -----------------------------------------------------
+    def action_phase(self) -> list[BattleEvent]:
+        """Resolve every queued action as one batch. Returns [] if none
+        were queued, else an ACTIONS header, the actions' events and an
+        ACTIONS_DONE footer.
+
+        Rules:
+          * Order is round-robin by player. Players go in the order of their
+            first queued action; each player's first action resolves, then
+            each player's second, and so on. Mashing a button can't push
+            someone else's single action behind a whole stack.
+          * An action by a player who has fallen by the batch point fizzles.
+          * Items are spent when they resolve, not when queued. A fizzled or
+            discarded use costs nothing, and a fizzled !hack is handed back.
+          * Once the boss is down, the rest of the batch fizzles. The killing
+            blow belongs to whoever came first in the order.
+        """
+        b = self.battle
+        pending, b.pending_actions = b.pending_actions, []
+        if not pending:
+            return []
+        events = [BattleEvent(ACTIONS, f"⚡ {len(pending)} action{'s' if len(pending) != 1 else ''} "
+                                       f"resolve:", "info", amount=len(pending))]
+        health_before = b.boss_health
+        for action in fair_order(pending):
+            if b.boss_health <= 0:
+                events.append(self._fizzle(action, f"{b.boss_name} is already down"))
+            elif action.username not in b.challenger_team:
+                events.append(self._fizzle(action, "fallen before it landed"))
+            elif action.kind == HACK:
+                events.append(self._hack(action))
+            else:
+                events.extend(self._use_item(action))
+        burst = health_before - b.boss_health
+        events.append(BattleEvent(
+            ACTIONS_DONE, f"Boss HP: {b.boss_health} (-{burst} from actions)", "info", amount=burst))
+        return events
+
+    def discard_pending(self) -> int:
+        """Drop actions still queued when the fight ends. Nothing is spent."""
+        b = self.battle
+        for action in b.pending_actions:
+            if action.kind == HACK:
+                b.hack_used.discard(action.username)
+        n, b.pending_actions = len(b.pending_actions), []
+        return n
+
+    def _fizzle(self, action: BattleAction, why: str) -> BattleEvent:
+        if action.kind == HACK:
+            self.battle.hack_used.discard(action.username)
+        what = "!hack" if action.kind == HACK else action.item
+        return BattleEvent(FIZZLE, f"  ⤷ @{action.username}'s {what} fizzles — {why}.", "info",
+                           target=action.username, data={"item": action.item})
+
+    def _hit_boss(self, username: str, damage: int) -> None:
+        b = self.battle
+        b.boss_health = max(0, b.boss_health - damage)
+        b.team_damage += damage
+        b.per_player_damage[username] = b.per_player_damage.get(username, 0) + damage
+
+    def _hack(self, action: BattleAction) -> BattleEvent:
+        b, user = self.battle, action.username
+        if action.item:
+            damage = self.rng.randint(*HACK_TOOL_DAMAGE)
+            text = f"@{user} deploys {action.item}! CRITICAL HIT — {damage} damage to {b.boss_name}!"
+        else:
+            damage = self.rng.randint(*HACK_DAMAGE)
+            text = f"@{user} launches a manual hack — {damage} damage to {b.boss_name}!"
+        self._hit_boss(user, damage)
+        return BattleEvent(HACK_NUKE, text, "hack", target=user, amount=damage)
+
+    def _use_item(self, action: BattleAction) -> list[BattleEvent]:
+        """One ITEM_EFFECTS button: roll damage, apply the side effect."""
+        b, rng, user, item = self.battle, self.rng, action.username, action.item
+        spec = ITEM_EFFECTS[item]
+        if self.consume is not None and not self.consume(user, item):
+            return [self._fizzle(action, "no longer in the inventory")]
+
+        lo, hi = spec["damage_range"]
+        effect = spec.get("effect") or {}
+        etype = effect.get("type")
+        damage = rng.randint(lo, hi) if lo or hi else 0
+        note = ""
+        if etype == "max_roll":
+            damage = hi
+        elif etype == "crit":
+            damage = int(damage * effect.get("mult", 1.5))
+            note = " — CRIT!"
+        elif etype == "burner_volley":
+            plo, phi = effect["per_shot"]
+            damage = sum(rng.randint(plo, phi) for _ in range(effect["shots"]))
+            note = f" ({effect['shots']} hits)"
+        self._hit_boss(user, damage)
+
+        emoji = self.emojis.get(item, "📦")
+        events = [BattleEvent(ITEM_USE, f"{emoji} @{user} → {spec['attack_name']}{note} — "
+                                        f"{damage} dmg to {b.boss_name}!", "item",
+                              target=user, amount=damage, data={"item": item})]
+        line = self._item_effect(user, etype, effect)
+        if line:
+            events.append(BattleEvent(EFFECT, f"  ⤷ {line[0]}", line[1], target=user))
+        return events
+
+    def _item_effect(self, user: str, etype, effect: dict):
+        """Apply a side effect; returns (log line, style) or None."""
+        b, rng = self.battle, self.rng
+        if etype == "skip_boss_next_turn":
+            if rng.random() < effect.get("chance", 1.0):
+                b.skip_boss_turns += 1
+                return f"{b.boss_name} is stunned — skipping their next turn!", "buff"
+        elif etype == "weakness_next_turn":
+            b.weakness_next_turn += effect["reduction"]
+            return f"{b.boss_name} weakened — next attack does -{effect['reduction']} dmg.", "buff"
+        elif etype == "heal_self":
+            return self._heal(user, effect["amount"]), "heal"
+        elif etype == "heal_random_teammate":
+            others = [u for u in b.challenger_team if u != user and b.challenger_team[u] > 0]
+            if not others:
+                return "No teammates left to heal.", "info"
+            return self._heal(rng.choice(others), effect["amount"], healed=True), "heal"
+        elif etype == "bonus_points":
+            b.bonus_points[user] = b.bonus_points.get(user, 0) + effect["amount"]
+            return f"@{user} pockets +{effect['amount']} bonus pts at battle end.", "buff"
+        elif etype == "reveal_boss_damage":
+            # Pre-roll the boss's next-turn damage so the reveal is honest.
+            b.next_boss_damage = rng.randint(*RECON_DAMAGE)
+            return f"Recon: {b.boss_name}'s next attack will hit for {b.next_boss_damage} dmg.", "reveal"
+        elif etype == "reveal_boss_target":
+            alive = [u for u in b.challenger_team if b.challenger_team[u] > 0]
+            if alive:
+                b.next_boss_target = rng.choice(alive)
+                return f"Sniff: {b.boss_name} is targeting @{b.next_boss_target} next turn.", "reveal"
+        elif etype == "browns_punt":
+            if rng.random() < PUNT_CHANCE:
+                return f"{b.boss_name} laughs at the tiny helmet. The Browns punt.", "gag"
+        return None
+
+    def _heal(self, target: str, amount: int, healed: bool = False) -> str:
+        b = self.battle
+        max_hp = b.player_max_health.get(target, b.challenger_team[target])
+        new_hp = min(max_hp, b.challenger_team[target] + amount)
+        gained = new_hp - b.challenger_team[target]
+        b.challenger_team[target] = new_hp
+        verb = "healed for" if healed else "heals"
+        return f"@{target} {verb} +{gained} HP ({new_hp}/{max_hp})."
+
+    # -- whole turns ----------------------------------------------------------
+    def play_turn(self) -> list[BattleEvent]:
+        """One whole turn: start, actions, boss phase, then (unless the boss
+        was skipped or the team wiped) actions and the team phase."""
+        events = self.begin_turn() + self.action_phase()
+        if self.victory:
+            return events
+        boss = self.boss_phase()
+        events += boss
+        if boss[-1].kind in (SKIP, WIPE):
+            return events
+        events += self.action_phase()
+        if self.victory:
+            return events
+        return events + self.team_phase()
+
+    def resolve(self) -> list[BattleEvent]:
+        """Run the fight to the end with no pacing; returns the full timeline."""
+        timeline = []
+        while not self.over:
+            timeline += self.play_turn()
+        self.discard_pending()
+        return timeline
+
+
+def fair_order(actions: list[BattleAction]) -> list[BattleAction]:
+    """Round-robin by player, players in order of their first action."""
+    per_player: dict[str, list[BattleAction]] = {}
+    for action in actions:
+        per_player.setdefault(action.username, []).append(action)
+    ordered = []
+    depth = max(len(q) for q in per_player.values()) if per_player else 0
+    for i in range(depth):
+        ordered.extend(q[i] for q in per_player.values() if i < len(q))
+    return ordered
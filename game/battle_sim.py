@@ -0,0 +1,245 @@
+"""Monte-Carlo boss-battle balance simulator (NumPy-batched).
+
+Balance rounds ("Round 2" item buffs, "Round 3" boss HP 1500, damage 15–40,
+soft enrage at 25% and doubled rewards) were tuned by feel. This module
+runs many seeded battles per team composition at once: every roll for every
+battle in a turn is one array operation. It reports win rate, turns to
+kill, deaths, rewards and treasury bounties.
+
+The rules mirror BattleEngine (game/battle.py) and use the same tuning
+constants and reward formulas. That includes the item-button batch: once a
+press drops the boss, the rest of the batch fizzles and the turn ends there,
+with no boss attack and no team phase. Two simplifications are needed to
+batch:
+  * Flavor rolls (taunts, action lines) are skipped; they don't affect play.
+  * Item buttons follow a fixed plan. Each living player presses at most one
+    ITEM_EFFECTS item per turn, in `Composition.items` order, in the batch
+    before the boss acts. Live players press whenever they like, so the simulator
+    answers "what if the team spends its kit early".
+
+NumPy is a dev-only dependency (not in requirements.txt); the bot never
+imports this module. Run a sweep with `python3 scripts/sim_battles.py`.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from game import battle as rules
+
+
+@dataclass(frozen=True)
+class Composition:
+    """One team to simulate."""
+    hp: tuple[int, ...]                          # join-time HP (= max HP) per player
+    items: tuple[tuple[str, ...], ...] = ()      # per player: inventory (passives + buttons)
+    boss_health: int = rules.BOSS_MAX_HEALTH
+
+    @property
+    def size(self) -> int:
+        return len(self.hp)
+
+    def holds(self, player: int, item: str) -> bool:
+        return player < len(self.items) and item in self.items[player]
+
+    def button_plan(self, player: int) -> list[str]:
+        """The ITEM_EFFECTS items this player presses, in order."""
+        if player >= len(self.items):
+            return []
+        return [i for i in self.items[player] if i in rules.ITEM_EFFECTS]
+
+    def label(self) -> str:
+        kit = sum(len(self.button_plan(p)) for p in range(self.size))
+        passives = sum(1 for p in range(self.size) for i in (self.items[p] if p < len(self.items) else ())
+                       if i not in rules.ITEM_EFFECTS)
+        return f"{self.size}p hp{min(self.hp)}-{max(self.hp)} items:{kit} passives:{passives}"
+
+
+@dataclass
+class SimResult:
+    composition: Composition
+    n: int
+    won: np.ndarray                 # bool  (n,)
+    turns: np.ndarray               # int   (n,) turns played
+    deaths: np.ndarray              # int   (n,)
+    survivors: np.ndarray           # int   (n,)
+    team_damage: np.ndarray         # int   (n,)
+    reward: np.ndarray              # int   (n,) points per survivor (0 on loss)
+    bounty: np.ndarray              # int   (n,) treasury credit (0 on loss)
+    bonus_points: np.ndarray        # int   (n,) item bonus pts, paid win or lose
+    extra: dict = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        won = self.won
+        win_turns = self.turns[won]
+        pct = (lambda a, q: float(np.percentile(a, q)) if a.size else float("nan"))
+        return {
+            "composition": self.composition.label(),
+            "n": self.n,
+            "win_rate": float(won.mean()),
+            "turns_to_kill_mean": float(win_turns.mean()) if win_turns.size else float("nan"),
+            "turns_to_kill_p50": pct(win_turns, 50),
+            "turns_to_kill_p90": pct(win_turns, 90),
+            "deaths_mean": float(self.deaths.mean()),
+            "wipe_rate": float((self.survivors == 0).mean()),
+            "reward_per_survivor_mean": float(self.reward[won].mean()) if won.any() else 0.0,
+            "team_points_mean": float((self.reward * self.survivors + self.bonus_points).mean()),
+            "bounty_mean": float(self.bounty.mean()),
+            "bounty_p10": pct(self.bounty[won], 10),
+            "bounty_p50": pct(self.bounty[won], 50),
+            "bounty_p90": pct(self.bounty[won], 90),
+        }
+
+
+def _pick(rng, mask: np.ndarray) -> np.ndarray:
+    """Uniform random column among True entries of each row (-1 if none)."""
+    keys = rng.random(mask.shape)
+    keys[~mask] = -1.0
+    col = keys.argmax(axis=1)
+    col[~mask.any(axis=1)] = -1
+    return col
+
+
+def simulate(comp: Composition, n: int = 100_000, seed: int | None = 0,
+             max_turns: int = rules.MAX_TURNS) -> SimResult:
+    """Run `n` independent battles for one composition."""
+    rng = np.random.default_rng(seed)
+    T = comp.size
+    rows = np.arange(n)
+    max_hp = np.asarray(comp.hp, dtype=np.int64)
+    hp = np.tile(max_hp, (n, 1))
+    alive = np.ones((n, T), dtype=bool)
+    usb_used = np.zeros((n, T), dtype=bool)
+    boss = np.full(n, comp.boss_health, dtype=np.int64)
+    team_damage = np.zeros(n, dtype=np.int64)
+    bonus = np.zeros(n, dtype=np.int64)
+    skip = np.zeros(n, dtype=np.int64)
+    weakness = np.zeros(n, dtype=np.int64)
+    next_damage = np.full(n, -1, dtype=np.int64)
+    next_target = np.full(n, -1, dtype=np.int64)
+    turns = np.zeros(n, dtype=np.int64)
+
+    hold = {item: np.array([comp.holds(p, item) for p in range(T)])
+            for item in (rules.RASPBERRY_PI, rules.LAMBO_KEYS,
+                         rules.CONSCIOUSNESS_USB, rules.PASSWORD_CRACKER)}
+    plans = [comp.button_plan(p) for p in range(T)]
+
+    for turn in range(max_turns):
+        active = (boss > 0) & alive.any(axis=1)
+        if not active.any():
+            break
+        turns += active
+
+        # -- item buttons (one per living player, plan order) ------------------
+        for p in range(T):
+            if turn >= len(plans[p]):
+                continue
+            spec = rules.ITEM_EFFECTS[plans[p][turn]]
+            users = active & alive[:, p]
+            if not users.any():
+                continue
+            _press(rng, spec, p, users, hp, alive, max_hp, boss, team_damage,
+                   bonus, skip, weakness, next_damage, next_target)
+            active &= boss > 0          # a kill ends the batch and the turn
+
+        # -- boss phase ---------------------------------------------------------
+        skipped = active & (skip > 0)
+        skip[skipped] -= 1
+        attacking = active & ~skipped
+        pi = (alive & hold[rules.RASPBERRY_PI]).any(axis=1)
+        attacking &= ~(pi & (rng.random(n) < rules.PI_CHANCE))
+
+        target = _pick(rng, alive)
+        revealed = (next_target >= 0)
+        revealed_ok = revealed & alive[rows, np.maximum(next_target, 0)]
+        target = np.where(attacking & revealed_ok, next_target, target)
+        next_target[attacking] = -1
+
+        dmg = rng.integers(rules.BOSS_DAMAGE[0], rules.BOSS_DAMAGE[1] + 1, size=n)
+        preset = attacking & (next_damage >= 0)
+        dmg = np.where(preset, next_damage, dmg)
+        next_damage[attacking] = -1
+        enraged = (boss > 0) & (boss < comp.boss_health * rules.ENRAGE_BELOW)
+        dmg = np.where(enraged, (dmg * rules.ENRAGE_MULT).astype(np.int64), dmg)
+        weak = attacking & (weakness > 0)
+        dmg = np.where(weak, np.maximum(0, dmg - weakness), dmg)
+        weakness[weak] = 0
+
+        t = np.maximum(target, 0)
+        dodged = hold[rules.LAMBO_KEYS][t] & (rng.random(n) < rules.LAMBO_CHANCE)
+        hit = attacking & (target >= 0) & ~dodged
+        new_hp = hp[rows, t] - dmg
+        lethal = hit & (new_hp <= 0)
+        saved = lethal & hold[rules.CONSCIOUSNESS_USB][t] & ~usb_used[rows, t]
+        killed = lethal & ~saved
+        hp[rows[hit], t[hit]] = np.maximum(0, new_hp[hit])
+        hp[rows[saved], t[saved]] = 1
+        usb_used[rows[saved], t[saved]] = True
+        alive[rows[killed], t[killed]] = False
+
+        # -- team phase (skipped turns and wipes have none) ---------------------
+        fighting = active & ~skipped & alive.any(axis=1)
+        rolls = rng.integers(rules.TEAM_DAMAGE[0], rules.TEAM_DAMAGE[1] + 1, size=(n, T))
+        total = (rolls * alive).sum(axis=1)
+        total += (alive & hold[rules.PASSWORD_CRACKER]).sum(axis=1) * rules.CRACKER_BONUS
+        total = np.where(fighting, total, 0)
+        team_damage += total
+        boss = np.maximum(0, boss - total)
+
+    won = boss <= 0
+    survivors = alive.sum(axis=1)
+    team_size_bonus = np.minimum((rules.TEAM_CAP - survivors) * rules.TEAM_SIZE_STEP,
+                                 rules.TEAM_SIZE_CAP)
+    damage_bonus = np.minimum(team_damage // rules.DAMAGE_DIVISOR, rules.DAMAGE_CAP)
+    reward = np.where(won, rules.BASE_REWARD + team_size_bonus + damage_bonus, 0)
+    bounty = np.where(won, (team_damage * rules.BOUNTY_MULT).astype(np.int64), 0)
+    return SimResult(comp, n, won, turns, T - survivors, survivors, team_damage,
+                     reward, bounty, bonus)
+
+
+def _press(rng, spec, p, users, hp, alive, max_hp, boss, team_damage, bonus,
+           skip, weakness, next_damage, next_target):
+    """Apply one ITEM_EFFECTS button for player `p` in the battles in `users`
+    (the vectorized twin of BattleEngine._use_item)."""
+    n = users.size
+    lo, hi = spec["damage_range"]
+    effect = spec.get("effect") or {}
+    etype = effect.get("type")
+    dmg = rng.integers(lo, hi + 1, size=n) if (lo or hi) else np.zeros(n, dtype=np.int64)
+    if etype == "max_roll":
+        dmg = np.full(n, hi, dtype=np.int64)
+    elif etype == "crit":
+        dmg = (dmg * effect.get("mult", 1.5)).astype(np.int64)
+    elif etype == "burner_volley":
+        plo, phi = effect["per_shot"]
+        dmg = rng.integers(plo, phi + 1, size=(n, effect["shots"])).sum(axis=1)
+    dmg = np.where(users, dmg, 0)
+    boss -= np.minimum(boss, dmg)
+    team_damage += dmg
+
+    if etype == "skip_boss_next_turn":
+        skip += users & (rng.random(n) < effect.get("chance", 1.0))
+    elif etype == "weakness_next_turn":
+        weakness[users] += effect["reduction"]
+    elif etype == "heal_self":
+        hp[users, p] = np.minimum(max_hp[p], hp[users, p] + effect["amount"])
+    elif etype == "heal_random_teammate":
+        others = alive.copy()
+        others[:, p] = False
+        who = _pick(rng, others)
+        ok = users & (who >= 0)
+        r = np.flatnonzero(ok)
+        hp[r, who[ok]] = np.minimum(max_hp[who[ok]], hp[r, who[ok]] + effect["amount"])
+    elif etype == "bonus_points":
+        bonus[users] += effect["amount"]
+    elif etype == "reveal_boss_damage":
+        lo, hi = rules.RECON_DAMAGE
+        next_damage[users] = rng.integers(lo, hi + 1, size=int(users.sum()))
+    elif etype == "reveal_boss_target":
+        who = _pick(rng, alive)
+        next_target[users] = who[users]
+
+
+def sweep(compositions, n: int = 100_000, seed: int = 0) -> list[dict]:
+    """Simulate every composition (each with its own derived seed) and return
+    one summary dict per composition."""
+    return [simulate(c, n, seed + i).summary() for i, c in enumerate(compositions)]
@@ -0,0 +1,134 @@
+"""Timed-curse scheduler: when each held on_tick malicious item fires next.
+
+Timed curses (Metaploit's inventory_drop, the 0.MG Cable's jail_beacon, and
+any later kind with an `interval_sec`) used to be polled by the idle ticker.
+Every tick walked every holder of every timed curse, then swept an in-memory
+{(username, item): due} dict to forget curses no longer held. A restart
+cleared that dict, so every curse got a free cycle.
+
+CurseTimers keeps one min-heap of (due, seq, username, item). The bot's
+deadline loop sleeps until the earliest entry and fires only what is due.
+Entries are scheduled when the curse is acquired and cancelled when the last
+copy leaves the inventory (junk, drop, consume, self-destruct). Both go
+through Player.add_item / remove_item via playerdata.set_curse_timers, so no
+call site has to remember. Cancelled or rescheduled entries stay in the heap
+and are skipped when they surface, because they no longer match the latest
+due time recorded for their (username, item).
+
+Each due time is also written to the player as `curse_due` {item: iso} and
+saved with them. `rebuild()` re-arms from those, so a restart neither resets
+nor duplicates a timer. An overdue curse fires as soon as the loop starts.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+import heapq
+import itertools
+from datetime import datetime, timedelta, timezone
+
+from game.timestamps import epoch_seconds
+
+
+def _now(now: datetime | None) -> datetime:
+    return now or datetime.now(timezone.utc)
+
+
+class CurseTimers:
+    """Min-heap of next-fire times for held timed curses."""
+
+    def __init__(self, intervals: dict[str, float], on_earlier=None):
+        # item name → seconds between firings. Only these items are tracked.
+        self.intervals = dict(intervals)
+        # Same contract as JobScheduler: called when the earliest deadline
+        # moves forward so a sleeping loop can re-arm.
+        self._on_earlier = on_earlier
+        self._heap: list[tuple[float, int, str, str]] = []
+        self._latest: dict[tuple[str, str], float] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def is_timed(self, item: str) -> bool:
+        return item in self.intervals
+
+    def due_at(self, username: str, item: str) -> float | None:
+        return self._latest.get((username, item))
+
+    def _push(self, username: str, item: str, ts: float) -> None:
+        self._latest[(username, item)] = ts
+        earlier = not self._heap or ts < self._heap[0][0]
+        heapq.heappush(self._heap, (ts, next(self._seq), username, item))
+        if earlier and self._on_earlier is not None:
+            self._on_earlier()
+
+    def schedule(self, player, item: str, now: datetime | None = None) -> float | None:
+        """Arm `item` one interval from `now` on `player` (acquisition, or
+        after it fired and should keep going). Returns the due epoch time,
+        or None if `item` isn't a timed curse."""
+        interval = self.intervals.get(item)
+        if interval is None:
+            return None
+        due = _now(now) + timedelta(seconds=interval)
+        player.curse_due[item] = due.isoformat(timespec='seconds')
+        ts = due.replace(microsecond=0).timestamp()
+        self._push(player.username, item, ts)
+        return ts
+
+    def cancel(self, player, item: str) -> bool:
+        """Forget `item`'s timer on `player` (it left the inventory)."""
+        player.curse_due.pop(item, None)
+        return self._latest.pop((player.username, item), None) is not None
+
+    def rebuild(self, player_data: dict, now: datetime | None = None) -> int:
+        """Re-seed from the roster (startup). Persisted due times are kept;
+        a held curse without one is armed a full interval out, and stale
+        entries for curses no longer held are dropped. Returns entries loaded."""
+        self._heap = []
+        self._latest = {}
+        n = _now(now)
+        for username, player in player_data.items():
+            held = set(player.items or [])
+            due = player.curse_due
+            for item in [i for i in due if i not in held or i not in self.intervals]:
+                del due[item]
+            for item in held:
+                if item not in self.intervals:
+                    continue
+                ts = epoch_seconds(due.get(item))
+                if ts is None:
+                    when = n + timedelta(seconds=self.intervals[item])
+                    due[item] = when.isoformat(timespec='seconds')
+                    ts = when.replace(microsecond=0).timestamp()
+                self._latest[(username, item)] = ts
+                self._heap.append((ts, next(self._seq), username, item))
+        heapq.heapify(self._heap)
+        if self._on_earlier is not None:
+            self._on_earlier()
+        return len(self._heap)
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            ts, _, username, item = self._heap[0]
+            if self._latest.get((username, item)) == ts:
+                return
+            heapq.heappop(self._heap)
+
+    def seconds_until_next(self, now: datetime | None = None) -> float | None:
+        self._drop_stale()
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - _now(now).timestamp())
+
+    def pop_due(self, now: datetime | None = None) -> list[tuple[str, str]]:
+        """Pop every live entry due by `now` as (username, item). The caller
+        fires it, then either `schedule()`s the next round or `cancel()`s."""
+        cutoff = _now(now).timestamp()
+        due = []
+        while self._heap and self._heap[0][0] <= cutoff:
+            ts, _, username, item = heapq.heappop(self._heap)
+            ident = (username, item)
+            if self._latest.get(ident) != ts:
+                continue            # cancelled or rescheduled since
+            del self._latest[ident]
+            due.append(ident)
+        return due
@@ -0,0 +1,123 @@
+"""World-drop registry: grabbable items lying around the TwitcHack world.
+
+Drops used to live in a plain list. Every spawn and grab scanned it with
+case-insensitive name compares and rebuilt it to prune expired entries, and
+an expired drop stayed in the overlay's Grab bar until somebody tried it.
+DropRegistry keys live drops by lowercased name, so spawn-dedup, lookup and
+claim are O(1). An expiry heap orders them by deadline, which lets the bot's
+deadline loop retire each drop on time and tell the overlay.
+
+`claim()` removes the drop in the same synchronous step that finds it. Two
+concurrent grabs therefore can't both win, whatever the callers await
+afterwards. A claimer that can't use the drop after all (already owns the
+item) hands it back with `release()`, which keeps the original deadline.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+
+DEFAULT_TTL_SECONDS = 15 * 60
+
+
+def _key(name) -> str:
+    return str(name or "").strip().lower()
+
+
+@dataclass
+class Drop:
+    name: str
+    location: str
+    ts: float                       # spawn time (epoch seconds)
+    expires_at: float
+    seq: int = field(default=0, compare=False)
+
+
+class DropRegistry:
+    """Live drops by lowercased name, plus an expiry heap."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, on_earlier=None, clock=time.time):
+        self.ttl_seconds = ttl_seconds
+        # Called when the earliest expiry moves forward (same contract as the
+        # job/expiry timers) so the deadline loop can re-arm.
+        self._on_earlier = on_earlier
+        self._clock = clock
+        self._live: dict[str, Drop] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, name) -> bool:
+        return _key(name) in self._live
+
+    def __iter__(self):
+        """Live drops, oldest first."""
+        return iter(sorted(self._live.values(), key=lambda d: d.seq))
+
+    def get(self, name) -> Drop | None:
+        return self._live.get(_key(name))
+
+    def _push(self, drop: Drop) -> None:
+        earlier = not self._heap or drop.expires_at < self._heap[0][0]
+        heapq.heappush(self._heap, (drop.expires_at, drop.seq, _key(drop.name)))
+        if earlier and self._on_earlier is not None:
+            self._on_earlier()
+
+    def spawn(self, name: str, location: str, now: float | None = None) -> Drop | None:
+        """Put a drop into the world. None if one with that name is already
+        waiting (drops are unique by name)."""
+        key = _key(name)
+        if not key or key in self._live:
+            return None
+        now = self._clock() if now is None else now
+        drop = Drop(name=name, location=location, ts=now,
+                    expires_at=now + self.ttl_seconds, seq=next(self._seq))
+        self._live[key] = drop
+        self._push(drop)
+        return drop
+
+    def claim(self, name) -> Drop | None:
+        """Atomically take the drop named `name` (case-insensitive)."""
+        return self._live.pop(_key(name), None)
+
+    def release(self, drop: Drop) -> bool:
+        """Hand back a claimed drop, keeping its original deadline. False if
+        another drop with that name has since spawned."""
+        key = _key(drop.name)
+        if key in self._live:
+            return False
+        self._live[key] = drop
+        self._push(drop)
+        return True
+
+    def seconds_until_next(self, now: float | None = None) -> float | None:
+        self._drop_stale()
+        if not self._heap:
+            return None
+        now = self._clock() if now is None else now
+        return max(0.0, self._heap[0][0] - now)
+
+    def pop_due(self, now: float | None = None) -> list[Drop]:
+        """Remove and return every drop whose time is up."""
+        now = self._clock() if now is None else now
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, key = heapq.heappop(self._heap)
+            drop = self._live.get(key)
+            if drop is not None and drop.seq == seq:
+                del self._live[key]
+                expired.append(drop)
+        return expired
+
+    def _drop_stale(self) -> None:
+        """Discard heap heads whose drop was already claimed."""
+        while self._heap:
+            _, seq, key = self._heap[0]
+            drop = self._live.get(key)
+            if drop is not None and drop.seq == seq:
+                return
+            heapq.heappop(self._heap)
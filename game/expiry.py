@@ -0,0 +1,154 @@
+"""Unified expiry timers: jail release, VPS rental lapse, Cardboard Box expiry
+and the Burner Laptop no-cap window.
+
+Each of these used to be noticed only when the player next acted, so the GUI
+kept showing a 🚔 badge or a rented VPS long after it had ended. ExpiryTimers
+keeps one min-heap of (deadline, seq, kind, username, key) for all of them. The
+bot's deadline loop sleeps until the earliest entry and fires the expiry
+(release, prune, overlay push) right on time.
+
+Deadlines are registered by the mutators that set them (jail._send_to_jail,
+jail.grant_no_cap, hardware.rent_vps, perks.grant_box) through `track()`, which
+is a no-op until the bot installs a timer set with `set_expiry_timers()`.
+Extending a deadline (renewing a rental, stacking no-cap) just pushes a new
+entry. Superseded entries are dropped when popped because they no longer match
+the latest deadline recorded for their (kind, username, key).
+
+The lazy per-command checks stay as the fallback. They cover tests, scripts,
+and a bot that has not caught up yet.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+import heapq
+import itertools
+from datetime import datetime, timezone
+
+from game.timestamps import epoch_seconds
+
+# The Cardboard Box item (bot/perks.py grants it); a BOX expiry prunes it.
+CARDBOARD_BOX = "Snake's Cardboard Box"
+
+JAIL = "jail"
+RENTAL = "rental"
+BOX = "box"
+NO_CAP = "no_cap"
+
+
+def deadlines_for(player, now: datetime | None = None) -> list[tuple[str, str | None, float]]:
+    """Every pending expiry on a player as (kind, key, epoch_seconds).
+
+    Past deadlines that still need settling are included: an un-released jail
+    term, or a box still sitting in items. Lapsed rentals and no-cap windows
+    leave nothing to settle, so they are skipped. Otherwise an expiry that has
+    already fired would be rescheduled forever."""
+    n = (now or datetime.now(timezone.utc)).timestamp()
+    out = []
+    jail = getattr(player, "jail", None)
+    if jail:
+        ts = epoch_seconds(jail.get("until"))
+        if ts is not None:
+            out.append((JAIL, None, ts))
+    for vps_id, until in (getattr(player, "rentals", None) or {}).items():
+        ts = epoch_seconds(until)
+        if ts is not None and ts > n:
+            out.append((RENTAL, vps_id, ts))
+    ts = epoch_seconds(getattr(player, "cardboard_box_until", None))
+    if ts is not None and (ts > n or CARDBOARD_BOX in (player.items or [])):
+        out.append((BOX, None, ts))
+    ts = epoch_seconds(getattr(player, "no_cap_until", None))
+    if ts is not None and ts > n:
+        out.append((NO_CAP, None, ts))
+    return out
+
+
+class ExpiryTimers:
+    """Min-heap of expiry deadlines across all timed player state."""
+
+    def __init__(self, on_earlier=None):
+        # Same contract as JobScheduler: called when the earliest deadline
+        # moves forward so a sleeping loop can re-arm.
+        self._on_earlier = on_earlier
+        self._heap: list[tuple[float, int, str, str, str | None]] = []
+        self._latest: dict[tuple[str, str, str | None], float] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def schedule(self, kind: str, username: str, deadline, key: str | None = None) -> None:
+        ts = epoch_seconds(deadline)
+        if ts is None:
+            return
+        ident = (kind, username, key)
+        if self._latest.get(ident) == ts:
+            return
+        self._latest[ident] = ts
+        earlier = not self._heap or ts < self._heap[0][0]
+        heapq.heappush(self._heap, (ts, next(self._seq), kind, username, key))
+        if earlier and self._on_earlier is not None:
+            self._on_earlier()
+
+    def track(self, username: str, player, now: datetime | None = None) -> None:
+        """(Re)register every pending expiry on one player."""
+        for kind, key, ts in deadlines_for(player, now):
+            self.schedule(kind, username, ts, key)
+
+    def rebuild(self, player_data: dict, now: datetime | None = None) -> int:
+        """Re-seed from the whole roster (startup). Returns entries loaded."""
+        self._heap = []
+        self._latest = {}
+        for username, player in player_data.items():
+            for kind, key, ts in deadlines_for(player, now):
+                ident = (kind, username, key)
+                self._latest[ident] = ts
+                self._heap.append((ts, next(self._seq), kind, username, key))
+        heapq.heapify(self._heap)
+        if self._on_earlier is not None:
+            self._on_earlier()
+        return len(self._heap)
+
+    def _drop_superseded(self) -> None:
+        while self._heap:
+            ts, _, kind, username, key = self._heap[0]
+            if self._latest.get((kind, username, key)) == ts:
+                return
+            heapq.heappop(self._heap)
+
+    def seconds_until_next(self, now: datetime | None = None) -> float | None:
+        self._drop_superseded()
+        if not self._heap:
+            return None
+        n = (now or datetime.now(timezone.utc)).timestamp()
+        return max(0.0, self._heap[0][0] - n)
+
+    def pop_due(self, now: datetime | None = None) -> list[tuple[str, str, str | None]]:
+        """Pop every live entry due by `now` as (kind, username, key)."""
+        cutoff = (now or datetime.now(timezone.utc)).timestamp()
+        due = []
+        while self._heap and self._heap[0][0] <= cutoff:
+            ts, _, kind, username, key = heapq.heappop(self._heap)
+            ident = (kind, username, key)
+            if self._latest.get(ident) != ts:
+                continue            # superseded by a later deadline
+            del self._latest[ident]
+            due.append(ident)
+        return due
+
+
+# ---------------------------------------------------------------------------
+# Module-level hook so the pure mutators can register deadlines.
+# ---------------------------------------------------------------------------
+
+_TIMERS: ExpiryTimers | None = None
+
+
+def set_expiry_timers(timers: ExpiryTimers | None) -> None:
+    """Install the timer set mutators register with (None to detach)."""
+    global _TIMERS
+    _TIMERS = timers
+
+
+def track(player) -> None:
+    """Register a player's current deadlines with the installed timers."""
+    if _TIMERS is not None:
+        _TIMERS.track(player.username, player)
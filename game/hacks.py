@@ -4,8 +4,16 @@ Design source of truth: TWITCHACK_IDLE_HACKING_SPEC.md (§3 jobs, §6 catalog).
 
 A "hack" is a timed job. `!run <id>` starts one (consuming a job slot); it
 resolves when its timer elapses, paying out cash + rep (or failing — losing the
-time). Phase 1 resolves lazily: `resolve_due_jobs()` is called whenever the
-player next interacts. The data model is ready for a background ticker later.
+time). `resolve_due_jobs()` is called lazily whenever the player next
+interacts, and proactively by the bot's scheduler loop: every started job is
+registered with the deadline heap installed via `set_job_scheduler()`.
+
+Machines can also hold a job queue (`enqueue()`): when a job resolves, the
+machine's next queued run starts at that same instant, server-side.
+
+A *standing order* (`set_order()`) keeps one hack repeating on a machine with
+no job rows at all. `settle_orders()` replays the elapsed interval in one pass
+when the player returns, or at the coarse ORDER_SETTLE_SECONDS cadence.
 
 Pure module — no Twitch/async dependencies — so the whole loop is unit-testable.
 """
@@ -14,7 +22,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
 import items
-from game import hardware
+from game import hardware, ledger
 
 
 # Cash dropped per successful *click* (clicker tier). The bootstrap rule
@@ -22,6 +30,16 @@ from game import hardware
 # rig, since idle hacks require hardware. Clicks stay cash-light; hacks pay more.
 CLICK_CASH = 4
 
+# Deadline heap (game.job_scheduler.JobScheduler) that start_hack registers new
+# jobs with. None = lazy resolution only (tests, scripts).
+_JOB_SCHEDULER = None
+
+
+def set_job_scheduler(scheduler) -> None:
+    """Install the scheduler new jobs are registered with (None to detach)."""
+    global _JOB_SCHEDULER
+    _JOB_SCHEDULER = scheduler
+
 
 @dataclass(frozen=True)
 class HackDef:
@@ -188,17 +206,26 @@ def resolve_machine(player, hack: HackDef, machine_id: str | None):
     return best, ""
 
 
+def _gate(player, hack_id: str):
+    """The player-side requirements for a hack (exists, level, location).
+    Returns (hack, "") or (None, reason)."""
+    hack = HACK_DEFS.get(hack_id)
+    if not hack:
+        return None, f"unknown hack '{hack_id}'."
+    if player.level < hack.level_req:
+        return None, f"{hack.name} needs level {hack.level_req}."
+    if hack.location and player.location != hack.location:
+        return None, f"{hack.name} must be run from {hack.location}."
+    return hack, ""
+
+
 def can_run(player, hack_id: str, machine_id: str | None = None):
     """Return (ok, reason, machine_id). On success machine_id is the resolved
     machine the hack will run on; on failure it is None and reason is a
     player-facing string."""
-    hack = HACK_DEFS.get(hack_id)
+    hack, reason = _gate(player, hack_id)
     if not hack:
-        return False, f"unknown hack '{hack_id}'.", None
-    if player.level < hack.level_req:
-        return False, f"{hack.name} needs level {hack.level_req}.", None
-    if hack.location and player.location != hack.location:
-        return False, f"{hack.name} must be run from {hack.location}.", None
+        return False, reason, None
     resolved, reason = resolve_machine(player, hack, machine_id)
     if not resolved:
         return False, reason, None
@@ -232,6 +259,8 @@ def start_hack(player, hack_id: str, machine_id: str | None = None,
     if player.jobs is None:
         player.jobs = []
     player.jobs.append(job)
+    if _JOB_SCHEDULER is not None:
+        _JOB_SCHEDULER.register(player.username, job["finishes_at"])
     return job, seconds
 
 
@@ -252,8 +281,7 @@ def _resolve_one(player, job: dict, rng) -> dict:
     # the treasury. The caller credits the treasury with `skimmed` so this pure
     # module stays free of treasury/IO knowledge.
     net, skimmed = items.apply_cash_skim(player, gross)
-    player.cash = getattr(player, "cash", 0) + net
-    player.points += rep  # rep is points → caller runs check_level_up
+    ledger.apply(player, ledger.HACK_PAYOUT, points=rep, cash=net)  # rep is points → caller runs check_level_up
     return {"hack_id": hack.id, "name": hack.name, "success": True,
             "cash": net, "gross_cash": gross, "skimmed": skimmed, "rep": rep}
 
@@ -262,28 +290,114 @@ def resolve_due_jobs(player, now: datetime | None = None, rng=random) -> list[di
     """Resolve every job whose timer has elapsed. Mutates player (cash, points,
     jobs). Returns one result dict per resolved job (for the feed). Jobs still
     running are left in place. Banking rep does not level the player here — the
-    caller runs helpers.check_level_up so leveling stays in one place."""
+    caller runs helpers.check_level_up so leveling stays in one place.
+
+    Each resolved job frees a slot on its machine, and that machine's queue
+    (see enqueue) starts its next run at the moment the job finished. A chain
+    that ran while nobody was watching is therefore replayed in full here."""
     now = _now(now)
     results: list[dict] = []
     remaining: list[dict] = []
-    for job in player.jobs or []:
+    pending = list(player.jobs or [])
+    while pending:
+        job = pending.pop(0)
         finishes = _from_iso(job.get("finishes_at"))
-        if finishes is not None and finishes <= now:
-            results.append(_resolve_one(player, job, rng))
-            # Running the job wears the machine that ran it (win or lose), and
-            # overclocked runs wear it harder.
-            hk = HACK_DEFS.get(job.get("hack_id"))
-            if hk and job.get("machine"):
-                w = wear_for(hk)
-                if job.get("oc"):
-                    w *= hardware.OC_WEAR_MULT
-                hardware.apply_wear(player, job["machine"], w)
-        else:
+        if finishes is None or finishes > now:
             remaining.append(job)
+            continue
+        results.append(_resolve_one(player, job, rng))
+        # Running the job wears the machine that ran it (win or lose), and
+        # overclocked runs wear it harder.
+        hk = HACK_DEFS.get(job.get("hack_id"))
+        if hk and job.get("machine"):
+            w = wear_for(hk)
+            if job.get("oc"):
+                w *= hardware.OC_WEAR_MULT
+            hardware.apply_wear(player, job["machine"], w)
+        if job.get("machine"):
+            player.jobs = remaining + pending
+            nxt = _advance_queue(player, job["machine"], finishes)
+            if nxt is not None:
+                pending.append(nxt)
     player.jobs = remaining
     return results
 
 
+# ---------------------------------------------------------------------------
+# Per-machine job queues. Each machine keeps an ordered list of entries in
+# player.queues; the head entry re-runs whenever the machine frees a slot, so
+# players no longer click "run" after every job. An entry repeats until
+# cancelled (runs None), for N more runs, or while the machine's condition
+# stays at or above min_condition.
+# ---------------------------------------------------------------------------
+def _entry_done(player, machine_id: str, entry: dict) -> bool:
+    if entry.get("runs") is not None and entry["runs"] <= 0:
+        return True
+    floor = entry.get("min_condition")
+    return floor is not None and hardware.condition_of(player, machine_id) < floor
+
+
+def _advance_queue(player, machine_id: str, at: datetime) -> dict | None:
+    """Start the machine's next queued run at `at`, dropping finished or
+    unrunnable entries on the way. Returns the new job, or None."""
+    queue = hardware.queue_of(player, machine_id)
+    job = None
+    while queue:
+        entry = queue[0]
+        if _entry_done(player, machine_id, entry):
+            queue.pop(0)
+            continue
+        job, _ = start_hack(player, entry["hack_id"], machine_id, now=at)
+        if job is None:
+            if hardware.machine_free(player, machine_id) <= 0:
+                return None         # busy: the next resolution retries
+            queue.pop(0)            # can't run here any more (sold, level, …)
+            continue
+        job["queued"] = True
+        if entry.get("runs") is not None:
+            entry["runs"] -= 1
+            if entry["runs"] <= 0:
+                queue.pop(0)
+        break
+    if not queue and player.queues:
+        player.queues.pop(machine_id, None)
+    return job
+
+
+def enqueue(player, machine_id: str, hack_id: str, runs: int | None = None,
+            min_condition: float | None = None, now: datetime | None = None):
+    """Queue `hack_id` on `machine_id`. runs=None repeats until cancelled;
+    min_condition stops the entry once the machine wears below it. If the
+    machine has a free slot the first run starts at once. Returns
+    (entry, job_or_None, "") or (None, None, reason)."""
+    if runs is not None and runs <= 0:
+        return None, None, "queue at least one run."
+    hack, reason = _gate(player, hack_id)
+    if not hack:
+        return None, None, reason
+    if machine_id not in hardware.machines(player):
+        return None, None, "you don't own that machine."
+    ok, reason = _machine_meets(hack, machine_id)
+    if not ok:
+        return None, None, reason
+    if len(hardware.queue_of(player, machine_id)) >= hardware.QUEUE_DEPTH:
+        return None, None, f"that machine's queue is full ({hardware.QUEUE_DEPTH})."
+    entry = {"hack_id": hack_id, "runs": runs, "min_condition": min_condition}
+    if player.queues is None:
+        player.queues = {}
+    player.queues.setdefault(machine_id, []).append(entry)
+    job = None
+    if hardware.machine_free(player, machine_id) > 0:
+        job = _advance_queue(player, machine_id, _now(now))
+    return entry, job, ""
+
+
+def clear_queue(player, machine_id: str) -> int:
+    """Drop every queued entry on the machine (running jobs finish normally).
+    Returns how many entries were removed."""
+    return len((player.queues or {}).pop(machine_id, None) or [])
+
+
 def time_left(job: dict, now: datetime | None = None) -> int:
     """Seconds remaining on a job (never negative)."""
     now = _now(now)
@@ -291,3 +405,139 @@ def time_left(job: dict, now: datetime | None = None) -> int:
     if finishes is None:
         return 0
     return max(0, int((finishes - now).total_seconds()))
+
+
+# ---------------------------------------------------------------------------
+# Standing orders — offline progress. An order keeps `hack_id` running back to
+# back on one machine (holding one of its slots) without a job row per run.
+# settle_orders() replays the elapsed interval in one pass. Run k+1 starts the
+# instant run k ends, at the duration the machine's condition gives it at that
+# moment. Each run then wears the machine and rolls its payout exactly as
+# resolve_due_jobs would, so the outcome has the same distribution as stepping
+# every job. Once condition can no longer change (a worn-out or non-wearing
+# machine), the remaining run count is a single division.
+# ---------------------------------------------------------------------------
+ORDER_SETTLE_SECONDS = 15 * 60   # coarse settle cadence while the player is away
+
+
+def _register_settle(player, order: dict, now: datetime) -> None:
+    order["next_settle"] = _to_iso(now + timedelta(seconds=ORDER_SETTLE_SECONDS))
+    if _JOB_SCHEDULER is not None:
+        _JOB_SCHEDULER.register(player.username, order["next_settle"])
+
+
+def set_order(player, machine_id: str, hack_id: str, now: datetime | None = None):
+    """Put `machine_id` on a standing order for `hack_id`. Returns (order, "")
+    or (None, reason). The machine must be owned, capable and have a free
+    slot. The order holds that slot until cancel_order()."""
+    hack, reason = _gate(player, hack_id)
+    if not hack:
+        return None, reason
+    if machine_id in (player.orders or {}):
+        return None, "that machine already has a standing order — cancel it first."
+    resolved, reason = resolve_machine(player, hack, machine_id)
+    if not resolved:
+        return None, reason
+    now = _now(now)
+    order = {"hack_id": hack_id, "since": _to_iso(now)}
+    if player.orders is None:
+        player.orders = {}
+    player.orders[machine_id] = order
+    _register_settle(player, order, now)
+    return order, ""
+
+
+def _order_end(player, machine_id: str, now: datetime) -> tuple[datetime, str | None]:
+    """How far an order can run: `now`, or earlier if its machine went away.
+    Returns (end, stop_reason); a stop_reason means the order ends there."""
+    if machine_id not in hardware.COMPONENTS:
+        return now, "machine gone"
+    if hardware.is_rental(machine_id):
+        until = _from_iso((player.rentals or {}).get(machine_id))
+        if until is None:
+            return now, "rental ended"
+        if until <= now:
+            return until, "rental lapsed"
+        return now, None
+    if machine_id not in (player.rig or []):
+        return now, "machine gone"
+    return now, None
+
+
+def _settle_one(player, machine_id: str, order: dict, now: datetime, rng) -> dict:
+    """Replay one order up to `now`. Mutates player (cash, points, condition)
+    and advances order["since"] to the end of the last completed run."""
+    hack = HACK_DEFS.get(order.get("hack_id"))
+    result = {"machine": machine_id, "hack_id": order.get("hack_id"),
+              "name": hack.name if hack else order.get("hack_id"),
+              "runs": 0, "successes": 0, "cash": 0, "gross_cash": 0,
+              "skimmed": 0, "rep": 0, "wear": 0.0, "stopped": None}
+    end, stopped = _order_end(player, machine_id, now)
+    result["stopped"] = stopped
+    start = _from_iso(order.get("since"))
+    if hack is None or start is None:
+        result["stopped"] = result["stopped"] or "unknown hack"
+        return result
+    # Overclock and stats are read once: toggling overclock settles first.
+    stats = hardware.effective_stats(player, machine_id)
+    wear = wear_for(hack)
+    if hardware.overclock_active(player, machine_id):
+        wear *= hardware.OC_WEAR_MULT
+    left = (end - start).total_seconds()
+    elapsed = 0
+    runs = 0
+    while True:
+        cond = hardware.condition_of(player, machine_id)
+        seconds = duration_for(hack, stats, cond)
+        if cond <= 0 or not hardware.machine_wears(machine_id):
+            # Condition is fixed from here on: every remaining run is as long.
+            extra = int((left - elapsed) // seconds)
+            runs += extra
+            elapsed += extra * seconds
+            break
+        if elapsed + seconds > left:
+            break
+        elapsed += seconds
+        runs += 1
+        result["wear"] += cond - hardware.apply_wear(player, machine_id, wear)
+    for _ in range(runs):
+        r = _resolve_one(player, order, rng)
+        if r["success"]:
+            result["successes"] += 1
+            for k in ("cash", "gross_cash", "skimmed", "rep"):
+                result[k] += r[k]
+    result["runs"] = runs
+    order["since"] = _to_iso(start + timedelta(seconds=elapsed))
+    return result
+
+
+def settle_orders(player, now: datetime | None = None, rng=random) -> list[dict]:
+    """Bank every standing order's progress up to `now`. Returns one summary
+    per order that completed a run or stopped (machine sold, rental lapsed).
+    Stopped orders are removed. The caller runs check_level_up and credits
+    the treasury with the summed `skimmed`, as for resolve_due_jobs."""
+    now = _now(now)
+    results = []
+    for machine_id, order in list((player.orders or {}).items()):
+        r = _settle_one(player, machine_id, order, now, rng)
+        if r["stopped"]:
+            del player.orders[machine_id]
+        elif (_from_iso(order.get("next_settle")) or now) <= now:
+            # Only re-arm once the coarse settle is due (or was never set).
+            # An early settle from an idle command keeps its slot in the heap.
+            _register_settle(player, order, now)
+        if r["runs"] or r["stopped"]:
+            results.append(r)
+    return results
+
+
+def cancel_order(player, machine_id: str, now: datetime | None = None, rng=random):
+    """Settle and end the standing order on `machine_id`, freeing its slot.
+    Returns (summary, "") or (None, reason). The partial run in progress is
+    lost, like a hack abandoned mid-way."""
+    order = (player.orders or {}).get(machine_id)
+    if order is None:
+        return None, "that machine has no standing order."
+    result = _settle_one(player, machine_id, order, _now(now), rng)
+    del player.orders[machine_id]
+    return result, ""
@@ -18,6 +18,8 @@ player's rig.
 from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, timezone
 
+from game import expiry, ledger
+
 # GB of RAM each concurrent job consumes (spec §4.2). This is the knob that makes
 # you need BOTH compute and memory: job_slots is gated by min(threads, mem/2).
 MEM_PER_JOB = 2
@@ -236,8 +238,9 @@ def rent_vps(player, vps_id: str, now=None):
                 base = end       # still active → stack onto the remaining time
         except (TypeError, ValueError):
             pass
-    player.cash = cash - cost
+    ledger.apply(player, ledger.HARDWARE, cash=-cost)
     player.rentals[vps_id] = (base + timedelta(seconds=RENT_PERIOD_SECONDS)).isoformat()
+    expiry.track(player)
     return cost, ""
 
 
@@ -261,9 +264,11 @@ def machine_slots(machine_id: str) -> int:
 
 
 def jobs_on(player, machine_id: str) -> int:
-    """How many of the player's running jobs are assigned to this machine."""
-    return sum(1 for j in (getattr(player, "jobs", None) or [])
-               if j.get("machine") == machine_id)
+    """How many of the player's running jobs are assigned to this machine. A
+    standing order (hacks.set_order) holds one slot for as long as it runs."""
+    running = sum(1 for j in (getattr(player, "jobs", None) or [])
+                  if j.get("machine") == machine_id)
+    return running + (1 if machine_id in (getattr(player, "orders", None) or {}) else 0)
 
 
 def machine_free(player, machine_id: str) -> int:
@@ -271,6 +276,16 @@ def machine_free(player, machine_id: str) -> int:
     return max(0, machine_slots(machine_id) - jobs_on(player, machine_id))
 
 
+# Per-machine job queues (hacks.enqueue): how many queued orders one machine
+# holds, so a single player can't park an unbounded backlog.
+QUEUE_DEPTH = 5
+
+
+def queue_of(player, machine_id: str) -> list[dict]:
+    """The machine's pending queue entries (empty if none)."""
+    return (getattr(player, "queues", None) or {}).get(machine_id, [])
+
+
 def total_slots(player) -> int:
     """Total concurrent jobs across all owned machines (the sum)."""
     return sum(machine_slots(m) for m in machines(player))
@@ -342,7 +357,7 @@ def repair(player, machine_id: str):
     cash = getattr(player, "cash", 0)
     if cash < cost:
         return None, f"repairing {comp.name} costs {cost} cash — you have {cash}."
-    player.cash = cash - cost
+    ledger.apply(player, ledger.HARDWARE, cash=-cost)
     if player.conditions is None:
         player.conditions = {}
     if player.repairs is None:
@@ -409,7 +424,7 @@ def install_cooling(player, machine_id: str):
     cash = getattr(player, "cash", 0)
     if cash < cost:
         return None, f"AIO cooling for {comp.name} costs {cost} cash — you have {cash}."
-    player.cash = cash - cost
+    ledger.apply(player, ledger.HARDWARE, cash=-cost)
     if player.cooling is None:
         player.cooling = []
     player.cooling.append(machine_id)
@@ -452,7 +467,7 @@ def buy_component(player, component_id: str):
     cash = getattr(player, "cash", 0)
     if cash < comp.cost:
         return None, f"{comp.name} costs {comp.cost} cash — you have {cash}."
-    player.cash = cash - comp.cost
+    ledger.apply(player, ledger.HARDWARE, cash=-comp.cost)
     if player.rig is None:
         player.rig = []
     player.rig.append(component_id)
@@ -0,0 +1,72 @@
+"""Inverted item → holders index.
+
+Item-driven mechanics used to scan the roster to find who holds what: the
+malicious on_tick effects, battle passives (Raspberry Pi, Password Cracker)
+and the `!items` lookups. ItemIndex maps each item, keyed case-insensitively,
+to the set of usernames holding it. That makes those queries cost
+O(holders), not O(roster · inventory).
+
+It is kept current by Player.add_item / Player.remove_item (see
+playerdata.set_item_index) and rebuilt from the roster on startup. Code that
+mutates `player.items` directly bypasses it, so inventory changes go through
+those two methods.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+
+
+def _key(item_name) -> str:
+    return str(item_name).strip().lower()
+
+
+class ItemIndex:
+    """Case-insensitive map of item name → usernames holding it."""
+
+    def __init__(self):
+        self._holders: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._holders)
+
+    def add(self, username: str, item_name) -> None:
+        self._holders.setdefault(_key(item_name), set()).add(username)
+
+    def discard(self, username: str, item_name) -> None:
+        key = _key(item_name)
+        holders = self._holders.get(key)
+        if holders is None:
+            return
+        holders.discard(username)
+        if not holders:
+            del self._holders[key]
+
+    def holders(self, item_name) -> frozenset[str]:
+        return frozenset(self._holders.get(_key(item_name), ()))
+
+    def holds(self, username: str, item_name) -> bool:
+        return username in self._holders.get(_key(item_name), ())
+
+    def holders_among(self, item_name, usernames) -> list[str]:
+        """The subset of `usernames` holding the item, in the given order
+        (e.g. a battle team)."""
+        holders = self._holders.get(_key(item_name))
+        if not holders:
+            return []
+        return [u for u in usernames if u in holders]
+
+    def held_items(self, item_names) -> dict[str, frozenset[str]]:
+        """Holders for each of `item_names` that anyone holds."""
+        out = {}
+        for name in item_names:
+            holders = self._holders.get(_key(name))
+            if holders:
+                out[name] = frozenset(holders)
+        return out
+
+    def rebuild(self, player_data: dict) -> int:
+        """Re-seed from the whole roster. Returns distinct items indexed."""
+        self._holders = {}
+        for username, player in player_data.items():
+            for item_name in getattr(player, "items", None) or []:
+                self.add(username, item_name)
+        return len(self._holders)
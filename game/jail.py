@@ -18,8 +18,9 @@ Time handling: every public function accepts a `now` parameter so tests can
 inject deterministic timestamps. When omitted, UTC wall-clock is used.
 
 Persistence: per-player jail state lives on the Player object (see
-playerdata.py). The treasury balance lives in a sidecar JSON file because
-it is a single global value mutated rarely.
+playerdata.py). The treasury balance is a single global value: a one-row
+Postgres table once the bot is connected (bot/db.py), a sidecar JSON file
+before that and in tests.
 """
 from __future__ import annotations
 
@@ -27,26 +28,39 @@ import json
 import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Union
+
+from game import expiry, ledger, telemetry
+from game.speed_limits import SlidingWindowLimit, TokenBucketLimit
 
 
 # ---------------------------------------------------------------------------
 # Tunables — confirmed by spec; revisit after one stream of telemetry.
 # ---------------------------------------------------------------------------
 
+# A float gap (legacy engine) or a game/speed_limits.py engine.
+SpeedLimit = Union[float, TokenBucketLimit, SlidingWindowLimit]
+
 # Speed threshold table: minimum gap (seconds) below which an attack counts
 # as a speed violation. Indexed by location and level tier.
 #
 # Each row is sorted [(max_level_inclusive, threshold_seconds), ...].
 # Use `None` for the open-ended top tier.
 #
+# A tier's value can also be a rate-limit engine from game/speed_limits.py
+# instead of a gap in seconds, e.g.
+#     "evilcorp": [(None, TokenBucketLimit(rate=8, burst=12))],
+# or SlidingWindowLimit(max_hits=40, window=5). Engines limit the sustained
+# click rate, so jittered clicks can't slip under a fixed gap. Strikes, jail
+# and telemetry work the same either way.
+#
 # Design intent (revised post-launch): ANY level should be safe at 10 clicks/sec
 # or slower. So thresholds are uniformly 0.1s at every location and every level
 # — only superhuman click rates (>10/sec, auto-clicker territory) generate
 # strikes. The escalation against high-level abusers comes from the penalty
 # size (PENALTY_MULTIPLIER * base_reward, which is already larger at harder
 # locations), not from tighter thresholds.
-SPEED_THRESHOLDS: dict[str, list[tuple[Optional[int], float]]] = {
+SPEED_THRESHOLDS: dict[str, list[tuple[Optional[int], SpeedLimit]]] = {
     "email":       [(None, 0.1)],
     "website":     [(None, 0.1)],
     "server":      [(None, 0.1)],
@@ -102,6 +116,7 @@ def grant_no_cap(player, minutes: int = BURNER_LAPTOP_NO_CAP_MINUTES,
     base = existing if existing and existing > n else n
     new_until = base + timedelta(minutes=minutes)
     player.no_cap_until = _to_iso(new_until)
+    expiry.track(player)
     return player.no_cap_until
 
 
@@ -115,7 +130,13 @@ def no_cap_remaining_seconds(player, now: Optional[datetime] = None) -> int:
 
 
 # ---------------------------------------------------------------------------
-# Treasury storage — single global integer in a sidecar file.
+# Treasury storage — a single global integer behind a swappable store.
+#
+# Until the bot connects to Postgres (and in tests) the balance lives in a
+# sidecar JSON file, read and rewritten on every call. Once bot/db.py is up it
+# installs a CachedTreasury: reads come from memory, credits bump the cached
+# value and queue a delta, and the db flusher applies queued deltas with one
+# atomic `UPDATE ... RETURNING` on a single-row table.
 # ---------------------------------------------------------------------------
 
 _TREASURY_PATH = os.environ.get(
@@ -124,68 +145,161 @@ _TREASURY_PATH = os.environ.get(
 )
 
 
+class FileTreasury:
+    """Treasury in a JSON sidecar file (`{"treasury_balance": N}`)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def balance(self) -> int:
+        """Current balance from disk. Missing/corrupt file → 0."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        return int(data.get("treasury_balance", 0))
+
+    def credit(self, amount: int) -> int:
+        new_balance = self.balance() + amount
+        payload = {"treasury_balance": int(new_balance)}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp, self.path)
+        return new_balance
+
+
+class CachedTreasury:
+    """In-memory treasury whose credits are written back in batches.
+
+    `credit` is instant and returns the new cached balance. The writer calls
+    `take_pending()` for the delta to persist, then `settle(db_balance)` with
+    the balance the database returned (or `restore(delta)` if the write
+    failed). Credits made while the write was in flight stay pending and are
+    folded back on top. With no writer attached it is a plain in-memory
+    stand-in.
+    """
+
+    def __init__(self, balance: int = 0):
+        self._balance = int(balance)
+        self._pending = 0
+
+    def balance(self) -> int:
+        return self._balance
+
+    def credit(self, amount: int) -> int:
+        self._balance += amount
+        self._pending += amount
+        return self._balance
+
+    def take_pending(self) -> int:
+        amount, self._pending = self._pending, 0
+        return amount
+
+    def restore(self, amount: int) -> None:
+        self._pending += amount
+
+    def settle(self, db_balance: int) -> int:
+        self._balance = int(db_balance) + self._pending
+        return self._balance
+
+
+_treasury = FileTreasury(_TREASURY_PATH)
+
+
 def set_treasury_path(path: str) -> None:
-    """Override the treasury file location (used by tests)."""
-    global _TREASURY_PATH
+    """Back the treasury with a sidecar file at `path` (used by tests)."""
+    global _TREASURY_PATH, _treasury
     _TREASURY_PATH = path
+    _treasury = FileTreasury(path)
 
 
-def get_treasury_balance() -> int:
-    """Read the current treasury balance from disk. Missing file → 0."""
-    try:
-        with open(_TREASURY_PATH, "r") as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return 0
-    return int(data.get("treasury_balance", 0))
+def set_treasury_store(store) -> None:
+    """Install the treasury store (bot/db.py installs a CachedTreasury)."""
+    global _treasury
+    _treasury = store
+
 
+def sidecar_treasury_balance() -> int:
+    """Balance recorded in the sidecar file, for the one-time Postgres import."""
+    return FileTreasury(_TREASURY_PATH).balance()
 
-def _write_treasury(balance: int) -> None:
-    """Replace the treasury file atomically-ish (best effort)."""
-    payload = {"treasury_balance": int(balance)}
-    tmp = _TREASURY_PATH + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(payload, f, indent=2)
-    os.replace(tmp, _TREASURY_PATH)
+
+def get_treasury_balance() -> int:
+    """Current treasury balance."""
+    return _treasury.balance()
 
 
 def _credit_treasury(amount: int) -> int:
     """Add `amount` (≥ 0) to the treasury, returning the new balance."""
     if amount < 0:
         raise ValueError("Treasury credits must be non-negative")
-    new_balance = get_treasury_balance() + amount
-    _write_treasury(new_balance)
-    return new_balance
+    return _treasury.credit(amount)
 
 
 # ---------------------------------------------------------------------------
-# Per-attack telemetry — append-only JSONL for post-stream threshold tuning.
+# Per-attack telemetry — JSONL for post-stream threshold tuning.
 # One line per attack records the gap, the threshold it was compared to,
-# whether it struck, and the resulting jail state. Set TWITCHACK_ATTACK_LOG=""
-# to disable.
+# whether it struck, and the resulting jail state. Rows go through a buffered
+# TelemetrySink (game/telemetry.py): a background thread writes them, rotates
+# the file by size/age into gzipped segments, and samples a single user's
+# rows past TWITCHACK_ATTACK_LOG_SAMPLE_ABOVE per second (strikes and jailings
+# are always kept). Set TWITCHACK_ATTACK_LOG="" to disable.
 # ---------------------------------------------------------------------------
 
 _ATTACK_LOG_PATH = os.environ.get(
     "TWITCHACK_ATTACK_LOG",
     os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "attack_log.jsonl"),
 )
+# A bad value falls back to the default rather than breaking the import
+# (and with it every attack).
+try:
+    _ATTACK_LOG_MAX_BYTES = int(float(os.environ.get("TWITCHACK_ATTACK_LOG_MAX_MB", "64")) * 1024 * 1024)
+except ValueError:
+    _ATTACK_LOG_MAX_BYTES = telemetry.MAX_BYTES
+try:
+    _ATTACK_LOG_SAMPLE_ABOVE = int(os.environ.get("TWITCHACK_ATTACK_LOG_SAMPLE_ABOVE",
+                                                  str(telemetry.SAMPLE_ABOVE)))
+except ValueError:
+    _ATTACK_LOG_SAMPLE_ABOVE = telemetry.SAMPLE_ABOVE
+
+
+def _make_sink(path: str):
+    if not path:
+        return None
+    return telemetry.TelemetrySink(path, max_bytes=_ATTACK_LOG_MAX_BYTES,
+                                   sample_above=_ATTACK_LOG_SAMPLE_ABOVE)
+
+
+_SINK = _make_sink(_ATTACK_LOG_PATH)
 
 
 def set_attack_log_path(path: str) -> None:
-    """Override the attack-log location (used by tests)."""
-    global _ATTACK_LOG_PATH
+    """Override the attack-log location (used by tests); "" disables it."""
+    global _ATTACK_LOG_PATH, _SINK
+    if _SINK is not None:
+        _SINK.close()
     _ATTACK_LOG_PATH = path
+    _SINK = _make_sink(path)
+
+
+def flush_telemetry() -> None:
+    """Write buffered attack-log rows now (tests, shutdown)."""
+    if _SINK is not None:
+        _SINK.flush()
 
 
 def _telemetry(player, location: str, base_reward: int, now: datetime, result) -> None:
-    """Append one JSONL row describing this attack. Errors are swallowed so
-    telemetry never breaks gameplay."""
-    if not _ATTACK_LOG_PATH:
+    """Queue one attack-log row. Errors are swallowed so telemetry never
+    breaks gameplay."""
+    if _SINK is None:
         return
     try:
-        row = {
-            "ts": _to_iso(now),
-            "user": getattr(player, "username", "?"),
+        user = getattr(player, "username", "?")
+        _SINK.emit({
+            "ts": now,                  # ISO-8601 on the writer thread
+            "user": user,
             "level": getattr(player, "level", 0),
             "location": location,
             "base_reward": base_reward,
@@ -194,9 +308,8 @@ def _telemetry(player, location: str, base_reward: int, now: datetime, result) -
             "violation": result.is_violation,
             "strikes_now": result.strikes_now,
             "jailed": result.jailed,
-        }
-        with open(_ATTACK_LOG_PATH, "a") as f:
-            f.write(json.dumps(row) + "\n")
+            **({} if result.limiter == "gap" else {"limiter": result.limiter}),
+        }, key=user, keep=result.is_violation or result.jailed)
     except Exception:
         pass
 
@@ -227,23 +340,33 @@ def _from_iso(s: Optional[str]) -> Optional[datetime]:
 
 
 # ---------------------------------------------------------------------------
-# Threshold lookup — pure helper, exposed for tests.
+# Threshold lookup — pure helpers, exposed for tests.
 # ---------------------------------------------------------------------------
 
+def limit_for(location: str, level: int) -> Optional[SpeedLimit]:
+    """Return the SPEED_THRESHOLDS entry for this location+level: a gap in
+    seconds, a rate-limit engine, or None if speed-limiting does not apply
+    at this location (e.g. `home`).
+    """
+    tiers = SPEED_THRESHOLDS.get(location)
+    if tiers is None:
+        return None
+    for max_level, limit in tiers:
+        if max_level is None or level <= max_level:
+            return limit
+    return tiers[-1][1]  # defensive; should be unreachable
+
+
 def threshold_for(location: str, level: int) -> Optional[float]:
     """Return the speed threshold (seconds) for this location+level, or None
     if speed-limiting does not apply at this location (e.g. `home`).
 
+    For an engine tier this is its nominal seconds per attack.
     A return of None means "no rate limit here" — caller should skip the
     speed check entirely.
     """
-    tiers = SPEED_THRESHOLDS.get(location)
-    if tiers is None:
-        return None
-    for max_level, threshold in tiers:
-        if max_level is None or level <= max_level:
-            return threshold
-    return tiers[-1][1]  # defensive; should be unreachable
+    limit = limit_for(location, level)
+    return getattr(limit, "threshold", limit)
 
 
 # ---------------------------------------------------------------------------
@@ -261,7 +384,10 @@ class SpeedResult:
     gap_seconds  : seconds since this player's previous attack at this location,
                    or None for first-ever. Used for telemetry / threshold tuning.
     threshold    : the threshold (seconds) the gap was measured against. None
-                   when the location is not rate-limited.
+                   when the location is not rate-limited. For engine limits,
+                   the engine's nominal seconds per attack.
+    limiter      : which engine judged the attack: "gap" (legacy float
+                   threshold), "bucket" or "window".
     message      : optional user-facing copy describing what happened. The
                    caller composes the full chat reply; this is the jail-
                    specific fragment.
@@ -273,6 +399,7 @@ class SpeedResult:
     gap_seconds: Optional[float] = None
     threshold: Optional[float] = None
     message: Optional[str] = None
+    limiter: str = "gap"
 
 
 @dataclass
@@ -372,6 +499,7 @@ def _send_to_jail(player, reason: str, now: datetime) -> tuple[int, int]:
     player.offense_count = offense_no
     player.speed_strikes = 0
     player.last_strike_at = None
+    expiry.track(player)
     return duration_min, offense_no
 
 
@@ -417,7 +545,8 @@ def record_attack(
 
     `bypass_speed_check=True` is for items like Burner Laptop that fire
     auto-attacks: we still record the timestamp (so the next manual click
-    is measured against this one) but skip the strike/penalty machinery.
+    is measured against this one; engine limits count it against the rate)
+    but skip the strike/penalty machinery.
 
     Returns a SpeedResult; on jail-flip the caller should suppress the
     normal reward path and use the result's message.
@@ -426,37 +555,40 @@ def record_attack(
     _release_if_expired(player, n)
     _decay_strikes(player, n)
 
-    threshold = threshold_for(location, player.level)
-    last_attack = _from_iso((player.last_attack_at or {}).get(location))
-    gap = (n - last_attack).total_seconds() if last_attack else None
+    limit = limit_for(location, player.level)
 
     # Burner Laptop's lingering "no-cap" window: while active, attacks
     # bypass the speed-penalty check entirely (no strikes, no penalty).
     no_cap_until = _from_iso(getattr(player, 'no_cap_until', None))
     in_no_cap = no_cap_until is not None and n < no_cap_until
 
-    # Record this attack's timestamp regardless of outcome — strikes are
-    # measured by the *next* attack, not this one.
-    if player.last_attack_at is None:
-        player.last_attack_at = {}
-    player.last_attack_at[location] = _to_iso(n)
-
-    if bypass_speed_check or in_no_cap or threshold is None or last_attack is None:
-        result = SpeedResult(
-            is_violation=False,
-            strikes_now=player.speed_strikes,
-            gap_seconds=gap,
-            threshold=threshold,
-        )
-        _telemetry(player, location, base_reward, n, result)
-        return result
-
-    if gap >= threshold:
+    # Record this attack regardless of outcome — strikes are measured by the
+    # *next* attack, not this one, and exempt attacks still use up the rate.
+    if limit is None or isinstance(limit, (int, float)):
+        threshold, limiter = limit, "gap"
+        last_attack = _from_iso((player.last_attack_at or {}).get(location))
+        gap = (n - last_attack).total_seconds() if last_attack else None
+        if player.last_attack_at is None:
+            player.last_attack_at = {}
+        player.last_attack_at[location] = _to_iso(n)
+        too_fast = threshold is not None and gap is not None and gap < threshold
+    else:
+        threshold, limiter = limit.threshold, limit.kind
+        states = getattr(player, 'rate_state', None)
+        if states is None:
+            states = player.rate_state = {}
+        state = states.get(location)
+        if state is None:
+            state = states[location] = []
+        too_fast, gap = limit.hit(state, n.timestamp())
+
+    if bypass_speed_check or in_no_cap or not too_fast:
         result = SpeedResult(
             is_violation=False,
             strikes_now=player.speed_strikes,
             gap_seconds=gap,
             threshold=threshold,
+            limiter=limiter,
         )
         _telemetry(player, location, base_reward, n, result)
         return result
@@ -475,6 +607,7 @@ def record_attack(
             jail_minutes=duration_min,
             gap_seconds=gap,
             threshold=threshold,
+            limiter=limiter,
             message=(
                 f"🚔 Too fast — strike {STRIKES_TO_JAIL}/{STRIKES_TO_JAIL}. "
                 f"You're in jail for {duration_min} min (offense #{offense_no}). "
@@ -489,6 +622,7 @@ def record_attack(
         strikes_now=strikes,
         gap_seconds=gap,
         threshold=threshold,
+        limiter=limiter,
         message=(
             f"⚠️ Too fast at {location}. Strike {strikes}/{STRIKES_TO_JAIL}. "
             f"One more and you're going to jail."
@@ -595,8 +729,8 @@ def post_bail(bailer, jailed, now: Optional[datetime] = None) -> BailResult:
     bailer_share = int(round(cost * BAILER_SHARE))
     treasury_share = cost - bailer_share
 
-    jailed.points = max(0, jailed.points - cost)
-    bailer.points += bailer_share
+    ledger.apply(jailed, ledger.BAIL, points=-cost, counterparty=bailer.username, clamp=True)
+    ledger.apply(bailer, ledger.BAIL, points=bailer_share, counterparty=jailed.username)
     _credit_treasury(treasury_share)
 
     # Spring them. Strikes already zeroed by _release_if_expired pattern;
@@ -0,0 +1,86 @@
+"""Deadline scheduler for idle-hack jobs.
+
+A min-heap of (finishes_at, seq, username). `hacks.start_hack` registers every
+new job here (see hacks.set_job_scheduler), the bot rebuilds the heap from the
+persisted `player.jobs` on startup, and the bot's scheduler loop sleeps until
+the earliest deadline instead of polling the whole roster every tick. Each
+wake-up pops only the players whose jobs are due, so per-wake cost is
+O(due jobs · log n), not O(roster).
+
+Entries are never removed eagerly. A job settled early by the lazy per-command
+resolver just leaves a stale entry, and popping it later resolves nothing.
+That is cheaper than tracking heap positions.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+import heapq
+import itertools
+from datetime import datetime, timezone
+
+from game.timestamps import epoch_seconds
+
+
+def _now(now: datetime | None) -> datetime:
+    return now or datetime.now(timezone.utc)
+
+
+class JobScheduler:
+    """Min-heap of job deadlines keyed by username."""
+
+    def __init__(self, on_earlier=None):
+        # Called when a registration moves the earliest deadline forward, so a
+        # sleeping scheduler loop can wake and re-arm its timer.
+        self._on_earlier = on_earlier
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def register(self, username: str, finishes_at) -> None:
+        ts = epoch_seconds(finishes_at)
+        if ts is None:
+            return
+        earlier = not self._heap or ts < self._heap[0][0]
+        heapq.heappush(self._heap, (ts, next(self._seq), username))
+        if earlier and self._on_earlier is not None:
+            self._on_earlier()
+
+    def rebuild(self, player_data: dict) -> int:
+        """Re-seed from every player's persisted jobs and standing-order settle
+        times. Returns entries loaded."""
+        entries = []
+        for username, player in player_data.items():
+            for job in getattr(player, 'jobs', None) or []:
+                ts = epoch_seconds(job.get('finishes_at'))
+                if ts is not None:
+                    entries.append((ts, next(self._seq), username))
+            for order in (getattr(player, 'orders', None) or {}).values():
+                ts = epoch_seconds(order.get('next_settle'))
+                if ts is not None:
+                    entries.append((ts, next(self._seq), username))
+        heapq.heapify(entries)
+        self._heap = entries
+        if self._on_earlier is not None:
+            self._on_earlier()
+        return len(entries)
+
+    def next_deadline(self) -> float | None:
+        return self._heap[0][0] if self._heap else None
+
+    def seconds_until_next(self, now: datetime | None = None) -> float | None:
+        """Seconds until the earliest deadline (0 if overdue, None if empty)."""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        return max(0.0, deadline - _now(now).timestamp())
+
+    def pop_due(self, now: datetime | None = None) -> list[str]:
+        """Pop every entry due by `now`; return the distinct usernames in
+        deadline order."""
+        cutoff = _now(now).timestamp()
+        due: dict[str, None] = {}
+        while self._heap and self._heap[0][0] <= cutoff:
+            _, _, username = heapq.heappop(self._heap)
+            due[username] = None
+        return list(due)
@@ -0,0 +1,167 @@
+"""Incrementally maintained leaderboards: points, cash and session earnings.
+
+`!leaderboard` used to sort the whole roster on every call, and a player's
+rank needed another full sort. Each Board keeps its players in a sorted list
+of (-score, username) and updates it with bisect whenever a score changes.
+Rank, percentile and neighbour lookups are binary searches. Top-N is a slice.
+An insert is still a list memmove, but that is microseconds at this roster
+size, and no sort ever happens.
+
+Player.points / Player.cash report every write through
+playerdata.set_leaderboards, so no call site has to remember to update a
+board. Boards remember the top-N they last pushed. `take_changed()` only
+returns a board when its top-N actually differs, so the overlay is not pushed
+on every click.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+from bisect import bisect_left, bisect_right, insort
+
+POINTS = "points"
+CASH = "cash"
+SESSION = "session"     # net points earned since the bot started
+BOARDS = (POINTS, CASH, SESSION)
+
+TOP_N = 5
+
+# Sorts after every username, so (-score, _LAST) bounds a tie group.
+_LAST = "\U0010ffff"
+
+
+class Board:
+    """One ranking: highest score first, ties broken by username."""
+
+    def __init__(self, top_n: int = TOP_N):
+        self.top_n = top_n
+        self._entries: list[tuple[int, str]] = []
+        self._scores: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, username) -> bool:
+        return username in self._scores
+
+    def score(self, username: str) -> int | None:
+        return self._scores.get(username)
+
+    def _position(self, username: str) -> int | None:
+        score = self._scores.get(username)
+        if score is None:
+            return None
+        return bisect_left(self._entries, (-score, username))
+
+    def update(self, username: str, score: int) -> bool:
+        """Set a player's score. Returns True if the top-N may have changed."""
+        old = self._scores.get(username)
+        if old == score:
+            return False
+        touched = False
+        if old is not None:
+            i = bisect_left(self._entries, (-old, username))
+            del self._entries[i]
+            touched = i < self.top_n
+        self._scores[username] = score
+        entry = (-score, username)
+        insort(self._entries, entry)
+        return touched or bisect_left(self._entries, entry) < self.top_n
+
+    def remove(self, username: str) -> bool:
+        i = self._position(username)
+        if i is None:
+            return False
+        del self._entries[i]
+        del self._scores[username]
+        return i < self.top_n
+
+    def top(self, n: int | None = None) -> list[tuple[str, int]]:
+        return [(u, -neg) for neg, u in self._entries[:n or self.top_n]]
+
+    def rank(self, username: str) -> int | None:
+        """1-based competition rank: tied scores share the better rank."""
+        score = self._scores.get(username)
+        if score is None:
+            return None
+        return bisect_left(self._entries, (-score, "")) + 1
+
+    def percentile(self, username: str) -> float | None:
+        """Percent of the other players this player strictly out-scores."""
+        score = self._scores.get(username)
+        if score is None:
+            return None
+        n = len(self._entries)
+        if n <= 1:
+            return 100.0
+        below = n - bisect_right(self._entries, (-score, _LAST))
+        return round(100.0 * below / (n - 1), 1)
+
+    def around(self, username: str, k: int = 2) -> list[tuple[int, str, int]]:
+        """Up to k players either side as (rank, username, score)."""
+        i = self._position(username)
+        if i is None:
+            return []
+        lo, hi = max(0, i - k), min(len(self._entries), i + k + 1)
+        out = []
+        for neg, u in self._entries[lo:hi]:
+            out.append((bisect_left(self._entries, (neg, "")) + 1, u, -neg))
+        return out
+
+
+class Leaderboards:
+    """The points, cash and session boards, fed by Player stat writes."""
+
+    def __init__(self, top_n: int = TOP_N):
+        self.top_n = top_n
+        self.boards = {name: Board(top_n) for name in BOARDS}
+        # Points each player had when first seen this session.
+        self._baseline: dict[str, int] = {}
+        self._dirty: set[str] = set()
+        self._pushed: dict[str, list] = {}
+
+    def __getitem__(self, name: str) -> Board:
+        return self.boards[name]
+
+    def _set(self, name: str, username: str, score: int) -> None:
+        if self.boards[name].update(username, score):
+            self._dirty.add(name)
+
+    def observe(self, username: str, field: str, value) -> None:
+        """A player's `points` or `cash` was written."""
+        try:
+            value = int(value or 0)
+        except (TypeError, ValueError):
+            return
+        if field == POINTS:
+            baseline = self._baseline.setdefault(username, value)
+            self._set(POINTS, username, value)
+            self._set(SESSION, username, value - baseline)
+        elif field == CASH:
+            self._set(CASH, username, value)
+
+    def remove(self, username: str) -> None:
+        self._baseline.pop(username, None)
+        for name, board in self.boards.items():
+            if board.remove(username):
+                self._dirty.add(name)
+
+    def rebuild(self, player_data: dict) -> None:
+        """Re-seed every board from the roster and start a new session."""
+        self.boards = {name: Board(self.top_n) for name in BOARDS}
+        self._baseline = {}
+        self._pushed = {}
+        for username, player in player_data.items():
+            self.observe(username, POINTS, getattr(player, "points", 0))
+            self.observe(username, CASH, getattr(player, "cash", 0))
+        self._dirty = set(BOARDS)
+
+    def take_changed(self) -> dict[str, list[tuple[str, int]]]:
+        """Boards whose top-N differs from the last call, with their new top-N.
+        Marks them pushed."""
+        changed = {}
+        for name in self._dirty:
+            top = self.boards[name].top(self.top_n)
+            if self._pushed.get(name) != top:
+                self._pushed[name] = top
+                changed[name] = top
+        self._dirty = set()
+        return changed
@@ -0,0 +1,162 @@
+"""Append-only economy ledger: why every points/cash balance changed.
+
+Points and cash move in dozens of places (attacks, !steal, bail, skims,
+battle rewards, !patchtuesday, owner grants, idle payouts, hardware buys),
+and the only trace used to be the new balance. Every balance mutation now
+goes through `apply()`. It changes the player and appends one row to the
+installed Ledger:
+
+    (ts, username, delta_points, delta_cash, reason, counterparty)
+
+`ts` is epoch seconds. The deltas are the amounts actually applied, after
+any clamp at zero. `counterparty` is the other player in a transfer (the
+victim of a steal, the bailer, ...) or None.
+
+The write path is the hot path (autoclickers), so `record` does only a tuple
+append, a bounded per-user deque append and two aggregate bumps. Persisting
+happens elsewhere: bot/db.py's flusher calls `take_batch()` and bulk-copies
+the rows into Postgres. `history()` and `totals()` answer from memory. They
+cover recent rows per user and since-boot per-reason sums; older history is
+a database query.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+import time
+from collections import deque
+
+# Reasons (one per mutation site family; the aggregates group by these).
+ATTACK = "attack"
+ATTACK_PENALTY = "attack_penalty"
+SPEED_PENALTY = "speed_penalty"
+STEAL = "steal"
+STEAL_PENALTY = "steal_penalty"
+BAIL = "bail"
+HACK_PAYOUT = "hack_payout"
+HARDWARE = "hardware"
+BATTLE_REWARD = "battle_reward"
+BATTLE_BONUS = "battle_bonus"
+PATCH_TUESDAY = "patch_tuesday"
+VIRUS = "virus"
+OWNER_GRANT = "owner_grant"
+EVENT = "event"             # chat easter eggs, MVP, Konami, ...
+FEE = "fee"
+NEOVIM = "neovim"
+
+HISTORY_PER_USER = 50       # recent rows kept in memory per user
+MAX_PENDING = 100_000       # unflushed rows kept if the database is unreachable
+
+
+class Ledger:
+    """In-memory side of the ledger: the unflushed batch, recent history per
+    user and since-boot totals per reason."""
+
+    def __init__(self, history_per_user: int = HISTORY_PER_USER,
+                 max_pending: int = MAX_PENDING):
+        self.history_per_user = history_per_user
+        self.max_pending = max_pending
+        self._batch: list[tuple] = []
+        self._history: dict[str, deque] = {}
+        self._totals: dict[str, list[int]] = {}    # reason → [count, points, cash]
+        self.dropped = 0                           # rows lost to max_pending
+
+    def record(self, username: str, delta_points: int = 0, delta_cash: int = 0,
+               reason: str = EVENT, counterparty: str | None = None,
+               ts: float | None = None) -> None:
+        row = (ts if ts is not None else time.time(), username,
+               delta_points, delta_cash, reason, counterparty)
+        self._batch.append(row)
+        hist = self._history.get(username)
+        if hist is None:
+            hist = self._history[username] = deque(maxlen=self.history_per_user)
+        hist.append(row)
+        agg = self._totals.get(reason)
+        if agg is None:
+            agg = self._totals[reason] = [0, 0, 0]
+        agg[0] += 1
+        agg[1] += delta_points
+        agg[2] += delta_cash
+
+    # -- flusher side -----------------------------------------------------------
+    def pending(self) -> int:
+        return len(self._batch)
+
+    def take_batch(self) -> list[tuple]:
+        """Hand the unflushed rows to the writer (oldest first)."""
+        batch, self._batch = self._batch, []
+        return batch
+
+    def restore(self, batch: list[tuple]) -> None:
+        """Put back a batch whose write failed, ahead of newer rows. Drops the
+        oldest rows beyond `max_pending` so an outage can't grow without bound."""
+        self._batch[:0] = batch
+        excess = len(self._batch) - self.max_pending
+        if excess > 0:
+            del self._batch[:excess]
+            self.dropped += excess
+
+    # -- queries ----------------------------------------------------------------
+    def history(self, username: str, limit: int | None = None) -> list[tuple]:
+        """Most recent rows for `username`, newest first."""
+        hist = self._history.get(username)
+        if not hist:
+            return []
+        rows = list(reversed(hist))
+        return rows[:limit] if limit is not None else rows
+
+    def totals(self, reason: str | None = None) -> dict:
+        """{reason: {"count", "points", "cash"}} since boot (one reason if given)."""
+        items = ([(reason, self._totals[reason])] if reason in self._totals else []) \
+            if reason is not None else self._totals.items()
+        return {r: {"count": n, "points": p, "cash": c} for r, (n, p, c) in items}
+
+
+# ---------------------------------------------------------------------------
+# Installed ledger + the mutation API
+# ---------------------------------------------------------------------------
+
+# None = not tracked (tests, scripts): balances still change, nothing is recorded.
+_LEDGER: Ledger | None = None
+
+
+def set_ledger(ledger: Ledger | None) -> None:
+    """Install the ledger `apply` records into (None to detach)."""
+    global _LEDGER
+    _LEDGER = ledger
+
+
+def get_ledger() -> Ledger | None:
+    return _LEDGER
+
+
+def apply(player, reason: str, points: int = 0, cash: int = 0,
+          counterparty: str | None = None, clamp: bool = False) -> tuple[int, int]:
+    """Add `points`/`cash` (either may be negative) to `player` and record it.
+
+    With `clamp`, a balance that would go negative stops at 0 and only the
+    amount actually taken is recorded. Returns the applied (points, cash).
+    """
+    if points:
+        before = player.points
+        after = before + points
+        if clamp and after < 0:
+            after = 0
+        player.points = after
+        points = after - before
+    if cash:
+        before = getattr(player, "cash", 0) or 0
+        after = before + cash
+        if clamp and after < 0:
+            after = 0
+        player.cash = after
+        cash = after - before
+    if _LEDGER is not None and (points or cash):
+        _LEDGER.record(player.username, points, cash, reason, counterparty)
+    return points, cash
+
+
+def transfer(payer, payee, points: int, reason: str, clamp: bool = True) -> int:
+    """Move `points` from `payer` to `payee` (both recorded, each naming the
+    other as counterparty). Returns the amount that moved."""
+    taken, _ = apply(payer, reason, points=-points, counterparty=payee.username, clamp=clamp)
+    apply(payee, reason, points=-taken, counterparty=payer.username)
+    return -taken
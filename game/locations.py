@@ -0,0 +1,102 @@
+"""Location occupancy index: who is where, plus per-location activity.
+
+The seven TwitcHack locations are the natural shards of the game world.
+`!steal` needs attacker and victim in the same place, and the "who's here"
+features need the same answer. LocationIndex maps each location to the set of
+players there and counts activity per location, so none of those queries
+scan the roster.
+
+Player.location is a property that reports moves through
+playerdata.set_location_index, covering `!hack <location>`, `!start` and
+hydration alike. The bot rebuilds the index from the roster on startup.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+from dataclasses import dataclass
+
+# Where `!hack <location>` can move you (in the order it lists them).
+LOCATIONS = ('email', '/etc/shadow', 'website', 'database', 'server', 'network', 'evilcorp')
+
+
+def normalize(location) -> str | None:
+    """Canonical location name, or None if it isn't a TwitcHack location."""
+    loc = str(location or '').strip().lower()
+    return loc if loc in LOCATIONS else None
+
+
+@dataclass
+class LocationStats:
+    """Session activity at one location."""
+    arrivals: int = 0
+    actions: int = 0
+
+
+class LocationIndex:
+    """location → usernames there, and username → location."""
+
+    def __init__(self):
+        self._here: dict[str, set[str]] = {}
+        self._where: dict[str, str] = {}
+        self._stats: dict[str, LocationStats] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def _stat(self, location: str) -> LocationStats:
+        return self._stats.setdefault(location, LocationStats())
+
+    def move(self, username: str, location, *, count: bool = True) -> None:
+        """Place a player at `location` (any string; 'home' is tracked too).
+        With count=False the arrival isn't counted (hydration)."""
+        location = str(location or 'home').strip().lower()
+        old = self._where.get(username)
+        if old == location:
+            return
+        if old is not None:
+            self._discard(username, old)
+        self._where[username] = location
+        self._here.setdefault(location, set()).add(username)
+        if count and old is not None:
+            self._stat(location).arrivals += 1
+
+    def _discard(self, username: str, location: str) -> None:
+        players = self._here.get(location)
+        if players is None:
+            return
+        players.discard(username)
+        if not players:
+            del self._here[location]
+
+    def remove(self, username: str) -> None:
+        old = self._where.pop(username, None)
+        if old is not None:
+            self._discard(username, old)
+
+    def where(self, username: str) -> str | None:
+        return self._where.get(username)
+
+    def players_at(self, location) -> frozenset[str]:
+        return frozenset(self._here.get(str(location or '').strip().lower(), ()))
+
+    def count_at(self, location) -> int:
+        return len(self._here.get(str(location or '').strip().lower(), ()))
+
+    def record_action(self, location) -> None:
+        """Count one game action (an attack, a steal) at `location`."""
+        self._stat(str(location or 'home').strip().lower()).actions += 1
+
+    def stats(self) -> dict[str, dict]:
+        """Occupancy and session activity for every TwitcHack location."""
+        return {loc: {"here": self.count_at(loc),
+                      "arrivals": self._stat(loc).arrivals,
+                      "actions": self._stat(loc).actions}
+                for loc in LOCATIONS}
+
+    def rebuild(self, player_data: dict) -> int:
+        """Re-seed occupancy from the roster (activity counters are kept).
+        Returns the number of players placed."""
+        self._here = {}
+        self._where = {}
+        for username, player in player_data.items():
+            self.move(username, getattr(player, 'location', None), count=False)
+        return len(self._where)
@@ -0,0 +1,107 @@
+"""Rate-limit engines for the jail speed check (see game/jail.py).
+
+The legacy engine is a bare float in `jail.SPEED_THRESHOLDS`. It is the
+minimum gap (seconds) between two attacks at a location. A clicker jittering
+around that gap never trips it, however fast its average rate is. Each
+attack also costs an ISO parse and an ISO write on `last_attack_at`.
+
+The engines here limit the *rate* instead. Each keeps a short list of floats
+per player per location (`Player.rate_state`) and works in epoch seconds:
+
+  * TokenBucketLimit(rate, burst) — `burst` attacks back to back, then
+    `rate` attacks/sec sustained.
+  * SlidingWindowLimit(max_hits, window) — at most `max_hits` attacks in
+    any `window` seconds. The count is the usual two-bucket approximation:
+    the current fixed window plus the previous one weighted by how much of
+    it still overlaps.
+
+Put an engine anywhere a float threshold goes in SPEED_THRESHOLDS. The
+strike, jail and telemetry rules in `jail.record_attack` are the same for
+every engine; only the "too fast?" verdict differs.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+
+class TokenBucketLimit:
+    """Token bucket: `burst` tokens, refilled at `rate` per second; an
+    attack with less than one token left is too fast.
+
+    State: [tokens, last_ts].
+    """
+    kind = "bucket"
+    __slots__ = ("rate", "burst")
+
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0 or burst < 1:
+            raise ValueError("TokenBucketLimit needs rate > 0 and burst >= 1")
+        self.rate = float(rate)
+        self.burst = float(burst)
+
+    @property
+    def threshold(self) -> float:
+        """Nominal seconds per attack (telemetry / threshold_for)."""
+        return 1.0 / self.rate
+
+    def hit(self, state: list, t: float) -> tuple[bool, Optional[float]]:
+        """Count one attack at epoch `t`, updating `state` in place.
+        Returns (too_fast, gap_seconds); gap is None on the first attack."""
+        if not state:
+            state[:] = (self.burst - 1.0, t)
+            return False, None
+        tokens, last = state
+        gap = t - last
+        if gap > 0:
+            tokens = min(self.burst, tokens + gap * self.rate)
+        too_fast = tokens < 1.0
+        state[0] = 0.0 if too_fast else tokens - 1.0
+        state[1] = t
+        return too_fast, gap
+
+    def __repr__(self) -> str:
+        return f"TokenBucketLimit(rate={self.rate:g}, burst={self.burst:g})"
+
+
+class SlidingWindowLimit:
+    """Sliding-window counter: an attack is too fast when at least
+    `max_hits` attacks already landed in the trailing `window` seconds.
+
+    State: [window_start, prev_count, curr_count, last_ts].
+    """
+    kind = "window"
+    __slots__ = ("max_hits", "window")
+
+    def __init__(self, max_hits: int, window: float):
+        if max_hits < 1 or window <= 0:
+            raise ValueError("SlidingWindowLimit needs max_hits >= 1 and window > 0")
+        self.max_hits = max_hits
+        self.window = float(window)
+
+    @property
+    def threshold(self) -> float:
+        """Nominal seconds per attack (telemetry / threshold_for)."""
+        return self.window / self.max_hits
+
+    def hit(self, state: list, t: float) -> tuple[bool, Optional[float]]:
+        """Count one attack at epoch `t`, updating `state` in place.
+        Returns (too_fast, gap_seconds); gap is None on the first attack."""
+        if not state:
+            state[:] = (t, 0.0, 1.0, t)
+            return False, None
+        start, prev, curr, last = state
+        elapsed = t - start
+        if elapsed >= self.window:
+            windows = int(elapsed // self.window)
+            prev = curr if windows == 1 else 0.0
+            curr = 0.0
+            start += windows * self.window
+            elapsed = t - start
+        recent = prev * (1.0 - elapsed / self.window) + curr
+        state[:] = (start, prev, curr + 1.0, t)
+        return recent >= self.max_hits, t - last
+
+    def __repr__(self) -> str:
+        return f"SlidingWindowLimit(max_hits={self.max_hits}, window={self.window:g})"
@@ -0,0 +1,217 @@
+"""Buffered, rotating JSONL telemetry sink (jail attack log and friends).
+
+`jail._telemetry` used to open attack_log.jsonl and write one line per
+attack, synchronously on the event loop, into a file that grew forever.
+TelemetrySink splits that work:
+
+  * `emit(row)` is the hot path. It does a sampling check and one deque
+    append; JSON encoding (including datetime → ISO-8601) and file IO
+    happen elsewhere.
+  * A daemon writer thread drains the buffer every `flush_interval`
+    seconds and appends the rows to the live segment (`attack_log.jsonl`).
+  * When the live segment reaches `max_bytes` or `max_age` seconds, it is
+    closed and renamed `attack_log.<YYYYmmdd-HHMMSS>.jsonl`, then gzipped
+    to `.jsonl.gz` on the writer thread. Only the newest `keep` closed
+    segments are kept.
+  * Sampling: once one key (a username) emits more than `sample_above` rows
+    in a second, only every `sample_every`-th extra row is kept and tagged
+    `"sample": sample_every`, so analysis can re-weight it. Rows emitted with
+    `keep=True` (strikes, jailings) are never sampled out.
+
+The buffer is bounded (`max_buffer`), so if the disk stalls the oldest
+unwritten rows are dropped rather than the bot's memory growing; `dropped`
+counts them. Errors in the writer are swallowed — telemetry never breaks
+gameplay.
+"""
+import atexit
+import glob
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from datetime import timezone
+
+MAX_BYTES = 64 * 1024 * 1024        # rotate the live segment at 64 MB ...
+MAX_AGE = 24 * 3600                 # ... or after a day, whichever comes first
+KEEP_SEGMENTS = 60                  # closed .gz segments kept on disk
+FLUSH_INTERVAL = 1.0                # seconds between writer drains
+MAX_BUFFER = 200_000                # unwritten rows held before dropping the oldest
+SAMPLE_ABOVE = 20                   # rows/sec per key before sampling kicks in
+SAMPLE_EVERY = 10                   # keep 1 in N rows past SAMPLE_ABOVE
+
+
+def _encode(obj):
+    """JSON fallback for values left raw on the hot path (datetimes)."""
+    if hasattr(obj, "isoformat"):
+        if getattr(obj, "tzinfo", False) is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat()
+    raise TypeError(f"not JSON serializable: {type(obj).__name__}")
+
+
+def segment_glob(path: str) -> str:
+    """Glob matching the closed (gzipped) segments of the log at `path`."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.*{ext}.gz"
+
+
+class TelemetrySink:
+    """One JSONL log: buffered writes, rotation, gzip and sampling."""
+
+    def __init__(self, path: str, max_bytes: int = MAX_BYTES, max_age: float = MAX_AGE,
+                 keep: int = KEEP_SEGMENTS, flush_interval: float = FLUSH_INTERVAL,
+                 max_buffer: int = MAX_BUFFER, sample_above: int = SAMPLE_ABOVE,
+                 sample_every: int = SAMPLE_EVERY, clock=time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.keep = keep
+        self.flush_interval = flush_interval
+        self.sample_above = sample_above        # 0 disables sampling
+        self.sample_every = max(1, sample_every)
+        self._clock = clock
+        self._buf: deque = deque(maxlen=max_buffer)
+        self._rate_sec = None                   # the second _rates counts
+        self._rates: dict[str, int] = {}        # key → rows emitted this second
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread: threading.Thread | None = None
+        self._file = None
+        self._opened_at = 0.0
+        self.emitted = 0
+        self.sampled_out = 0
+        self.written = 0
+
+    @property
+    def dropped(self) -> int:
+        """Rows pushed out of the full buffer before the writer got to them."""
+        return max(0, self.emitted - self.sampled_out - self.written - len(self._buf))
+
+    # -- hot path -------------------------------------------------------------
+    def emit(self, row: dict, key: str | None = None, keep: bool = False) -> None:
+        """Queue one row. Cheap; never touches the disk."""
+        self.emitted += 1
+        if key is not None and self.sample_above and not keep:
+            sec = int(self._clock())
+            if sec != self._rate_sec:
+                self._rate_sec, self._rates = sec, {}
+            count = self._rates[key] = self._rates.get(key, 0) + 1
+            over = count - self.sample_above
+            if over > 0:
+                if over % self.sample_every:
+                    self.sampled_out += 1
+                    return
+                row["sample"] = self.sample_every
+        self._buf.append(row)
+        if self._thread is None:
+            self._start()
+
+    # -- writer ---------------------------------------------------------------
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass
+
+    def flush(self) -> None:
+        """Write everything buffered so far (writer thread, tests, shutdown)."""
+        with self._io_lock:
+            if not self._buf:
+                self._maybe_rotate()
+                return
+            rows = []
+            buf = self._buf
+            while buf:
+                try:
+                    rows.append(buf.popleft())
+                except IndexError:
+                    break
+            f = self._open()
+            f.write("".join(json.dumps(r, default=_encode) + "\n" for r in rows))
+            f.flush()
+            self.written += len(rows)
+            self._maybe_rotate()
+
+    def close(self) -> None:
+        """Stop the writer, write what's buffered and close the live segment."""
+        self._stop = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+        try:
+            self.flush()
+        finally:
+            with self._io_lock:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+        self._stop = False
+
+    # -- segments -------------------------------------------------------------
+    def _open(self):
+        if self._file is None:
+            # Age counts from when this process opened the live segment.
+            self._file = open(self.path, "a")
+            self._opened_at = self._clock()
+        return self._file
+
+    def _maybe_rotate(self) -> None:
+        if self._file is None:
+            if not os.path.exists(self.path):
+                return
+            self._open()
+        size = self._file.tell()
+        if size == 0:
+            return
+        if size < self.max_bytes and self._clock() - self._opened_at < self.max_age:
+            return
+        self._rotate()
+
+    def rotate(self) -> str | None:
+        """Close the live segment, gzip it and prune old ones. Returns the .gz
+        path (None if there was nothing to rotate)."""
+        with self._io_lock:
+            return self._rotate()
+
+    def _rotate(self) -> str | None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        stem, ext = os.path.splitext(self.path)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(self._clock()))
+        closed = f"{stem}.{stamp}{ext}"
+        n = 1
+        while os.path.exists(closed) or os.path.exists(closed + ".gz"):
+            closed = f"{stem}.{stamp}-{n}{ext}"
+            n += 1
+        os.replace(self.path, closed)
+        with open(closed, "rb") as src, gzip.open(closed + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(closed)
+        self._prune()
+        return closed + ".gz"
+
+    def _prune(self) -> None:
+        if self.keep is None:
+            return
+        segments = sorted(glob.glob(segment_glob(self.path)))
+        for old in segments[:max(0, len(segments) - self.keep)]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
@@ -0,0 +1,23 @@
+"""Timestamp parsing shared by the deadline heaps (job_scheduler, expiry,
+curse_timers).
+
+Player fields hold deadlines as ISO strings; the heaps key on epoch seconds.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+from datetime import datetime
+
+
+def epoch_seconds(value) -> float | None:
+    """Epoch seconds from an ISO string, datetime or epoch number (None if
+    unparseable)."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
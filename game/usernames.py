@@ -0,0 +1,87 @@
+"""Username prefix index for target autocomplete and "did you mean".
+
+Targeted commands (!steal, !bail, !requestbail, !jail, !status <player>,
+!assignpoints, !ownercash) need the exact lowercase username, and a typo used
+to end in a flat "not registered". UsernameIndex keeps every registered name
+in one sorted list. A prefix query is two bisects plus a slice, so
+autocomplete costs O(log n + k). That stays well under a millisecond at 100k
+players. Suggestions rank only the names near the typo's longest matching
+prefix, never the whole roster.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+import difflib
+from bisect import bisect_left, insort
+
+# How many prefix neighbours a "did you mean" lookup ranks at most.
+SUGGEST_CANDIDATES = 50
+# difflib similarity floor for a suggestion.
+SUGGEST_CUTOFF = 0.6
+
+
+def _norm(name) -> str:
+    return str(name or "").strip().lstrip("@").lower()
+
+
+class UsernameIndex:
+    """Sorted, de-duplicated lowercase usernames."""
+
+    def __init__(self, names=()):
+        self._names = sorted({_norm(n) for n in names if _norm(n)})
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name) -> bool:
+        name = _norm(name)
+        i = bisect_left(self._names, name)
+        return i < len(self._names) and self._names[i] == name
+
+    def add(self, name) -> bool:
+        name = _norm(name)
+        if not name or name in self:
+            return False
+        insort(self._names, name)
+        return True
+
+    def remove(self, name) -> bool:
+        name = _norm(name)
+        i = bisect_left(self._names, name)
+        if i < len(self._names) and self._names[i] == name:
+            del self._names[i]
+            return True
+        return False
+
+    def rebuild(self, names) -> int:
+        self._names = sorted({_norm(n) for n in names if _norm(n)})
+        return len(self._names)
+
+    def complete(self, prefix, limit: int = 10) -> list[str]:
+        """Up to `limit` usernames starting with `prefix`, alphabetically."""
+        prefix = _norm(prefix)
+        if not prefix:
+            return []
+        start = bisect_left(self._names, prefix)
+        out = []
+        for name in self._names[start:start + limit]:
+            if not name.startswith(prefix):
+                break
+            out.append(name)
+        return out
+
+    def suggest(self, name, limit: int = 3) -> list[str]:
+        """Likely intended usernames for an unknown `name`. Completions of
+        the whole input come first. Otherwise the input's prefix is shortened
+        until some names share it, and those are ranked by similarity."""
+        name = _norm(name)
+        if not name:
+            return []
+        exact = self.complete(name, limit)
+        if exact:
+            return exact
+        for k in range(len(name) - 1, 0, -1):
+            candidates = self.complete(name[:k], SUGGEST_CANDIDATES)
+            if candidates:
+                return difflib.get_close_matches(name, candidates, n=limit,
+                                                 cutoff=SUGGEST_CUTOFF)
+        return []
@@ -1,5 +1,8 @@
 """Fire-and-forget HTTP pushes to the boss battle spectator overlay.
 
+Every call names the arena (game/arenas.py) it belongs to; the overlay keeps
+one battle state and one spectator room per arena.
+
 All calls silently swallow errors — if the overlay server isn't running
 it never affects the bot.
 """
@@ -7,11 +10,24 @@ it never affects the bot.
 import asyncio
 import json
 import os
+import urllib.error
 import urllib.request
 
+from integrations.battle_state import StateStream
+
 OVERLAY_URL = os.environ.get("OVERLAY_URL", "http://localhost:3003")
 _TIMEOUT = 0.5  # tight so the bot never stalls waiting on this
 
+DEFAULT_ARENA = "1"
+
+# Versioned state per arena: the first push (and any after a clear or a
+# failed send) is a full snapshot; the rest are patches of what changed.
+_streams: dict[str, StateStream] = {}
+
+
+def _stream(arena: str) -> StateStream:
+    return _streams.setdefault(arena, StateStream())
+
 
 def _post(path: str, payload: dict) -> None:
     data = json.dumps(payload).encode()
@@ -24,30 +40,58 @@ def _post(path: str, payload: dict) -> None:
     urllib.request.urlopen(req, timeout=_TIMEOUT)
 
 
-async def push(**kwargs) -> None:
-    """Push full battle state snapshot to the overlay."""
+async def push(arena: str = DEFAULT_ARENA, **kwargs) -> None:
+    """Push an arena's battle state to the overlay: a patch of what changed
+    since the last push, or a full snapshot if the overlay may be out of step."""
+    stream = _stream(arena)
+    msg = stream.next(kwargs)
+    if msg is None:
+        return
     try:
         loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, lambda: _post("/api/push", kwargs))
+        try:
+            path, payload = msg
+            await loop.run_in_executor(None, lambda: _post(path, {**payload, "arena": arena}))
+        except urllib.error.HTTPError:
+            # 409: the overlay missed a version (restart, dropped request).
+            stream.reset()
+            path, payload = stream.next(kwargs)
+            await loop.run_in_executor(None, lambda: _post(path, {**payload, "arena": arena}))
     except Exception:
-        pass
+        stream.reset()
+
 
+def resend(arena: str = DEFAULT_ARENA) -> None:
+    """Make the arena's next push a full snapshot (e.g. after an overlay restart)."""
+    _stream(arena).reset()
 
-async def log(msg: str, entry_type: str = "info") -> None:
-    """Append a single line to the overlay combat log."""
+
+async def log(msg: str, entry_type: str = "info", arena: str = DEFAULT_ARENA) -> None:
+    """Append a single line to an arena's combat log."""
     try:
         loop = asyncio.get_event_loop()
         await loop.run_in_executor(
-            None, lambda: _post("/api/log", {"msg": msg, "type": entry_type})
+            None, lambda: _post("/api/log", {"msg": msg, "type": entry_type, "arena": arena})
         )
     except Exception:
         pass
 
 
-async def clear() -> None:
-    """Reset the overlay to idle state."""
+async def log_batch(entries, arena: str = DEFAULT_ARENA) -> None:
+    """Append a block of (msg, entry_type) lines in one request, in order."""
+    payload = {"entries": [{"msg": m, "type": t} for m, t in entries], "arena": arena}
+    try:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, lambda: _post("/api/log", payload))
+    except Exception:
+        pass
+
+
+async def clear(arena: str = DEFAULT_ARENA) -> None:
+    """Reset an arena's overlay to idle state."""
+    _stream(arena).reset()
     try:
         loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, lambda: _post("/api/clear", {}))
+        await loop.run_in_executor(None, lambda: _post("/api/clear", {"arena": arena}))
     except Exception:
         pass
@@ -0,0 +1,95 @@
+"""Versioned boss-battle overlay state: full snapshots plus per-field patches.
+
+`_ov_state()` builds the whole battle view (boss, every player's HP and
+filtered inventory, hack_used, ...) and used to ship all of it on every
+push, many times a turn. StateStream remembers what the overlay was last
+sent and turns each new snapshot into a patch of only the fields that
+changed:
+
+    {"v": 8, "base": 7,
+     "set": {"boss_health": 1210, "hack_used": ["bob"]},
+     "players": {"alice": {"health": 22}, "carol": null}}
+
+`set` replaces top-level fields. `players` merges changed fields into each
+named player; a whole entry is sent for a new player and null removes one.
+Top-level keys missing from a snapshot are left alone, the same way
+/api/push treats them.
+
+The overlay server applies a patch only if `base` matches its current
+version, and otherwise answers 409. The sender then `reset()`s and sends a
+full snapshot, tagged with `version`. Spectators follow the same rule: they
+apply patches in order and ask for the full state when they see a gap.
+
+Pure module — no Twitch/async dependencies — so it is unit-testable.
+"""
+import copy
+
+PATCH_PATH = "/api/patch"
+FULL_PATH = "/api/push"
+_MISSING = object()
+
+
+def diff(old: dict, new: dict) -> dict:
+    """Changes that turn `old` into `new` ({} if none)."""
+    patch = {}
+    changed = {k: v for k, v in new.items() if k != "players" and old.get(k, _MISSING) != v}
+    if changed:
+        patch["set"] = changed
+    if "players" in new:
+        before, after = old.get("players") or {}, new["players"] or {}
+        players = {}
+        for name, entry in after.items():
+            prev = before.get(name)
+            if prev is None:
+                players[name] = entry
+                continue
+            fields = {k: v for k, v in entry.items() if prev.get(k, _MISSING) != v}
+            if fields:
+                players[name] = fields
+        for name in before:
+            if name not in after:
+                players[name] = None
+        if players:
+            patch["players"] = players
+    return patch
+
+
+def apply(state: dict, patch: dict) -> dict:
+    """Apply a patch in place (the server side of `diff`). Returns `state`."""
+    state.update(patch.get("set") or {})
+    if patch.get("players"):
+        players = dict(state.get("players") or {})
+        for name, fields in patch["players"].items():
+            if fields is None:
+                players.pop(name, None)
+            else:
+                players[name] = {**players.get(name, {}), **fields}
+        state["players"] = players
+    if "v" in patch:
+        state["version"] = patch["v"]
+    return state
+
+
+class StateStream:
+    """Sender side: numbers snapshots and diffs each against the last one sent."""
+
+    def __init__(self):
+        self.version = 0
+        self._sent = None
+
+    def reset(self) -> None:
+        """Forget what the receiver has; the next snapshot goes out whole."""
+        self._sent = None
+
+    def next(self, state: dict) -> tuple[str, dict] | None:
+        """(path, payload) to send for `state`, or None if nothing changed."""
+        if self._sent is None:
+            self.version += 1
+            self._sent = copy.deepcopy(state)
+            return FULL_PATH, {**state, "version": self.version}
+        changes = diff(self._sent, state)
+        if not changes:
+            return None
+        self.version += 1
+        apply(self._sent, copy.deepcopy(changes))
+        return PATCH_PATH, {"v": self.version, "base": self.version - 1, **changes}
@@ -65,6 +65,8 @@ async def player(username: str, player_obj) -> None:
             "no_cap_until": getattr(player_obj, "no_cap_until", None),
             "rig":          getattr(player_obj, "rig", []),
             "jobs":         getattr(player_obj, "jobs", []),
+            "orders":       getattr(player_obj, "orders", {}),
+            "queues":       getattr(player_obj, "queues", {}),
             "job_slots":    hardware.job_slots(player_obj),
             # Wear & tear: per-machine condition + repair cost for the GUI.
             "rig_state":    {m: {"condition": round(hardware.condition_of(player_obj, m)),
@@ -113,6 +115,19 @@ async def treasury(balance: int) -> None:
         pass
 
 
+async def leaderboard(board: str, top: list) -> None:
+    """Push a leaderboard's top-N ([(username, score)]) to the overlay. Sent
+    only when that top-N changes (see game/leaderboard.py)."""
+    try:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, lambda: _post("/api/game/leaderboard", {
+            "board": board,
+            "top":   [{"username": u, "score": score} for u, score in top],
+        }))
+    except Exception:
+        pass
+
+
 async def drop(item_name: str, location: str) -> None:
     """Announce a new item drop to the overlay (structured, for web grab buttons)."""
     try:
@@ -1,3 +1,43 @@
+# Item → holders index (game.item_index.ItemIndex) kept current by add_item /
+# remove_item. None = not tracked (tests, scripts).
+_ITEM_INDEX = None
+
+
+def set_item_index(index):
+    """Install the index add_item/remove_item keep current (None to detach)."""
+    global _ITEM_INDEX
+    _ITEM_INDEX = index
+
+# Leaderboards (game.leaderboard.Leaderboards) told about every points/cash
+# write. None = not tracked (tests, scripts).
+_LEADERBOARDS = None
+
+
+def set_leaderboards(boards):
+    """Install the leaderboards points/cash writes report to (None to detach)."""
+    global _LEADERBOARDS
+    _LEADERBOARDS = boards
+
+# Location occupancy index (game.locations.LocationIndex) told about every
+# location write. None = not tracked (tests, scripts).
+_LOCATION_INDEX = None
+
+
+def set_location_index(index):
+    """Install the index location writes report to (None to detach)."""
+    global _LOCATION_INDEX
+    _LOCATION_INDEX = index
+
+# Timed-curse scheduler (game.curse_timers.CurseTimers) armed by add_item and
+# cancelled by remove_item. None = not tracked (tests, scripts).
+_CURSE_TIMERS = None
+
+
+def set_curse_timers(timers):
+    """Install the curse timers add_item/remove_item arm and cancel (None to detach)."""
+    global _CURSE_TIMERS
+    _CURSE_TIMERS = timers
+
 
 class Player:
     def __init__(self, username, level, health, items, location, points, started,
@@ -7,7 +47,8 @@ class Player:
                  bail_request_for=None, no_cap_until=None,
                  max_health=None, last_regen_at=None,
                  cash=0, rig=None, jobs=None, conditions=None, repairs=None,
-                 cooling=None, overclock=None, rentals=None):
+                 cooling=None, overclock=None, rentals=None, curse_due=None,
+                 orders=None, queues=None):
         self.username = username
         self.level = level
         # health == current HP; max_health == personal cap (50 start, +5/win, cap 1000).
@@ -28,6 +69,9 @@ class Player:
         self.cardboard_box_until = cardboard_box_until  # ISO timestamp when steal-immunity expires
         # Jail / speed-penalty state (see TWITCHACK_JAIL_RATELIMIT_SPEC.md)
         self.last_attack_at = last_attack_at if last_attack_at else {}  # {location: iso_ts}
+        # Rate-limit engine state (game/speed_limits.py): {location: [floats]}.
+        # Not persisted — a restart is a long enough pause to refill any bucket.
+        self.rate_state = {}
         self.speed_strikes = speed_strikes
         self.last_strike_at = last_strike_at        # ISO timestamp; drives 10-min strike decay
         self.jail = jail                            # None or {"until": iso, "reason": str, "offense_number": int}
@@ -51,6 +95,48 @@ class Player:
         # Rented machines (VPS): {vps_id: rented_until_iso}. Active while not
         # lapsed; prepaid by extending the timestamp (ongoing cash rent).
         self.rentals = rentals if rentals else {}
+        # Standing orders (offline progress): {machine_id: {hack_id, since,
+        # next_settle}}. Each repeats one hack on that machine, settled in bulk.
+        self.orders = orders if orders else {}
+        # Per-machine job queues: {machine_id: [{hack_id, runs, min_condition}]}.
+        # The head entry re-runs each time the machine frees a slot.
+        self.queues = queues if queues else {}
+        # Timed curses held (Metaploit, 0.MG Cable): {item: next_fire_iso}.
+        # Persisted so a restart neither resets nor duplicates the timer.
+        self.curse_due = curse_due if curse_due else {}
+
+    # points/cash/location are properties so every write — from any call
+    # site — keeps the leaderboards and location index current without
+    # touching them.
+    @property
+    def points(self):
+        return self._points
+
+    @points.setter
+    def points(self, value):
+        self._points = value
+        if _LEADERBOARDS is not None:
+            _LEADERBOARDS.observe(self.username, 'points', value)
+
+    @property
+    def location(self):
+        return self._location
+
+    @location.setter
+    def location(self, value):
+        self._location = value
+        if _LOCATION_INDEX is not None:
+            _LOCATION_INDEX.move(self.username, value)
+
+    @property
+    def cash(self):
+        return self._cash
+
+    @cash.setter
+    def cash(self, value):
+        self._cash = value
+        if _LEADERBOARDS is not None:
+            _LEADERBOARDS.observe(self.username, 'cash', value)
 
     def add_item(self, item_name):
         """Add `item_name` to the player's inventory, case-insensitively
@@ -73,8 +159,32 @@ class Player:
         if any(str(i).strip().lower() == lower for i in self.items):
             return False
         self.items.append(canonical)
+        if _ITEM_INDEX is not None:
+            _ITEM_INDEX.add(self.username, canonical)
+        if _CURSE_TIMERS is not None:
+            _CURSE_TIMERS.schedule(self, canonical)
         return True
 
+    def find_item(self, item_name):
+        """The owned item matching `item_name` case-insensitively, as stored
+        in the inventory, or None."""
+        lower = str(item_name or '').strip().lower()
+        return next((i for i in self.items if str(i).strip().lower() == lower), None)
+
+    def remove_item(self, item_name):
+        """Remove one copy of `item_name` (case-insensitive). Returns the name
+        as it was stored, or None if the player didn't own it."""
+        owned = self.find_item(item_name)
+        if owned is None:
+            return None
+        self.items.remove(owned)
+        if self.find_item(owned) is None:
+            if _ITEM_INDEX is not None:
+                _ITEM_INDEX.discard(self.username, owned)
+            if _CURSE_TIMERS is not None:
+                _CURSE_TIMERS.cancel(self, owned)
+        return owned
+
     def to_dict(self):
         """Converts the Player object to a dictionary for JSON serialization."""
         d = {
@@ -127,6 +237,12 @@ class Player:
             d['overclock'] = self.overclock
         if self.rentals:
             d['rentals'] = self.rentals
+        if self.orders:
+            d['orders'] = self.orders
+        if self.queues:
+            d['queues'] = self.queues
+        if self.curse_due:
+            d['curse_due'] = self.curse_due
         return d
 
     @classmethod
@@ -161,6 +277,9 @@ class Player:
             cooling=data.get('cooling', []),
             overclock=data.get('overclock', []),
             rentals=data.get('rentals', {}),
+            curse_due=data.get('curse_due', {}),
+            orders=data.get('orders', {}),
+            queues=data.get('queues', {}),
         )
         player.items = data.get('items', [])
         return player
@@ -0,0 +1,117 @@
+"""Attack-log analyzer: gap histograms, violation/jail rates and what-ifs.
+
+Reads attack_log.jsonl and its rotated .jsonl.gz segments via
+game/attack_log_stats.py. Needs NumPy (a dev-only dependency, not in
+requirements.txt):
+
+    pip install numpy
+
+Run from the repo root:
+    python3 scripts/analyze_attack_log.py                          # ./attack_log.jsonl + segments
+    python3 scripts/analyze_attack_log.py logs/ --hist
+    python3 scripts/analyze_attack_log.py --threshold 0.08,0.1,0.15 --strikes 3,5 --decay 5,10,20
+    python3 scripts/analyze_attack_log.py --threshold email=0.2,evilcorp=0.08
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import attack_log_stats as stats
+from game import jail
+
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "attack_log.jsonl")
+
+REPORT_COLUMNS = [("location", 12, "{}"), ("levels", 10, "{}"), ("attacks", 10, "{:,}"),
+                  ("users", 6, "{}"), ("violation_rate", 8, "{:.2%}"), ("jail_rate", 8, "{:.3%}"),
+                  ("gap_p1", 7, "{:.3f}"), ("gap_p5", 7, "{:.3f}"), ("gap_p50", 7, "{:.3f}")]
+REPORT_HEADERS = ["location", "levels", "attacks", "users", "viol", "jail", "gap p1", "gap p5", "gap p50"]
+
+WHATIF_COLUMNS = [("threshold", 24, "{}"), ("strikes", 7, "{}"), ("decay_seconds", 7, "{:.0f}s"),
+                  ("violations", 11, "{:,}"), ("violation_rate", 8, "{:.2%}"),
+                  ("jails", 7, "{:,}"), ("users_jailed", 7, "{:,}")]
+WHATIF_HEADERS = ["threshold", "strikes", "decay", "violations", "viol", "jails", "users"]
+
+
+def _floats(text):
+    return [float(x) for x in text.split(",") if x.strip()]
+
+
+def _thresholds(text):
+    """"0.08,0.1" → [0.08, 0.1]; "email=0.2,evilcorp=0.08" → [{...}]; "" → [None]."""
+    if not text:
+        return [None]
+    if "=" in text:
+        return [{k.strip(): float(v) for k, v in (p.split("=", 1) for p in text.split(",") if p.strip())}]
+    return _floats(text)
+
+
+def _cell(value, fmt):
+    if value is None:
+        return "recorded"
+    if isinstance(value, dict):
+        return ",".join(f"{k}={v:g}" for k, v in value.items())
+    if value != value:                                  # NaN: no gaps to measure
+        return "-"
+    return fmt.format(value)
+
+
+def _table(headers, columns, rows):
+    print("  ".join(h.rjust(w) if i > 1 else h.ljust(w)
+                    for i, (h, (_, w, _)) in enumerate(zip(headers, columns))))
+    for row in rows:
+        cells = [_cell(row[key], fmt) for key, _, fmt in columns]
+        print("  ".join(c.rjust(w) if i > 1 else c.ljust(w)
+                        for i, (c, (_, w, _)) in enumerate(zip(cells, columns))))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("paths", nargs="*", default=[DEFAULT_LOG],
+                    help="log files, live log paths or directories (default: ./attack_log.jsonl)")
+    ap.add_argument("--levels", default=",".join(map(str, stats.LEVEL_BANDS)),
+                    help="level band edges, comma-separated")
+    ap.add_argument("--hist", action="store_true", help="print gap histograms per location × level band")
+    ap.add_argument("--threshold", default="",
+                    help="what-if thresholds: uniform seconds (0.08,0.1) or location=seconds overrides")
+    ap.add_argument("--strikes", default=str(jail.STRIKES_TO_JAIL), help="what-if strikes to jail")
+    ap.add_argument("--decay", default=f"{jail.STRIKE_DECAY.total_seconds() / 60:g}",
+                    help="what-if strike decay windows, minutes")
+    ap.add_argument("--no-cache", action="store_true", help="don't read/write .cols.npz segment caches")
+    args = ap.parse_args(argv)
+
+    bands = [int(x) for x in _floats(args.levels)]
+    start = time.perf_counter()
+    cols = stats.load(args.paths, cache=not args.no_cache)
+    loaded = time.perf_counter() - start
+    if not len(cols):
+        print("no attack-log rows found in: " + ", ".join(args.paths))
+        return
+    span_h = (cols.ts.max() - cols.ts.min()) / 3600
+    print(f"{int(cols.weight.sum()):,} attacks ({len(cols):,} rows) from {len(cols.users):,} users "
+          f"over {span_h:.1f}h — loaded in {loaded:.2f}s\n")
+
+    _table(REPORT_HEADERS, REPORT_COLUMNS, stats.location_report(cols, bands))
+
+    if args.hist:
+        edges = stats.GAP_BINS
+        labels = [f"<{hi:g}s" for hi in edges[1:-1]] + [f"≥{edges[-2]:g}s"]
+        print("\ngap histograms (attacks per bin)")
+        print(" " * 24 + "".join(label.rjust(9) for label in labels))
+        for (loc, band), counts in sorted(stats.gap_histograms(cols, edges, bands).items()):
+            print(f"{loc:<12}{band:>12}" + "".join(f"{int(c):>9,}" for c in counts))
+
+    print("\nwhat-if replay (recorded traffic)")
+    start = time.perf_counter()
+    rows = stats.sweep(cols, _thresholds(args.threshold), [int(k) for k in _floats(args.strikes)],
+                       [m * 60 for m in _floats(args.decay)])
+    _table(WHATIF_HEADERS, WHATIF_COLUMNS, rows)
+    recorded = int(cols.weight[cols.jailed].sum())
+    print(f"\nrecorded jails: {recorded:,}  |  {len(rows)} scenario(s) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
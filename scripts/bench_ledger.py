@@ -0,0 +1,48 @@
+"""Microbenchmark: per-mutation overhead of the economy ledger.
+
+Compares a bare `player.points += n` against ledger.apply() with no ledger
+installed and with one installed (tuple append + per-user history + per-reason
+aggregates). Only the in-memory write path is measured; the Postgres bulk
+copy happens later on the flusher.
+
+Run from the repo root:
+    python3 scripts/bench_ledger.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import ledger
+from playerdata import Player
+
+
+def _run(fn, n):
+    return min(timeit.repeat(fn, number=n, repeat=5)) / n * 1e6
+
+
+def main(n=200_000):
+    players = [Player(f"user{i}", 1, 100, [], "email", 0, 1) for i in range(500)]
+    p = players[0]
+
+    def bare():
+        p.points += 3
+
+    def apply_():
+        ledger.apply(p, ledger.ATTACK, points=3)
+
+    bare_us = _run(bare, n)
+    ledger.set_ledger(None)
+    off_us = _run(apply_, n)
+    ledger.set_ledger(ledger.Ledger(max_pending=10 ** 9))
+    on_us = _run(apply_, n)
+    ledger.set_ledger(None)
+    print(f"bare attribute write  : {bare_us:6.3f} µs/mutation")
+    print(f"apply, no ledger      : {off_us:6.3f} µs/mutation")
+    print(f"apply, ledger         : {on_us:6.3f} µs/mutation")
+    print(f"ledger overhead       : {on_us - bare_us:6.3f} µs/mutation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Microbenchmark: per-call overhead of web command dispatch.
+
+Compares the old execute_web_command path (inspect.signature on every call)
+against the precompiled table in bot/web_dispatch.py. Only the dispatch
+overhead is measured — the command body is a no-op coroutine step.
+
+Run from the repo root:
+    python3 scripts/bench_web_dispatch.py
+"""
+import inspect
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import web_dispatch
+
+
+class _Cmd:
+    def __init__(self, callback):
+        self._callback = callback
+        self._instance = None
+
+
+class _Bot:
+    async def steal(self, ctx, target: str):
+        return None
+
+
+def _old_dispatch(bot, commands, cmd, args):
+    cmd_obj = commands.get(cmd)
+    params = list(inspect.signature(cmd_obj._callback).parameters.values())[2:]
+    kwargs = {}
+    if params:
+        first = params[0]
+        if args:
+            kwargs[first.name] = args
+        elif first.default is inspect.Parameter.empty:
+            return None
+    instance = cmd_obj._instance if cmd_obj._instance is not None else bot
+    return cmd_obj._callback(instance, None, **kwargs)
+
+
+def _new_dispatch(table, cmd, args):
+    route = table.get(cmd)
+    kwargs = route.bind(args)
+    if kwargs is None:
+        return None
+    return route.handler(None, **kwargs)
+
+
+def _run(fn, n):
+    def once():
+        coro = fn()
+        coro.close()  # we only care about dispatch, not awaiting the body
+    return min(timeit.repeat(once, number=n, repeat=5)) / n * 1e6
+
+
+def main(n=100_000):
+    bot = _Bot()
+    commands = {"steal": _Cmd(_Bot.steal)}
+    table = web_dispatch.build_dispatch_table(bot, commands, {})
+    old_us = _run(lambda: _old_dispatch(bot, commands, "steal", "bob"), n)
+    new_us = _run(lambda: _new_dispatch(table, "steal", "bob"), n)
+    print(f"introspect per call : {old_us:6.2f} µs/dispatch")
+    print(f"precompiled table   : {new_us:6.2f} µs/dispatch")
+    print(f"speedup             : {old_us / new_us:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
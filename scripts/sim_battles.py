@@ -0,0 +1,101 @@
+"""Boss-battle balance sweep: Monte-Carlo win rates, turns, deaths and payouts.
+
+Runs game/battle_sim.py over a grid of team sizes, HP levels and item kits
+and prints one row per composition. Needs NumPy (a dev-only dependency, not
+in requirements.txt):
+
+    pip install numpy
+
+Run from the repo root:
+    python3 scripts/sim_battles.py                       # default grid, 100k battles each
+    python3 scripts/sim_battles.py --n 300000 --sizes 3,5 --hp 50,150 --kits none,full
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import battle as rules
+from game.battle_sim import Composition, sweep
+
+# Per-player inventories handed out round-robin. "passives" is BATTLE_DROPS
+# only; the button kits add ITEM_EFFECTS items pressed one per turn.
+KITS = {
+    "none": [()],
+    "passives": [(rules.RASPBERRY_PI,), (rules.CONSCIOUSNESS_USB,),
+                 (rules.PASSWORD_CRACKER,), (rules.LAMBO_KEYS,), ()],
+    "starter": [("Cookies", "Mimikatz"), ("VX Underground HDD",),
+                ("A Fresh Hot Cup of Black Coffee", "Cookies"), ("Root Beer Flask",), ("Mimikatz",)],
+    "full": [("NES", "Metasploit", "Contra Cartridge"), ("YubiKey", "Burner Laptop"),
+             ("Kali ISO", "Hydra", "Root Beer Flask"), ("Golden Cassette Tape", "Nmap", "Wireshark"),
+             ("O.MG Cable", "Jet Black Hoodie", rules.CONSCIOUSNESS_USB)],
+}
+
+COLUMNS = [("composition", 46, "{}"), ("win_rate", 8, "{:.3f}"),
+           ("turns_to_kill_mean", 7, "{:.2f}"), ("deaths_mean", 7, "{:.2f}"),
+           ("wipe_rate", 7, "{:.3f}"), ("reward_per_survivor_mean", 8, "{:.0f}"),
+           ("team_points_mean", 8, "{:.0f}"), ("bounty_p10", 7, "{:.0f}"),
+           ("bounty_p50", 7, "{:.0f}"), ("bounty_p90", 7, "{:.0f}")]
+HEADERS = ["team", "win", "turns", "deaths", "wipe", "pts/surv", "team pts",
+           "bty p10", "bty p50", "bty p90"]
+
+
+def _ints(text):
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def build_grid(sizes, hps, kits, boss_health):
+    """[(kit_name, Composition)] for every kit × team size × HP level."""
+    grid = []
+    for kit in kits:
+        inv = KITS[kit]
+        for size in sizes:
+            for hp in hps:
+                grid.append((kit, Composition(hp=(hp,) * size,
+                                              items=tuple(inv[i % len(inv)] for i in range(size)),
+                                              boss_health=boss_health)))
+    return grid
+
+
+def _cell(key, fmt, row, kit):
+    if key == "composition":
+        return f"{kit}: {row[key]}"
+    value = row[key]
+    return "-" if value != value else fmt.format(value)     # NaN: no wins to measure
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--n", type=int, default=100_000, help="battles per composition")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--sizes", default="1,3,5", help="team sizes, comma-separated")
+    ap.add_argument("--hp", default="50,100,200", help="per-player HP levels")
+    ap.add_argument("--kits", default="none,passives,starter,full",
+                    help=f"item kits: {', '.join(KITS)}")
+    ap.add_argument("--boss-health", type=int, default=rules.BOSS_MAX_HEALTH)
+    args = ap.parse_args(argv)
+
+    kits = [k.strip() for k in args.kits.split(",") if k.strip()]
+    unknown = [k for k in kits if k not in KITS]
+    if unknown:
+        ap.error(f"unknown kit(s): {', '.join(unknown)}")
+    grid = build_grid(_ints(args.sizes), _ints(args.hp), kits, args.boss_health)
+
+    start = time.perf_counter()
+    rows = sweep([comp for _, comp in grid], args.n, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print("  ".join(h.rjust(w) if i else h.ljust(w)
+                    for i, (h, (_, w, _)) in enumerate(zip(HEADERS, COLUMNS))))
+    for (kit, _), row in zip(grid, rows):
+        cells = [_cell(key, fmt, row, kit) for key, _, fmt in COLUMNS]
+        print("  ".join(c.rjust(w) if i else c.ljust(w)
+                        for i, (c, (_, w, _)) in enumerate(zip(cells, COLUMNS))))
+    total = args.n * len(grid)
+    print(f"\n{len(grid)} compositions × {args.n:,} battles = {total:,} in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
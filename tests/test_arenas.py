@@ -0,0 +1,139 @@
+"""Tests for game/arenas.py — concurrent boss-battle arenas.
+
+Run from the repo root:
+    python3 -m unittest tests.test_arenas -v
+"""
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.arenas import ArenaManager
+
+T0 = datetime(2026, 1, 1, 12, 0)
+
+
+def _fill(manager, arena, names):
+    for name in names:
+        joined, reason = manager.join(name, arena.id)
+        assert joined is arena, reason
+        arena.battle.challenger_team[name] = 100
+
+
+class StartTests(unittest.TestCase):
+    def test_start_picks_first_free_arena(self):
+        m = ArenaManager(3)
+        a, _ = m.start(now=T0)
+        b, _ = m.start(now=T0)
+        self.assertEqual((a.id, b.id), ("1", "2"))
+        self.assertEqual([x.id for x in m.active()], ["1", "2"])
+
+    def test_explicit_arena(self):
+        m = ArenaManager(3)
+        arena, reason = m.start("#3", now=T0)
+        self.assertEqual(arena.id, "3", reason)
+        again, reason = m.start("3", now=T0)
+        self.assertIsNone(again)
+        self.assertIn("in progress", reason)
+
+    def test_unknown_arena(self):
+        arena, reason = ArenaManager(2).start("7", now=T0)
+        self.assertIsNone(arena)
+        self.assertIn("1, 2", reason)
+
+    def test_all_busy(self):
+        m = ArenaManager(2)
+        m.start(now=T0)
+        m.start(now=T0)
+        arena, reason = m.start(now=T0)
+        self.assertIsNone(arena)
+        self.assertIn("Every arena", reason)
+
+    def test_cooldown_is_per_arena(self):
+        m = ArenaManager(2, cooldown=timedelta(minutes=5))
+        first, _ = m.start(now=T0)
+        m.close(first.id)
+        # Arena 1 is cooling down; arena 2 is still free.
+        arena, _ = m.start(now=T0 + timedelta(minutes=1))
+        self.assertEqual(arena.id, "2")
+        m.close(arena.id)
+        arena, reason = m.start("1", now=T0 + timedelta(minutes=2))
+        self.assertIsNone(arena)
+        self.assertIn("cooling down", reason)
+        arena, reason = m.start(now=T0 + timedelta(minutes=3))
+        self.assertIsNone(arena)
+        self.assertIn("2 minutes", reason)
+        arena, _ = m.start(now=T0 + timedelta(minutes=5))
+        self.assertEqual(arena.id, "1")
+
+    def test_cooldown_until(self):
+        m = ArenaManager(1, cooldown=timedelta(minutes=5))
+        arena = m.get("1")
+        self.assertIsNone(arena.cooldown_until())
+        m.start(now=T0)
+        self.assertEqual(arena.cooldown_until(m.cooldown), T0 + timedelta(minutes=5))
+
+
+class JoinTests(unittest.TestCase):
+    def test_join_defaults_to_first_open_arena(self):
+        m = ArenaManager(2)
+        m.start("2", now=T0)
+        arena, _ = m.join("alice")
+        self.assertEqual(arena.id, "2")
+        self.assertIs(m.arena_of("alice"), arena)
+        self.assertIs(m.battle_of("alice"), arena.battle)
+
+    def test_one_arena_per_player(self):
+        m = ArenaManager(2)
+        a, _ = m.start(now=T0)
+        b, _ = m.start(now=T0)
+        m.join("alice", a.id)
+        arena, reason = m.join("alice", b.id)
+        self.assertIsNone(arena)
+        self.assertIn("arena 1", reason)
+
+    def test_team_cap_spills_to_next_arena(self):
+        m = ArenaManager(2, team_cap=2)
+        a, _ = m.start(now=T0)
+        b, _ = m.start(now=T0)
+        _fill(m, a, ["alice", "bob"])
+        arena, reason = m.join("carol", a.id)
+        self.assertIsNone(arena)
+        self.assertIn("full", reason)
+        arena, _ = m.join("carol")
+        self.assertIs(arena, b)
+
+    def test_no_join_outside_join_phase(self):
+        m = ArenaManager(1)
+        arena, _ = m.start(now=T0)
+        arena.battle.join_phase = False
+        joined, reason = m.join("alice")
+        self.assertIsNone(joined)
+        self.assertIn("No battle", reason)
+        self.assertIsNone(m.arena_of("alice"))
+
+    def test_unbind(self):
+        m = ArenaManager(1)
+        m.start(now=T0)
+        m.join("alice")
+        m.unbind("alice")
+        self.assertIsNone(m.arena_of("alice"))
+
+    def test_close_releases_members_only_of_that_arena(self):
+        m = ArenaManager(2)
+        a, _ = m.start(now=T0)
+        b, _ = m.start(now=T0)
+        _fill(m, a, ["alice"])
+        _fill(m, b, ["bob"])
+        battle = m.close(a.id)
+        self.assertIn("alice", battle.challenger_team)
+        self.assertIsNone(a.battle)
+        self.assertIsNone(m.arena_of("alice"))
+        self.assertIs(m.arena_of("bob"), b)
+        self.assertIsNone(m.close("9"))
+
+
+if __name__ == "__main__":
+    unittest.main()
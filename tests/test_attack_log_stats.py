@@ -0,0 +1,155 @@
+"""Tests for game/attack_log_stats.py — attack-log columns, reports, what-ifs.
+
+Traffic is generated through the real jail.record_attack into a real
+TelemetrySink, so a what-if with today's tunables must reproduce what jail
+recorded. Skipped when NumPy isn't installed (it is a dev-only dependency).
+
+Run from the repo root:
+    python3 -m unittest tests.test_attack_log_stats -v
+"""
+import importlib.util
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import jail
+from playerdata import Player
+
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAVE_NUMPY:
+    import numpy as np
+    from game import attack_log_stats as stats
+
+T0 = datetime(2026, 5, 9, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def make_player(username, level):
+    return Player(username=username, level=level, health=10, items=[],
+                  location="email", points=0, started=0)
+
+
+@unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+class AttackLogStatsTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.dir, "attack_log.jsonl")
+        jail.set_attack_log_path(cls.path)
+        jail._SINK.sample_above = 0            # keep every row; sampling has its own test
+        rng = random.Random(7)
+        players = [make_player(f"p{i}", level) for i, level in enumerate((5, 50, 500, 5000))]
+        now = T0
+        cls.rows = 0
+        for step in range(4000):
+            p = rng.choice(players)
+            # Mostly human pace, with autoclicker bursts from p3.
+            now += timedelta(seconds=rng.choice((0.03, 0.06, 0.3, 1.5, 40.0)))
+            loc = rng.choice(("email", "evilcorp"))
+            if step == 2000:
+                jail.flush_telemetry()
+                jail._SINK.rotate()
+            if jail.is_jailed(p, now=now):
+                continue                        # the bot gates attacks while jailed
+            jail.record_attack(p, loc, 100, now=now, bypass_speed_check=(step % 97 == 0))
+            cls.rows += 1
+        jail.set_attack_log_path("")            # closes and flushes
+        with open(cls.path, "a") as f:
+            f.write('{"ts": "2026-05-')         # half-written tail line
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.dir, ignore_errors=True)
+
+    def setUp(self):
+        self.cols = stats.load([self.path])
+
+    def test_reads_segments_and_live_file(self):
+        self.assertEqual(len(stats.log_files(self.path)), 2)
+        self.assertEqual(len(self.cols), self.rows)
+        self.assertEqual(sorted(self.cols.users), ["p0", "p1", "p2", "p3"])
+        self.assertTrue(np.all(np.diff(self.cols.ts) > 0))
+
+    def test_segment_cache_round_trip(self):
+        (segment,) = [f for f in stats.log_files(self.path) if f.endswith(".gz")]
+        self.assertTrue(os.path.exists(segment + stats.CACHE_SUFFIX))
+        cached = stats.read_file(segment)
+        fresh = stats.read_file(segment, cache=False)
+        np.testing.assert_array_equal(cached.ts, fresh.ts)
+        np.testing.assert_array_equal(cached.gap, fresh.gap)
+        self.assertEqual(cached.users, fresh.users)
+
+    def test_replay_with_current_tunables_matches_recorded(self):
+        result = stats.what_if(self.cols)
+        self.assertEqual(result["violations"], int(self.cols.violation.sum()))
+        self.assertEqual(result["jails"], int(self.cols.jailed.sum()))
+        self.assertGreater(result["jails"], 0)
+
+    def test_exempt_rows_stay_exempt(self):
+        self.assertGreater(int(self.cols.exempt.sum()), 0)
+        loose = stats.what_if(self.cols, threshold=1e9)
+        self.assertEqual(loose["violations"],
+                         int((~np.isnan(self.cols.gap) & ~self.cols.exempt).sum()))
+
+    def test_stricter_settings_jail_more(self):
+        base = stats.what_if(self.cols)
+        self.assertGreater(stats.what_if(self.cols, threshold=0.5)["jails"], base["jails"])
+        self.assertLess(stats.what_if(self.cols, strikes=10)["jails"], base["jails"])
+        self.assertLessEqual(stats.what_if(self.cols, decay_seconds=1)["jails"], base["jails"])
+
+    def test_per_location_override(self):
+        only_email = stats.what_if(self.cols, threshold={"email": 0.0})
+        email = self.cols.locations.index("email")
+        self.assertEqual(only_email["violations"],
+                         int((self.cols.violation & (self.cols.loc != email)).sum()))
+
+    def test_location_report(self):
+        rows = stats.location_report(self.cols)
+        overall = {r["location"]: r for r in rows if r["levels"] == "all"}
+        self.assertEqual(sum(r["attacks"] for r in overall.values()), self.rows)
+        bands = [r for r in rows if r["location"] == "email" and r["levels"] != "all"]
+        self.assertEqual(sum(r["attacks"] for r in bands), overall["email"]["attacks"])
+        self.assertTrue(0 < overall["evilcorp"]["violation_rate"] < 1)
+
+    def test_histograms_count_every_gap(self):
+        hists = stats.gap_histograms(self.cols)
+        total = sum(int(h.sum()) for h in hists.values())
+        self.assertEqual(total, int((~np.isnan(self.cols.gap)).sum()))
+
+    def test_sampled_rows_weigh_in(self):
+        path = os.path.join(self.dir, "sampled.jsonl")
+        rows = [{"ts": (T0 + timedelta(seconds=i)).isoformat(), "user": "a", "level": 1,
+                 "location": "email", "gap": 0.01, "threshold": 0.1, "violation": True,
+                 "jailed": False, "sample": 4} for i in range(2)]
+        with open(path, "w") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in rows))
+        cols = stats.load([path])
+        result = stats.what_if(cols)
+        self.assertEqual(result["violations"], 8)
+        self.assertEqual(result["jails"], 2)        # 8 strikes → 2 jails at 3 each, 2 left over
+
+    def test_engine_rows_keep_recorded_verdict(self):
+        path = os.path.join(self.dir, "engine.jsonl")
+        rows = [{"ts": (T0 + timedelta(seconds=i)).isoformat(), "user": "a", "level": 1,
+                 "location": "email", "gap": 0.5, "threshold": 0.2, "violation": i < 3,
+                 "jailed": i == 2, "limiter": "bucket"} for i in range(4)]
+        with open(path, "w") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in rows))
+        cols = stats.load([path])
+        self.assertTrue(np.isnan(cols.threshold).all())
+        self.assertEqual(stats.what_if(cols, threshold=1.0)["violations"], 3)
+        self.assertEqual(stats.what_if(cols, threshold={"email": 0.1})["violations"], 0)
+
+    def test_sweep_grid(self):
+        rows = stats.sweep(self.cols, thresholds=(None, 0.2), strikes=(3, 5), decays=(60, 600))
+        self.assertEqual(len(rows), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Tests for game/attacks.py — the clicker attack table and engine.
+
+Run from the repo root:
+    python3 -m unittest tests.test_attacks -v
+"""
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import attacks
+from playerdata import Player
+
+
+def make_player(level=1, location="email", points=100, items=None):
+    return Player(username="alice", level=level, health=50, items=items or [],
+                  location=location, points=points, started=0)
+
+
+class FakeRandom:
+    """choice() returns a fixed pick; randint() returns lo or hi."""
+    def __init__(self, success, high=True):
+        self._success = success
+        self._high = high
+        self.choices = []
+
+    def choice(self, seq):
+        self.choices.append(tuple(seq))
+        return self._success
+
+    def randint(self, lo, hi):
+        return hi if self._high else lo
+
+
+class TableTests(unittest.TestCase):
+    def test_every_row_is_consistent(self):
+        for a in attacks.ATTACKS.values():
+            self.assertLessEqual(a.win[0], a.win[1], a.id)
+            self.assertLessEqual(a.loss[0], a.loss[1], a.id)
+            self.assertEqual(a.base_reward, a.win[1], f"{a.id}: gate reward tracks the win ceiling")
+            self.assertIn("{points}", a.success_msg)
+            self.assertIn("{points}", a.fail_msg)
+            if a.boosted:
+                self.assertIn("{item_msg}", a.success_msg, a.id)
+
+    def test_boost_index_inverts_item_table(self):
+        for item, attack_ids in attacks.ITEM_BOOSTS.items():
+            for attack_id in attack_ids:
+                self.assertIn(item, attacks.BOOSTING_ITEMS[attack_id])
+        self.assertEqual(attacks.BOOSTING_ITEMS["ddos"],
+                         {"Wireshark", "NES", "Contra Cartridge"})
+
+    def test_every_attack_is_registered_as_a_command(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with open(os.path.join(root, "PainfulBot.py"), encoding="utf-8") as f:
+            src = f.read()
+        for attack_id in attacks.ATTACKS:
+            self.assertRegex(
+                src,
+                rf"@commands\.command\(name='{attack_id}'\)\s+async def \w+\(self, ctx\):\s+"
+                rf"await self\._run_attack\(ctx, '{attack_id}'\)",
+            )
+
+
+class ItemBonusTests(unittest.TestCase):
+    def test_no_items(self):
+        self.assertEqual(attacks.item_bonus([], "phish"),
+                         {"success_boost": False, "points_multiplier": 1.0, "item_name": None})
+
+    def test_first_matching_item_in_inventory_order(self):
+        bonus = attacks.item_bonus(["Cookies", "NES", "Wireshark"], "ddos")
+        self.assertEqual(bonus["item_name"], "NES")
+        self.assertEqual(bonus["points_multiplier"], 1.5)
+
+    def test_unrelated_item_does_not_boost(self):
+        self.assertFalse(attacks.item_bonus(["Hydra"], "phish")["success_boost"])
+
+
+class AccessTests(unittest.TestCase):
+    def test_wrong_location(self):
+        a = attacks.ATTACKS["spoof"]
+        self.assertEqual(attacks.check_access(a, make_player(level=50, location="website")), a.where_msg)
+
+    def test_level_floor(self):
+        a = attacks.ATTACKS["spoof"]
+        self.assertEqual(attacks.check_access(a, make_player(level=4)), a.level_msg)
+        self.assertIsNone(attacks.check_access(a, make_player(level=5)))
+
+    def test_beginner_attack_level_cap(self):
+        a = attacks.ATTACKS["nmap"]
+        self.assertIsNone(attacks.check_access(a, make_player(level=5, location="network")))
+        self.assertEqual(attacks.check_access(a, make_player(level=6, location="server")), a.level_msg)
+
+    def test_owner_bypasses_gates(self):
+        a = attacks.ATTACKS["socialengineer"]
+        self.assertIsNone(attacks.check_access(a, make_player(level=0, location="home"), is_owner=True))
+
+
+class RollTests(unittest.TestCase):
+    def test_unboosted_success_uses_coin_flip(self):
+        rng = FakeRandom(True)
+        r = attacks.roll(attacks.ATTACKS["phish"], [], rng)
+        self.assertEqual(rng.choices, [attacks.COIN_FLIP])
+        self.assertEqual((r.success, r.points, r.item_name), (True, 60, None))
+
+    def test_boosted_success_multiplies_points(self):
+        rng = FakeRandom(True)
+        r = attacks.roll(attacks.ATTACKS["spoof"], ["EvilGinx"], rng)
+        self.assertEqual(rng.choices, [attacks.STRONG])
+        self.assertEqual((r.points, r.item_name), (105, "EvilGinx"))
+
+    def test_rows_without_boosts_ignore_items(self):
+        rng = FakeRandom(True)
+        r = attacks.roll(attacks.ATTACKS["stealth"], ["Hydra"], rng)
+        self.assertEqual(rng.choices, [attacks.COIN_FLIP])
+        self.assertIsNone(r.item_name)
+
+    def test_failure_rolls_loss_range(self):
+        r = attacks.roll(attacks.ATTACKS["crack"], [], FakeRandom(False, high=False))
+        self.assertEqual((r.success, r.points), (False, 10))
+
+    def test_apply_roll_banks_and_formats(self):
+        a = attacks.ATTACKS["spoof"]
+        p = make_player(points=100)
+        msg = attacks.apply_roll(a, p, attacks.AttackRoll(True, 50, "EvilGinx"))
+        self.assertEqual(p.points, 150)
+        self.assertEqual(msg, "spoofing successful! Your EvilGinx helped! You earned 50 points.")
+
+    def test_apply_roll_loss_clamps_at_zero(self):
+        p = make_player(points=10)
+        msg = attacks.apply_roll(attacks.ATTACKS["ddos"], p, attacks.AttackRoll(False, 80, None))
+        self.assertEqual(p.points, 0)
+        self.assertTrue(re.search(r"lost 80 points", msg))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Tests for game/battle_sim.py — the NumPy-batched balance simulator.
+
+Skipped when NumPy isn't installed (it is a dev-only dependency).
+
+Run from the repo root:
+    python3 -m unittest tests.test_battle_sim -v
+"""
+import importlib.util
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import battle as rules
+from game.battle import USE_ITEM, BattleAction, BattleEngine, BossBattle
+from game.item_index import ItemIndex
+
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAVE_NUMPY:
+    from game.battle_sim import Composition, simulate, sweep
+
+
+def engine_stats(comp, n, with_damage=False):
+    """Win rate and mean deaths (and optionally mean team damage) from the
+    real engine, one battle at a time. Item buttons are queued before each
+    turn, following the same plan the simulator uses."""
+    wins = deaths = damage = 0
+    for seed in range(n):
+        battle = BossBattle("b7h30", comp.boss_health)
+        idx = ItemIndex()
+        for i, hp in enumerate(comp.hp):
+            battle.challenger_team[f"p{i}"] = hp
+            for item in comp.items[i] if i < len(comp.items) else ():
+                idx.add(f"p{i}", item)
+        e = BattleEngine(battle, idx, rng=random.Random(seed))
+        plans = [comp.button_plan(i) for i in range(comp.size)]
+        while not e.over:
+            for i, plan in enumerate(plans):
+                if e.turn < len(plan) and f"p{i}" in battle.challenger_team:
+                    battle.queue_action(BattleAction(USE_ITEM, f"p{i}", plan[e.turn]))
+            e.play_turn()
+        e.discard_pending()
+        wins += e.victory
+        deaths += len(battle.fallen)
+        damage += battle.team_damage
+    if with_damage:
+        return wins / n, deaths / n, damage / n
+    return wins / n, deaths / n
+
+
+@unittest.skipUnless(HAVE_NUMPY, "numpy not installed")
+class SimulatorTests(unittest.TestCase):
+    def test_seeded_runs_are_reproducible(self):
+        comp = Composition(hp=(80, 80, 80), items=(("Cookies",), ("Hydra",), ()))
+        a, b = simulate(comp, 2_000, seed=5), simulate(comp, 2_000, seed=5)
+        for attr in ("won", "turns", "deaths", "team_damage", "bounty", "bonus_points"):
+            self.assertTrue((getattr(a, attr) == getattr(b, attr)).all(), attr)
+
+    def test_matches_engine_with_passives(self):
+        comp = Composition(hp=(40, 80, 120), boss_health=400,
+                           items=((rules.RASPBERRY_PI,),
+                                  (rules.CONSCIOUSNESS_USB, rules.LAMBO_KEYS),
+                                  (rules.PASSWORD_CRACKER,)))
+        sim = simulate(comp, 100_000, seed=1)
+        win, deaths = engine_stats(comp, 3_000)
+        self.assertAlmostEqual(float(sim.won.mean()), win, delta=0.03)
+        self.assertAlmostEqual(float(sim.deaths.mean()), deaths, delta=0.08)
+
+    def test_item_kill_ends_the_turn_like_the_engine(self):
+        # The first press always kills the boss: no boss attack, no team phase.
+        comp = Composition(hp=(30,), items=(("Contra Cartridge",),), boss_health=100)
+        sim = simulate(comp, 20_000, seed=6)
+        win, deaths, damage = engine_stats(comp, 2_000, with_damage=True)
+        self.assertEqual(float(sim.won.mean()), win)
+        self.assertEqual(int(sim.deaths.sum()), 0)
+        self.assertEqual(deaths, 0)
+        self.assertTrue((sim.turns == 1).all())
+        self.assertAlmostEqual(float(sim.team_damage.mean()), damage, delta=1.0)
+        self.assertLessEqual(int(sim.team_damage.max()), 130)
+
+    def test_rewards_use_the_live_formula(self):
+        comp = Composition(hp=(500,) * 3, boss_health=200)
+        r = simulate(comp, 1_000, seed=2)
+        self.assertTrue(r.won.all())
+        for i in range(20):
+            self.assertEqual(int(r.reward[i]),
+                             rules.victory_reward(int(r.survivors[i]), int(r.team_damage[i])))
+            self.assertEqual(int(r.bounty[i]), rules.treasury_bounty(int(r.team_damage[i])))
+
+    def test_yubikey_skips_the_first_boss_turn(self):
+        comp = Composition(hp=(rules.BOSS_DAMAGE[0],), items=(("YubiKey",),), boss_health=10_000)
+        r = simulate(comp, 1_000, seed=3, max_turns=1)
+        self.assertEqual(int(r.deaths.sum()), 0)
+        bare = simulate(Composition(hp=(rules.BOSS_DAMAGE[0],), boss_health=10_000),
+                        1_000, seed=3, max_turns=1)
+        self.assertEqual(int(bare.deaths.sum()), 1_000)
+
+    def test_items_only_press_while_alive_and_pay_bonus_points(self):
+        comp = Composition(hp=(1,), items=(("Cookies", "Golden Cassette Tape"),))
+        r = simulate(comp, 1_000, seed=4)
+        # Dies on turn 1's boss attack (unless a dodge it doesn't have), so the
+        # cassette queued for turn 2 never plays.
+        self.assertEqual(int(r.bonus_points.sum()), 0)
+        self.assertTrue((r.turns == 1).all())
+
+    def test_sweep_returns_one_summary_per_composition(self):
+        comps = [Composition(hp=(100,) * k) for k in (1, 2)]
+        rows = sweep(comps, 500)
+        self.assertEqual([row["composition"] for row in rows], [c.label() for c in comps])
+
+
+if __name__ == "__main__":
+    unittest.main()
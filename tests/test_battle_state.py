@@ -0,0 +1,92 @@
+"""Tests for integrations/battle_state.py — versioned overlay state patches.
+
+Run from the repo root:
+    python3 -m unittest tests.test_battle_state -v
+"""
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from integrations import battle_state
+from integrations.battle_state import StateStream, apply, diff
+
+KIT = ["Cookies", "Mimikatz", "Hydra", "Nmap", "Kali ISO", "Metasploit", "YubiKey", "NES"]
+
+
+def snapshot(boss=1500, hp=None, fallen=(), hack_used=()):
+    hp = hp or {}
+    players = {}
+    for name in ("alice", "bob", "carol", "dave", "erin"):
+        dead = name in fallen
+        players[name] = {"health": 0 if dead else hp.get(name, 80), "max_health": 80,
+                         "items": [], "inventory": list(KIT), "alive": not dead,
+                         "jail": None, "founder_tier": None}
+    return {"active": True, "boss_name": "b7h30", "boss_health": boss,
+            "boss_max_health": 1500, "players": players, "join_phase": False,
+            "hack_used": sorted(hack_used), "cooldown_until": 123}
+
+
+class DiffTests(unittest.TestCase):
+    def test_only_changed_fields(self):
+        patch = diff(snapshot(), snapshot(boss=1400, hp={"bob": 55}, hack_used={"bob"}))
+        self.assertEqual(patch, {"set": {"boss_health": 1400, "hack_used": ["bob"]},
+                                 "players": {"bob": {"health": 55}}})
+
+    def test_no_change_is_empty(self):
+        self.assertEqual(diff(snapshot(), snapshot()), {})
+
+    def test_players_added_and_removed(self):
+        old = snapshot()
+        new = snapshot()
+        del new["players"]["erin"]
+        new["players"]["zed"] = {"health": 9}
+        self.assertEqual(diff(old, new)["players"], {"zed": {"health": 9}, "erin": None})
+
+    def test_missing_top_level_keys_are_left_alone(self):
+        self.assertEqual(diff(snapshot(), {"active": False, "cooldown_until": 123}),
+                         {"set": {"active": False}})
+
+    def test_apply_round_trips(self):
+        old, new = snapshot(), snapshot(boss=900, hp={"alice": 3}, fallen={"dave"})
+        self.assertEqual(apply(json.loads(json.dumps(old)), diff(old, new)), new)
+
+
+class StateStreamTests(unittest.TestCase):
+    def test_first_send_is_full_then_patches(self):
+        stream = StateStream()
+        path, full = stream.next(snapshot())
+        self.assertEqual((path, full["version"]), (battle_state.FULL_PATH, 1))
+        path, patch = stream.next(snapshot(boss=1490))
+        self.assertEqual(path, battle_state.PATCH_PATH)
+        self.assertEqual((patch["v"], patch["base"], patch["set"]), (2, 1, {"boss_health": 1490}))
+        self.assertIsNone(stream.next(snapshot(boss=1490)))
+
+    def test_reset_sends_full_with_a_fresh_version(self):
+        stream = StateStream()
+        stream.next(snapshot())
+        stream.reset()
+        path, payload = stream.next(snapshot(boss=10))
+        self.assertEqual((path, payload["version"], payload["boss_health"]),
+                         (battle_state.FULL_PATH, 2, 10))
+
+    def test_sender_is_not_fooled_by_caller_mutation(self):
+        stream = StateStream()
+        state = snapshot()
+        stream.next(state)
+        state["players"]["alice"]["health"] = 1
+        _, patch = stream.next(state)
+        self.assertEqual(patch["players"], {"alice": {"health": 1}})
+
+    def test_turn_patch_bytes_track_changes_not_inventories(self):
+        stream = StateStream()
+        stream.next(snapshot())
+        _, patch = stream.next(snapshot(boss=1450, hp={"carol": 60}))
+        full = json.dumps(snapshot(boss=1450, hp={"carol": 60}))
+        self.assertLess(len(json.dumps(patch)) * 8, len(full))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,18 @@
-"""Tests for boss battle setup.
+"""Tests for boss battle setup and the headless battle engine.
 
 Run from the repo root:
     python3 -m unittest tests.test_boss_battle -v
 """
 import os
+import random
 import sys
 import unittest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from game.battle import BossBattle, BOSS_MAX_HEALTH
+from game import battle as engine
+from game.battle import BattleEngine, BossBattle, BOSS_MAX_HEALTH
+from game.item_index import ItemIndex
 
 
 class BossStartHealthTests(unittest.TestCase):
@@ -26,5 +29,234 @@ class BossStartHealthTests(unittest.TestCase):
         self.assertEqual(BOSS_MAX_HEALTH, 1500)
 
 
+def make_battle(team=None, boss_health=BOSS_MAX_HEALTH):
+    battle = BossBattle(boss_name="b7h30", boss_health=boss_health)
+    battle.join_phase = False
+    for name, hp in (team or {"alice": 50, "bob": 50}).items():
+        battle.challenger_team[name] = hp
+        battle.player_max_health[name] = hp
+    return battle
+
+
+class FixedRandom:
+    """random() always returns `roll`; randint the low end; choice the first."""
+    def __init__(self, roll=0.99):
+        self.roll = roll
+
+    def random(self):
+        return self.roll
+
+    def randint(self, lo, hi):
+        return lo
+
+    def choice(self, seq):
+        return seq[0]
+
+
+class BattleEngineTests(unittest.TestCase):
+    def test_full_fight_resolves_headless(self):
+        for seed in range(200):
+            e = BattleEngine(make_battle(), rng=random.Random(seed))
+            timeline = e.resolve()
+            self.assertTrue(e.over)
+            self.assertLessEqual(e.turn, engine.MAX_TURNS)
+            self.assertEqual(timeline[0].kind, engine.TURN)
+
+    def test_same_seed_same_timeline(self):
+        a = BattleEngine(make_battle(), rng=random.Random(7)).resolve()
+        b = BattleEngine(make_battle(), rng=random.Random(7)).resolve()
+        self.assertEqual(a, b)
+
+    def test_turn_shape(self):
+        e = BattleEngine(make_battle(), rng=FixedRandom())
+        kinds = [ev.kind for ev in e.play_turn()]
+        self.assertEqual(kinds, [engine.TURN, engine.BOSS_ATTACK, engine.HIT, engine.TEAM_PHASE,
+                                 engine.TEAM_ATTACK, engine.TEAM_ATTACK, engine.BOSS_HP])
+        self.assertEqual(e.battle.challenger_team["alice"], 50 - engine.BOSS_DAMAGE[0])
+        self.assertEqual(e.battle.boss_health, BOSS_MAX_HEALTH - 2 * engine.TEAM_DAMAGE[0])
+
+    def test_skip_consumes_the_boss_turn_and_team_phase(self):
+        battle = make_battle()
+        battle.skip_boss_turns = 1
+        kinds = [ev.kind for ev in BattleEngine(battle, rng=FixedRandom()).play_turn()]
+        self.assertEqual(kinds, [engine.TURN, engine.SKIP])
+        self.assertEqual(battle.skip_boss_turns, 0)
+
+    def test_enrage_and_weakness(self):
+        battle = make_battle()
+        battle.boss_health = BOSS_MAX_HEALTH // 5      # under the 25% enrage line
+        battle.weakness_next_turn = 5
+        e = BattleEngine(battle, rng=FixedRandom())
+        e.begin_turn()
+        attack = [ev for ev in e.boss_phase() if ev.kind == engine.BOSS_ATTACK][0]
+        self.assertEqual(attack.amount, int(engine.BOSS_DAMAGE[0] * engine.ENRAGE_MULT) - 5)
+        self.assertEqual(battle.weakness_next_turn, 0)
+
+    def test_death_save_then_death(self):
+        idx = ItemIndex()
+        idx.add("alice", engine.CONSCIOUSNESS_USB)
+        battle = make_battle({"alice": 10})
+        e = BattleEngine(battle, items=idx, rng=FixedRandom())
+        self.assertEqual([ev.kind for ev in e.boss_phase()], [engine.BOSS_ATTACK, engine.SAVE])
+        self.assertEqual(battle.challenger_team, {"alice": 1})
+        kinds = [ev.kind for ev in e.boss_phase()]
+        self.assertEqual(kinds, [engine.BOSS_ATTACK, engine.DEATH, engine.WIPE])
+        self.assertEqual(battle.fallen, ["alice"])
+        self.assertTrue(e.over)
+
+    def test_passives(self):
+        idx = ItemIndex()
+        idx.add("alice", engine.LAMBO_KEYS)
+        idx.add("bob", engine.PASSWORD_CRACKER)
+        battle = make_battle()
+        e = BattleEngine(battle, items=idx, rng=FixedRandom(roll=0.3))
+        boss = [ev.kind for ev in e.boss_phase()]
+        self.assertEqual(boss, [engine.TAUNT, engine.BOSS_ATTACK, engine.DODGE])
+        self.assertEqual(battle.challenger_team["alice"], 50)
+        team = e.team_phase()
+        self.assertEqual(team[-2].kind, engine.CRACKER)
+        self.assertEqual(team[-1].amount, 2 * engine.TEAM_DAMAGE[0] + engine.CRACKER_BONUS)
+
+    def test_revealed_target_and_damage_are_honored(self):
+        battle = make_battle()
+        battle.next_boss_target, battle.next_boss_damage = "bob", 33
+        e = BattleEngine(battle, rng=FixedRandom())
+        hit = e.boss_phase()[-1]
+        self.assertEqual((hit.kind, hit.target, hit.amount), (engine.HIT, "bob", 33))
+        self.assertIsNone(battle.next_boss_target)
+        self.assertIsNone(battle.next_boss_damage)
+
+
+def use(name, item):
+    return engine.BattleAction(engine.USE_ITEM, name, item)
+
+
+class BattleActionTests(unittest.TestCase):
+    def test_no_actions_no_batch(self):
+        self.assertEqual(BattleEngine(make_battle()).action_phase(), [])
+
+    def test_batch_is_one_block_with_header_and_footer(self):
+        battle = make_battle()
+        battle.queue_action(use("alice", "Cookies"))
+        battle.queue_action(engine.BattleAction(engine.HACK, "bob", None))
+        events = BattleEngine(battle, rng=FixedRandom()).action_phase()
+        self.assertEqual([ev.kind for ev in events],
+                         [engine.ACTIONS, engine.ITEM_USE, engine.HACK_NUKE, engine.ACTIONS_DONE])
+        burst = 15 + engine.HACK_DAMAGE[0]
+        self.assertEqual(events[-1].amount, burst)
+        self.assertEqual(battle.boss_health, BOSS_MAX_HEALTH - burst)
+        self.assertEqual(battle.per_player_damage, {"alice": 15, "bob": engine.HACK_DAMAGE[0]})
+        self.assertEqual(battle.pending_actions, [])
+
+    def test_round_robin_by_first_press(self):
+        actions = [use("alice", "Cookies"), use("alice", "Mimikatz"), use("alice", "Hydra"),
+                   use("bob", "Cookies"), use("carol", "Kali ISO"), use("bob", "Nmap")]
+        order = [(a.username, a.item) for a in engine.fair_order(actions)]
+        self.assertEqual(order, [("alice", "Cookies"), ("bob", "Cookies"), ("carol", "Kali ISO"),
+                                 ("alice", "Mimikatz"), ("bob", "Nmap"), ("alice", "Hydra")])
+
+    def test_items_are_spent_at_resolution_and_missing_ones_fizzle(self):
+        spent = []
+        inventory = {("alice", "Cookies")}
+
+        def consume(name, item):
+            if (name, item) not in inventory:
+                return False
+            inventory.discard((name, item))
+            spent.append((name, item))
+            return True
+
+        battle = make_battle()
+        battle.queue_action(use("alice", "Cookies"))
+        battle.queue_action(use("alice", "Cookies"))   # second copy was sold meanwhile
+        events = BattleEngine(battle, rng=FixedRandom(), consume=consume).action_phase()
+        self.assertEqual([ev.kind for ev in events[1:-1]], [engine.ITEM_USE, engine.FIZZLE])
+        self.assertEqual(spent, [("alice", "Cookies")])
+
+    def test_fallen_players_fizzle_and_keep_their_hack(self):
+        spent = []
+        battle = make_battle()
+        battle.hack_used.add("bob")
+        battle.queue_action(engine.BattleAction(engine.HACK, "bob", "Nmap"))
+        battle.queue_action(use("bob", "Cookies"))
+        del battle.challenger_team["bob"]
+        e = BattleEngine(battle, rng=FixedRandom(), consume=lambda n, i: spent.append(i) or True)
+        events = e.action_phase()
+        self.assertEqual([ev.kind for ev in events[1:-1]], [engine.FIZZLE, engine.FIZZLE])
+        self.assertEqual(spent, [])
+        self.assertNotIn("bob", battle.hack_used)
+        self.assertEqual(battle.boss_health, BOSS_MAX_HEALTH)
+
+    def test_killing_blow_goes_first_and_the_rest_fizzle(self):
+        battle = make_battle(boss_health=10)
+        battle.queue_action(use("bob", "Cookies"))
+        battle.queue_action(use("alice", "Cookies"))
+        events = BattleEngine(battle, rng=FixedRandom()).action_phase()
+        self.assertEqual([(ev.kind, ev.target) for ev in events[1:-1]],
+                         [(engine.ITEM_USE, "bob"), (engine.FIZZLE, "alice")])
+        self.assertEqual(battle.per_player_damage, {"bob": 15})
+        self.assertEqual(battle.boss_health, 0)
+
+    def test_effects_apply_to_this_turns_boss_attack(self):
+        battle = make_battle()
+        battle.queue_action(use("alice", "O.MG Cable"))
+        e = BattleEngine(battle, rng=FixedRandom())
+        events = e.play_turn()
+        kinds = [ev.kind for ev in events]
+        self.assertEqual(kinds[:5], [engine.TURN, engine.ACTIONS, engine.ITEM_USE,
+                                     engine.EFFECT, engine.ACTIONS_DONE])
+        attack = [ev for ev in events if ev.kind == engine.BOSS_ATTACK][0]
+        self.assertEqual(attack.amount, 0)      # 15 dmg - 15 weakness
+
+    def test_batch_before_team_phase(self):
+        battle = make_battle()
+        e = BattleEngine(battle, rng=FixedRandom())
+        e.begin_turn()
+        e.action_phase()
+        e.boss_phase()
+        battle.queue_action(use("bob", "Jet Black Hoodie"))
+        events = e.action_phase()
+        self.assertEqual(events[2].text, "  ⤷ @bob heals +0 HP (50/50).")
+        battle.challenger_team["alice"] = 20
+        battle.queue_action(use("bob", "Root Beer Flask"))
+        e.action_phase()
+        self.assertEqual(battle.challenger_team["alice"], 40)
+
+    def test_leftovers_are_discarded_when_the_fight_ends(self):
+        battle = make_battle(boss_health=1)
+        battle.hack_used.add("alice")
+        battle.queue_action(engine.BattleAction(engine.HACK, "alice", None))
+        battle.queue_action(use("bob", "Cookies"))
+        e = BattleEngine(battle, rng=FixedRandom())
+        e.resolve()
+        self.assertTrue(e.victory)
+        # The hack killed the boss; bob's press fizzled, and nothing remains.
+        self.assertEqual(battle.per_player_damage, {"alice": engine.HACK_DAMAGE[0]})
+        battle.queue_action(use("bob", "Cookies"))
+        self.assertEqual(e.discard_pending(), 1)
+        self.assertEqual(battle.pending_actions, [])
+
+    def test_queued_counts_per_item(self):
+        battle = make_battle()
+        battle.queue_action(use("alice", "Cookies"))
+        battle.queue_action(use("alice", "Cookies"))
+        battle.queue_action(use("bob", "Cookies"))
+        self.assertEqual(battle.queued("alice", "Cookies"), 2)
+        self.assertEqual(battle.queued("alice"), 2)
+        self.assertEqual(battle.queued("bob", "Hydra"), 0)
+
+
+class RewardFormulaTests(unittest.TestCase):
+    def test_round3_victory_reward(self):
+        # base 400 + (5 - 2 survivors) * 100 + 1000 dmg // 25
+        self.assertEqual(engine.victory_reward(2, 1000), 400 + 300 + 40)
+
+    def test_bonuses_are_capped(self):
+        self.assertEqual(engine.victory_reward(0, 100_000), 400 + 400 + 200)
+
+    def test_treasury_bounty(self):
+        self.assertEqual(engine.treasury_bounty(1001), 1501)
+
+
 if __name__ == "__main__":
     unittest.main()
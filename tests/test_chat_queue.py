@@ -0,0 +1,188 @@
+"""Tests for bot/chat_queue.py — token-bucket pacing, priorities, merging,
+load shedding and metrics of the outbound chat queue.
+
+Run from the repo root:
+    python3 -m unittest tests.test_chat_queue -v
+"""
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import chat_queue
+from bot.chat_queue import (
+    ChatQueue, TokenBucket, bucket_for_limit,
+    PRIORITY_MOD, PRIORITY_GAME, PRIORITY_FLAVOR,
+)
+
+
+class FakeClock:
+    def __init__(self, t=1000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+    def advance(self, seconds):
+        self.t += seconds
+
+
+class QueueTestBase(unittest.TestCase):
+    def setUp(self):
+        # Drops/merges log to bot.log; keep tests from writing into the repo.
+        patcher = mock.patch.object(chat_queue.helpers, "log_to_file")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clock = FakeClock()
+        self.sent = []
+
+    async def _send(self, text):
+        self.sent.append(text)
+
+    def make_queue(self, **kw):
+        kw.setdefault("clock", self.clock)
+        return ChatQueue(self._send, **kw)
+
+    def drain(self, q, max_sends=1000):
+        """Drain everything the bucket currently allows, without sleeping."""
+        async def go():
+            for _ in range(max_sends):
+                wait = await q.drain_once()
+                if wait != 0.0:
+                    return wait
+        return asyncio.run(go())
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        b = TokenBucket(rate=1.0, capacity=3, clock=clock)
+        self.assertTrue(all(b.try_take() for _ in range(3)))
+        self.assertFalse(b.try_take())
+        self.assertAlmostEqual(b.wait_time(), 1.0)
+        clock.advance(1.0)
+        self.assertTrue(b.try_take())
+
+    def test_never_exceeds_limit_in_any_window(self):
+        """Greedy sender over 5 minutes: every 30s window stays within 20."""
+        clock = FakeClock(0.0)
+        b = bucket_for_limit(20, clock=clock)
+        sends = []
+        while clock.t < 300:
+            if b.try_take():
+                sends.append(clock.t)
+            else:
+                clock.advance(0.01)
+        for i, t in enumerate(sends):
+            in_window = sum(1 for s in sends[i:] if s < t + 30.0)
+            self.assertLessEqual(in_window, 20)
+
+
+class PriorityAndMergeTests(QueueTestBase):
+    def test_higher_priority_drains_first(self):
+        q = self.make_queue(burst=3)
+        q.put("flavor", PRIORITY_FLAVOR, mergeable=False)
+        q.put("game", PRIORITY_GAME, mergeable=False)
+        q.put("owner", PRIORITY_MOD, mergeable=False)
+        self.drain(q)
+        self.assertEqual(self.sent, ["owner", "game", "flavor"])
+
+    def test_short_lines_merge_into_one_send(self):
+        q = self.make_queue(burst=1)
+        for n in range(5):
+            q.put(f"line {n}")
+        self.drain(q)
+        self.assertEqual(self.sent, ["line 0 | line 1 | line 2 | line 3 | line 4"])
+        self.assertEqual(q.metrics()["merged"], 4)
+
+    def test_merge_respects_length_limit(self):
+        q = self.make_queue(burst=5, limit=20)
+        q.put("a" * 12)
+        q.put("b" * 12)
+        self.drain(q)
+        self.assertEqual(self.sent, ["a" * 12, "b" * 12])
+
+    def test_unmergeable_lines_go_out_verbatim(self):
+        q = self.make_queue(burst=5)
+        q.put("!clip1", PRIORITY_FLAVOR, mergeable=False)
+        q.put("!clip2", PRIORITY_FLAVOR, mergeable=False)
+        self.drain(q)
+        self.assertEqual(self.sent, ["!clip1", "!clip2"])
+
+    def test_overlong_line_is_clamped(self):
+        q = self.make_queue()
+        q.put("x" * 600)
+        self.drain(q)
+        self.assertEqual(len(self.sent[0]), 480)
+        self.assertTrue(self.sent[0].endswith("..."))
+
+
+class PacingTests(QueueTestBase):
+    def test_rate_limited_until_tokens_refill(self):
+        q = self.make_queue(rate_limit=20, burst=2)
+        for n in range(4):
+            q.put(f"m{n}", mergeable=False)
+        wait = self.drain(q)
+        self.assertEqual(self.sent, ["m0", "m1"])
+        self.assertGreater(wait, 0)
+        self.clock.advance(wait)
+        self.drain(q)
+        self.assertEqual(self.sent, ["m0", "m1", "m2"])
+
+    def test_empty_queue_reports_none(self):
+        q = self.make_queue()
+        self.assertIsNone(self.drain(q))
+
+    def test_send_failure_is_counted_not_raised(self):
+        async def boom(_text):
+            raise RuntimeError("channel gone")
+        q = ChatQueue(boom, clock=self.clock)
+        q.put("hi")
+        self.drain(q)
+        self.assertEqual(q.metrics()["send_errors"], 1)
+        self.assertEqual(q.depth(), 0)
+
+
+class SheddingTests(QueueTestBase):
+    def test_full_queue_sheds_lowest_priority(self):
+        q = self.make_queue(max_depth=2)
+        q.put("f1", PRIORITY_FLAVOR)
+        q.put("f2", PRIORITY_FLAVOR)
+        self.assertTrue(q.put("KO", PRIORITY_GAME))
+        m = q.metrics()
+        self.assertEqual(m["depth"], 2)
+        self.assertEqual(m["dropped"]["overflow"], 1)
+        self.assertEqual(m["depth_by_priority"][PRIORITY_GAME], 1)
+
+    def test_full_queue_rejects_equal_priority(self):
+        q = self.make_queue(max_depth=1)
+        q.put("g1", PRIORITY_GAME)
+        self.assertFalse(q.put("g2", PRIORITY_GAME))
+        self.assertEqual(q.metrics()["dropped"]["overflow"], 1)
+
+    def test_stale_flavor_is_dropped(self):
+        q = self.make_queue()
+        q.put("old joke", PRIORITY_FLAVOR)
+        q.put("victory", PRIORITY_GAME, mergeable=False)
+        self.clock.advance(chat_queue.MAX_AGE_SECONDS[PRIORITY_FLAVOR] + 1)
+        self.drain(q)
+        self.assertEqual(self.sent, ["victory"])
+        self.assertEqual(q.metrics()["dropped"]["stale"], 1)
+
+    def test_metrics_track_depth_high_water(self):
+        q = self.make_queue()
+        for n in range(3):
+            q.put(f"m{n}")
+        self.drain(q)
+        m = q.metrics()
+        self.assertEqual(m["max_depth_seen"], 3)
+        self.assertEqual(m["enqueued"], 3)
+        self.assertEqual(m["sent"], 1)
+        self.assertEqual(m["depth"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+"""Tests for bot/click_burst.py — autoclicker burst coalescing.
+
+Run from the repo root:
+    python3 -m unittest tests.test_click_burst -v
+"""
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.click_burst import BurstCoalescer
+from playerdata import Player
+
+
+def make_player(points=100):
+    return Player(username="alice", level=1, health=50, items=[],
+                  location="email", points=points, started=0)
+
+
+class BurstTests(unittest.TestCase):
+    def setUp(self):
+        self.flushed = []
+
+    async def _flush(self, burst):
+        self.flushed.append((burst, burst.summary()))
+
+    def _click(self, co, player, success, gain):
+        co.begin("alice", "!phish", player.points)
+        player.points += gain
+        co.add("alice", "!phish", player, success, f"msg {gain}", cash=4 if success else 0)
+
+    def test_rapid_clicks_flush_once(self):
+        player = make_player()
+
+        async def go():
+            co = BurstCoalescer(self._flush, window=0.05)
+            for gain in (30, -10, 40, 20):
+                self._click(co, player, gain > 0, gain)
+            self.assertEqual(self.flushed, [])
+            await asyncio.sleep(0.1)
+            return co
+        co = asyncio.run(go())
+        self.assertEqual(co.pending(), 0)
+        self.assertEqual(len(self.flushed), 1)
+        burst, (msg, kind) = self.flushed[0]
+        self.assertEqual((burst.clicks, burst.successes, burst.failures), (4, 3, 1))
+        self.assertEqual(burst.cash, 12)
+        self.assertIn("×4", msg)
+        self.assertIn("+80 pts", msg)
+        self.assertEqual(kind, "attack-success")
+
+    def test_single_click_keeps_its_own_message(self):
+        player = make_player()
+
+        async def go():
+            co = BurstCoalescer(self._flush, window=0.01)
+            self._click(co, player, False, -10)
+            await asyncio.sleep(0.05)
+        asyncio.run(go())
+        _, (msg, kind) = self.flushed[0]
+        self.assertEqual((msg, kind), ("msg -10", "attack-fail"))
+
+    def test_separate_windows_flush_separately(self):
+        player = make_player()
+
+        async def go():
+            co = BurstCoalescer(self._flush, window=0.01)
+            self._click(co, player, True, 10)
+            await asyncio.sleep(0.05)
+            self._click(co, player, True, 10)
+            await asyncio.sleep(0.05)
+        asyncio.run(go())
+        self.assertEqual(len(self.flushed), 2)
+
+    def test_aborted_click_emits_nothing(self):
+        """A click that opened a window but never resolved (e.g. blocked)
+        produces no feed event."""
+        async def go():
+            co = BurstCoalescer(self._flush, window=0.01)
+            co.begin("alice", "!phish", 100)
+            await asyncio.sleep(0.05)
+        asyncio.run(go())
+        self.assertEqual(self.flushed, [])
+
+    def test_flush_all_drains_open_bursts(self):
+        player = make_player()
+
+        async def go():
+            co = BurstCoalescer(self._flush, window=10)
+            self._click(co, player, True, 5)
+            await co.flush_all()
+            return co
+        co = asyncio.run(go())
+        self.assertEqual(len(self.flushed), 1)
+        self.assertEqual(co.pending(), 0)
+
+    def test_flush_all_cancels_timers_and_waits_for_running_flushes(self):
+        player = make_player()
+        started = []
+
+        async def slow_flush(burst):
+            started.append(burst)
+            await asyncio.sleep(0.05)
+            self.flushed.append(burst)
+
+        async def go():
+            co = BurstCoalescer(slow_flush, window=0.01)
+            self._click(co, player, True, 5)
+            await asyncio.sleep(0.02)          # timer woke and is mid-flush
+            co.begin("alice", "!spoof", player.points)
+            co.add("alice", "!spoof", player, True, "spoofed")
+            await co.flush_all()
+            self.assertEqual(len(self.flushed), 2)
+            await asyncio.sleep(0.05)          # the cancelled timer never fires
+            return co
+        co = asyncio.run(go())
+        self.assertEqual(len(started), 2)
+        self.assertEqual(co.pending(), 0)
+
+    def test_failed_flush_is_logged(self):
+        async def broken(burst):
+            raise RuntimeError("overlay down")
+
+        async def go():
+            co = BurstCoalescer(broken, window=0.01)
+            self._click(co, make_player(), True, 5)
+            await asyncio.sleep(0.05)
+        with mock.patch("bot.click_burst.helpers.log_to_file") as log:
+            asyncio.run(go())
+        log.assert_called_once()
+        self.assertIn("overlay down", log.call_args[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
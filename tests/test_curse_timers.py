@@ -0,0 +1,132 @@
+"""Tests for game/curse_timers.py — the timed-curse scheduler and the Player
+inventory hooks that arm and cancel it.
+
+Run from the repo root:
+    python3 -m unittest tests.test_curse_timers -v
+"""
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import playerdata
+from game.curse_timers import CurseTimers
+from playerdata import Player
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+INTERVALS = {"Metaploit": 300, "0.MG Cable": 600}
+
+
+def at(seconds):
+    return T0 + timedelta(seconds=seconds)
+
+
+def make_player(name="alice", items=None, curse_due=None):
+    return Player(username=name, level=1, health=50, items=items or [],
+                  location="home", points=0, started=0, curse_due=curse_due)
+
+
+class ScheduleTests(unittest.TestCase):
+    def test_only_timed_curses_are_armed(self):
+        timers = CurseTimers(INTERVALS)
+        p = make_player()
+        self.assertIsNone(timers.schedule(p, "NES", T0))
+        self.assertEqual(timers.schedule(p, "Metaploit", T0), at(300).timestamp())
+        self.assertEqual(p.curse_due, {"Metaploit": at(300).isoformat()})
+        self.assertEqual(len(timers), 1)
+
+    def test_pop_due_returns_only_due_entries(self):
+        timers = CurseTimers(INTERVALS)
+        a, b = make_player("alice"), make_player("bob")
+        timers.schedule(a, "Metaploit", T0)
+        timers.schedule(b, "0.MG Cable", T0)
+        self.assertEqual(timers.pop_due(at(299)), [])
+        self.assertEqual(timers.seconds_until_next(T0), 300)
+        self.assertEqual(timers.pop_due(at(300)), [("alice", "Metaploit")])
+        self.assertEqual(timers.seconds_until_next(at(300)), 300)
+
+    def test_cancel_and_reschedule_skip_stale_entries(self):
+        timers = CurseTimers(INTERVALS)
+        a, b = make_player("alice"), make_player("bob")
+        timers.schedule(a, "Metaploit", T0)
+        timers.schedule(b, "Metaploit", T0)
+        self.assertTrue(timers.cancel(a, "Metaploit"))
+        self.assertEqual(a.curse_due, {})
+        timers.schedule(b, "Metaploit", at(100))        # fired, next round
+        self.assertEqual(timers.pop_due(at(300)), [])
+        self.assertEqual(timers.pop_due(at(400)), [("bob", "Metaploit")])
+
+    def test_on_earlier_fires_when_head_moves_forward(self):
+        calls = []
+        timers = CurseTimers(INTERVALS, on_earlier=lambda: calls.append(1))
+        p = make_player()
+        timers.schedule(p, "0.MG Cable", T0)
+        timers.schedule(p, "Metaploit", T0)         # earlier: wake
+        timers.schedule(make_player("bob"), "0.MG Cable", T0)  # later: no wake
+        self.assertEqual(len(calls), 2)
+
+
+class RebuildTests(unittest.TestCase):
+    def test_persisted_due_times_survive_a_restart(self):
+        p = make_player(items=["Metaploit", "NES"],
+                        curse_due={"Metaploit": at(-30).isoformat()})
+        timers = CurseTimers(INTERVALS)
+        self.assertEqual(timers.rebuild({"alice": p}, T0), 1)
+        # Overdue across the restart: fires right away, not a fresh interval.
+        self.assertEqual(timers.pop_due(T0), [("alice", "Metaploit")])
+
+    def test_rebuild_arms_missing_and_drops_stale(self):
+        p = make_player(items=["0.MG Cable"],
+                        curse_due={"Metaploit": at(10).isoformat()})
+        timers = CurseTimers(INTERVALS)
+        timers.rebuild({"alice": p}, T0)
+        self.assertEqual(p.curse_due, {"0.MG Cable": at(600).isoformat()})
+        self.assertEqual(timers.seconds_until_next(T0), 600)
+
+    def test_rebuild_never_duplicates(self):
+        p = make_player(items=["Metaploit"])
+        timers = CurseTimers(INTERVALS)
+        timers.rebuild({"alice": p}, T0)
+        timers.rebuild({"alice": p}, T0)
+        self.assertEqual(timers.pop_due(at(300)), [("alice", "Metaploit")])
+        self.assertEqual(timers.pop_due(at(10_000)), [])
+
+    def test_curse_due_round_trips(self):
+        p = make_player(items=["Metaploit"],
+                        curse_due={"Metaploit": at(5).isoformat()})
+        again = Player.from_dict("alice", p.to_dict())
+        self.assertEqual(again.curse_due, p.curse_due)
+        self.assertNotIn("curse_due", make_player().to_dict())
+
+
+class PlayerHookTests(unittest.TestCase):
+    def setUp(self):
+        self.timers = CurseTimers(INTERVALS)
+        playerdata.set_curse_timers(self.timers)
+
+    def tearDown(self):
+        playerdata.set_curse_timers(None)
+
+    def test_acquiring_a_curse_arms_it(self):
+        p = make_player()
+        p.add_item("Metaploit")
+        p.add_item("NES")
+        self.assertEqual(list(p.curse_due), ["Metaploit"])
+        self.assertIsNotNone(self.timers.due_at("alice", "Metaploit"))
+
+    def test_losing_the_last_copy_cancels_it(self):
+        p = make_player()
+        p.add_item("Metaploit")
+        p.items.append("Metaploit")             # legacy duplicate copy
+        p.remove_item("Metaploit")
+        self.assertIsNotNone(self.timers.due_at("alice", "Metaploit"))
+        p.remove_item("Metaploit")
+        self.assertIsNone(self.timers.due_at("alice", "Metaploit"))
+        self.assertEqual(p.curse_due, {})
+        self.assertEqual(self.timers.pop_due(datetime.now(timezone.utc) + timedelta(days=1)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
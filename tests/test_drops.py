@@ -0,0 +1,86 @@
+"""Tests for game/drops.py — the world-drop registry.
+
+Run from the repo root:
+    python3 -m unittest tests.test_drops -v
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.drops import DropRegistry
+
+
+class FakeClock:
+    def __init__(self, t=1000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+class RegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.reg = DropRegistry(ttl_seconds=60, clock=self.clock)
+
+    def test_spawn_dedups_by_name_case_insensitively(self):
+        self.assertIsNotNone(self.reg.spawn("Hydra", "email"))
+        self.assertIsNone(self.reg.spawn("hydra", "server"))
+        self.assertIn("HYDRA", self.reg)
+        self.assertEqual(self.reg.get("hydra").location, "email")
+
+    def test_claim_is_exclusive(self):
+        self.reg.spawn("Hydra", "email")
+        first = self.reg.claim("hydra")
+        self.assertEqual(first.name, "Hydra")
+        self.assertIsNone(self.reg.claim("Hydra"))
+        self.assertEqual(len(self.reg), 0)
+
+    def test_release_keeps_original_deadline(self):
+        self.reg.spawn("Hydra", "email")
+        drop = self.reg.claim("Hydra")
+        self.clock.t += 30
+        self.assertTrue(self.reg.release(drop))
+        self.assertEqual(self.reg.seconds_until_next(), 30)
+        self.assertEqual([d.name for d in self.reg.pop_due(self.clock.t + 30)], ["Hydra"])
+
+    def test_expiry_in_deadline_order(self):
+        self.reg.spawn("A", "email")
+        self.clock.t += 10
+        self.reg.spawn("B", "email")
+        self.assertEqual(self.reg.pop_due(self.clock.t + 49), [])
+        self.assertEqual([d.name for d in self.reg.pop_due(self.clock.t + 50)], ["A"])
+        self.assertEqual([d.name for d in self.reg.pop_due(self.clock.t + 60)], ["B"])
+        self.assertIsNone(self.reg.seconds_until_next())
+
+    def test_claimed_drop_never_expires(self):
+        self.reg.spawn("A", "email")
+        self.reg.claim("A")
+        self.assertIsNone(self.reg.seconds_until_next())
+        self.assertEqual(self.reg.pop_due(self.clock.t + 999), [])
+
+    def test_respawn_after_claim_gets_a_fresh_deadline(self):
+        self.reg.spawn("A", "email")
+        self.reg.claim("A")
+        self.clock.t += 50
+        self.reg.spawn("A", "server")
+        self.assertEqual(self.reg.pop_due(self.clock.t + 10), [])
+        self.assertEqual(len(self.reg), 1)
+
+    def test_iterates_oldest_first(self):
+        for name in ("C", "A", "B"):
+            self.reg.spawn(name, "email")
+        self.assertEqual([d.name for d in self.reg], ["C", "A", "B"])
+
+    def test_wakes_loop_when_first_drop_arrives(self):
+        wakes = []
+        reg = DropRegistry(ttl_seconds=60, on_earlier=lambda: wakes.append(1), clock=self.clock)
+        reg.spawn("A", "email")
+        reg.spawn("B", "email")
+        self.assertEqual(len(wakes), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Tests for game/expiry.py — unified expiry timers.
+
+Run from the repo root:
+    python3 -m unittest tests.test_expiry -v
+"""
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import perks
+from game import expiry, hardware, jail
+from game.expiry import ExpiryTimers
+from playerdata import Player
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def at(seconds):
+    return T0 + timedelta(seconds=seconds)
+
+
+def make_player(name="alice", **kw):
+    p = Player(username=name, level=1, health=50, items=[],
+               location="home", points=0, started=0)
+    for k, v in kw.items():
+        setattr(p, k, v)
+    return p
+
+
+class DeadlineScanTests(unittest.TestCase):
+    def test_collects_every_kind(self):
+        p = make_player(jail={"until": at(60).isoformat()},
+                        rentals={"vps": at(120).isoformat()},
+                        no_cap_until=at(30).isoformat())
+        kinds = {(k, key) for k, key, _ in expiry.deadlines_for(p, T0)}
+        self.assertEqual(kinds, {(expiry.JAIL, None), (expiry.RENTAL, "vps"),
+                                 (expiry.NO_CAP, None)})
+
+    def test_settled_past_deadlines_are_skipped(self):
+        p = make_player(rentals={"vps": at(-5).isoformat()},
+                        no_cap_until=at(-5).isoformat())
+        self.assertEqual(expiry.deadlines_for(p, T0), [])
+
+    def test_overdue_jail_still_needs_release(self):
+        p = make_player(jail={"until": at(-5).isoformat()})
+        self.assertEqual([k for k, _, _ in expiry.deadlines_for(p, T0)], [expiry.JAIL])
+
+
+class TimerTests(unittest.TestCase):
+    def test_fires_in_deadline_order(self):
+        t = ExpiryTimers()
+        t.schedule(expiry.NO_CAP, "bob", at(20))
+        t.schedule(expiry.JAIL, "alice", at(10))
+        self.assertEqual(t.pop_due(at(5)), [])
+        self.assertEqual(t.seconds_until_next(at(5)), 5)
+        self.assertEqual(t.pop_due(at(30)), [(expiry.JAIL, "alice", None),
+                                             (expiry.NO_CAP, "bob", None)])
+        self.assertEqual(len(t), 0)
+
+    def test_extended_deadline_supersedes_the_old_one(self):
+        t = ExpiryTimers()
+        t.schedule(expiry.RENTAL, "alice", at(10), "vps")
+        t.schedule(expiry.RENTAL, "alice", at(70), "vps")
+        self.assertEqual(t.pop_due(at(30)), [])
+        self.assertEqual(t.seconds_until_next(at(30)), 40)
+        self.assertEqual(t.pop_due(at(70)), [(expiry.RENTAL, "alice", "vps")])
+
+    def test_rescheduling_the_same_deadline_is_a_noop(self):
+        wakes = []
+        t = ExpiryTimers(on_earlier=lambda: wakes.append(1))
+        t.schedule(expiry.JAIL, "alice", at(10))
+        t.schedule(expiry.JAIL, "alice", at(10))
+        self.assertEqual((len(t), len(wakes)), (1, 1))
+
+    def test_rebuild_from_roster(self):
+        players = {"alice": make_player("alice", jail={"until": at(10).isoformat()}),
+                   "bob": make_player("bob")}
+        t = ExpiryTimers()
+        self.assertEqual(t.rebuild(players, T0), 1)
+        self.assertEqual(t.pop_due(at(10)), [(expiry.JAIL, "alice", None)])
+
+
+class MutatorHookTests(unittest.TestCase):
+    def setUp(self):
+        self.timers = ExpiryTimers()
+        expiry.set_expiry_timers(self.timers)
+
+    def tearDown(self):
+        expiry.set_expiry_timers(None)
+
+    def _kinds(self):
+        return {(k, key) for k, _, key in self.timers.pop_due(at(10 ** 9))}
+
+    def test_rent_vps_registers_lapse(self):
+        p = make_player(cash=10_000)
+        cost, _ = hardware.rent_vps(p, "vps")
+        self.assertIsNotNone(cost)
+        self.assertEqual(self._kinds(), {(expiry.RENTAL, "vps")})
+
+    def test_no_cap_and_box_register(self):
+        p = make_player()
+        jail.grant_no_cap(p)
+        perks.grant_box(p)
+        self.assertEqual(self._kinds(), {(expiry.NO_CAP, None), (expiry.BOX, None)})
+
+    def test_no_timers_installed_is_harmless(self):
+        expiry.set_expiry_timers(None)
+        jail.grant_no_cap(make_player())
+
+
+if __name__ == "__main__":
+    unittest.main()
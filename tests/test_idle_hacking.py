@@ -469,6 +469,164 @@ class VPSRentalTests(unittest.TestCase):
         self.assertEqual(hardware.condition_of(p, "vps"), 100.0)   # cloud → no wear
 
 
+class StandingOrderTests(unittest.TestCase):
+    """Standing orders repeat a hack on one machine, settled in a single pass."""
+    NOW = datetime(2026, 6, 7, 12, 0, 0, tzinfo=timezone.utc)
+    FAIL = FakeRandom(0.999, 7)     # every roll fails → no skim lookup needed
+
+    def _step(self, p, machine, hack_id, end):
+        """Reference: start and resolve each job back to back until `end`."""
+        t, runs = self.NOW, 0
+        while True:
+            job, seconds = hacks.start_hack(p, hack_id, machine, now=t)
+            if t + timedelta(seconds=seconds) > end:
+                p.jobs = []
+                return runs
+            t += timedelta(seconds=seconds)
+            runs += len(hacks.resolve_due_jobs(p, now=t, rng=self.FAIL))
+
+    def test_order_holds_a_slot(self):
+        p = make_player(rig=["sbc"])
+        order, _ = hacks.set_order(p, "sbc", "portscan", now=self.NOW)
+        self.assertIsNotNone(order)
+        self.assertEqual(hardware.machine_free(p, "sbc"), 0)
+        job, reason = hacks.start_hack(p, "portscan", now=self.NOW)
+        self.assertIsNone(job)
+        self.assertIsNone(hacks.set_order(p, "sbc", "portscan")[0])
+
+    def test_settle_matches_stepping_every_job(self):
+        end = self.NOW + timedelta(hours=3)
+        stepped = make_player(rig=["sbc"])
+        runs = self._step(stepped, "sbc", "portscan", end)
+        settled = make_player(rig=["sbc"])
+        hacks.set_order(settled, "sbc", "portscan", now=self.NOW)
+        [r] = hacks.settle_orders(settled, now=end, rng=self.FAIL)
+        self.assertEqual(r["runs"], runs)
+        self.assertAlmostEqual(hardware.condition_of(settled, "sbc"),
+                               hardware.condition_of(stepped, "sbc"))
+
+    def test_worn_out_machine_keeps_running_at_crawl_speed(self):
+        p = make_player(rig=["sbc"])
+        p.conditions = {"sbc": 0.0}
+        hacks.set_order(p, "sbc", "portscan", now=self.NOW)
+        seconds = hacks.duration_for(hacks.HACK_DEFS["portscan"],
+                                     hardware.machine_stats("sbc"), 0.0)
+        [r] = hacks.settle_orders(p, now=self.NOW + timedelta(seconds=10 * seconds + 1),
+                                  rng=self.FAIL)
+        self.assertEqual(r["runs"], 10)
+
+    def test_progress_carries_across_settles(self):
+        p = make_player(rig=["sbc"])
+        hacks.set_order(p, "sbc", "portscan", now=self.NOW)
+        self.assertEqual(hacks.settle_orders(p, now=self.NOW + timedelta(seconds=10),
+                                             rng=self.FAIL), [])
+        [r] = hacks.settle_orders(p, now=self.NOW + timedelta(seconds=16), rng=self.FAIL)
+        self.assertEqual(r["runs"], 1)      # 15s run started at NOW, not at t=10
+
+    def test_early_settle_keeps_the_scheduled_settle(self):
+        p = make_player(rig=["sbc"])
+        hacks.set_order(p, "sbc", "portscan", now=self.NOW)
+        due = p.orders["sbc"]["next_settle"]
+        hacks.settle_orders(p, now=self.NOW + timedelta(minutes=5), rng=self.FAIL)
+        self.assertEqual(p.orders["sbc"]["next_settle"], due)
+        later = self.NOW + timedelta(seconds=hacks.ORDER_SETTLE_SECONDS)
+        hacks.settle_orders(p, now=later, rng=self.FAIL)
+        self.assertGreater(p.orders["sbc"]["next_settle"], due)
+
+    def test_order_stops_when_rental_lapses(self):
+        now = datetime.now(timezone.utc)    # machine checks use the real clock
+        p = make_player(cash=1000)
+        hardware.rent_vps(p, "vps", now=now)
+        hacks.set_order(p, "vps", "portscan", now=now)
+        [r] = hacks.settle_orders(p, now=now + timedelta(hours=5), rng=self.FAIL)
+        seconds = hacks.duration_for(hacks.HACK_DEFS["portscan"],
+                                     hardware.machine_stats("vps"))
+        self.assertEqual(r["runs"], hardware.RENT_PERIOD_SECONDS // seconds)
+        self.assertEqual(r["stopped"], "rental lapsed")
+        self.assertEqual(p.orders, {})
+
+    def test_cancel_settles_and_frees_the_slot(self):
+        p = make_player(rig=["sbc"])
+        hacks.set_order(p, "sbc", "portscan", now=self.NOW)
+        r, _ = hacks.cancel_order(p, "sbc", now=self.NOW + timedelta(seconds=31),
+                                  rng=self.FAIL)
+        self.assertEqual(r["runs"], 2)
+        self.assertEqual(hardware.machine_free(p, "sbc"), 1)
+        self.assertIsNone(hacks.cancel_order(p, "sbc")[0])
+
+    def test_orders_round_trip(self):
+        p = make_player(rig=["sbc"])
+        hacks.set_order(p, "sbc", "portscan", now=self.NOW)
+        restored = Player.from_dict("alice", p.to_dict())
+        self.assertEqual(restored.orders, p.orders)
+
+
+class JobQueueTests(unittest.TestCase):
+    """Per-machine queues start the next run server-side as each job ends."""
+    NOW = datetime(2026, 6, 7, 12, 0, 0, tzinfo=timezone.utc)
+    FAIL = FakeRandom(0.999, 7)
+
+    def test_enqueue_on_idle_machine_starts_at_once(self):
+        p = make_player(rig=["sbc"])
+        entry, job, _ = hacks.enqueue(p, "sbc", "portscan", runs=3, now=self.NOW)
+        self.assertTrue(job["queued"])
+        self.assertEqual(entry["runs"], 2)
+        self.assertEqual(len(p.jobs), 1)
+
+    def test_n_runs_chain_back_to_back(self):
+        p = make_player(rig=["sbc"])
+        _, job, _ = hacks.enqueue(p, "sbc", "portscan", runs=3, now=self.NOW)
+        seconds = hacks.time_left(job, self.NOW)
+        results = hacks.resolve_due_jobs(p, now=self.NOW + timedelta(hours=1), rng=self.FAIL)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(p.jobs, [])
+        self.assertEqual(p.queues, {})
+        # The chain never idled: run 2 started the second run 1 ended.
+        p2 = make_player(rig=["sbc"])
+        hacks.enqueue(p2, "sbc", "portscan", runs=3, now=self.NOW)
+        hacks.resolve_due_jobs(p2, now=self.NOW + timedelta(seconds=seconds), rng=self.FAIL)
+        self.assertEqual(p2.jobs[0]["started_at"],
+                         (self.NOW + timedelta(seconds=seconds)).isoformat())
+
+    def test_busy_machine_queues_behind_running_job(self):
+        p = make_player(rig=["sbc"])
+        hacks.start_hack(p, "portscan", "sbc", now=self.NOW)
+        entry, job, _ = hacks.enqueue(p, "sbc", "servicescan", runs=1, now=self.NOW)
+        self.assertIsNone(job)
+        hacks.resolve_due_jobs(p, now=self.NOW + timedelta(seconds=16), rng=self.FAIL)
+        self.assertEqual([j["hack_id"] for j in p.jobs], ["servicescan"])
+        self.assertEqual(p.queues, {})
+
+    def test_condition_floor_stops_the_entry(self):
+        p = make_player(rig=["sbc"])
+        p.conditions = {"sbc": 50.0}
+        hacks.enqueue(p, "sbc", "portscan", min_condition=49.0, now=self.NOW)
+        hacks.resolve_due_jobs(p, now=self.NOW + timedelta(hours=1), rng=self.FAIL)
+        # Each portscan wears 0.48%: runs at 50, 49.52, 49.04, then stops.
+        self.assertLess(hardware.condition_of(p, "sbc"), 49.0)
+        self.assertEqual(p.jobs, [])
+        self.assertEqual(p.queues, {})
+
+    def test_until_cancelled_and_clear(self):
+        p = make_player(rig=["sbc"])
+        hacks.enqueue(p, "sbc", "portscan", now=self.NOW)
+        results = hacks.resolve_due_jobs(p, now=self.NOW + timedelta(seconds=151), rng=self.FAIL)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(len(p.jobs), 1)             # still going
+        self.assertEqual(hacks.clear_queue(p, "sbc"), 1)
+        hacks.resolve_due_jobs(p, now=self.NOW + timedelta(hours=1), rng=self.FAIL)
+        self.assertEqual(p.jobs, [])
+
+    def test_enqueue_rejects_bad_requests(self):
+        p = make_player(rig=["sbc"])
+        self.assertIsNone(hacks.enqueue(p, "laptop", "portscan")[0])
+        self.assertIsNone(hacks.enqueue(p, "sbc", "dbexfil")[0])
+        self.assertIsNone(hacks.enqueue(p, "sbc", "portscan", runs=0)[0])
+        for _ in range(hardware.QUEUE_DEPTH):
+            hacks.enqueue(p, "sbc", "portscan", now=self.NOW)
+        self.assertIn("full", hacks.enqueue(p, "sbc", "portscan")[2])
+
+
 class StartHackTests(unittest.TestCase):
     def test_cannot_run_without_a_rig(self):
         job, reason = hacks.start_hack(make_player(), "portscan")
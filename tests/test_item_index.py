@@ -0,0 +1,91 @@
+"""Tests for game/item_index.py and the Player inventory hooks that keep it
+current.
+
+Run from the repo root:
+    python3 -m unittest tests.test_item_index -v
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import playerdata
+from bot import perks
+from game.item_index import ItemIndex
+from playerdata import Player
+
+
+def make_player(name, items=None):
+    return Player(username=name, level=1, health=50, items=items or [],
+                  location="home", points=0, started=0)
+
+
+class IndexTests(unittest.TestCase):
+    def test_lookup_is_case_insensitive(self):
+        idx = ItemIndex()
+        idx.add("alice", "Hydra")
+        self.assertEqual(idx.holders("hydra"), {"alice"})
+        self.assertTrue(idx.holds("alice", " HYDRA "))
+
+    def test_discard_drops_empty_entries(self):
+        idx = ItemIndex()
+        idx.add("alice", "Hydra")
+        idx.discard("alice", "Hydra")
+        idx.discard("bob", "Nope")
+        self.assertEqual(len(idx), 0)
+
+    def test_holders_among_keeps_team_order(self):
+        idx = ItemIndex()
+        for u in ("carol", "alice"):
+            idx.add(u, "NES")
+        self.assertEqual(idx.holders_among("NES", ["alice", "bob", "carol"]),
+                         ["alice", "carol"])
+
+    def test_rebuild_and_held_items(self):
+        players = {"alice": make_player("alice", ["Hydra", "NES"]),
+                   "bob": make_player("bob", ["NES"])}
+        idx = ItemIndex()
+        self.assertEqual(idx.rebuild(players), 2)
+        self.assertEqual(idx.held_items(["NES", "Kali", "Hydra"]),
+                         {"NES": {"alice", "bob"}, "Hydra": {"alice"}})
+
+
+class PlayerHookTests(unittest.TestCase):
+    def setUp(self):
+        self.idx = ItemIndex()
+        playerdata.set_item_index(self.idx)
+
+    def tearDown(self):
+        playerdata.set_item_index(None)
+
+    def test_add_and_remove_item_maintain_index(self):
+        p = make_player("alice")
+        self.assertTrue(p.add_item("hydra"))
+        self.assertEqual(self.idx.holders("Hydra"), {"alice"})
+        stored = p.items[0]
+        self.assertEqual(p.remove_item("HYDRA"), stored)
+        self.assertEqual(self.idx.holders("Hydra"), frozenset())
+
+    def test_remove_missing_item(self):
+        self.assertIsNone(make_player("alice").remove_item("Hydra"))
+
+    def test_duplicate_copy_keeps_holder_until_last_removed(self):
+        p = make_player("alice", ["NES", "NES"])
+        self.idx.rebuild({"alice": p})
+        p.remove_item("NES")
+        self.assertTrue(self.idx.holds("alice", "NES"))
+        p.remove_item("NES")
+        self.assertFalse(self.idx.holds("alice", "NES"))
+
+    def test_cardboard_box_grant_and_prune(self):
+        p = make_player("alice")
+        perks.grant_box(p)
+        self.assertTrue(self.idx.holds("alice", perks.CARDBOARD_BOX))
+        p.cardboard_box_until = "2000-01-01T00:00:00"
+        self.assertTrue(perks.prune_box(p))
+        self.assertFalse(self.idx.holds("alice", perks.CARDBOARD_BOX))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ Run from the repo root:
     python3 -m unittest tests.test_jail -v
 """
 import os
+import subprocess
 import sys
 import tempfile
 import unittest
@@ -432,6 +433,63 @@ class BailConsentTests(JailTestBase):
         self.assertEqual(p2.bail_request_for, "trip")
 
 
+# ---------------------------------------------------------------------------
+# Treasury stores
+# ---------------------------------------------------------------------------
+
+class TreasuryStoreTests(JailTestBase):
+    def tearDown(self):
+        jail.set_treasury_path(self._tmp.name)
+        super().tearDown()
+
+    def test_file_store_round_trip(self):
+        self.assertEqual(jail._credit_treasury(40), 40)
+        self.assertEqual(jail._credit_treasury(2), 42)
+        self.assertEqual(jail.sidecar_treasury_balance(), 42)
+
+    def test_negative_credit_rejected(self):
+        with self.assertRaises(ValueError):
+            jail._credit_treasury(-1)
+
+    def test_cached_store_serves_reads_from_memory(self):
+        jail._credit_treasury(100)                 # sidecar: 100
+        store = jail.CachedTreasury(jail.sidecar_treasury_balance())
+        jail.set_treasury_store(store)
+        self.assertEqual(jail._credit_treasury(25), 125)
+        self.assertEqual(jail.get_treasury_balance(), 125)
+        self.assertEqual(jail.sidecar_treasury_balance(), 100)   # file untouched
+
+    def test_bail_credits_installed_store(self):
+        store = jail.CachedTreasury(0)
+        jail.set_treasury_store(store)
+        bailer = make_player("bob", points=0)
+        jailed = make_player("alice", points=10_000)
+        jailed.jail = {
+            "until": (T0 + timedelta(minutes=4)).isoformat(),
+            "reason": "speed",
+            "offense_number": 3,
+        }
+        jail.request_bail(jailed, "bob", now=T0)
+        result = jail.post_bail(bailer, jailed, now=T0)
+        self.assertTrue(result.ok, result.message)
+        self.assertEqual(store.take_pending(), result.treasury_share)
+
+    def test_settle_keeps_credits_made_during_the_write(self):
+        store = jail.CachedTreasury(10)
+        store.credit(5)
+        flushing = store.take_pending()
+        store.credit(3)                            # lands while the UPDATE is in flight
+        self.assertEqual(store.settle(500 + flushing), 508)   # another process added 500
+        self.assertEqual(store.take_pending(), 3)
+
+    def test_restore_after_failed_write(self):
+        store = jail.CachedTreasury(0)
+        store.credit(7)
+        store.restore(store.take_pending())
+        self.assertEqual(store.take_pending(), 7)
+        self.assertEqual(store.balance(), 7)
+
+
 # ---------------------------------------------------------------------------
 # Command gating
 # ---------------------------------------------------------------------------
@@ -518,6 +576,7 @@ class TelemetryTests(JailTestBase):
             p = make_player(level=5000)
             jail.record_attack(p, "evilcorp", 100, now=T0)
             jail.record_attack(p, "evilcorp", 100, now=T0 + timedelta(seconds=0.05))
+            jail.flush_telemetry()
             with open(path) as f:
                 lines = [line for line in f.read().splitlines() if line]
             self.assertEqual(len(lines), 2)
@@ -536,6 +595,19 @@ class TelemetryTests(JailTestBase):
                 pass
             jail.set_attack_log_path("")
 
+    def test_bad_env_values_fall_back_to_defaults(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, TWITCHACK_ATTACK_LOG="",
+                   TWITCHACK_ATTACK_LOG_MAX_MB="lots", TWITCHACK_ATTACK_LOG_SAMPLE_ABOVE="2.5")
+        out = subprocess.run(
+            [sys.executable, "-c",
+             "from game import jail; from game import telemetry as t; "
+             "print(jail._ATTACK_LOG_MAX_BYTES == t.MAX_BYTES, "
+             "jail._ATTACK_LOG_SAMPLE_ABOVE == t.SAMPLE_ABOVE)"],
+            cwd=root, env=env, capture_output=True, text=True)
+        self.assertEqual(out.returncode, 0, out.stderr)
+        self.assertEqual(out.stdout.split(), ["True", "True"])
+
 
 class AutoclickerScenarioTests(JailTestBase):
     def test_autoclicker_jails_within_milliseconds(self):
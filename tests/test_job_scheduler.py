@@ -0,0 +1,100 @@
+"""Tests for game/job_scheduler.py — the idle-job deadline heap.
+
+Run from the repo root:
+    python3 -m unittest tests.test_job_scheduler -v
+"""
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import hacks
+from game.job_scheduler import JobScheduler
+from playerdata import Player
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def at(seconds):
+    return T0 + timedelta(seconds=seconds)
+
+
+def make_player(name="alice", jobs=None):
+    p = Player(username=name, level=1, health=50, items=[],
+               location="home", points=0, started=0)
+    p.jobs = jobs
+    return p
+
+
+class HeapTests(unittest.TestCase):
+    def test_pops_only_due_users_in_deadline_order(self):
+        s = JobScheduler()
+        s.register("carol", at(30))
+        s.register("alice", at(10))
+        s.register("bob", at(20))
+        self.assertEqual(s.pop_due(at(5)), [])
+        self.assertEqual(s.pop_due(at(20)), ["alice", "bob"])
+        self.assertEqual(len(s), 1)
+        self.assertEqual(s.seconds_until_next(at(20)), 10)
+
+    def test_user_with_several_due_jobs_is_returned_once(self):
+        s = JobScheduler()
+        s.register("alice", at(1))
+        s.register("alice", at(2))
+        self.assertEqual(s.pop_due(at(3)), ["alice"])
+        self.assertIsNone(s.seconds_until_next(at(3)))
+
+    def test_overdue_deadline_is_zero_wait(self):
+        s = JobScheduler()
+        s.register("alice", at(1))
+        self.assertEqual(s.seconds_until_next(at(9)), 0.0)
+
+    def test_accepts_iso_strings_and_skips_garbage(self):
+        s = JobScheduler()
+        s.register("alice", at(5).isoformat())
+        s.register("bob", "not a date")
+        s.register("carol", None)
+        self.assertEqual(len(s), 1)
+
+    def test_wakes_only_when_earliest_deadline_moves(self):
+        wakes = []
+        s = JobScheduler(on_earlier=lambda: wakes.append(1))
+        s.register("alice", at(10))
+        s.register("bob", at(20))
+        s.register("carol", at(5))
+        self.assertEqual(len(wakes), 2)
+
+    def test_rebuild_from_persisted_jobs(self):
+        players = {
+            "alice": make_player("alice", [{"finishes_at": at(10).isoformat()},
+                                           {"finishes_at": at(40).isoformat()}]),
+            "bob": make_player("bob", None),
+            "carol": make_player("carol", [{"finishes_at": at(25).isoformat()}]),
+        }
+        s = JobScheduler()
+        s.register("stale", at(1))
+        self.assertEqual(s.rebuild(players), 3)
+        self.assertEqual(s.pop_due(at(30)), ["alice", "carol"])
+
+
+class StartHackRegistrationTests(unittest.TestCase):
+    def tearDown(self):
+        hacks.set_job_scheduler(None)
+
+    def test_start_hack_registers_deadline(self):
+        s = JobScheduler()
+        hacks.set_job_scheduler(s)
+        p = make_player()
+        p.rig = ["sbc"]
+        hack_id = next(h.id for h in hacks.HACK_DEFS.values()
+                       if hacks.can_run(p, h.id)[0])
+        job, seconds = hacks.start_hack(p, hack_id, now=T0)
+        self.assertIsNotNone(job)
+        self.assertEqual(s.pop_due(at(seconds - 1)), [])
+        self.assertEqual(s.pop_due(at(seconds)), ["alice"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Tests for game/leaderboard.py — incrementally maintained rankings.
+
+Run from the repo root:
+    python3 -m unittest tests.test_leaderboard -v
+"""
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import playerdata
+from game import leaderboard
+from game.leaderboard import Board, Leaderboards
+from playerdata import Player
+
+
+def make_player(name, points=0, cash=0):
+    return Player(username=name, level=1, health=50, items=[],
+                  location="home", points=points, started=0, cash=cash)
+
+
+class BoardTests(unittest.TestCase):
+    def setUp(self):
+        self.b = Board(top_n=3)
+        for name, score in (("alice", 50), ("bob", 80), ("carol", 50), ("dave", 10)):
+            self.b.update(name, score)
+
+    def test_top_is_highest_first_ties_by_name(self):
+        self.assertEqual(self.b.top(), [("bob", 80), ("alice", 50), ("carol", 50)])
+
+    def test_competition_rank_for_ties(self):
+        self.assertEqual([self.b.rank(u) for u in ("bob", "alice", "carol", "dave")],
+                         [1, 2, 2, 4])
+        self.assertIsNone(self.b.rank("nobody"))
+
+    def test_percentile(self):
+        self.assertEqual(self.b.percentile("bob"), 100.0)
+        self.assertEqual(self.b.percentile("alice"), 33.3)
+        self.assertEqual(self.b.percentile("dave"), 0.0)
+
+    def test_around(self):
+        self.assertEqual(self.b.around("carol", k=1),
+                         [(2, "alice", 50), (2, "carol", 50), (4, "dave", 10)])
+
+    def test_update_reports_top_n_touches(self):
+        self.assertFalse(self.b.update("dave", 20))      # 4th → 4th
+        self.assertTrue(self.b.update("dave", 90))       # into the top
+        self.assertTrue(self.b.update("dave", 5))        # back out of it
+        self.assertFalse(self.b.update("dave", 5))       # unchanged
+
+    def test_matches_full_sort_under_random_updates(self):
+        rng = random.Random(7)
+        b, scores = Board(), {}
+        for _ in range(2000):
+            name = f"p{rng.randrange(60)}"
+            scores[name] = rng.randrange(500)
+            b.update(name, scores[name])
+        expected = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        self.assertEqual(b.top(len(scores)), expected)
+
+
+class LeaderboardsTests(unittest.TestCase):
+    def test_session_board_tracks_gain_since_start(self):
+        lbs = Leaderboards()
+        lbs.rebuild({"alice": make_player("alice", points=500),
+                     "bob": make_player("bob", points=100)})
+        lbs.observe("bob", "points", 300)
+        self.assertEqual(lbs[leaderboard.SESSION].top(2), [("bob", 200), ("alice", 0)])
+        self.assertEqual(lbs[leaderboard.POINTS].top(2), [("alice", 500), ("bob", 300)])
+
+    def test_take_changed_only_when_top_n_moves(self):
+        lbs = Leaderboards(top_n=1)
+        lbs.rebuild({"alice": make_player("alice", points=500),
+                     "bob": make_player("bob", points=100)})
+        self.assertEqual(set(lbs.take_changed()), set(leaderboard.BOARDS))
+        lbs.observe("bob", "points", 150)       # still below alice
+        self.assertNotIn(leaderboard.POINTS, lbs.take_changed())
+        lbs.observe("alice", "cash", 0)          # unchanged write
+        self.assertEqual(lbs.take_changed(), {})
+        lbs.observe("bob", "points", 900)
+        self.assertEqual(lbs.take_changed()[leaderboard.POINTS], [("bob", 900)])
+
+
+class PlayerHookTests(unittest.TestCase):
+    def setUp(self):
+        self.lbs = Leaderboards()
+        playerdata.set_leaderboards(self.lbs)
+
+    def tearDown(self):
+        playerdata.set_leaderboards(None)
+
+    def test_points_and_cash_writes_update_boards(self):
+        p = make_player("alice", points=10, cash=5)
+        p.points += 40
+        p.cash = 99
+        self.assertEqual(self.lbs[leaderboard.POINTS].score("alice"), 50)
+        self.assertEqual(self.lbs[leaderboard.CASH].score("alice"), 99)
+        self.assertEqual(self.lbs[leaderboard.SESSION].score("alice"), 40)
+        self.assertEqual(p.to_dict()["points"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
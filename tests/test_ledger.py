@@ -0,0 +1,106 @@
+"""Tests for game/ledger.py — the append-only economy ledger.
+
+Run from the repo root:
+    python3 -m unittest tests.test_ledger -v
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import ledger
+from playerdata import Player
+
+
+def make_player(username="alice", points=100, cash=50) -> Player:
+    return Player(username=username, level=1, health=100, items=[],
+                  location="email", points=points, started=1, cash=cash)
+
+
+class LedgerTestBase(unittest.TestCase):
+    def setUp(self):
+        self.book = ledger.Ledger(history_per_user=3)
+        ledger.set_ledger(self.book)
+
+    def tearDown(self):
+        ledger.set_ledger(None)
+
+
+class ApplyTests(LedgerTestBase):
+    def test_apply_changes_balance_and_records(self):
+        p = make_player()
+        self.assertEqual(ledger.apply(p, ledger.ATTACK, points=10, cash=5), (10, 5))
+        self.assertEqual((p.points, p.cash), (110, 55))
+        (row,) = self.book.take_batch()
+        self.assertEqual(row[1:], ("alice", 10, 5, ledger.ATTACK, None))
+
+    def test_clamp_records_amount_actually_taken(self):
+        p = make_player(points=30)
+        self.assertEqual(ledger.apply(p, ledger.VIRUS, points=-50, clamp=True), (-30, 0))
+        self.assertEqual(p.points, 0)
+        self.assertEqual(self.book.history("alice")[0][2], -30)
+
+    def test_noop_is_not_recorded(self):
+        p = make_player(points=0)
+        ledger.apply(p, ledger.FEE, points=-5, clamp=True)
+        self.assertEqual(self.book.pending(), 0)
+
+    def test_transfer_records_both_sides(self):
+        victim, thief = make_player("bob", points=8), make_player("eve", points=0)
+        moved = ledger.transfer(victim, thief, 10, ledger.STEAL)
+        self.assertEqual(moved, 8)
+        self.assertEqual((victim.points, thief.points), (0, 8))
+        rows = self.book.take_batch()
+        self.assertEqual([(r[1], r[2], r[5]) for r in rows], [("bob", -8, "eve"), ("eve", 8, "bob")])
+
+    def test_untracked_without_ledger(self):
+        ledger.set_ledger(None)
+        p = make_player()
+        ledger.apply(p, ledger.ATTACK, points=1)
+        self.assertEqual(p.points, 101)
+        self.assertEqual(self.book.pending(), 0)
+
+
+class QueryTests(LedgerTestBase):
+    def test_history_newest_first_and_bounded(self):
+        for i in range(5):
+            self.book.record("alice", i, 0, ledger.ATTACK, ts=float(i))
+        self.assertEqual([r[2] for r in self.book.history("alice")], [4, 3, 2])
+        self.assertEqual([r[2] for r in self.book.history("alice", limit=1)], [4])
+        self.assertEqual(self.book.history("nobody"), [])
+
+    def test_totals_per_reason(self):
+        self.book.record("alice", 10, 0, ledger.ATTACK)
+        self.book.record("bob", -4, 0, ledger.ATTACK)
+        self.book.record("bob", 0, -20, ledger.HARDWARE)
+        self.assertEqual(self.book.totals()[ledger.ATTACK], {"count": 2, "points": 6, "cash": 0})
+        self.assertEqual(self.book.totals(ledger.HARDWARE),
+                         {ledger.HARDWARE: {"count": 1, "points": 0, "cash": -20}})
+        self.assertEqual(self.book.totals("nope"), {})
+
+
+class FlushTests(LedgerTestBase):
+    def test_take_batch_drains(self):
+        self.book.record("alice", 1)
+        self.assertEqual(len(self.book.take_batch()), 1)
+        self.assertEqual(self.book.take_batch(), [])
+
+    def test_restore_puts_failed_batch_first(self):
+        self.book.record("alice", 1, ts=1.0)
+        batch = self.book.take_batch()
+        self.book.record("alice", 2, ts=2.0)
+        self.book.restore(batch)
+        self.assertEqual([r[2] for r in self.book.take_batch()], [1, 2])
+
+    def test_restore_caps_pending(self):
+        book = ledger.Ledger(max_pending=3)
+        for i in range(4):
+            book.record("alice", i)
+        book.restore(book.take_batch())
+        self.assertEqual([r[2] for r in book.take_batch()], [1, 2, 3])
+        self.assertEqual(book.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Tests for game/locations.py — the location occupancy index.
+
+Run from the repo root:
+    python3 -m unittest tests.test_locations -v
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import playerdata
+from game import locations
+from game.locations import LocationIndex
+from playerdata import Player
+
+
+def make_player(name, location="home"):
+    return Player(username=name, level=1, health=50, items=[],
+                  location=location, points=0, started=0)
+
+
+class IndexTests(unittest.TestCase):
+    def test_move_updates_both_directions(self):
+        idx = LocationIndex()
+        idx.move("alice", "email")
+        idx.move("bob", "email")
+        idx.move("alice", "server")
+        self.assertEqual(idx.players_at("email"), {"bob"})
+        self.assertEqual(idx.players_at("server"), {"alice"})
+        self.assertEqual(idx.where("alice"), "server")
+
+    def test_arrivals_skip_first_placement_and_repeats(self):
+        idx = LocationIndex()
+        idx.move("alice", "email")          # first sighting, not an arrival
+        idx.move("alice", "server")
+        idx.move("alice", "server")         # no-op
+        stats = idx.stats()
+        self.assertEqual(stats["server"], {"here": 1, "arrivals": 1, "actions": 0})
+        self.assertEqual(stats["email"]["arrivals"], 0)
+
+    def test_actions_and_remove(self):
+        idx = LocationIndex()
+        idx.move("alice", "network")
+        idx.record_action("network")
+        idx.remove("alice")
+        self.assertEqual(idx.stats()["network"], {"here": 0, "arrivals": 0, "actions": 1})
+        self.assertEqual(len(idx), 0)
+
+    def test_rebuild_counts_no_arrivals(self):
+        idx = LocationIndex()
+        n = idx.rebuild({"alice": make_player("alice", "email"),
+                         "bob": make_player("bob", "email")})
+        self.assertEqual(n, 2)
+        self.assertEqual(idx.stats()["email"], {"here": 2, "arrivals": 0, "actions": 0})
+
+    def test_normalize(self):
+        self.assertEqual(locations.normalize(" EvilCorp "), "evilcorp")
+        self.assertIsNone(locations.normalize("mars"))
+
+
+class PlayerHookTests(unittest.TestCase):
+    def setUp(self):
+        self.idx = LocationIndex()
+        playerdata.set_location_index(self.idx)
+
+    def tearDown(self):
+        playerdata.set_location_index(None)
+
+    def test_location_writes_update_index(self):
+        p = make_player("alice")
+        self.assertEqual(self.idx.where("alice"), "home")
+        p.location = "database"
+        self.assertEqual(self.idx.players_at("database"), {"alice"})
+        self.assertEqual(p.to_dict()["location"], "database")
+
+
+if __name__ == "__main__":
+    unittest.main()
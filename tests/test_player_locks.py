@@ -0,0 +1,138 @@
+"""Tests for bot/player_locks.py — per-player command serialization.
+
+Includes a stress test that fires thousands of interleaved steal/attack
+commands whose handlers yield mid-mutation (like the real ones do around
+overlay pushes) and checks the economy invariants hold.
+
+Run from the repo root:
+    python3 -m unittest tests.test_player_locks -v
+"""
+import asyncio
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.player_locks import PlayerLocks, involved_players
+
+
+class InvolvedPlayersTests(unittest.TestCase):
+    def test_single_player_command(self):
+        self.assertEqual(involved_players("phish", "Alice", "ignored"), ["alice"])
+
+    def test_steal_includes_target_sorted(self):
+        self.assertEqual(involved_players("steal", "zed", "@Bob"), ["bob", "zed"])
+
+    def test_ownercash_target_is_second_arg(self):
+        self.assertEqual(involved_players("ownercash", "theo", "100 carol"), ["carol", "theo"])
+
+    def test_self_target_deduplicated(self):
+        self.assertEqual(involved_players("bail", "alice", "alice"), ["alice"])
+
+    def test_missing_target(self):
+        self.assertEqual(involved_players("steal", "alice", ""), ["alice"])
+
+
+class Wallet:
+    def __init__(self, points):
+        self.points = points
+
+
+class EconomySim:
+    """A tiny economy whose handlers read-modify-write across awaits."""
+
+    def __init__(self, n_players=20, start=1_000, locks=True):
+        self.players = {f"p{i}": Wallet(start) for i in range(n_players)}
+        self.locks = PlayerLocks() if locks else None
+        self.minted = 0
+
+    async def _hold(self, command, author, args):
+        if self.locks is None:
+            await self._dispatch(command, author, args)
+            return
+        async with self.locks.hold(*involved_players(command, author, args)):
+            await self._dispatch(command, author, args)
+
+    async def _dispatch(self, command, author, args):
+        if command == "steal":
+            await self.steal(author, args)
+        else:
+            await self.attack(author)
+
+    async def steal(self, thief, victim):
+        if thief == victim:
+            return
+        v = self.players[victim]
+        t = self.players[thief]
+        amount = min(v.points, 50)
+        await asyncio.sleep(0)          # e.g. overlay push between read and write
+        v.points -= amount
+        await asyncio.sleep(0)
+        t.points += amount
+
+    async def attack(self, user):
+        p = self.players[user]
+        before = p.points
+        await asyncio.sleep(0)          # e.g. chat send before banking
+        p.points = before + 10
+        self.minted += 10
+
+    async def run(self, n_commands, seed=7):
+        rng = random.Random(seed)
+        names = list(self.players)
+        coros = []
+        for _ in range(n_commands):
+            author = rng.choice(names)
+            if rng.random() < 0.5:
+                coros.append(self._hold("steal", author, rng.choice(names)))
+            else:
+                coros.append(self._hold("phish", author, ""))
+        await asyncio.wait_for(asyncio.gather(*coros), timeout=30)
+
+    def total(self):
+        return sum(p.points for p in self.players.values())
+
+
+class StressTests(unittest.TestCase):
+    def test_thousands_of_interleaved_commands_keep_invariants(self):
+        sim = EconomySim()
+        start_total = sim.total()
+        asyncio.run(sim.run(5_000))
+        self.assertTrue(all(p.points >= 0 for p in sim.players.values()))
+        # Steals only move points; attacks mint exactly what they report.
+        self.assertEqual(sim.total(), start_total + sim.minted)
+        self.assertEqual(len(sim.locks), 0, "idle locks must be released")
+
+    def test_without_locks_the_same_load_loses_points(self):
+        """Sanity check that the stress test actually exercises the race."""
+        sim = EconomySim(locks=False)
+        start_total = sim.total()
+        asyncio.run(sim.run(5_000))
+        self.assertNotEqual(sim.total(), start_total + sim.minted)
+
+    def test_opposing_steals_do_not_deadlock(self):
+        sim = EconomySim(n_players=2)
+
+        async def go():
+            await asyncio.wait_for(asyncio.gather(*[
+                sim._hold("steal", a, b)
+                for _ in range(500) for a, b in (("p0", "p1"), ("p1", "p0"))
+            ]), timeout=10)
+        asyncio.run(go())
+        self.assertEqual(sim.total(), 2_000)
+
+    def test_unrelated_players_run_concurrently(self):
+        locks = PlayerLocks()
+
+        async def go():
+            async with locks.hold("alice"):
+                # bob's command must not wait for alice's.
+                async with locks.hold("bob"):
+                    return locks.is_held("alice") and locks.is_held("bob")
+        self.assertTrue(asyncio.run(go()))
+
+
+if __name__ == "__main__":
+    unittest.main()
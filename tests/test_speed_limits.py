@@ -0,0 +1,178 @@
+"""Tests for game/speed_limits.py — token-bucket and sliding-window engines,
+and jail.record_attack driving them from SPEED_THRESHOLDS.
+
+Run from the repo root:
+    python3 -m unittest tests.test_speed_limits -v
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game import jail
+from game.speed_limits import SlidingWindowLimit, TokenBucketLimit
+from playerdata import Player
+
+T0 = datetime(2026, 5, 9, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def make_player(username="alice", level=10) -> Player:
+    return Player(username=username, level=level, health=10, items=[],
+                  location="email", points=10_000, started=0)
+
+
+def _hits(limit, gaps, t=1_000.0):
+    """Feed attacks `gaps` seconds apart (first at `t`); return the verdicts."""
+    state, out = [], []
+    for gap in gaps:
+        t += gap
+        out.append(limit.hit(state, t)[0])
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Engines
+# ---------------------------------------------------------------------------
+
+class TokenBucketTests(unittest.TestCase):
+    def test_burst_then_too_fast(self):
+        verdicts = _hits(TokenBucketLimit(rate=5, burst=3), [0, 0, 0, 0])
+        self.assertEqual(verdicts, [False, False, False, True])
+
+    def test_refills_at_rate(self):
+        limit, state = TokenBucketLimit(rate=4, burst=1), []
+        limit.hit(state, 0.0)
+        self.assertTrue(limit.hit(state, 0.125)[0])     # 0.5 token back
+        self.assertFalse(limit.hit(state, 0.375)[0])    # 1.0 token back
+        self.assertEqual(state[0], 0.0)
+
+    def test_refill_caps_at_burst(self):
+        limit, state = TokenBucketLimit(rate=5, burst=2), []
+        limit.hit(state, 0.0)
+        too_fast, gap = limit.hit(state, 3600.0)
+        self.assertFalse(too_fast)
+        self.assertEqual(gap, 3600.0)
+        self.assertEqual(state[0], 1.0)
+
+    def test_first_hit_has_no_gap(self):
+        self.assertEqual(TokenBucketLimit(5, 2).hit([], 0.0), (False, None))
+
+    def test_rejects_bad_config(self):
+        with self.assertRaises(ValueError):
+            TokenBucketLimit(rate=0, burst=2)
+        with self.assertRaises(ValueError):
+            TokenBucketLimit(rate=5, burst=0.5)
+
+
+class SlidingWindowTests(unittest.TestCase):
+    def test_caps_hits_per_window(self):
+        verdicts = _hits(SlidingWindowLimit(max_hits=3, window=1), [0, 0.1, 0.1, 0.1])
+        self.assertEqual(verdicts, [False, False, False, True])
+
+    def test_previous_window_fades(self):
+        limit, state = SlidingWindowLimit(max_hits=2, window=1), []
+        self.assertEqual([limit.hit(state, t)[0] for t in (0.0, 0.5, 0.9)], [False, False, True])
+        self.assertTrue(limit.hit(state, 1.2)[0])       # 3 × 0.8 still in the window
+        self.assertFalse(limit.hit(state, 2.9)[0])      # 1 × 0.1
+
+    def test_long_idle_clears_both_windows(self):
+        limit, state = SlidingWindowLimit(max_hits=1, window=1), []
+        limit.hit(state, 0.0)
+        self.assertFalse(limit.hit(state, 5.5)[0])
+        self.assertEqual(state[:3], [5.0, 0.0, 1.0])
+
+
+class RateNotGapTests(unittest.TestCase):
+    """Engines judge the sustained rate, not any single gap."""
+
+    ENGINES = (TokenBucketLimit(rate=8, burst=4), SlidingWindowLimit(max_hits=16, window=2))
+
+    def test_occasional_double_click_is_safe(self):
+        # ~6 clicks/sec with a 50 ms double-click every other click: the
+        # legacy 0.1s gap would strike on each double-click.
+        for limit in self.ENGINES:
+            self.assertFalse(any(_hits(limit, [0] + [0.3, 0.05] * 20)), limit)
+
+    def test_steady_autoclicker_is_caught(self):
+        # 10/sec exactly never trips the legacy 0.1s gap.
+        for limit in self.ENGINES:
+            self.assertTrue(any(_hits(limit, [0] + [0.1] * 60)), limit)
+
+
+# ---------------------------------------------------------------------------
+# jail.record_attack with engine tiers
+# ---------------------------------------------------------------------------
+
+class EngineTierTests(unittest.TestCase):
+    def setUp(self):
+        self._tables = dict(jail.SPEED_THRESHOLDS)
+        jail.SPEED_THRESHOLDS["evilcorp"] = [(100, 0.1), (None, TokenBucketLimit(rate=5, burst=2))]
+        jail.SPEED_THRESHOLDS["email"] = [(None, SlidingWindowLimit(max_hits=2, window=1))]
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "attack_log.jsonl")
+        jail.set_attack_log_path(self.path)
+        jail._SINK.sample_above = 0
+
+    def tearDown(self):
+        jail.SPEED_THRESHOLDS.clear()
+        jail.SPEED_THRESHOLDS.update(self._tables)
+        jail.set_attack_log_path("")
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _attack(self, p, loc, seconds, **kwargs):
+        return jail.record_attack(p, loc, 100, now=T0 + timedelta(seconds=seconds), **kwargs)
+
+    def test_tier_picks_engine_by_level(self):
+        self.assertEqual(jail.threshold_for("evilcorp", 100), 0.1)
+        self.assertIsInstance(jail.limit_for("evilcorp", 101), TokenBucketLimit)
+        self.assertEqual(jail.threshold_for("evilcorp", 101), 0.2)
+
+    def test_three_strikes_jail(self):
+        p = make_player(level=500)
+        results = [self._attack(p, "evilcorp", 0.01 * i) for i in range(5)]
+        self.assertEqual([r.is_violation for r in results], [False, False, True, True, True])
+        self.assertEqual([r.strikes_now for r in results[2:4]], [1, 2])
+        self.assertTrue(results[4].jailed)
+        self.assertEqual(results[4].limiter, "bucket")
+        self.assertTrue(jail.is_jailed(p, now=T0 + timedelta(seconds=1)))
+
+    def test_engine_skips_iso_timestamps(self):
+        p = make_player(level=500)
+        self._attack(p, "evilcorp", 0)
+        self.assertEqual(p.last_attack_at, {})
+        self.assertIn("evilcorp", p.rate_state)
+        self.assertNotIn("rate_state", p.to_dict())
+
+    def test_bypass_uses_rate_without_strikes(self):
+        p = make_player(level=500)
+        for i in range(5):
+            r = self._attack(p, "evilcorp", 0.01 * i, bypass_speed_check=True)
+            self.assertFalse(r.is_violation)
+        self.assertEqual(p.speed_strikes, 0)
+        self.assertTrue(self._attack(p, "evilcorp", 0.05).is_violation)
+
+    def test_no_cap_window_exempts(self):
+        p = make_player(level=500)
+        jail.grant_no_cap(p, minutes=1, now=T0)
+        for i in range(10):
+            self.assertFalse(self._attack(p, "email", 0.01 * i).is_violation)
+
+    def test_telemetry_tags_engine_rows(self):
+        p = make_player(level=500)
+        self._attack(p, "evilcorp", 0)
+        self._attack(p, "website", 0)
+        jail.flush_telemetry()
+        with open(self.path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows[0]["limiter"], "bucket")
+        self.assertEqual(rows[0]["threshold"], 0.2)
+        self.assertNotIn("limiter", rows[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
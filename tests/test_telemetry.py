@@ -0,0 +1,178 @@
+"""Tests for game/telemetry.py — buffered, rotating, sampled JSONL sink.
+
+Run from the repo root:
+    python3 -m unittest tests.test_telemetry -v
+"""
+import glob
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.telemetry import TelemetrySink, segment_glob
+
+
+class FakeClock:
+    def __init__(self, t=1_800_000_000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+    def advance(self, seconds):
+        self.t += seconds
+
+
+def _lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class SinkTestBase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "attack_log.jsonl")
+        self.clock = FakeClock()
+        self.sinks = []
+
+    def tearDown(self):
+        for sink in self.sinks:
+            sink.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def sink(self, **kwargs):
+        kwargs.setdefault("flush_interval", 3600)     # tests flush by hand
+        s = TelemetrySink(self.path, clock=self.clock, **kwargs)
+        self.sinks.append(s)
+        return s
+
+
+class BufferTests(SinkTestBase):
+    def test_emit_is_buffered_until_flush(self):
+        s = self.sink()
+        s.emit({"n": 1})
+        self.assertFalse(os.path.exists(self.path))
+        s.flush()
+        self.assertEqual(_lines(self.path), [{"n": 1}])
+
+    def test_datetimes_encoded_on_write(self):
+        s = self.sink()
+        s.emit({"ts": datetime(2026, 5, 9, 12, 0, tzinfo=timezone.utc)})
+        s.emit({"ts": datetime(2026, 5, 9, 12, 0)})                 # naive → UTC
+        s.flush()
+        self.assertEqual([r["ts"] for r in _lines(self.path)],
+                         ["2026-05-09T12:00:00+00:00"] * 2)
+
+    def test_background_writer_drains(self):
+        s = self.sink(flush_interval=0.01)
+        s.emit({"n": 1})
+        deadline = time.time() + 2
+        while time.time() < deadline and not (os.path.exists(self.path) and _lines(self.path)):
+            time.sleep(0.01)
+        self.assertEqual(_lines(self.path), [{"n": 1}])
+
+    def test_close_writes_remaining_rows(self):
+        s = self.sink()
+        s.emit({"n": 1})
+        s.close()
+        self.assertEqual(_lines(self.path), [{"n": 1}])
+
+    def test_full_buffer_drops_oldest(self):
+        s = self.sink(max_buffer=2)
+        for n in range(3):
+            s.emit({"n": n})
+        self.assertEqual(s.dropped, 1)
+        s.flush()
+        self.assertEqual([r["n"] for r in _lines(self.path)], [1, 2])
+
+
+class SamplingTests(SinkTestBase):
+    def test_rows_past_threshold_are_sampled_and_tagged(self):
+        s = self.sink(sample_above=3, sample_every=2)
+        for n in range(9):
+            s.emit({"n": n}, key="alice")
+        s.emit({"n": 99}, key="bob")
+        s.flush()
+        rows = _lines(self.path)
+        kept = [r["n"] for r in rows if "sample" not in r]
+        tagged = [r["n"] for r in rows if r.get("sample") == 2]
+        self.assertEqual(kept, [0, 1, 2, 99])
+        self.assertEqual(tagged, [4, 6, 8])
+        self.assertEqual(s.sampled_out, 3)
+
+    def test_keep_rows_never_sampled(self):
+        s = self.sink(sample_above=1, sample_every=100)
+        for n in range(5):
+            s.emit({"n": n}, key="alice", keep=True)
+        s.flush()
+        self.assertEqual(len(_lines(self.path)), 5)
+
+    def test_window_resets_each_second(self):
+        s = self.sink(sample_above=1, sample_every=100)
+        s.emit({"n": 0}, key="alice")
+        s.emit({"n": 1}, key="alice")          # sampled out
+        self.clock.advance(1)
+        s.emit({"n": 2}, key="alice")
+        s.flush()
+        self.assertEqual([r["n"] for r in _lines(self.path)], [0, 2])
+
+    def test_zero_disables_sampling(self):
+        s = self.sink(sample_above=0)
+        for n in range(50):
+            s.emit({"n": n}, key="alice")
+        s.flush()
+        self.assertEqual(len(_lines(self.path)), 50)
+
+
+class RotationTests(SinkTestBase):
+    def _segments(self):
+        return sorted(glob.glob(segment_glob(self.path)))
+
+    def test_size_rotation_gzips_closed_segment(self):
+        s = self.sink(max_bytes=50)
+        for n in range(5):
+            s.emit({"n": n, "pad": "x" * 20})
+        s.flush()
+        (seg,) = self._segments()
+        with gzip.open(seg, "rt") as f:
+            self.assertEqual(len(f.read().splitlines()), 5)
+        self.assertFalse(os.path.exists(seg[:-3]))      # plain copy removed
+        s.emit({"n": 5})
+        s.flush()
+        self.assertEqual(_lines(self.path), [{"n": 5}])
+
+    def test_age_rotation(self):
+        s = self.sink(max_age=60)
+        s.emit({"n": 0})
+        s.flush()
+        self.assertEqual(self._segments(), [])
+        self.clock.advance(61)
+        s.flush()                                       # idle drain still rotates
+        self.assertEqual(len(self._segments()), 1)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_prune_keeps_newest_segments(self):
+        s = self.sink(keep=2)
+        for n in range(4):
+            s.emit({"n": n})
+            s.flush()
+            s.rotate()
+            self.clock.advance(1)
+        segs = self._segments()
+        self.assertEqual(len(segs), 2)
+        with gzip.open(segs[-1], "rt") as f:
+            self.assertEqual(json.loads(f.read()), {"n": 3})
+
+    def test_rotate_nothing(self):
+        self.assertIsNone(self.sink().rotate())
+
+
+if __name__ == "__main__":
+    unittest.main()
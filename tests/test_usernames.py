@@ -0,0 +1,60 @@
+"""Tests for game/usernames.py — the username prefix index.
+
+Run from the repo root:
+    python3 -m unittest tests.test_usernames -v
+"""
+import os
+import random
+import string
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.usernames import UsernameIndex
+
+
+class IndexTests(unittest.TestCase):
+    def setUp(self):
+        self.idx = UsernameIndex(["theo2612", "TheoBot", "alice", "alicia", "bob"])
+
+    def test_complete_is_sorted_prefix_slice(self):
+        self.assertEqual(self.idx.complete("THE"), ["theo2612", "theobot"])
+        self.assertEqual(self.idx.complete("@ali", limit=1), ["alice"])
+        self.assertEqual(self.idx.complete("z"), [])
+        self.assertEqual(self.idx.complete(""), [])
+
+    def test_add_remove_contains(self):
+        self.assertTrue(self.idx.add("Carol"))
+        self.assertFalse(self.idx.add("carol"))
+        self.assertIn("carol", self.idx)
+        self.assertTrue(self.idx.remove("carol"))
+        self.assertNotIn("carol", self.idx)
+        self.assertEqual(len(self.idx), 5)
+
+    def test_suggest_completes_a_truncated_name(self):
+        self.assertEqual(self.idx.suggest("theo"), ["theo2612", "theobot"])
+
+    def test_suggest_fixes_a_typo(self):
+        self.assertEqual(self.idx.suggest("alcie")[0], "alice")
+        self.assertEqual(self.idx.suggest("theo2613")[0], "theo2612")
+
+    def test_suggest_nothing_close(self):
+        self.assertEqual(self.idx.suggest("zzz"), [])
+
+
+class ScaleTests(unittest.TestCase):
+    def test_lookups_at_100k(self):
+        rng = random.Random(1)
+        names = {"".join(rng.choices(string.ascii_lowercase + string.digits,
+                                     k=rng.randint(4, 14)))
+                 for _ in range(100_000)}
+        idx = UsernameIndex(names)
+        for p in (n[:3] for n in rng.sample(sorted(names), 500)):
+            matches = idx.complete(p)
+            self.assertTrue(matches)
+            self.assertTrue(all(m.startswith(p) for m in matches))
+
+
+if __name__ == "__main__":
+    unittest.main()
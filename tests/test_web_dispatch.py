@@ -0,0 +1,99 @@
+"""Tests for bot/web_dispatch.py — the precompiled web command dispatch table.
+
+The table must bind web `args` exactly like the old per-call signature
+introspection in execute_web_command did.
+
+Run from the repo root:
+    python3 -m unittest tests.test_web_dispatch -v
+"""
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import web_dispatch
+
+
+class FakeCommand:
+    """Just the slice of twitchio's Command that the table reads."""
+    def __init__(self, callback, instance=None):
+        self._callback = callback
+        self._instance = instance
+
+
+class FakeCtx:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, msg):
+        self.sent.append(msg)
+
+
+class FakeBot:
+    async def points(self, ctx):
+        await ctx.send("points:bot")
+
+    async def steal(self, ctx, target: str):
+        await ctx.send(f"steal:{target}")
+
+    async def hack(self, ctx, location: str = None):
+        await ctx.send(f"hack:{location}")
+
+
+class FakeCog:
+    async def hello(self, ctx):
+        await ctx.send(f"hello:{type(self).__name__}")
+
+
+def build(bot=None):
+    bot = bot or FakeBot()
+    cog = FakeCog()
+    commands = {
+        "points": FakeCommand(FakeBot.points),
+        "steal": FakeCommand(FakeBot.steal),
+        "hack": FakeCommand(FakeBot.hack),
+        "hello": FakeCommand(FakeCog.hello, instance=cog),
+    }
+    web_only = {"konami": lambda self, ctx, args: ctx.send(f"konami:{args}")}
+    return web_dispatch.build_dispatch_table(bot, commands, web_only)
+
+
+def dispatch(table, name, args=""):
+    ctx = FakeCtx()
+    route = table[name]
+    kwargs = route.bind(args)
+    if kwargs is None:
+        return [route.usage]
+    asyncio.run(route.handler(ctx, **kwargs))
+    return ctx.sent
+
+
+class DispatchTableTests(unittest.TestCase):
+    def test_no_arg_command(self):
+        self.assertEqual(dispatch(build(), "points", "ignored"), ["points:bot"])
+
+    def test_required_arg_is_forwarded(self):
+        self.assertEqual(dispatch(build(), "steal", "bob"), ["steal:bob"])
+
+    def test_missing_required_arg_gives_usage(self):
+        self.assertEqual(dispatch(build(), "steal"), ["Usage: !steal <target>"])
+
+    def test_optional_arg_defaults(self):
+        table = build()
+        self.assertEqual(dispatch(table, "hack"), ["hack:None"])
+        self.assertEqual(dispatch(table, "hack", "email"), ["hack:email"])
+
+    def test_cog_commands_bind_to_the_cog(self):
+        self.assertEqual(dispatch(build(), "hello"), ["hello:FakeCog"])
+
+    def test_web_only_handlers_get_raw_args(self):
+        self.assertEqual(dispatch(build(), "konami", "up up down"), ["konami:up up down"])
+
+    def test_unknown_command_absent(self):
+        self.assertNotIn("nope", build())
+
+
+if __name__ == "__main__":
+    unittest.main()